@@ -9,7 +9,7 @@ Requirements: 3.3
 """
 
 import math
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from PySide6.QtCore import Qt, QPoint, QRect
 from PySide6.QtGui import (
@@ -17,6 +17,9 @@ from PySide6.QtGui import (
     QPolygon, QPainterPath
 )
 
+from screenshot_tool.core.mosaic_engine import MosaicMode, render_mosaic
+from screenshot_tool.core.stroke_geometry import StrokePoints
+
 
 # 文字工具常量（与 overlay_screenshot.py 保持一致）
 TEXT_FONT_FAMILY = "Microsoft YaHei"
@@ -100,6 +103,13 @@ class AnnotationRenderer:
         # 解析颜色
         color = QColor(color_str)
         
+        # 画笔笔画直接从坐标数组构建路径，不创建 QPoint 列表
+        # Feature: stroke-simplification
+        if tool == "pen":
+            if points_data:
+                AnnotationRenderer._render_pen(painter, StrokePoints.from_xy(points_data), color, width)
+            return
+        
         # 转换点数据
         points = [QPoint(p[0], p[1]) for p in points_data]
         
@@ -115,14 +125,15 @@ class AnnotationRenderer:
             AnnotationRenderer._render_arrow(painter, points, color, width)
         elif tool == "line":
             AnnotationRenderer._render_line(painter, points, color, width)
-        elif tool == "pen":
-            AnnotationRenderer._render_pen(painter, points, color, width)
         elif tool == "marker":
             AnnotationRenderer._render_marker(painter, points, color, width)
         elif tool == "text":
             AnnotationRenderer._render_text(painter, points, color, width, text)
         elif tool == "mosaic":
-            AnnotationRenderer._render_mosaic(painter, points, image)
+            AnnotationRenderer._render_mosaic(
+                painter, points, image,
+                AnnotationRenderer._parse_mosaic_mode(annotation.get("mosaic_mode"))
+            )
         elif tool == "step":
             AnnotationRenderer._render_step(painter, points, color, width, step_number)
     
@@ -219,7 +230,7 @@ class AnnotationRenderer:
         painter.drawLine(points[0], points[-1])
     
     @staticmethod
-    def _render_pen(painter: QPainter, points: List[QPoint], color: QColor, width: int) -> None:
+    def _render_pen(painter: QPainter, points: Sequence[QPoint], color: QColor, width: int) -> None:
         """渲染画笔路径"""
         if len(points) < 2:
             return
@@ -228,15 +239,12 @@ class AnnotationRenderer:
         pen.setCapStyle(Qt.PenCapStyle.RoundCap)
         pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
         painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
         
         # 使用 QPainterPath 绘制平滑曲线
-        path = QPainterPath()
-        path.moveTo(points[0])
-        
-        for i in range(1, len(points)):
-            path.lineTo(points[i])
-        
-        painter.drawPath(path)
+        if not isinstance(points, StrokePoints):
+            points = StrokePoints.from_points(points)
+        painter.drawPath(points.to_path())
     
     @staticmethod
     def _render_marker(painter: QPainter, points: List[QPoint], color: QColor, width: int) -> None:
@@ -289,53 +297,27 @@ class AnnotationRenderer:
         painter.drawText(points[0], text)
     
     @staticmethod
-    def _render_mosaic(painter: QPainter, points: List[QPoint], image: Optional[QImage]) -> None:
-        """渲染马赛克"""
+    def _parse_mosaic_mode(value: Optional[str]) -> MosaicMode:
+        """解析标注中的马赛克模式，缺省或未知值为像素化"""
+        try:
+            return MosaicMode(value)
+        except ValueError:
+            return MosaicMode.PIXELATE
+    
+    @staticmethod
+    def _render_mosaic(painter: QPainter, points: List[QPoint], image: Optional[QImage],
+                       mode: MosaicMode = MosaicMode.PIXELATE) -> None:
+        """渲染马赛克（与截图编辑共用 mosaic_engine）"""
         if len(points) < 2 or image is None:
             return
         
         rect = QRect(points[0], points[-1]).normalized()
-        
-        # 确保矩形在图像范围内
-        img_rect = image.rect()
-        rect = rect.intersected(img_rect)
-        
-        if rect.isEmpty():
+        tile = render_mosaic(image, rect, AnnotationRenderer.MOSAIC_BLOCK_SIZE, mode)
+        if tile is None:
             return
         
-        block_size = AnnotationRenderer.MOSAIC_BLOCK_SIZE
-        
-        # 遍历每个马赛克块
-        for y in range(rect.top(), rect.bottom(), block_size):
-            for x in range(rect.left(), rect.right(), block_size):
-                # 计算块的实际大小
-                block_w = min(block_size, rect.right() - x)
-                block_h = min(block_size, rect.bottom() - y)
-                
-                if block_w <= 0 or block_h <= 0:
-                    continue
-                
-                # 计算块的平均颜色
-                total_r, total_g, total_b = 0, 0, 0
-                pixel_count = 0
-                
-                for py in range(y, min(y + block_h, image.height())):
-                    for px in range(x, min(x + block_w, image.width())):
-                        pixel = image.pixelColor(px, py)
-                        total_r += pixel.red()
-                        total_g += pixel.green()
-                        total_b += pixel.blue()
-                        pixel_count += 1
-                
-                if pixel_count > 0:
-                    avg_color = QColor(
-                        total_r // pixel_count,
-                        total_g // pixel_count,
-                        total_b // pixel_count
-                    )
-                    
-                    # 填充块
-                    painter.fillRect(x, y, block_w, block_h, avg_color)
+        # render_mosaic 已把区域裁剪到图像范围内
+        painter.drawImage(rect.intersected(image.rect()).topLeft(), tile)
     
     @staticmethod
     def _render_step(painter: QPainter, points: List[QPoint], color: QColor, width: int, step_number: int) -> None:
@@ -7,11 +7,23 @@
 Feature: clipboard-history
 Feature: workbench-temporary-preview-python (SQLite 存储迁移)
 Requirements: 8.1, 8.2
+
+Feature: clipboard-content-dedup
+按内容摘要去重：重复复制的文本/图片只更新已有条目的时间戳，不再写入新的 PNG 和记录。
+
+Feature: image-encode-queue
+所有图片（剪贴板与截图）经有界后台编码队列写盘，GUI 线程不做图片编码。
+
+Feature: history-thumbnail-store
+历史列表使用持久化到 SQLite 的小尺寸缩略图，内存缓存按字节预算做 LRU 淘汰。
 """
 
 import json
+import math
 import os
+import threading
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -20,8 +32,8 @@ from typing import List, Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from screenshot_tool.core.screenshot_state_manager import AnnotationData
 
-from PySide6.QtCore import QObject, Signal, QTimer, QThread
-from PySide6.QtGui import QClipboard, QImage
+from PySide6.QtCore import QCoreApplication, QDeadlineTimer, QObject, Signal, QTimer, QThread
+from PySide6.QtGui import QClipboard, QImage, QImageWriter
 from PySide6.QtWidgets import QApplication
 
 # SQLite 存储模块
@@ -30,9 +42,110 @@ from screenshot_tool.core.sqlite_history_storage import (
     get_sqlite_history_storage,
     HistoryItem as SQLiteHistoryItem,
     ContentType as SQLiteContentType,
+    HistorySummary,
+    PageCursor,
+    compute_pixel_hash,
+    compute_text_hash,
+)
+from screenshot_tool.core.thumbnail_cache import (
+    THUMBNAIL_MAX_EDGE,
+    ByteBudgetLRUCache,
+    decode_thumbnail,
+    encode_thumbnail,
+    image_nbytes,
+    load_scaled_image,
+    scale_to_thumbnail,
 )
 
 
+@dataclass(frozen=True)
+class ImageEncodeOptions:
+    """图片编码选项
+    
+    Feature: image-encode-queue
+    
+    Attributes:
+        format: 图片格式，"PNG" 或 "WEBP"（无损）；Qt 缺少 WebP 插件时回退到 PNG
+        png_compression: PNG zlib 压缩级别 0-9，越大文件越小、编码越慢
+    """
+    format: str = "PNG"
+    png_compression: int = 6
+    
+    # 支持的格式及对应扩展名
+    FORMAT_EXTENSIONS = {"PNG": ".png", "WEBP": ".webp"}
+    
+    def __post_init__(self):
+        """验证并规范化选项值"""
+        fmt = str(self.format).upper()
+        if fmt not in self.FORMAT_EXTENSIONS:
+            fmt = "PNG"
+        if fmt == "WEBP" and not self.is_format_supported(fmt):
+            fmt = "PNG"
+        object.__setattr__(self, "format", fmt)
+        
+        try:
+            level = int(self.png_compression)
+        except (TypeError, ValueError):
+            level = 6
+        object.__setattr__(self, "png_compression", max(0, min(9, level)))
+    
+    @staticmethod
+    def is_format_supported(fmt: str) -> bool:
+        """Qt 是否可以写入该格式"""
+        supported = {bytes(f).decode("ascii").upper() for f in QImageWriter.supportedImageFormats()}
+        return fmt.upper() in supported
+    
+    @property
+    def extension(self) -> str:
+        """文件扩展名"""
+        return self.FORMAT_EXTENSIONS[self.format]
+    
+    @property
+    def quality(self) -> int:
+        """传给 QImage.save 的 quality 参数
+        
+        - PNG：Qt 按 compression = (100 - quality) * 9 / 91 换算压缩级别
+        - WEBP：quality 100 为无损编码
+        """
+        if self.format == "WEBP":
+            return 100
+        return 100 - math.ceil(self.png_compression * 91 / 9)
+
+
+def save_image_file(
+    image: QImage,
+    image_path: str,
+    options: Optional[ImageEncodeOptions] = None,
+) -> bool:
+    """编码并保存图片文件
+    
+    先写入临时文件再原子替换，读取方不会看到写了一半的图片。
+    
+    Feature: image-encode-queue
+    
+    Args:
+        image: 要保存的图片
+        image_path: 目标文件完整路径
+        options: 编码选项，默认 PNG
+        
+    Returns:
+        是否保存成功
+    """
+    options = options or ImageEncodeOptions()
+    temp_path = f"{image_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        if not image.save(temp_path, options.format, options.quality):
+            return False
+        os.replace(temp_path, image_path)
+        return True
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
 class ImageSaveWorker(QThread):
     """后台线程保存图片，避免阻塞 UI
     
@@ -45,10 +158,12 @@ class ImageSaveWorker(QThread):
         image: QImage,
         image_path: str,
         parent: Optional[QObject] = None,
+        options: Optional[ImageEncodeOptions] = None,
     ):
         super().__init__(parent)
         self._image = image
         self._image_path = image_path
+        self._options = options
         self._item_id = ""
     
     def set_item_id(self, item_id: str) -> None:
@@ -58,12 +173,219 @@ class ImageSaveWorker(QThread):
     def run(self) -> None:
         """在后台线程中保存图片"""
         try:
-            success = self._image.save(self._image_path, "PNG")
+            success = save_image_file(self._image, self._image_path, self._options)
             self.finished.emit(self._item_id, success)
         except Exception:
             self.finished.emit(self._item_id, False)
 
 
+class _ImageEncodeThread(QThread):
+    """编码队列的工作线程：持续取任务直到队列为空后退出
+    
+    Feature: image-encode-queue
+    """
+    job_finished = Signal(str, bool)  # (item_id, success)
+    
+    def __init__(self, queue: 'ImageEncodeQueue'):
+        super().__init__(queue)
+        self._queue = queue
+    
+    def run(self) -> None:
+        """在后台线程中依次编码队列中的图片"""
+        while True:
+            job = self._queue._take_job(self)
+            if job is None:
+                return
+            item_id, image, image_path, options = job
+            try:
+                success = save_image_file(image, image_path, options)
+            except Exception:
+                success = False
+            self._queue._finish_job(self)
+            self.job_finished.emit(item_id, success)
+
+
+class ImageEncodeQueue(QObject):
+    """有界后台图片编码队列
+    
+    剪贴板图片和截图统一经此队列写盘：最多 max_workers 个编码线程并行，
+    已提交但尚未回调完成的图片不超过 max_pending 张（限制突发复制时的内存占用）。
+    队列满时 submit() 返回 False，由调用方决定如何退让。
+    
+    工作线程自行从队列取下一个任务，不依赖主线程事件循环推进；
+    同一文件的任务串行执行，保证后提交的图片最终落盘。
+    
+    Feature: image-encode-queue
+    """
+    finished = Signal(str, bool)  # (item_id, success)
+    
+    DEFAULT_MAX_WORKERS = 2
+    DEFAULT_MAX_PENDING = 8
+    
+    def __init__(
+        self,
+        options: Optional[ImageEncodeOptions] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._options = options or ImageEncodeOptions()
+        self._max_workers = max(1, max_workers)
+        self._max_pending = max(1, max_pending)
+        
+        # 以下状态由工作线程和主线程共享，通过 _lock 保护
+        self._lock = threading.Lock()
+        self._jobs: deque = deque()  # (item_id, image, image_path, options)
+        self._current: dict = {}     # 工作线程 -> 正在编码的任务
+        self._active_threads = 0     # 尚未退出取任务循环的线程数
+        
+        # 以下状态只在主线程访问
+        self._threads: List[_ImageEncodeThread] = []
+        self._inflight = 0  # 已提交、完成回调尚未处理的任务数
+    
+    @property
+    def options(self) -> ImageEncodeOptions:
+        """当前编码选项（对之后提交的任务生效）"""
+        return self._options
+    
+    def set_options(self, options: ImageEncodeOptions) -> None:
+        """设置编码选项"""
+        self._options = options
+    
+    @property
+    def workers(self) -> List[QThread]:
+        """正在运行的编码线程"""
+        return [t for t in self._threads if not t.isFinished()]
+    
+    def pending_count(self) -> int:
+        """已提交、尚未完成回调的任务数"""
+        return self._inflight
+    
+    def is_full(self) -> bool:
+        """队列是否已满"""
+        return self._inflight >= self._max_pending
+    
+    def is_pending(self, item_id: str) -> bool:
+        """条目是否还有排队或编码中的任务"""
+        with self._lock:
+            return (
+                any(job[0] == item_id for job in self._jobs)
+                or any(job[0] == item_id for job in self._current.values())
+            )
+    
+    def submit(
+        self,
+        item_id: str,
+        image: QImage,
+        image_path: str,
+        force: bool = False,
+    ) -> bool:
+        """提交编码任务
+        
+        Args:
+            item_id: 条目 ID（完成信号参数）
+            image: 要保存的图片（QImage 隐式共享，提交后调用方不应再修改）
+            image_path: 目标文件完整路径
+            force: 忽略容量限制（用户主动保存的截图不能丢弃）
+            
+        Returns:
+            是否已加入队列
+        """
+        if not force and self.is_full():
+            return False
+        
+        self._inflight += 1
+        with self._lock:
+            self._jobs.append((item_id, image, image_path, self._options))
+            spawn = self._active_threads < self._max_workers
+            if spawn:
+                self._active_threads += 1
+        
+        if spawn:
+            self._prune_threads()
+            thread = _ImageEncodeThread(self)
+            thread.job_finished.connect(self._on_job_finished)
+            self._threads.append(thread)
+            thread.start()
+        return True
+    
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """等待所有任务完成（用于退出和测试）
+        
+        在调用线程中处理完成回调，回调中新提交的任务也会等待。
+        
+        Args:
+            timeout_ms: 超时时间（毫秒），-1 表示无限等待
+            
+        Returns:
+            是否全部完成
+        """
+        deadline = QDeadlineTimer(timeout_ms)  # -1 表示永不超时
+        while True:
+            for thread in list(self._threads):
+                if not thread.wait(deadline):
+                    return False
+            QCoreApplication.sendPostedEvents(self)
+            if self._inflight == 0:
+                return True
+            if not self.workers:
+                # 所有线程已退出但完成回调未送达
+                return False
+    
+    def _take_job(self, thread: QThread) -> Optional[tuple]:
+        """工作线程取下一个任务，没有可执行任务时登记退出
+        
+        正在被其他线程写入的文件对应的任务暂不取出，
+        由持有该文件的线程完成当前任务后继续处理。
+        """
+        with self._lock:
+            busy_paths = {job[2] for job in self._current.values()}
+            for job in self._jobs:
+                if job[2] not in busy_paths:
+                    self._jobs.remove(job)
+                    self._current[thread] = job
+                    return job
+            self._active_threads -= 1
+            return None
+    
+    def _finish_job(self, thread: QThread) -> None:
+        """工作线程完成当前任务"""
+        with self._lock:
+            self._current.pop(thread, None)
+    
+    def _prune_threads(self) -> None:
+        """释放已退出的线程对象"""
+        for thread in [t for t in self._threads if t.isFinished()]:
+            self._threads.remove(thread)
+            thread.deleteLater()
+    
+    def _on_job_finished(self, item_id: str, success: bool) -> None:
+        """任务完成回调（主线程）"""
+        self._inflight = max(0, self._inflight - 1)
+        self.finished.emit(item_id, success)
+
+
+def compute_image_hash(image: QImage) -> str:
+    """计算图片像素内容摘要
+    
+    先统一转换为 ARGB32，同一张图片无论剪贴板提供何种像素格式都得到相同摘要。
+    
+    Feature: clipboard-content-dedup
+    
+    Args:
+        image: QImage 对象
+        
+    Returns:
+        十六进制摘要字符串
+    """
+    if image.format() != QImage.Format.Format_ARGB32:
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+    # ARGB32 每像素 4 字节，行天然 4 字节对齐，缓冲区中没有填充字节
+    # 注意：image 必须在哈希完成前保持存活，constBits() 不持有数据所有权
+    return compute_pixel_hash(image.width(), image.height(), image.constBits())
+
+
 def get_clipboard_data_dir() -> str:
     """获取工作台数据目录
     
@@ -107,6 +429,9 @@ class HistoryItem:
     ocr_cache: Optional[str] = None  # OCR 识别结果文本
     ocr_cache_timestamp: Optional[datetime] = None  # OCR 缓存时间
     
+    # 内容摘要（Feature: clipboard-content-dedup），截图条目为 None
+    content_hash: Optional[str] = None
+    
     def has_ocr_cache(self) -> bool:
         """是否有 OCR 缓存
         
@@ -171,6 +496,10 @@ class HistoryItem:
         if self.ocr_cache_timestamp is not None:
             result["ocr_cache_timestamp"] = self.ocr_cache_timestamp.isoformat()
         
+        # 添加内容摘要（Feature: clipboard-content-dedup）
+        if self.content_hash is not None:
+            result["content_hash"] = self.content_hash
+        
         return result
     
     @classmethod
@@ -216,6 +545,7 @@ class HistoryItem:
             custom_name=custom_name,
             ocr_cache=ocr_cache,
             ocr_cache_timestamp=ocr_cache_timestamp,
+            content_hash=data.get("content_hash"),
         )
     
     @staticmethod
@@ -250,21 +580,37 @@ class ClipboardHistoryManager(QObject):
     
     # 信号
     history_changed = Signal()  # 历史记录变化时发射
+    image_saved = Signal(str)  # 后台编码的图片文件写入完成（item_id）
+    thumbnail_invalidated = Signal(str)  # 图片或标注变化，缩略图需重新加载（item_id）
     
     # 默认配置
     DEFAULT_MAX_ITEMS = 100
     HISTORY_FILE = "clipboard_history.json"
     IMAGES_DIR = "clipboard_images"
     
-    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS):
+    # 退出时等待后台图片编码完成的最长时间（毫秒）
+    PENDING_IMAGE_WAIT_MS = 5000
+    
+    # 全尺寸图片缓存预算（约 4 张 4K 截图）
+    IMAGE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+    
+    # 缩略图内存缓存预算（200px 缩略图约 160KB/张）
+    THUMBNAIL_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    
+    def __init__(
+        self,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        encode_options: Optional[ImageEncodeOptions] = None,
+    ):
         """初始化管理器
         
         自动检测并迁移 JSON 历史数据到 SQLite。
         
         Args:
             max_items: 最大历史记录数量
+            encode_options: 图片编码选项，默认 PNG 压缩级别 6
             
-        Feature: workbench-temporary-preview-python
+        Feature: workbench-temporary-preview-python, image-encode-queue
         Requirements: 8.1, 8.2, 8.8
         """
         super().__init__()
@@ -279,9 +625,15 @@ class ClipboardHistoryManager(QObject):
         self._in_screenshot_mode = False  # 截图模式下暂停监听
         self._history_window_focused = False  # 工作台窗口获得焦点时暂停监听
         
-        # 图片缓存（避免重复从磁盘加载）
-        self._image_cache: dict[str, QImage] = {}
-        self._image_cache_max_size = 10  # 最多缓存 10 张图片
+        # 图片缓存（避免重复从磁盘加载），按字节预算 LRU 淘汰
+        self._image_cache: ByteBudgetLRUCache[str, QImage] = ByteBudgetLRUCache(
+            self.IMAGE_CACHE_MAX_BYTES, image_nbytes
+        )
+        
+        # 缩略图内存缓存（Feature: history-thumbnail-store）
+        self._thumbnail_cache: ByteBudgetLRUCache[str, QImage] = ByteBudgetLRUCache(
+            self.THUMBNAIL_CACHE_MAX_BYTES, image_nbytes
+        )
         
         # 数据目录
         self._data_dir = get_clipboard_data_dir()
@@ -305,8 +657,17 @@ class ClipboardHistoryManager(QObject):
         self._save_timer.setInterval(500)  # 500ms 延迟
         self._save_timer.timeout.connect(self._do_save_history)
         
-        # 后台图片保存线程列表（避免阻塞 UI）
-        self._save_workers: List[ImageSaveWorker] = []
+        # 后台图片编码队列（Feature: image-encode-queue）
+        self._encode_queue = ImageEncodeQueue(encode_options, parent=self)
+        self._encode_queue.finished.connect(self._on_image_save_finished)
+        
+        # 文件尚未落盘的图片：item_id -> (QImage, 图片相对路径)
+        # 编码期间复制/预览直接使用内存中的图片
+        self._pending_images: dict[str, Tuple[QImage, str]] = {}
+        
+        # 队列满时等待提交编码的剪贴板图片：(item_id, QImage, 图片相对路径)
+        # 条目已插入（待写盘状态），队列空出后按复制顺序提交，不丢弃任何一张
+        self._deferred_saves: deque = deque()
         
         # 与截图模式管理器集成
         self._integrate_with_screenshot_mode_manager()
@@ -509,6 +870,59 @@ class ClipboardHistoryManager(QObject):
         sorted_items = sorted(self._history, key=lambda x: x.timestamp, reverse=True)
         return sorted_items
     
+    def get_history_page(
+        self,
+        after: Optional[PageCursor] = None,
+        limit: int = 50,
+        query: str = "",
+    ) -> Tuple[List[HistorySummary], Optional[PageCursor]]:
+        """按游标获取一页历史摘要（按时间降序）
+        
+        列表只需要摘要字段，完整记录通过 get_item() 按需加载。
+        
+        Args:
+            after: 上一页返回的游标，None 表示第一页
+            limit: 每页数量
+            query: 搜索关键词，为空时返回全部
+            
+        Returns:
+            (摘要列表, 下一页游标)，没有更多数据时游标为 None
+            
+        Feature: history-keyset-pagination
+        """
+        query = query.strip() if query else ""
+        
+        # 使用 SQLite 存储
+        if self._use_sqlite and self._sqlite_storage is not None:
+            try:
+                return self._sqlite_storage.get_summary_page(after, limit, query or None)
+            except Exception as e:
+                self._log_error(f"从 SQLite 分页获取历史失败: {e}")
+                # 回退到内存缓存
+        
+        # 回退：对内存中的记录应用相同的排序和游标
+        items = self.search(query) if query else list(self._history)
+        items.sort(key=lambda x: (x.timestamp, x.id), reverse=True)
+        if after is not None:
+            after_key = (datetime.fromisoformat(after.timestamp), after.id)
+            items = [x for x in items if (x.timestamp, x.id) < after_key]
+        
+        summaries = [
+            HistorySummary(
+                id=item.id,
+                content_type=SQLiteContentType(item.content_type.value),
+                preview_text=item.preview_text,
+                timestamp=item.timestamp,
+                is_pinned=item.is_pinned,
+                custom_name=item.custom_name,
+                image_path=item.image_path,
+                annotated=item.has_annotations(),
+            )
+            for item in items[:limit]
+        ]
+        next_cursor = summaries[-1].cursor if len(summaries) == limit else None
+        return summaries, next_cursor
+    
     def _convert_from_sqlite_item(self, sqlite_item: SQLiteHistoryItem) -> HistoryItem:
         """将 SQLite HistoryItem 转换为本地 HistoryItem
         
@@ -531,6 +945,7 @@ class ClipboardHistoryManager(QObject):
             custom_name=sqlite_item.custom_name,
             ocr_cache=sqlite_item.ocr_cache,
             ocr_cache_timestamp=sqlite_item.ocr_cache_timestamp,
+            content_hash=sqlite_item.content_hash,
         )
     
     def _convert_to_sqlite_item(self, item: HistoryItem) -> SQLiteHistoryItem:
@@ -555,6 +970,7 @@ class ClipboardHistoryManager(QObject):
             custom_name=item.custom_name,
             ocr_cache=item.ocr_cache,
             ocr_cache_timestamp=item.ocr_cache_timestamp,
+            content_hash=item.content_hash,
         )
     
     def get_item(self, item_id: str) -> Optional[HistoryItem]:
@@ -592,27 +1008,35 @@ class ClipboardHistoryManager(QObject):
         Args:
             item: 要添加的记录
             
-        Feature: workbench-temporary-preview-python
+        Feature: workbench-temporary-preview-python, clipboard-content-dedup
         Requirements: 8.1, 8.4
         """
+        # 文本条目自动计算内容摘要
+        if (item.content_hash is None and 
+            item.content_type != ContentType.IMAGE and item.text_content):
+            item.content_hash = compute_text_hash(item.text_content)
+        
         # 使用 SQLite 存储
         if self._use_sqlite and self._sqlite_storage is not None:
             try:
-                # 检查是否已存在相同内容（避免重复）
-                existing_items = self._sqlite_storage.get_all_items(offset=0, limit=self._max_items)
-                for existing in existing_items:
-                    if (existing.content_type.value == item.content_type.value and 
-                        existing.text_content == item.text_content and
-                        existing.image_path == item.image_path):
-                        # 已存在相同内容，删除旧记录
+                # 已存在相同内容（content_hash 唯一索引，单次查询），替换旧记录
+                existing = None
+                if item.content_hash is not None:
+                    existing = self._sqlite_storage.find_by_content_hash(item.content_hash)
+                    if existing is not None and existing.id != item.id:
                         self._sqlite_storage.delete_item(existing.id)
                         item.is_pinned = existing.is_pinned  # 保留置顶状态
-                        break
+                    else:
+                        existing = None
                 
                 # 添加到 SQLite
                 sqlite_item = self._convert_to_sqlite_item(item)
                 self._sqlite_storage.add_item(sqlite_item)
                 
+                if existing is not None and existing.content_type == SQLiteContentType.IMAGE:
+                    self._clear_image_cache(existing.id)
+                    self._release_image_file(existing.image_path)
+                
                 # 检查数量限制，删除最旧的非置顶项
                 self._enforce_limit_sqlite()
                 
@@ -625,24 +1049,91 @@ class ClipboardHistoryManager(QObject):
         
         # 回退：使用内存存储
         # 检查是否已存在相同内容（避免重复）
-        for existing in self._history:
-            if (existing.content_type == item.content_type and 
-                existing.text_content == item.text_content and
-                existing.image_path == item.image_path):
-                # 已存在相同内容，更新时间戳并移到最前
-                self._history.remove(existing)
-                item.is_pinned = existing.is_pinned  # 保留置顶状态
-                break
+        existing = None
+        if item.content_hash is not None:
+            for candidate in self._history:
+                if candidate.content_hash == item.content_hash and candidate.id != item.id:
+                    # 已存在相同内容，替换旧记录
+                    existing = candidate
+                    self._history.remove(candidate)
+                    item.is_pinned = candidate.is_pinned  # 保留置顶状态
+                    break
         
         # 添加到列表
         self._history.append(item)
         
+        if existing is not None and existing.content_type == ContentType.IMAGE:
+            self._clear_image_cache(existing.id)
+            self._release_image_file(existing.image_path)
+        
         # 检查数量限制，删除最旧的非置顶项
         self._enforce_limit()
         
         # 发射信号
         self.history_changed.emit()
     
+    def _touch_duplicate(self, content_hash: str) -> bool:
+        """如果已存在相同内容的条目，更新其时间戳使其移到最前
+        
+        剪贴板捕获在创建新条目前调用，命中时保留已有条目的 ID、置顶状态、
+        标注和 OCR 缓存，也省去图片的 PNG 编码和写盘。
+        
+        Args:
+            content_hash: 内容摘要
+            
+        Returns:
+            是否命中已有条目
+            
+        Feature: clipboard-content-dedup
+        """
+        # 使用 SQLite 存储（content_hash 唯一索引，单次查询）
+        if self._use_sqlite and self._sqlite_storage is not None:
+            try:
+                existing = self._sqlite_storage.find_by_content_hash(content_hash)
+                if existing is None:
+                    return False
+                if not self._sqlite_storage.touch_item(existing.id):
+                    return False
+                self.history_changed.emit()
+                return True
+            except Exception as e:
+                self._log_error(f"SQLite 内容去重失败: {e}")
+                # 回退到内存存储
+        
+        # 回退：从内存中查找
+        for existing in self._history:
+            if existing.content_hash == content_hash:
+                existing.timestamp = datetime.now()
+                self.history_changed.emit()
+                return True
+        return False
+    
+    def _release_image_file(self, image_path: Optional[str]) -> None:
+        """释放图片文件引用，没有记录再引用时删除文件
+        
+        在记录删除之后调用。
+        
+        Args:
+            image_path: 图片相对路径
+            
+        Feature: clipboard-content-dedup
+        """
+        if not image_path:
+            return
+        
+        if self._use_sqlite and self._sqlite_storage is not None:
+            if self._sqlite_storage.count_image_references(image_path) > 0:
+                return
+        elif any(item.image_path == image_path for item in self._history):
+            return
+        
+        image_file = os.path.join(self._data_dir, image_path)
+        if os.path.exists(image_file):
+            try:
+                os.remove(image_file)
+            except OSError:
+                pass
+    
     def _enforce_limit_sqlite(self) -> None:
         """强制执行数量限制（SQLite 版本）
         
@@ -680,21 +1171,15 @@ class ClipboardHistoryManager(QObject):
         # 使用 SQLite 存储
         if self._use_sqlite and self._sqlite_storage is not None:
             try:
-                # 先获取记录以删除图片文件
+                # 先获取记录以释放图片文件
                 sqlite_item = self._sqlite_storage.get_item(item_id)
                 if sqlite_item:
-                    # 如果是图片，删除图片文件
-                    if sqlite_item.content_type == SQLiteContentType.IMAGE and sqlite_item.image_path:
-                        image_file = os.path.join(self._data_dir, sqlite_item.image_path)
-                        if os.path.exists(image_file):
-                            try:
-                                os.remove(image_file)
-                            except OSError:
-                                pass
-                    
                     # 从 SQLite 删除
                     success = self._sqlite_storage.delete_item(item_id)
                     if success:
+                        # 如果是图片，没有其他记录引用时删除图片文件
+                        if sqlite_item.content_type == SQLiteContentType.IMAGE:
+                            self._release_image_file(sqlite_item.image_path)
                         self.history_changed.emit()
                     return success
                 return False
@@ -705,16 +1190,12 @@ class ClipboardHistoryManager(QObject):
         # 回退：从内存中删除
         for item in self._history:
             if item.id == item_id:
-                # 如果是图片，删除图片文件
-                if item.content_type == ContentType.IMAGE and item.image_path:
-                    image_file = os.path.join(self._data_dir, item.image_path)
-                    if os.path.exists(image_file):
-                        try:
-                            os.remove(image_file)
-                        except OSError:
-                            pass
-                
                 self._history.remove(item)
+                
+                # 如果是图片，没有其他记录引用时删除图片文件
+                if item.content_type == ContentType.IMAGE:
+                    self._release_image_file(item.image_path)
+                
                 self.history_changed.emit()
                 return True
         return False
@@ -929,22 +1410,20 @@ class ClipboardHistoryManager(QObject):
         # 使用 SQLite 存储
         if self._use_sqlite and self._sqlite_storage is not None:
             try:
-                # 获取要删除的记录以删除图片文件
+                # 获取要删除的记录以释放图片文件
                 items_to_delete = self._sqlite_storage.get_all_items(offset=0, limit=10000)
-                for item in items_to_delete:
-                    if keep_pinned and item.is_pinned:
-                        continue
-                    # 删除图片文件
-                    if item.content_type == SQLiteContentType.IMAGE and item.image_path:
-                        image_file = os.path.join(self._data_dir, item.image_path)
-                        if os.path.exists(image_file):
-                            try:
-                                os.remove(image_file)
-                            except OSError:
-                                pass
+                image_paths = {
+                    item.image_path for item in items_to_delete
+                    if not (keep_pinned and item.is_pinned)
+                    and item.content_type == SQLiteContentType.IMAGE and item.image_path
+                }
                 
                 # 从 SQLite 清空
                 self._sqlite_storage.clear_all(keep_pinned=keep_pinned)
+                
+                # 保留的置顶项可能引用相同图片，按引用数释放
+                for image_path in image_paths:
+                    self._release_image_file(image_path)
                 self.history_changed.emit()
                 return
             except Exception as e:
@@ -952,30 +1431,19 @@ class ClipboardHistoryManager(QObject):
                 # 回退到内存存储
         
         # 回退：清空内存
-        if keep_pinned:
-            # 删除非置顶项的图片文件
-            for item in self._history:
-                if not item.is_pinned and item.content_type == ContentType.IMAGE and item.image_path:
-                    image_file = os.path.join(self._data_dir, item.image_path)
-                    if os.path.exists(image_file):
-                        try:
-                            os.remove(image_file)
-                        except OSError:
-                            pass
-            
-            self._history = [item for item in self._history if item.is_pinned]
-        else:
-            # 删除所有图片文件
-            for item in self._history:
-                if item.content_type == ContentType.IMAGE and item.image_path:
-                    image_file = os.path.join(self._data_dir, item.image_path)
-                    if os.path.exists(image_file):
-                        try:
-                            os.remove(image_file)
-                        except OSError:
-                            pass
-            
-            self._history = []
+        removed = [
+            item for item in self._history
+            if not (keep_pinned and item.is_pinned)
+        ]
+        self._history = [
+            item for item in self._history
+            if keep_pinned and item.is_pinned
+        ]
+        
+        # 删除不再被引用的图片文件
+        for item in removed:
+            if item.content_type == ContentType.IMAGE:
+                self._release_image_file(item.image_path)
         
         self.history_changed.emit()
     
@@ -992,16 +1460,11 @@ class ClipboardHistoryManager(QObject):
             unpinned.sort(key=lambda x: x.timestamp)
             oldest = unpinned[0]
             
-            # 删除图片文件
-            if oldest.content_type == ContentType.IMAGE and oldest.image_path:
-                image_file = os.path.join(self._data_dir, oldest.image_path)
-                if os.path.exists(image_file):
-                    try:
-                        os.remove(image_file)
-                    except OSError:
-                        pass
-            
             self._history.remove(oldest)
+            
+            # 删除不再被引用的图片文件
+            if oldest.content_type == ContentType.IMAGE:
+                self._release_image_file(oldest.image_path)
 
     
     def start_monitoring(self) -> None:
@@ -1107,9 +1570,18 @@ class ClipboardHistoryManager(QObject):
     def _capture_text(self, text: str) -> None:
         """捕获文本内容
         
+        相同文本已存在时只更新已有条目的时间戳。
+        
         Args:
             text: 文本内容
+            
+        Feature: clipboard-history, clipboard-content-dedup
         """
+        content_hash = compute_text_hash(text)
+        if self._touch_duplicate(content_hash):
+            self._save_history()
+            return
+        
         item = HistoryItem(
             id=str(uuid.uuid4()),
             content_type=ContentType.TEXT,
@@ -1118,6 +1590,7 @@ class ClipboardHistoryManager(QObject):
             preview_text=HistoryItem.generate_preview(text),
             timestamp=datetime.now(),
             is_pinned=False,
+            content_hash=content_hash,
         )
         
         self.add_item(item)
@@ -1126,25 +1599,29 @@ class ClipboardHistoryManager(QObject):
     def _capture_image(self, image: QImage) -> None:
         """捕获图片内容
         
+        相同像素内容已存在时只更新已有条目的时间戳，跳过编码和写盘。
+        新图片先插入记录（待写盘状态），由后台编码队列保存文件，
+        GUI 线程不做图片编码。
+        
+        编码队列已满时（短时间内大量复制）条目照常插入，
+        编码任务暂存在等待队列中，队列空出后按顺序提交。
+        
         Args:
             image: QImage 对象
+            
+        Feature: clipboard-history, clipboard-content-dedup, image-encode-queue
         """
+        content_hash = compute_image_hash(image)
+        if self._touch_duplicate(content_hash):
+            self._save_history()
+            return
+        
         # 生成唯一 ID
         item_id = str(uuid.uuid4())
         
-        # 保存图片文件
-        image_filename = f"{item_id}.png"
+        # 图片文件路径（扩展名取决于编码格式）
+        image_filename = f"{item_id}{self._encode_queue.options.extension}"
         image_rel_path = os.path.join(self.IMAGES_DIR, image_filename)
-        image_full_path = os.path.join(self._data_dir, image_rel_path)
-        
-        try:
-            image.save(image_full_path, "PNG")
-        except Exception as e:
-            from screenshot_tool.core.error_logger import get_error_logger
-            logger = get_error_logger()
-            if logger:
-                logger.log_error(f"保存剪贴板图片失败: {e}")
-            return
         
         item = HistoryItem(
             id=item_id,
@@ -1154,10 +1631,93 @@ class ClipboardHistoryManager(QObject):
             preview_text="[图片]",
             timestamp=datetime.now(),
             is_pinned=False,
+            content_hash=content_hash,
         )
         
         self.add_item(item)
         self._save_history()
+        if self._deferred_saves or not self._enqueue_image_save(item_id, image, image_rel_path):
+            # 队列已满：保持待写盘状态，等编码队列空出后提交
+            self._pending_images[item_id] = (image, image_rel_path)
+            self._deferred_saves.append((item_id, image, image_rel_path))
+    
+    def _submit_deferred_saves(self, force: bool = False) -> None:
+        """按复制顺序提交等待中的编码任务
+        
+        Args:
+            force: 忽略队列容量限制（程序退出时全部提交）
+            
+        Feature: image-encode-queue
+        """
+        while self._deferred_saves:
+            if not force and self._encode_queue.is_full():
+                return
+            item_id, image, image_rel_path = self._deferred_saves.popleft()
+            if self.get_item(item_id) is None:
+                # 等待期间条目已被删除，无需写盘
+                self._pending_images.pop(item_id, None)
+                continue
+            self._enqueue_image_save(item_id, image, image_rel_path, force=True)
+    
+    def _enqueue_image_save(
+        self,
+        item_id: str,
+        image: QImage,
+        image_rel_path: str,
+        force: bool = False,
+    ) -> bool:
+        """将图片交给后台编码队列保存，文件落盘前条目处于待写盘状态
+        
+        Args:
+            item_id: 条目 ID
+            image: 要保存的图片
+            image_rel_path: 图片相对路径
+            force: 忽略队列容量限制
+            
+        Returns:
+            是否已加入队列
+            
+        Feature: image-encode-queue
+        """
+        image_full_path = os.path.join(self._data_dir, image_rel_path)
+        self._pending_images[item_id] = (image, image_rel_path)
+        if self._encode_queue.submit(item_id, image, image_full_path, force=force):
+            return True
+        self._pending_images.pop(item_id, None)
+        return False
+    
+    def is_image_pending(self, item_id: str) -> bool:
+        """条目的图片文件是否仍在后台编码中
+        
+        Feature: image-encode-queue
+        """
+        return item_id in self._pending_images
+    
+    def set_image_encode_options(self, options: ImageEncodeOptions) -> None:
+        """设置图片编码选项（对之后保存的图片生效）
+        
+        Feature: image-encode-queue
+        """
+        self._encode_queue.set_options(options)
+    
+    def wait_for_pending_images(self, timeout_ms: int = -1) -> bool:
+        """等待所有待写盘图片保存完成（程序退出时调用）
+        
+        Args:
+            timeout_ms: 超时时间（毫秒），-1 表示无限等待
+            
+        Returns:
+            是否全部完成
+            
+        Feature: image-encode-queue
+        """
+        self._submit_deferred_saves(force=True)
+        return self._encode_queue.wait_for_done(timeout_ms)
+    
+    @property
+    def _save_workers(self) -> List[ImageSaveWorker]:
+        """正在运行的图片保存线程（兼容旧接口）"""
+        return self._encode_queue.workers
 
     
     def _save_history(self) -> None:
@@ -1273,9 +1833,13 @@ class ClipboardHistoryManager(QObject):
         Args:
             immediate: 是否立即保存（用于程序退出等场景）
             
-        Feature: workbench-temporary-preview-python
+        Feature: workbench-temporary-preview-python, image-encode-queue
         Requirements: 8.1
         """
+        # 立即保存（程序退出）时等待后台编码的图片落盘
+        if immediate:
+            self.wait_for_pending_images(self.PENDING_IMAGE_WAIT_MS)
+        
         # SQLite 模式下数据已实时保存
         if self._use_sqlite and self._sqlite_storage is not None:
             return
@@ -1392,8 +1956,14 @@ class ClipboardHistoryManager(QObject):
             QImage 对象，如果失败返回 None
         """
         # 检查缓存
-        if item_id in self._image_cache:
-            return self._image_cache[item_id]
+        cached = self._image_cache.get(item_id)
+        if cached is not None:
+            return cached
+        
+        # 文件仍在后台编码时直接使用内存中的图片
+        pending = self._pending_images.get(item_id)
+        if pending is not None:
+            return pending[0]
         
         # 从磁盘加载
         image_full_path = os.path.join(self._data_dir, image_path)
@@ -1404,25 +1974,97 @@ class ClipboardHistoryManager(QObject):
         if image.isNull():
             return None
         
-        # 添加到缓存（LRU 策略：超出限制时删除最早的）
-        if len(self._image_cache) >= self._image_cache_max_size:
-            # 删除第一个（最早添加的）
-            oldest_key = next(iter(self._image_cache))
-            del self._image_cache[oldest_key]
-        
-        self._image_cache[item_id] = image
+        # 添加到缓存（超出字节预算时淘汰最久未使用的）
+        self._image_cache.put(item_id, image)
         return image
     
     def _clear_image_cache(self, item_id: Optional[str] = None):
-        """清除图片缓存
+        """清除图片缓存（含缩略图内存缓存）
+        
+        持久化的缩略图随记录删除级联删除，这里不处理。
         
         Args:
             item_id: 如果指定，只清除该 ID 的缓存；否则清除全部
         """
         if item_id:
-            self._image_cache.pop(item_id, None)
+            self._image_cache.pop(item_id)
+            self._thumbnail_cache.pop(item_id)
         else:
             self._image_cache.clear()
+            self._thumbnail_cache.clear()
+    
+    def get_thumbnail(self, item_id: str) -> Optional[QImage]:
+        """获取历史列表使用的缩略图（最长边 THUMBNAIL_MAX_EDGE）
+        
+        查找顺序：内存 LRU -> SQLite 持久化缩略图 -> 由原图生成并持久化。
+        有标注的截图缩略图包含标注。
+        
+        Args:
+            item_id: 记录 ID
+            
+        Returns:
+            缩略图，非图片记录或图片不可用时返回 None
+            
+        Feature: history-thumbnail-store
+        """
+        thumbnail = self._thumbnail_cache.get(item_id)
+        if thumbnail is not None:
+            return thumbnail
+        
+        storage = self._sqlite_storage if self._use_sqlite else None
+        if storage is not None:
+            data = storage.get_thumbnail(item_id, THUMBNAIL_MAX_EDGE)
+            if data is not None:
+                thumbnail = decode_thumbnail(data)
+                if thumbnail is not None:
+                    self._thumbnail_cache.put(item_id, thumbnail)
+                    return thumbnail
+        
+        thumbnail = self._generate_thumbnail(item_id)
+        if thumbnail is None:
+            return None
+        
+        if storage is not None:
+            data = encode_thumbnail(thumbnail)
+            if data is not None:
+                storage.save_thumbnail(item_id, THUMBNAIL_MAX_EDGE, data)
+        self._thumbnail_cache.put(item_id, thumbnail)
+        return thumbnail
+    
+    def _generate_thumbnail(self, item_id: str) -> Optional[QImage]:
+        """由原图生成缩略图
+        
+        无标注时解码阶段直接缩放，不保留全尺寸图片；
+        有标注时需在原图尺寸上渲染标注后再缩放。
+        
+        Feature: history-thumbnail-store
+        """
+        item = self.get_item(item_id)
+        if not item or item.content_type != ContentType.IMAGE or not item.image_path:
+            return None
+        
+        if item.has_annotations():
+            image = self.render_screenshot_with_annotations(item_id)
+            return scale_to_thumbnail(image) if image is not None else None
+        
+        pending = self._pending_images.get(item_id)
+        if pending is not None:
+            return scale_to_thumbnail(pending[0])
+        
+        image_full_path = os.path.join(self._data_dir, item.image_path)
+        if not os.path.exists(image_full_path):
+            return None
+        return load_scaled_image(image_full_path)
+    
+    def _invalidate_thumbnail(self, item_id: str) -> None:
+        """图片或标注变化后使缩略图失效
+        
+        Feature: history-thumbnail-store
+        """
+        self._thumbnail_cache.pop(item_id)
+        if self._use_sqlite and self._sqlite_storage is not None:
+            self._sqlite_storage.delete_thumbnail(item_id)
+        self.thumbnail_invalidated.emit(item_id)
 
     # ========== 截图历史扩展方法 (Feature: screenshot-state-restore) ==========
     
@@ -1461,10 +2103,9 @@ class ClipboardHistoryManager(QObject):
         # 创建新条目
         new_id = item_id or str(uuid.uuid4())
         
-        # 准备图片保存路径
-        image_filename = f"{new_id}.png"
+        # 准备图片保存路径（扩展名取决于编码格式）
+        image_filename = f"{new_id}{self._encode_queue.options.extension}"
         image_rel_path = os.path.join(self.IMAGES_DIR, image_filename)
-        image_full_path = os.path.join(self._data_dir, image_rel_path)
         
         # 生成预览文本
         annotation_count = len(annotations) if annotations else 0
@@ -1495,12 +2136,8 @@ class ClipboardHistoryManager(QObject):
         self.add_item(item)
         self._save_history()
         
-        # 异步保存图片（不阻塞 UI）
-        worker = ImageSaveWorker(image, image_full_path, self)
-        worker.set_item_id(new_id)
-        worker.finished.connect(self._on_image_save_finished)
-        self._save_workers.append(worker)
-        worker.start()
+        # 异步保存图片（不阻塞 UI）；用户主动保存的截图不受队列容量限制
+        self._enqueue_image_save(new_id, image, image_rel_path, force=True)
         
         return new_id
     
@@ -1510,15 +2147,27 @@ class ClipboardHistoryManager(QObject):
         Args:
             item_id: 条目 ID
             success: 是否成功
+            
+        Feature: clipboard-history, image-encode-queue
         """
-        # 清理已完成的 worker
-        self._save_workers = [w for w in self._save_workers if w.isRunning()]
+        if self._encode_queue.is_pending(item_id):
+            # 同一条目还有更新的图片在编码，等最后一次完成再处理
+            return
+        pending = self._pending_images.pop(item_id, None)
         
         if not success:
             from screenshot_tool.core.error_logger import get_error_logger
             logger = get_error_logger()
             if logger:
                 logger.log_error(f"异步保存截图图片失败: {item_id}")
+        elif pending is not None and self.get_item(item_id) is None:
+            # 编码期间条目已被删除，释放刚写入的文件
+            self._release_image_file(pending[1])
+        elif pending is not None:
+            self.image_saved.emit(item_id)
+        
+        # 队列空出后提交等待中的剪贴板图片
+        self._submit_deferred_saves()
     
     def _update_screenshot_item(
         self,
@@ -1549,12 +2198,11 @@ class ClipboardHistoryManager(QObject):
         
         # 异步更新图片文件（不阻塞 UI）
         if item.image_path:
-            image_full_path = os.path.join(self._data_dir, item.image_path)
-            worker = ImageSaveWorker(image, image_full_path, self)
-            worker.set_item_id(item_id)
-            worker.finished.connect(self._on_image_save_finished)
-            self._save_workers.append(worker)
-            worker.start()
+            self._clear_image_cache(item_id)
+            self._enqueue_image_save(item_id, image, item.image_path, force=True)
+        
+        # 图片已被替换，原内容摘要失效（Feature: clipboard-content-dedup）
+        item.content_hash = None
         
         # 更新标注数据（Requirement 8.7）
         item.annotations = annotations
@@ -1581,6 +2229,9 @@ class ClipboardHistoryManager(QObject):
             except Exception as e:
                 self._log_error(f"更新 SQLite 记录失败: {e}")
         
+        # 记录更新后再使缩略图失效，重新生成时使用新图片和标注
+        self._invalidate_thumbnail(item_id)
+        
         self.history_changed.emit()
         self._save_history()
         
@@ -1652,6 +2303,17 @@ class ClipboardHistoryManager(QObject):
         else:
             item.preview_text = "[截图]"
         
+        # 使用 SQLite 存储更新（如果可用）
+        if self._use_sqlite and self._sqlite_storage is not None:
+            try:
+                sqlite_item = self._convert_to_sqlite_item(item)
+                self._sqlite_storage.update_item(sqlite_item)
+            except Exception as e:
+                self._log_error(f"更新 SQLite 记录失败: {e}")
+        
+        # 缩略图包含标注，需重新生成（Feature: history-thumbnail-store）
+        self._invalidate_thumbnail(item_id)
+        
         self.history_changed.emit()
         self._save_history()
         
@@ -1673,6 +2335,11 @@ class ClipboardHistoryManager(QObject):
         if not item or item.content_type != ContentType.IMAGE or not item.image_path:
             return None
         
+        # 文件仍在后台编码时直接返回内存中的图片
+        pending = self._pending_images.get(item_id)
+        if pending is not None:
+            return pending[0]
+        
         image_full_path = os.path.join(self._data_dir, item.image_path)
         if not os.path.exists(image_full_path):
             return None
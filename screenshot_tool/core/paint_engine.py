@@ -16,6 +16,7 @@ Requirements: 2.4, 5.1
 Property 2: Rendering Performance
 """
 
+import math
 from typing import List, Optional, Set, Dict, Any
 from dataclasses import dataclass, field
 from weakref import WeakKeyDictionary
@@ -310,6 +311,161 @@ class AnnotationDirtyTracker:
         return self._bounding_cache.get(item_id)
 
 
+class AnnotationLayerCache:
+    """标注图层缓存（保留模式）
+    
+    已提交的标注项按瓦片栅格化到透明图像中，每帧只重绘失效的瓦片，
+    然后把瓦片贴到缓冲上。正在编辑的标注项由调用方实时绘制。
+    
+    失效区域来自内部的 AnnotationDirtyTracker（边界新增/变化/删除），
+    以及调用方提供的签名（颜色、粗细、文字等不改变边界的修改）。
+    
+    瓦片大小为逻辑像素，240 可被常见缩放比例（1.25/1.5/1.75/2.25）整除，
+    保证瓦片原点落在整数物理像素上，贴图时不需要重采样。
+    
+    Feature: annotation-layer-cache
+    """
+    
+    TILE_SIZE = 240
+    
+    def __init__(self):
+        self._tracker = AnnotationDirtyTracker()
+        self._device_pixel_ratio: float = 1.0
+        # (列, 行) -> 瓦片图像；None 表示瓦片内没有标注
+        self._tiles: Dict[tuple, Optional[QImage]] = {}
+        self._dirty_tiles: Set[tuple] = set()
+        self._all_dirty: bool = True
+        # item_id -> (签名, 扩展后的边界)
+        self._items: Dict[int, tuple] = {}
+        # 统计：本帧重绘的瓦片数
+        self.last_rendered_tiles: int = 0
+    
+    def reset(self, device_pixel_ratio: Optional[float] = None):
+        """丢弃所有瓦片（新截图、尺寸或 DPR 变化时调用）"""
+        if device_pixel_ratio is not None:
+            self._device_pixel_ratio = device_pixel_ratio
+        self._tiles.clear()
+        self._dirty_tiles.clear()
+        self._items.clear()
+        self._tracker.clear()
+        self._all_dirty = True
+    
+    def invalidate(self, rect: QRect):
+        """使与 rect（逻辑像素）相交的瓦片失效"""
+        if rect.isEmpty():
+            return
+        size = self.TILE_SIZE
+        for ty in range(rect.top() // size, rect.bottom() // size + 1):
+            for tx in range(rect.left() // size, rect.right() // size + 1):
+                self._dirty_tiles.add((tx, ty))
+    
+    def invalidate_all(self):
+        """使所有瓦片失效"""
+        self._all_dirty = True
+    
+    def sync(self, items: list, signature) -> None:
+        """与当前标注列表同步，计算失效瓦片
+        
+        Args:
+            items: 需要缓存的标注项（按绘制顺序）
+            signature: item -> 可比较的签名，签名变化时重绘该项所在区域
+        """
+        tracker = self._tracker
+        tracker.begin_frame()
+        # 顺序变化（撤销/重做/置顶）会改变重叠区域的绘制结果
+        # 新增/删除由 tracker 处理，这里只比较两帧共有项的相对顺序
+        current_ids = [item._id for item in items]
+        current_set = set(current_ids)
+        order_changed = (
+            [item_id for item_id in self._items if item_id in current_set]
+            != [item_id for item_id in current_ids if item_id in self._items]
+        )
+
+        current: Dict[int, tuple] = {}
+        for item in items:
+            bounds = item.get_bounding_rect()
+            tracker.track_item(item._id, bounds, item.width or 2)
+            expanded = tracker.get_cached_bounds(item._id) if not bounds.isEmpty() else QRect()
+            sig = signature(item)
+            previous = self._items.get(item._id)
+            if previous is not None and (previous[0] != sig or order_changed):
+                self.invalidate(previous[1])
+                self.invalidate(expanded)
+            current[item._id] = (sig, expanded)
+        
+        for item_id, (_, expanded) in self._items.items():
+            if item_id not in current:
+                tracker.track_item_removed(item_id)
+                self.invalidate(expanded)
+        self._items = current
+        
+        if tracker.needs_full_repaint():
+            self._all_dirty = True
+            tracker.clear_full_repaint()
+        for rect in tracker.get_dirty_rects():
+            self.invalidate(rect)
+    
+    def paint(self, painter: QPainter, area: QRect, items: list, draw_item) -> None:
+        """把 area（逻辑像素）内的标注图层绘制到 painter
+        
+        Args:
+            painter: 目标 painter（逻辑坐标）
+            area: 需要绘制的区域，通常是整个窗口
+            items: 与 sync 相同的标注项列表
+            draw_item: (painter, item) -> None，绘制单个标注项
+        """
+        if self._all_dirty:
+            self._tiles.clear()
+            self._dirty_tiles.clear()
+            self._all_dirty = False
+        
+        size = self.TILE_SIZE
+        rendered = 0
+        for ty in range(max(0, area.top() // size), area.bottom() // size + 1):
+            for tx in range(max(0, area.left() // size), area.right() // size + 1):
+                key = (tx, ty)
+                if key in self._dirty_tiles or key not in self._tiles:
+                    self._tiles[key] = self._render_tile(tx, ty, items, draw_item)
+                    self._dirty_tiles.discard(key)
+                    rendered += 1
+                tile = self._tiles[key]
+                if tile is not None:
+                    painter.drawImage(QPoint(tx * size, ty * size), tile)
+        self.last_rendered_tiles = rendered
+    
+    def _render_tile(self, tx: int, ty: int, items: list, draw_item) -> Optional[QImage]:
+        """栅格化一个瓦片，瓦片内没有标注时返回 None"""
+        size = self.TILE_SIZE
+        tile_rect = QRect(tx * size, ty * size, size, size)
+        inside = [
+            item for item in items
+            if self._items.get(item._id, (None, QRect()))[1].intersects(tile_rect)
+        ]
+        if not inside:
+            return None
+        
+        dpr = self._device_pixel_ratio
+        phys = int(math.ceil(size * dpr))
+        tile = QImage(phys, phys, QImage.Format.Format_ARGB32_Premultiplied)
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(0)
+        
+        painter = QPainter(tile)
+        if not painter.isActive():
+            return None
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.translate(-tile_rect.left(), -tile_rect.top())
+        for item in inside:
+            draw_item(painter, item)
+        painter.end()
+        return tile
+    
+    def tile_count(self) -> int:
+        """已缓存的非空瓦片数"""
+        return sum(1 for tile in self._tiles.values() if tile is not None)
+
+
 class OptimizedPaintEngine:
     """优化的绘制引擎
     
@@ -351,6 +507,11 @@ class OptimizedPaintEngine:
         # Feature: performance-ui-optimization
         # Requirements: 2.4, 5.1
         self._annotation_tracker = AnnotationDirtyTracker()
+        
+        # 标注图层缓存：选中项之下 / 之上各一层，选中项实时绘制在两层之间
+        # Feature: annotation-layer-cache
+        self._annotation_layer = AnnotationLayerCache()
+        self._annotation_layer_above = AnnotationLayerCache()
     
     def initialize(self, width: int, height: int, device_pixel_ratio: float = 1.0):
         """初始化缓冲区
@@ -384,6 +545,8 @@ class OptimizedPaintEngine:
         # 标记需要全屏重绘
         self._full_repaint_needed = True
         self._dirty_regions.clear()
+        self._annotation_layer.reset(device_pixel_ratio)
+        self._annotation_layer_above.reset(device_pixel_ratio)
     
     def mark_dirty(self, region: QRect, priority: int = 0):
         """标记脏区域
@@ -614,6 +777,8 @@ class OptimizedPaintEngine:
         self._dirty_regions.clear()
         self._full_repaint_needed = True
         self._annotation_tracker.clear()
+        self._annotation_layer.reset()
+        self._annotation_layer_above.reset()
     
     def reset(self):
         """重置状态（开始新的截图会话）"""
@@ -623,6 +788,8 @@ class OptimizedPaintEngine:
         self._last_selection = None
         self._last_draw_items_count = 0
         self._annotation_tracker.clear()
+        self._annotation_layer.reset()
+        self._annotation_layer_above.reset()
     
     # =====================================================
     # 标注工具脏区域追踪方法
@@ -635,6 +802,16 @@ class OptimizedPaintEngine:
         """获取标注脏区域追踪器"""
         return self._annotation_tracker
     
+    @property
+    def annotation_layer(self) -> AnnotationLayerCache:
+        """获取标注图层缓存（选中项之下的标注项）"""
+        return self._annotation_layer
+    
+    @property
+    def annotation_layer_above(self) -> AnnotationLayerCache:
+        """获取选中项之上的标注图层缓存"""
+        return self._annotation_layer_above
+    
     def begin_annotation_frame(self):
         """开始新的标注帧
         
@@ -7,6 +7,7 @@ Requirements: 1.1, 2.1, 2.3, 3.1, 4.1, 4.2, 9.1
 包括内存使用监控和验证功能。
 """
 
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -56,9 +57,15 @@ class PerformanceMonitor:
         # 检查性能阈值
         if PerformanceMonitor.exceeds_threshold("overlay_show", 200):
             print("Warning: overlay_show exceeded 200ms threshold")
+        
+        # 计数器（如缓存命中/未命中）
+        PerformanceMonitor.increment("ocr_cache_hit")
+        hits = PerformanceMonitor.get_counter("ocr_cache_hit")
     """
     
     _metrics: Dict[str, List[PerformanceMetric]] = {}
+    _counters: Dict[str, int] = {}
+    _counters_lock = threading.Lock()  # 计数器可能在工作线程中更新
     _enabled: bool = True
     _max_samples: int = 100  # 每个指标最多保留的样本数
     
@@ -302,13 +309,55 @@ class PerformanceMonitor:
             return False
         return avg > threshold_ms
     
+    # ========== 计数器 ==========
+    # Feature: ocr-result-cache
+    
+    @classmethod
+    def increment(cls, name: str, amount: int = 1) -> None:
+        """累加计数器（线程安全）
+        
+        Args:
+            name: 计数器名称
+            amount: 增量
+        """
+        if not cls._enabled:
+            return
+        
+        with cls._counters_lock:
+            cls._counters[name] = cls._counters.get(name, 0) + amount
+    
+    @classmethod
+    def get_counter(cls, name: str) -> int:
+        """获取计数器的值
+        
+        Args:
+            name: 计数器名称
+            
+        Returns:
+            计数值，未记录时返回 0
+        """
+        with cls._counters_lock:
+            return cls._counters.get(name, 0)
+    
+    @classmethod
+    def get_all_counters(cls) -> Dict[str, int]:
+        """获取所有计数器的快照"""
+        with cls._counters_lock:
+            return dict(cls._counters)
+    
     @classmethod
     def clear(cls, name: Optional[str] = None) -> None:
-        """清除指标数据
+        """清除指标数据（含同名计数器）
         
         Args:
             name: 指标名称，如果为 None 则清除所有指标
         """
+        with cls._counters_lock:
+            if name is None:
+                cls._counters.clear()
+            else:
+                cls._counters.pop(name, None)
+        
         if name is None:
             cls._metrics.clear()
         elif name in cls._metrics:
@@ -321,6 +370,8 @@ class PerformanceMonitor:
         清除所有数据并恢复默认设置。
         """
         cls._metrics.clear()
+        with cls._counters_lock:
+            cls._counters.clear()
         cls._enabled = True
         cls._max_samples = 100
     
@@ -331,7 +382,8 @@ class PerformanceMonitor:
         Returns:
             格式化的性能报告字符串
         """
-        if not cls._metrics:
+        counters = cls.get_all_counters()
+        if not cls._metrics and not counters:
             return "No performance metrics recorded."
         
         lines = ["Performance Report", "=" * 50]
@@ -346,6 +398,11 @@ class PerformanceMonitor:
                 lines.append(f"  Max:     {summary['max']:.2f} ms")
                 lines.append(f"  Last:    {summary['last']:.2f} ms")
         
+        if counters:
+            lines.append("\nCounters:")
+            for name in sorted(counters):
+                lines.append(f"  {name}: {counters[name]}")
+        
         return "\n".join(lines)
     
     # ========== 内存监控方法 ==========
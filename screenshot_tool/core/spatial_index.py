@@ -6,20 +6,467 @@
 空间索引 - 用于快速查找附近图形
 
 特性：
-- 网格化空间索引
-- O(1) 时间复杂度查询
-- 支持插入、删除、查询操作
+- R 树（Guttman 插入 + 最小重叠分裂），插入/更新代价与图形大小无关
+- STR（Sort-Tile-Recursive）批量构建
+- 点/矩形查询，结果按插入顺序返回，可附带精确几何过滤
+- nearest(pos, k)：按到边界矩形的距离做最优优先搜索
+
+Feature: rtree-spatial-index
 """
 
-from typing import List, Dict, Tuple, Set, Any, Optional
+import heapq
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
 from PySide6.QtCore import QPoint, QRect
 
 
+# 边界框：(left, top, right, bottom)，闭区间，与 QRect.right()/bottom() 一致
+BBox = Tuple[int, int, int, int]
+
+
+def _rect_bbox(rect: QRect) -> BBox:
+    return (rect.left(), rect.top(), rect.right(), rect.bottom())
+
+
+def _union(a: BBox, b: BBox) -> BBox:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _union_all(boxes: Iterable[BBox]) -> BBox:
+    it = iter(boxes)
+    x1, y1, x2, y2 = next(it)
+    for b in it:
+        if b[0] < x1:
+            x1 = b[0]
+        if b[1] < y1:
+            y1 = b[1]
+        if b[2] > x2:
+            x2 = b[2]
+        if b[3] > y2:
+            y2 = b[3]
+    return (x1, y1, x2, y2)
+
+
+def _area(b: BBox) -> int:
+    return (b[2] - b[0] + 1) * (b[3] - b[1] + 1)
+
+
+def _overlap(a: BBox, b: BBox) -> int:
+    w = min(a[2], b[2]) - max(a[0], b[0]) + 1
+    h = min(a[3], b[3]) - max(a[1], b[1]) + 1
+    return w * h if w > 0 and h > 0 else 0
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _distance_sq(x: int, y: int, b: BBox) -> int:
+    """点到边界框的距离平方（框内为 0）"""
+    dx = b[0] - x if x < b[0] else (x - b[2] if x > b[2] else 0)
+    dy = b[1] - y if y < b[1] else (y - b[3] if y > b[3] else 0)
+    return dx * dx + dy * dy
+
+
+class _Entry:
+    """叶子条目"""
+    __slots__ = ("item", "seq", "bbox", "parent")
+
+    def __init__(self, item: Any, seq: int, bbox: BBox):
+        self.item = item
+        self.seq = seq
+        self.bbox = bbox
+        self.parent: Optional["_Node"] = None
+
+
+class _Node:
+    """R 树节点，叶子节点的 entries 是 _Entry，内部节点的 entries 是子节点"""
+    __slots__ = ("leaf", "entries", "bbox", "parent")
+
+    def __init__(self, leaf: bool, entries: Optional[list] = None):
+        self.leaf = leaf
+        self.entries: list = entries if entries is not None else []
+        self.parent: Optional["_Node"] = None
+        self.bbox: Optional[BBox] = None
+        for child in self.entries:
+            child.parent = self
+        if self.entries:
+            self.bbox = _union_all(e.bbox for e in self.entries)
+
+
 class SpatialIndex:
     """
-    简单的空间索引，用于快速查找附近图形
+    R 树空间索引，用于快速查找附近图形
+
+    每个图形只存一次（叶子条目），不随面积增长；
+    query/query_rect 的结果按插入顺序（绘制顺序）返回，
+    update 保留原插入顺序。
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        初始化空间索引
+
+        Args:
+            max_entries: 每个节点的最大条目数
+        """
+        self._max_entries = max(4, max_entries)
+        self._min_entries = max(2, self._max_entries * 2 // 5)
+        self._root = _Node(leaf=True)
+        self._entries: Dict[int, _Entry] = {}  # item id -> 叶子条目
+        self._next_seq: int = 0
+
+        # 统计信息（用于测试）
+        self._query_count: int = 0
+        self._insert_count: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def insert(self, item: Any, rect: QRect):
+        """
+        插入图形到索引（已存在时等同于 update）
+
+        Args:
+            item: 图形对象
+            rect: 图形的边界矩形
+        """
+        if rect.isEmpty():
+            self.remove(item)
+            return
+
+        item_id = id(item)
+        existing = self._entries.get(item_id)
+        if existing is not None:
+            seq = existing.seq
+            self._remove_entry(existing)
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+
+        entry = _Entry(item, seq, _rect_bbox(rect))
+        self._entries[item_id] = entry
+        self._insert_entry(entry)
+        self._insert_count += 1
+
+    def bulk_load(self, items: Iterable[Tuple[Any, QRect]]):
+        """
+        批量构建索引（STR 打包），替换现有内容
+
+        Args:
+            items: (图形, 边界矩形) 序列，顺序即插入顺序
+        """
+        self.clear()
+        entries = []
+        for item, rect in items:
+            if rect.isEmpty():
+                continue
+            entry = _Entry(item, self._next_seq, _rect_bbox(rect))
+            self._next_seq += 1
+            self._entries[id(item)] = entry
+            entries.append(entry)
+        self._insert_count += len(entries)
+        if not entries:
+            return
+
+        nodes = self._str_pack(entries, leaf=True)
+        while len(nodes) > 1:
+            nodes = self._str_pack(nodes, leaf=False)
+        self._root = nodes[0]
+
+    def remove(self, item: Any):
+        """
+        从索引中移除图形
+
+        Args:
+            item: 要移除的图形对象
+        """
+        entry = self._entries.pop(id(item), None)
+        if entry is not None:
+            self._remove_entry(entry)
+
+    def update(self, item: Any, new_rect: QRect):
+        """
+        更新图形的位置
+
+        Args:
+            item: 图形对象
+            new_rect: 新的边界矩形
+        """
+        self.insert(item, new_rect)
+
+    def query(self, pos: QPoint, radius: int = 0,
+              predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        查询位置附近的图形
+
+        Args:
+            pos: 查询位置
+            radius: 查询半径（像素），边界矩形扩展 radius 后包含 pos 即命中
+            predicate: 精确几何过滤（如 item.contains_point），只对候选调用
+
+        Returns:
+            List[Any]: 附近的图形列表（按插入顺序）
+        """
+        radius = max(0, radius)
+        x, y = pos.x(), pos.y()
+        return self._search((x - radius, y - radius, x + radius, y + radius), predicate)
+
+    def query_rect(self, rect: QRect,
+                   predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        查询与矩形相交的图形
+
+        Args:
+            rect: 查询矩形
+            predicate: 精确几何过滤，只对候选调用
+
+        Returns:
+            List[Any]: 相交的图形列表（按插入顺序）
+        """
+        if rect.isEmpty():
+            self._query_count += 1
+            return []
+        return self._search(_rect_bbox(rect), predicate)
+
+    def nearest(self, pos: QPoint, k: int = 1,
+                max_distance: Optional[float] = None,
+                predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        查询距离 pos 最近的 k 个图形（到边界矩形的欧氏距离）
+
+        Args:
+            pos: 查询位置
+            k: 返回数量
+            max_distance: 最大距离（像素），None 表示不限
+            predicate: 精确几何过滤，不满足的候选被跳过
+
+        Returns:
+            List[Any]: 图形列表，按距离从近到远；距离相同时后插入的在前
+        """
+        self._query_count += 1
+        if k <= 0 or self._root.bbox is None:
+            return []
+
+        x, y = pos.x(), pos.y()
+        limit = math.inf if max_distance is None else max_distance * max_distance
+        result: List[Any] = []
+        counter = 0
+        # 堆元素：(距离平方, 次序键, 计数, 节点或条目)
+        # 距离相同时先展开节点，再按插入顺序从后往前返回条目
+        heap = [(_distance_sq(x, y, self._root.bbox), -math.inf, counter, self._root)]
+        while heap and len(result) < k:
+            dist, _, _, obj = heapq.heappop(heap)
+            if dist > limit:
+                break
+            if isinstance(obj, _Entry):
+                if predicate is None or predicate(obj.item):
+                    result.append(obj.item)
+                continue
+            for child in obj.entries:
+                child_dist = _distance_sq(x, y, child.bbox)
+                if child_dist <= limit:
+                    counter += 1
+                    order = -child.seq if obj.leaf else -math.inf
+                    heapq.heappush(heap, (child_dist, order, counter, child))
+        return result
+
+    def clear(self):
+        """清空索引"""
+        self._root = _Node(leaf=True)
+        self._entries.clear()
+        self._next_seq = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取统计信息（用于测试）
+
+        Returns:
+            dict: 包含 query_count, insert_count, node_count, item_count, height
+        """
+        node_count = 0
+        height = 0
+        level = [self._root]
+        while level:
+            height += 1
+            node_count += len(level)
+            level = [child for node in level if not node.leaf for child in node.entries]
+        return {
+            "query_count": self._query_count,
+            "insert_count": self._insert_count,
+            "node_count": node_count,
+            "item_count": len(self._entries),
+            "height": height,
+        }
+
+    def reset_stats(self):
+        """重置统计信息（用于测试）"""
+        self._query_count = 0
+        self._insert_count = 0
+
+    # =====================================================
+    # 内部实现
+    # =====================================================
+
+    def _search(self, box: BBox, predicate: Optional[Callable[[Any], bool]]) -> List[Any]:
+        self._query_count += 1
+        root = self._root
+        if root.bbox is None or not _intersects(root.bbox, box):
+            return []
+
+        # 内联相交判断（热点循环）
+        qx1, qy1, qx2, qy2 = box
+        hits: List[_Entry] = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            target = hits if node.leaf else stack
+            for child in node.entries:
+                x1, y1, x2, y2 = child.bbox
+                if x1 <= qx2 and qx1 <= x2 and y1 <= qy2 and qy1 <= y2:
+                    target.append(child)
+
+        hits.sort(key=lambda e: e.seq)
+        if predicate is None:
+            return [e.item for e in hits]
+        return [e.item for e in hits if predicate(e.item)]
+
+    def _insert_entry(self, entry: _Entry):
+        """插入叶子条目，必要时向上分裂"""
+        node = self._choose_leaf(entry.bbox)
+        node.entries.append(entry)
+        entry.parent = node
+
+        # 向上调整边界框并处理溢出
+        while node is not None:
+            node.bbox = entry.bbox if node.bbox is None else _union(node.bbox, entry.bbox)
+            if len(node.entries) > self._max_entries:
+                sibling = self._split(node)
+                parent = node.parent
+                if parent is None:
+                    self._root = _Node(leaf=False, entries=[node, sibling])
+                    return
+                parent.entries.append(sibling)
+                sibling.parent = parent
+            node = node.parent
+
+    def _choose_leaf(self, bbox: BBox) -> _Node:
+        """选择扩展面积最小的子树（相同时选面积更小的）"""
+        bx1, by1, bx2, by2 = bbox
+        node = self._root
+        while not node.leaf:
+            best = None
+            best_growth = best_area = math.inf
+            for child in node.entries:
+                x1, y1, x2, y2 = child.bbox
+                area = (x2 - x1 + 1) * (y2 - y1 + 1)
+                growth = (
+                    (max(x2, bx2) - min(x1, bx1) + 1) * (max(y2, by2) - min(y1, by1) + 1) - area
+                )
+                if growth < best_growth or (growth == best_growth and area < best_area):
+                    best, best_growth, best_area = child, growth, area
+            node = best
+        return node
+
+    def _split(self, node: _Node) -> _Node:
+        """分裂溢出节点，node 保留前半部分，返回新的兄弟节点
+
+        分别按 x、y 方向的中心排序，在所有合法切分位置中选
+        两组边界框重叠最小（其次总面积最小）的方案。
+        """
+        entries = node.entries
+        count = len(entries)
+        min_fill = self._min_entries
+        best = None
+        best_key = None
+        for axis in (0, 1):
+            ordered = sorted(entries, key=lambda e: e.bbox[axis] + e.bbox[axis + 2])
+            prefix = [ordered[0].bbox]
+            for e in ordered[1:]:
+                prefix.append(_union(prefix[-1], e.bbox))
+            suffix = [ordered[-1].bbox]
+            for e in reversed(ordered[:-1]):
+                suffix.append(_union(suffix[-1], e.bbox))
+            suffix.reverse()
+            for k in range(min_fill, count - min_fill + 1):
+                left, right = prefix[k - 1], suffix[k]
+                key = (_overlap(left, right), _area(left) + _area(right))
+                if best_key is None or key < best_key:
+                    best, best_key = (ordered, k), key
+
+        ordered, k = best
+        node.entries = ordered[:k]
+        node.bbox = _union_all(e.bbox for e in node.entries)
+        sibling = _Node(leaf=node.leaf, entries=ordered[k:])
+        return sibling
+
+    def _remove_entry(self, entry: _Entry):
+        """移除叶子条目并压缩树（下溢节点的条目重新插入）"""
+        leaf = entry.parent
+        leaf.entries.remove(entry)
+        entry.parent = None
+
+        orphans: List[_Entry] = []
+        node = leaf
+        while node.parent is not None:
+            parent = node.parent
+            if len(node.entries) < self._min_entries:
+                parent.entries.remove(node)
+                orphans.extend(self._collect_entries(node))
+            else:
+                node.bbox = _union_all(e.bbox for e in node.entries)
+            node = parent
+
+        root = self._root
+        root.bbox = _union_all(e.bbox for e in root.entries) if root.entries else None
+        while not root.leaf and len(root.entries) == 1:
+            root = root.entries[0]
+            root.parent = None
+        if not root.leaf and not root.entries:
+            root = _Node(leaf=True)
+        self._root = root
+
+        for orphan in orphans:
+            self._insert_entry(orphan)
+
+    @staticmethod
+    def _collect_entries(node: _Node) -> List[_Entry]:
+        """收集子树下的所有叶子条目"""
+        if node.leaf:
+            return list(node.entries)
+        result: List[_Entry] = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.leaf:
+                result.extend(current.entries)
+            else:
+                stack.extend(current.entries)
+        return result
+
+    def _str_pack(self, entries: list, leaf: bool) -> List[_Node]:
+        """STR 打包一层：按 x 中心分条带，条带内按 y 中心分组"""
+        capacity = self._max_entries
+        node_count = math.ceil(len(entries) / capacity)
+        slab_count = math.ceil(math.sqrt(node_count))
+        slab_size = slab_count * capacity
+
+        ordered = sorted(entries, key=lambda e: e.bbox[0] + e.bbox[2])
+        nodes: List[_Node] = []
+        for start in range(0, len(ordered), slab_size):
+            slab = sorted(ordered[start:start + slab_size], key=lambda e: e.bbox[1] + e.bbox[3])
+            for group_start in range(0, len(slab), capacity):
+                nodes.append(_Node(leaf=leaf, entries=slab[group_start:group_start + capacity]))
+        return nodes
+
+
+class GridSpatialIndex:
+    """
+    网格空间索引（旧实现，保留用于基准对比）
     
-    使用网格划分空间，每个网格单元存储覆盖该单元的图形列表
+    使用网格划分空间，每个网格单元存储覆盖该单元的图形列表。
+    大图形会占用大量单元，插入/更新代价与面积成正比。
     """
     
     def __init__(self, cell_size: int = 50):
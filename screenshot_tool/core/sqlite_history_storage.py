@@ -7,8 +7,18 @@ SQLite 历史存储模块
 
 Feature: workbench-temporary-preview-python
 Requirements: 8.1, 8.5, 8.6, 8.7, 8.8
+
+Feature: history-fts-search
+使用 FTS5 trigram 全文索引加速搜索，SQLite 未编译 FTS5 时回退到 LIKE 查询。
+
+Feature: history-keyset-pagination
+列表按 (timestamp, id) 游标分页，只查询摘要列，完整记录按需加载。
+
+Feature: clipboard-content-dedup
+content_hash 列（BLAKE2 内容摘要）带唯一索引，重复复制的内容只保留一条记录。
 """
 
+import hashlib
 import json
 import os
 import sqlite3
@@ -27,6 +37,48 @@ class ContentType(Enum):
     HTML = "html"
 
 
+# 内容摘要长度（字节），128 位足以避免碰撞
+CONTENT_HASH_DIGEST_SIZE = 16
+
+
+def compute_text_hash(text: str) -> str:
+    """计算文本内容摘要
+    
+    统一换行符后计算 BLAKE2b，不同来源复制的同一段文本得到相同摘要。
+    
+    Feature: clipboard-content-dedup
+    
+    Args:
+        text: 文本内容
+        
+    Returns:
+        十六进制摘要字符串
+    """
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+    hasher = hashlib.blake2b(digest_size=CONTENT_HASH_DIGEST_SIZE, person=b"text")
+    hasher.update(normalized.encode("utf-8", errors="surrogatepass"))
+    return hasher.hexdigest()
+
+
+def compute_pixel_hash(width: int, height: int, pixels) -> str:
+    """计算像素缓冲区摘要
+    
+    Feature: clipboard-content-dedup
+    
+    Args:
+        width: 图片宽度
+        height: 图片高度
+        pixels: 统一像素格式后的缓冲区（bytes / memoryview）
+        
+    Returns:
+        十六进制摘要字符串
+    """
+    hasher = hashlib.blake2b(digest_size=CONTENT_HASH_DIGEST_SIZE, person=b"image")
+    hasher.update(f"{width}x{height}:".encode("ascii"))
+    hasher.update(pixels)
+    return hasher.hexdigest()
+
+
 @dataclass
 class MigrationResult:
     """JSON 到 SQLite 迁移结果
@@ -69,6 +121,7 @@ class HistoryItem:
     selection_rect: Optional[Tuple[int, int, int, int]] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    content_hash: Optional[str] = None
     
     def to_dict(self) -> dict:
         """序列化为字典
@@ -94,6 +147,7 @@ class HistoryItem:
             "selection_rect": list(self.selection_rect) if self.selection_rect else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "content_hash": self.content_hash,
         }
         return result
     
@@ -143,9 +197,61 @@ class HistoryItem:
             selection_rect=selection_rect,
             created_at=created_at,
             updated_at=updated_at,
+            content_hash=data.get("content_hash"),
         )
 
 
+@dataclass(frozen=True)
+class PageCursor:
+    """分页游标：上一页最后一条记录的 (timestamp, id)
+    
+    列表按 (timestamp DESC, id DESC) 排序，下一页从游标之后开始，
+    查询代价只与页大小有关，与已翻过的记录数无关。
+    
+    Feature: history-keyset-pagination
+    """
+    timestamp: str  # ISO 格式时间戳（与数据库存储格式一致）
+    id: str
+
+
+@dataclass
+class HistorySummary:
+    """历史列表摘要行
+    
+    只包含列表渲染需要的字段，不读取 text_content、OCR 缓存和标注 JSON。
+    
+    Feature: history-keyset-pagination
+    """
+    id: str
+    content_type: ContentType
+    preview_text: str
+    timestamp: datetime
+    is_pinned: bool = False
+    custom_name: Optional[str] = None
+    image_path: Optional[str] = None  # 缩略图来源
+    annotated: bool = False  # 是否有标注数据
+    
+    def has_annotations(self) -> bool:
+        """是否有标注数据（与 HistoryItem 接口一致）"""
+        return self.annotated
+    
+    @property
+    def cursor(self) -> PageCursor:
+        """以本条记录为界的分页游标"""
+        return PageCursor(self.timestamp.isoformat(), self.id)
+
+
+@dataclass
+class SearchResult:
+    """全文搜索结果
+    
+    Feature: history-fts-search
+    """
+    item: HistoryItem
+    snippet: str = ""  # 高亮片段，匹配部分由 SNIPPET_MARK_START/END 包围
+    rank: float = 0.0  # 相关度分数（越小越相关，LIKE 回退时为 0）
+
+
 class SQLiteHistoryStorage:
     """SQLite 历史存储
     
@@ -165,7 +271,35 @@ class SQLiteHistoryStorage:
     DB_FILE = "clipboard_history.db"
     
     # 数据库 Schema 版本
-    SCHEMA_VERSION = 1
+    # v1: 基础表结构
+    # v2: FTS5 全文索引 history_fts（Feature: history-fts-search）
+    # v3: (timestamp, id) 复合索引替代 timestamp 单列索引（Feature: history-keyset-pagination）
+    # v4: content_hash 列及唯一索引（Feature: clipboard-content-dedup）
+    # v5: thumbnails 缩略图表（Feature: history-thumbnail-store）
+    SCHEMA_VERSION = 5
+    
+    # 摘要行查询列（不含大字段）
+    SUMMARY_COLUMNS = '''
+        id, content_type, preview_text, timestamp, is_pinned,
+        custom_name, image_path,
+        (annotations IS NOT NULL AND annotations NOT IN ('', '[]')) AS annotated
+    '''
+    
+    # 全文索引表名
+    FTS_TABLE = "history_fts"
+    
+    # trigram 分词器最短可匹配长度，更短的查询回退到 LIKE
+    FTS_MIN_QUERY_LENGTH = 3
+    
+    # 命中数达到该阈值视为高频词：按时间索引顺序 LIKE 扫描很快就能凑满一页，
+    # 而全文索引需要先匹配全部命中再排序，反而更慢
+    FTS_DENSE_MATCH_THRESHOLD = 1000
+    
+    # 搜索片段高亮标记
+    SNIPPET_MARK_START = "【"
+    SNIPPET_MARK_END = "】"
+    SNIPPET_ELLIPSIS = "…"
+    SNIPPET_CONTEXT_CHARS = 16
     
     def __init__(self, data_dir: Optional[str] = None):
         """初始化 SQLite 存储
@@ -187,6 +321,9 @@ class SQLiteHistoryStorage:
         # 线程本地存储，每个线程使用独立连接
         self._local = threading.local()
         
+        # FTS5 全文索引是否可用（在 _init_database 中检测）
+        self._fts_enabled = False
+        
         # 初始化数据库
         self._init_database()
     
@@ -215,6 +352,8 @@ class SQLiteHistoryStorage:
             conn.execute('PRAGMA temp_store=MEMORY')
             # 启用外键约束
             conn.execute('PRAGMA foreign_keys=ON')
+            # INSERT OR REPLACE 删除旧行时触发 DELETE 触发器，保持全文索引同步
+            conn.execute('PRAGMA recursive_triggers=ON')
             # 返回字典形式的行
             conn.row_factory = sqlite3.Row
             
@@ -266,14 +405,16 @@ class SQLiteHistoryStorage:
                     annotations TEXT,
                     selection_rect TEXT,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    content_hash TEXT
                 )
             ''')
             
             # 创建索引以提升查询性能
+            # (timestamp, id) 复合索引：排序和 keyset 分页共用
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_timestamp 
-                ON history_items(timestamp DESC)
+                CREATE INDEX IF NOT EXISTS idx_timestamp_id 
+                ON history_items(timestamp DESC, id DESC)
             ''')
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_content_type 
@@ -283,6 +424,21 @@ class SQLiteHistoryStorage:
                 CREATE INDEX IF NOT EXISTS idx_is_pinned 
                 ON history_items(is_pinned)
             ''')
+            # 删除记录时按图片路径统计引用数
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_image_path 
+                ON history_items(image_path) WHERE image_path IS NOT NULL
+            ''')
+            
+            # 缩略图表：记录删除（含 INSERT OR REPLACE）时级联删除
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS thumbnails (
+                    item_id TEXT PRIMARY KEY
+                        REFERENCES history_items(id) ON DELETE CASCADE,
+                    max_edge INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            ''')
             
             # 创建 schema 版本表
             cursor.execute('''
@@ -299,6 +455,196 @@ class SQLiteHistoryStorage:
                     'INSERT INTO schema_version (version) VALUES (?)',
                     (self.SCHEMA_VERSION,)
                 )
+            elif row['version'] < self.SCHEMA_VERSION:
+                self._migrate_schema(cursor, row['version'])
+                cursor.execute(
+                    'UPDATE schema_version SET version = ?',
+                    (self.SCHEMA_VERSION,)
+                )
+            
+            # 内容摘要唯一索引（旧库需先由 _migrate_schema 添加列）
+            # 部分索引：截图等未计算摘要的记录不参与去重
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_content_hash 
+                ON history_items(content_hash) WHERE content_hash IS NOT NULL
+            ''')
+            
+            # 全文索引（每次启动检查，SQLite 升级后可自动启用）
+            self._fts_enabled = self._ensure_search_index(cursor)
+    
+    def _migrate_schema(self, cursor: sqlite3.Cursor, from_version: int) -> None:
+        """按版本顺序升级数据库结构
+        
+        Args:
+            cursor: 数据库游标（与 _init_database 同一事务）
+            from_version: 当前数据库的 schema 版本
+        """
+        self._log_info(
+            f"升级历史数据库 schema: v{from_version} -> v{self.SCHEMA_VERSION}"
+        )
+        # v1 -> v2: 全文索引由 _ensure_search_index 创建并回填，无需修改主表
+        if from_version < 3:
+            # v2 -> v3: 复合索引已在 _init_database 中创建，旧的单列索引冗余
+            cursor.execute('DROP INDEX IF EXISTS idx_timestamp')
+        if from_version < 4:
+            # v3 -> v4: 添加内容摘要列，并为已有文本记录回填摘要
+            cursor.execute('PRAGMA table_info(history_items)')
+            columns = {row['name'] for row in cursor.fetchall()}
+            if 'content_hash' not in columns:
+                cursor.execute('ALTER TABLE history_items ADD COLUMN content_hash TEXT')
+            self._backfill_text_hashes(cursor)
+        # v4 -> v5: thumbnails 表已在 _init_database 中创建，按需生成，无需回填
+    
+    def _backfill_text_hashes(self, cursor: sqlite3.Cursor) -> None:
+        """为已有文本记录回填内容摘要
+        
+        按时间从新到旧回填，已存在的重复文本保持 NULL（不会被删除），
+        之后再复制相同文本时命中最新的那条。图片摘要需要解码像素，不做回填。
+        
+        Args:
+            cursor: 数据库游标（与 _init_database 同一事务）
+        """
+        cursor.execute('''
+            SELECT id, text_content FROM history_items
+            WHERE content_type != ? AND text_content IS NOT NULL AND content_hash IS NULL
+            ORDER BY timestamp DESC, id DESC
+        ''', (ContentType.IMAGE.value,))
+        rows = cursor.fetchall()
+        
+        seen = set()
+        updates = []
+        for row in rows:
+            content_hash = compute_text_hash(row['text_content'])
+            if content_hash in seen:
+                continue
+            seen.add(content_hash)
+            updates.append((content_hash, row['id']))
+        
+        cursor.executemany(
+            'UPDATE OR IGNORE history_items SET content_hash = ? WHERE id = ?',
+            updates
+        )
+    
+    @staticmethod
+    def _is_fts5_available(cursor: sqlite3.Cursor) -> bool:
+        """检测 SQLite 是否编译了 FTS5 及 trigram 分词器（SQLite >= 3.34）
+        
+        Args:
+            cursor: 数据库游标
+            
+        Returns:
+            True 如果可以创建 trigram FTS5 表
+        """
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='trigram')"
+            )
+            cursor.execute('DROP TABLE temp.fts5_probe')
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _ensure_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """创建 FTS5 全文索引及同步触发器
+        
+        索引为外部内容表（content=history_items），不重复存储文本，
+        由触发器在插入、删除、更新时保持同步。新建索引时从主表回填。
+        
+        Args:
+            cursor: 数据库游标
+            
+        Returns:
+            全文索引是否可用
+            
+        Feature: history-fts-search
+        """
+        if not self._is_fts5_available(cursor):
+            # 数据库可能由支持 FTS5 的 SQLite 创建过索引，移除触发器以免写入失败
+            for trigger in ('history_fts_ai', 'history_fts_ad', 'history_fts_au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            self._log_info("SQLite 不支持 FTS5 trigram，搜索回退到 LIKE 查询")
+            return False
+        
+        # 索引表或触发器缺失（新建索引，或曾在无 FTS5 环境下写入）时需要回填
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name IN (?, 'history_fts_ai')",
+            (self.FTS_TABLE,)
+        )
+        needs_rebuild = cursor.fetchone()[0] < 2
+        
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.FTS_TABLE} USING fts5(
+                text_content,
+                preview_text,
+                ocr_cache,
+                content='history_items',
+                content_rowid='rowid',
+                tokenize='trigram'
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS history_fts_ai
+            AFTER INSERT ON history_items BEGIN
+                INSERT INTO {self.FTS_TABLE}(rowid, text_content, preview_text, ocr_cache)
+                VALUES (new.rowid, new.text_content, new.preview_text, new.ocr_cache);
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS history_fts_ad
+            AFTER DELETE ON history_items BEGIN
+                INSERT INTO {self.FTS_TABLE}(
+                    {self.FTS_TABLE}, rowid, text_content, preview_text, ocr_cache
+                ) VALUES (
+                    'delete', old.rowid, old.text_content, old.preview_text, old.ocr_cache
+                );
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS history_fts_au
+            AFTER UPDATE OF text_content, preview_text, ocr_cache ON history_items BEGIN
+                INSERT INTO {self.FTS_TABLE}(
+                    {self.FTS_TABLE}, rowid, text_content, preview_text, ocr_cache
+                ) VALUES (
+                    'delete', old.rowid, old.text_content, old.preview_text, old.ocr_cache
+                );
+                INSERT INTO {self.FTS_TABLE}(rowid, text_content, preview_text, ocr_cache)
+                VALUES (new.rowid, new.text_content, new.preview_text, new.ocr_cache);
+            END
+        ''')
+        
+        if needs_rebuild:
+            cursor.execute(
+                f"INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}) VALUES('rebuild')"
+            )
+            self._log_info("已创建历史记录全文索引")
+        
+        return True
+    
+    @property
+    def fts_enabled(self) -> bool:
+        """FTS5 全文索引是否可用"""
+        return self._fts_enabled
+    
+    def rebuild_search_index(self) -> bool:
+        """从主表重建全文索引
+        
+        用于索引损坏或手动修改数据库后的修复。
+        
+        Returns:
+            是否重建成功
+        """
+        if not self._fts_enabled:
+            return False
+        
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}) VALUES('rebuild')"
+                )
+            return True
+        except sqlite3.Error as e:
+            self._log_error(f"重建全文索引失败: {e}")
+            return False
     
     def add_item(self, item: HistoryItem) -> bool:
         """添加历史记录
@@ -330,8 +676,8 @@ class SQLiteHistoryStorage:
                         id, content_type, text_content, image_path,
                         preview_text, timestamp, is_pinned, custom_name,
                         ocr_cache, ocr_cache_timestamp, annotations,
-                        selection_rect, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        selection_rect, created_at, updated_at, content_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     item.id,
                     item.content_type.value,
@@ -347,6 +693,7 @@ class SQLiteHistoryStorage:
                     selection_rect_json,
                     item.created_at.isoformat() if item.created_at else now.isoformat(),
                     now.isoformat(),
+                    item.content_hash,
                 ))
             return True
         except sqlite3.Error as e:
@@ -378,6 +725,147 @@ class SQLiteHistoryStorage:
             self._log_error(f"获取历史记录失败: {e}")
             return None
     
+    def find_by_content_hash(self, content_hash: str) -> Optional[HistoryItem]:
+        """根据内容摘要查找记录
+        
+        Args:
+            content_hash: compute_text_hash / compute_pixel_hash 计算的摘要
+            
+        Returns:
+            HistoryItem 或 None
+            
+        Feature: clipboard-content-dedup
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    'SELECT * FROM history_items WHERE content_hash = ?',
+                    (content_hash,)
+                )
+                row = cursor.fetchone()
+                if row:
+                    return self._row_to_item(row)
+                return None
+        except sqlite3.Error as e:
+            self._log_error(f"按内容摘要查找记录失败: {e}")
+            return None
+    
+    def touch_item(self, item_id: str, timestamp: Optional[datetime] = None) -> bool:
+        """只更新记录的时间戳（重复内容再次复制时移到最前）
+        
+        Args:
+            item_id: 记录 ID
+            timestamp: 新时间戳，默认当前时间
+            
+        Returns:
+            是否更新成功
+            
+        Feature: clipboard-content-dedup
+        """
+        now = datetime.now()
+        timestamp = timestamp or now
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    'UPDATE history_items SET timestamp = ?, updated_at = ? WHERE id = ?',
+                    (timestamp.isoformat(), now.isoformat(), item_id)
+                )
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            self._log_error(f"更新记录时间戳失败: {e}")
+            return False
+    
+    def count_image_references(self, image_path: str) -> int:
+        """统计引用指定图片文件的记录数
+        
+        删除记录后，只有引用数为 0 时才删除图片文件。
+        
+        Args:
+            image_path: 图片相对路径
+            
+        Returns:
+            引用数量，查询失败时返回 1（保守起见不删除文件）
+            
+        Feature: clipboard-content-dedup
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    'SELECT COUNT(*) FROM history_items WHERE image_path = ?',
+                    (image_path,)
+                )
+                return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            self._log_error(f"统计图片引用失败: {e}")
+            return 1
+    
+    def get_thumbnail(self, item_id: str, max_edge: int) -> Optional[bytes]:
+        """获取持久化的缩略图
+        
+        Args:
+            item_id: 记录 ID
+            max_edge: 期望的缩略图最长边，与存储的不一致时视为未命中
+            
+        Returns:
+            编码后的缩略图字节，不存在时返回 None
+            
+        Feature: history-thumbnail-store
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    'SELECT data FROM thumbnails WHERE item_id = ? AND max_edge = ?',
+                    (item_id, max_edge)
+                )
+                row = cursor.fetchone()
+                return bytes(row['data']) if row else None
+        except sqlite3.Error as e:
+            self._log_error(f"读取缩略图失败: {e}")
+            return None
+    
+    def save_thumbnail(self, item_id: str, max_edge: int, data: bytes) -> bool:
+        """保存缩略图
+        
+        Args:
+            item_id: 记录 ID（记录不存在时不保存）
+            max_edge: 缩略图最长边
+            data: 编码后的缩略图字节
+            
+        Returns:
+            是否保存成功
+            
+        Feature: history-thumbnail-store
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO thumbnails (item_id, max_edge, data)
+                    SELECT id, ?, ? FROM history_items WHERE id = ?
+                ''', (max_edge, sqlite3.Binary(data), item_id))
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            self._log_error(f"保存缩略图失败: {e}")
+            return False
+    
+    def delete_thumbnail(self, item_id: str) -> bool:
+        """删除缩略图（标注或图片变化后失效）
+        
+        Args:
+            item_id: 记录 ID
+            
+        Returns:
+            是否删除了缩略图
+            
+        Feature: history-thumbnail-store
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('DELETE FROM thumbnails WHERE item_id = ?', (item_id,))
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            self._log_error(f"删除缩略图失败: {e}")
+            return False
+    
     def get_all_items(
         self, 
         offset: int = 0, 
@@ -398,7 +886,7 @@ class SQLiteHistoryStorage:
             with self._get_cursor() as cursor:
                 cursor.execute('''
                     SELECT * FROM history_items 
-                    ORDER BY timestamp DESC 
+                    ORDER BY timestamp DESC, id DESC 
                     LIMIT ? OFFSET ?
                 ''', (limit, offset))
                 rows = cursor.fetchall()
@@ -407,6 +895,64 @@ class SQLiteHistoryStorage:
             self._log_error(f"获取历史记录列表失败: {e}")
             return []
     
+    def get_summary_page(
+        self,
+        after: Optional[PageCursor] = None,
+        limit: int = 50,
+        query: Optional[str] = None
+    ) -> Tuple[List[HistorySummary], Optional[PageCursor]]:
+        """按游标获取一页列表摘要（按时间降序）
+        
+        使用 keyset 分页：WHERE (timestamp, id) < 游标，
+        由 idx_timestamp_id 索引直接定位，翻到第 N 页的代价与第 1 页相同。
+        
+        Args:
+            after: 上一页返回的游标，None 表示第一页
+            limit: 每页数量
+            query: 搜索关键词（可选，语义与 search_items 相同）
+            
+        Returns:
+            (摘要列表, 下一页游标)，没有更多数据时游标为 None
+            
+        Feature: history-keyset-pagination
+        """
+        conditions = []
+        params: list = []
+        
+        if after is not None:
+            conditions.append('(timestamp, id) < (?, ?)')
+            params.extend([after.timestamp, after.id])
+        
+        try:
+            with self._get_cursor() as cursor:
+                if query and query.strip():
+                    if self._should_use_fts(cursor, query):
+                        conditions.append(
+                            f'rowid IN (SELECT rowid FROM {self.FTS_TABLE} '
+                            f'WHERE {self.FTS_TABLE} MATCH ?)'
+                        )
+                        params.append(self._to_fts_phrase(query))
+                    else:
+                        conditions.append(
+                            '(text_content LIKE ? OR preview_text LIKE ? OR ocr_cache LIKE ?)'
+                        )
+                        params.extend([f'%{query}%'] * 3)
+                
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f'''
+                    SELECT {self.SUMMARY_COLUMNS} FROM history_items
+                    {where}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                ''', (*params, limit))
+                summaries = [self._row_to_summary(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            self._log_error(f"分页获取历史摘要失败: {e}")
+            return [], None
+        
+        next_cursor = summaries[-1].cursor if len(summaries) == limit else None
+        return summaries, next_cursor
+    
     def update_item(self, item: HistoryItem) -> bool:
         """更新历史记录
         
@@ -445,7 +991,8 @@ class SQLiteHistoryStorage:
                         ocr_cache_timestamp = ?,
                         annotations = ?,
                         selection_rect = ?,
-                        updated_at = ?
+                        updated_at = ?,
+                        content_hash = ?
                     WHERE id = ?
                 ''', (
                     item.content_type.value,
@@ -460,6 +1007,7 @@ class SQLiteHistoryStorage:
                     annotations_json,
                     selection_rect_json,
                     now.isoformat(),
+                    item.content_hash,
                     item.id,
                 ))
                 return cursor.rowcount > 0
@@ -627,7 +1175,9 @@ class SQLiteHistoryStorage:
     ) -> List[HistoryItem]:
         """搜索历史记录
         
-        搜索文本内容、预览文本和 OCR 缓存。
+        搜索文本内容、预览文本和 OCR 缓存（子串匹配，不区分大小写）。
+        FTS5 可用且查询不短于 FTS_MIN_QUERY_LENGTH 时走全文索引，
+        否则回退到 LIKE 全表扫描。
         
         Args:
             query: 搜索关键词
@@ -635,29 +1185,165 @@ class SQLiteHistoryStorage:
             limit: 每页数量
             
         Returns:
-            匹配的历史记录列表
+            匹配的历史记录列表（按时间降序）
         """
         if not query or not query.strip():
             return self.get_all_items(offset, limit)
         
-        search_pattern = f'%{query}%'
-        
         try:
             with self._get_cursor() as cursor:
-                cursor.execute('''
-                    SELECT * FROM history_items 
-                    WHERE text_content LIKE ? 
-                    OR preview_text LIKE ?
-                    OR ocr_cache LIKE ?
-                    ORDER BY timestamp DESC 
-                    LIMIT ? OFFSET ?
-                ''', (search_pattern, search_pattern, search_pattern, limit, offset))
+                if self._should_use_fts(cursor, query):
+                    cursor.execute(f'''
+                        SELECT h.* FROM history_items h
+                        WHERE h.rowid IN (
+                            SELECT rowid FROM {self.FTS_TABLE}
+                            WHERE {self.FTS_TABLE} MATCH ?
+                        )
+                        ORDER BY h.timestamp DESC, h.id DESC 
+                        LIMIT ? OFFSET ?
+                    ''', (self._to_fts_phrase(query), limit, offset))
+                else:
+                    search_pattern = f'%{query}%'
+                    cursor.execute('''
+                        SELECT * FROM history_items 
+                        WHERE text_content LIKE ? 
+                        OR preview_text LIKE ?
+                        OR ocr_cache LIKE ?
+                        ORDER BY timestamp DESC, id DESC 
+                        LIMIT ? OFFSET ?
+                    ''', (search_pattern, search_pattern, search_pattern, limit, offset))
                 rows = cursor.fetchall()
                 return [self._row_to_item(row) for row in rows]
         except sqlite3.Error as e:
             self._log_error(f"搜索历史记录失败: {e}")
             return []
     
+    def search_items_ranked(
+        self,
+        query: str,
+        limit: int = 100
+    ) -> List[SearchResult]:
+        """按相关度搜索历史记录，并返回高亮片段
+        
+        FTS5 可用时按 bm25 相关度排序（相同分数按时间降序），
+        片段由 FTS5 snippet() 生成；回退路径按时间降序并在 Python 中生成片段。
+        
+        Args:
+            query: 搜索关键词
+            limit: 最大返回数量
+            
+        Returns:
+            SearchResult 列表
+            
+        Feature: history-fts-search
+        """
+        if not query or not query.strip():
+            return []
+        
+        try:
+            with self._get_cursor() as cursor:
+                if not self._should_use_fts(cursor, query):
+                    return [
+                        SearchResult(item=item, snippet=self._build_snippet(item, query))
+                        for item in self.search_items(query, 0, limit)
+                    ]
+                
+                cursor.execute(f'''
+                    SELECT h.*,
+                        snippet({self.FTS_TABLE}, -1, ?, ?, ?, ?) AS fts_snippet,
+                        bm25({self.FTS_TABLE}) AS fts_rank
+                    FROM {self.FTS_TABLE}
+                    JOIN history_items h ON h.rowid = {self.FTS_TABLE}.rowid
+                    WHERE {self.FTS_TABLE} MATCH ?
+                    ORDER BY fts_rank, h.timestamp DESC
+                    LIMIT ?
+                ''', (
+                    self.SNIPPET_MARK_START,
+                    self.SNIPPET_MARK_END,
+                    self.SNIPPET_ELLIPSIS,
+                    self.SNIPPET_CONTEXT_CHARS,
+                    self._to_fts_phrase(query),
+                    limit,
+                ))
+                return [
+                    SearchResult(
+                        item=self._row_to_item(row),
+                        snippet=row['fts_snippet'] or "",
+                        rank=row['fts_rank'],
+                    )
+                    for row in cursor.fetchall()
+                ]
+        except sqlite3.Error as e:
+            self._log_error(f"全文搜索历史记录失败: {e}")
+            return []
+    
+    def _should_use_fts(self, cursor: sqlite3.Cursor, query: str) -> bool:
+        """判断查询是否应该走全文索引
+        
+        - trigram 分词器无法匹配少于 3 个字符的查询（如两个汉字的词），
+          此时必须回退到 LIKE 才能保持相同的子串匹配语义
+        - 高频词（命中数 >= FTS_DENSE_MATCH_THRESHOLD）回退到 LIKE，
+          按时间索引扫描几百行即可凑满一页
+        
+        Args:
+            cursor: 数据库游标
+            query: 搜索关键词
+            
+        Returns:
+            True 如果应该使用全文索引
+        """
+        if not self._fts_enabled or len(query) < self.FTS_MIN_QUERY_LENGTH:
+            return False
+        
+        cursor.execute(f'''
+            SELECT COUNT(*) FROM (
+                SELECT rowid FROM {self.FTS_TABLE}
+                WHERE {self.FTS_TABLE} MATCH ?
+                LIMIT ?
+            )
+        ''', (self._to_fts_phrase(query), self.FTS_DENSE_MATCH_THRESHOLD))
+        return cursor.fetchone()[0] < self.FTS_DENSE_MATCH_THRESHOLD
+    
+    @staticmethod
+    def _to_fts_phrase(query: str) -> str:
+        """将用户输入转换为 FTS5 短语查询
+        
+        整体作为短语匹配，与 LIKE '%query%' 的子串语义一致，
+        同时避免用户输入中的 FTS5 语法字符（AND、*、: 等）被解释。
+        """
+        return '"' + query.replace('"', '""') + '"'
+    
+    def _build_snippet(self, item: HistoryItem, query: str) -> str:
+        """生成 LIKE 回退路径的高亮片段
+        
+        Args:
+            item: 匹配的历史记录
+            query: 搜索关键词
+            
+        Returns:
+            高亮片段，没有匹配时返回空字符串
+        """
+        needle = query.lower()
+        context = self.SNIPPET_CONTEXT_CHARS
+        for text in (item.text_content, item.preview_text, item.ocr_cache):
+            if not text:
+                continue
+            pos = text.lower().find(needle)
+            if pos < 0:
+                continue
+            start = max(0, pos - context)
+            end = min(len(text), pos + len(query) + context)
+            return (
+                (self.SNIPPET_ELLIPSIS if start > 0 else "")
+                + text[start:pos]
+                + self.SNIPPET_MARK_START
+                + text[pos:pos + len(query)]
+                + self.SNIPPET_MARK_END
+                + text[pos + len(query):end]
+                + (self.SNIPPET_ELLIPSIS if end < len(text) else "")
+            )
+        return ""
+    
     def delete_oldest_unpinned(self, keep_count: int) -> int:
         """删除最旧的非置顶记录，保留指定数量
         
@@ -780,6 +1466,27 @@ class SQLiteHistoryStorage:
             selection_rect=selection_rect,
             created_at=created_at,
             updated_at=updated_at,
+            content_hash=row['content_hash'],
+        )
+    
+    def _row_to_summary(self, row: sqlite3.Row) -> HistorySummary:
+        """将摘要查询行转换为 HistorySummary
+        
+        Args:
+            row: SUMMARY_COLUMNS 查询结果行
+            
+        Returns:
+            HistorySummary 实例
+        """
+        return HistorySummary(
+            id=row['id'],
+            content_type=ContentType(row['content_type']),
+            preview_text=row['preview_text'],
+            timestamp=datetime.fromisoformat(row['timestamp']),
+            is_pinned=bool(row['is_pinned']),
+            custom_name=row['custom_name'],
+            image_path=row['image_path'],
+            annotated=bool(row['annotated']),
         )
     
     def _log_error(self, message: str) -> None:
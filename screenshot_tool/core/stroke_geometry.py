@@ -0,0 +1,218 @@
+# =====================================================
+# =============== 笔画几何 ===============
+# =====================================================
+
+"""
+笔画几何 - 画笔笔画的简化与紧凑存储
+
+Feature: stroke-simplification
+
+特性：
+- Ramer–Douglas–Peucker 简化：提交笔画时去掉偏差小于容差的中间点，
+  容差以物理像素计，按 DPR 换算为逻辑像素
+- StrokePoints：array('i') 交错存储 x/y 的只读点序列，
+  按下标访问时才创建 QPoint，可直接得到 NumPy 视图和 QPainterPath
+- 序列化直接从紧凑数组生成 (x, y) 元组
+
+DrawItem（画笔工具）和 AnnotationRenderer 使用。
+"""
+
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PySide6.QtCore import QPoint, QPointF, QRect
+from PySide6.QtGui import QPainterPath
+
+
+# 默认简化容差（物理像素），小于半个多像素的偏差在屏幕上不可见
+DEFAULT_TOLERANCE_PX = 0.75
+
+
+def stroke_tolerance(device_pixel_ratio: float = 1.0,
+                     tolerance_px: float = DEFAULT_TOLERANCE_PX) -> float:
+    """返回逻辑像素下的简化容差
+
+    Args:
+        device_pixel_ratio: 设备像素比
+        tolerance_px: 物理像素容差
+
+    Returns:
+        逻辑像素容差
+    """
+    if not device_pixel_ratio or device_pixel_ratio <= 0:
+        device_pixel_ratio = 1.0
+    return tolerance_px / device_pixel_ratio
+
+
+def simplify_polyline(xy: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer–Douglas–Peucker 折线简化
+
+    使用显式栈代替递归（长笔画不会触发递归深度限制），
+    每段内所有点到弦的距离一次性用 NumPy 计算。
+    首尾点始终保留；连续重复点会先被去掉。
+
+    Args:
+        xy: (n, 2) 坐标数组
+        tolerance: 容差（与坐标同单位），<= 0 时只去掉重复点
+
+    Returns:
+        (m, 2) 简化后的坐标数组，dtype 与输入相同
+    """
+    xy = np.asarray(xy)
+    if len(xy) < 3:
+        return xy.copy()
+
+    # 去掉连续重复点（鼠标静止时产生）
+    keep = np.ones(len(xy), dtype=bool)
+    keep[1:] = np.any(xy[1:] != xy[:-1], axis=1)
+    xy = xy[keep]
+    if len(xy) < 3 or tolerance <= 0:
+        return xy.copy()
+
+    points = xy.astype(np.float64)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    tolerance_sq = tolerance * tolerance
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[start + 1:end]
+        origin = points[start]
+        chord = points[end] - origin
+        rel = segment - origin
+        chord_sq = chord[0] * chord[0] + chord[1] * chord[1]
+        # 点到线段（而非直线）的距离，笔画折返时不会丢掉折返点
+        if chord_sq == 0:
+            offset = rel
+        else:
+            t = np.clip((rel @ chord) / chord_sq, 0.0, 1.0)
+            offset = rel - t[:, None] * chord
+        dist_sq = offset[:, 0] * offset[:, 0] + offset[:, 1] * offset[:, 1]
+        index = int(np.argmax(dist_sq))
+        if dist_sq[index] > tolerance_sq:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return xy[keep]
+
+
+class StrokePoints(Sequence):
+    """紧凑的画笔点序列
+
+    坐标以 array('i') 交错存储（x0, y0, x1, y1, ...），每个点 8 字节，
+    而 QPoint 列表每个点是一个 Python 包装对象。实现只读序列协议，
+    可以替代 List[QPoint] 用于下标访问、遍历和 len()。
+    修改（移动、缩放）时创建新对象。
+    """
+
+    __slots__ = ("_coords",)
+
+    def __init__(self, coords: Optional[array] = None):
+        self._coords = coords if coords is not None else array("i")
+
+    @classmethod
+    def from_points(cls, points: Iterable[QPoint]) -> "StrokePoints":
+        """从 QPoint 序列创建"""
+        coords = array("i")
+        for p in points:
+            coords.append(p.x())
+            coords.append(p.y())
+        return cls(coords)
+
+    @classmethod
+    def from_xy(cls, xy: Union[np.ndarray, Sequence[Tuple[int, int]]]) -> "StrokePoints":
+        """从 (n, 2) 坐标数组或 (x, y) 元组列表创建"""
+        flat = np.asarray(xy, dtype=np.int32).reshape(-1)
+        coords = array("i")
+        coords.frombytes(flat.tobytes())
+        return cls(coords)
+
+    def __len__(self) -> int:
+        return len(self._coords) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("StrokePoints index out of range")
+        return QPoint(self._coords[2 * index], self._coords[2 * index + 1])
+
+    def __iter__(self) -> Iterator[QPoint]:
+        coords = self._coords
+        for i in range(0, len(coords), 2):
+            yield QPoint(coords[i], coords[i + 1])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StrokePoints):
+            return self._coords == other._coords
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"StrokePoints({len(self)} points)"
+
+    def copy(self) -> "StrokePoints":
+        """返回副本"""
+        return StrokePoints(array("i", self._coords))
+
+    def xy(self) -> np.ndarray:
+        """返回 (n, 2) int32 只读视图，与本对象共享内存"""
+        view = np.frombuffer(self._coords, dtype=np.int32) if self._coords else np.empty(0, np.int32)
+        view = view.reshape(-1, 2)
+        view.flags.writeable = False
+        return view
+
+    def to_tuples(self) -> List[Tuple[int, int]]:
+        """返回 (x, y) 元组列表（序列化用）"""
+        coords = self._coords
+        return list(zip(coords[0::2], coords[1::2]))
+
+    def bounds(self) -> QRect:
+        """返回包含所有点的矩形，宽高至少为 1"""
+        if not self._coords:
+            return QRect()
+        xs = self._coords[0::2]
+        ys = self._coords[1::2]
+        min_x, min_y = min(xs), min(ys)
+        return QRect(min_x, min_y, max(1, max(xs) - min_x), max(1, max(ys) - min_y))
+
+    def translated(self, dx: int, dy: int) -> "StrokePoints":
+        """返回平移后的新序列"""
+        xy = self.xy() + np.array([dx, dy], dtype=np.int32)
+        return StrokePoints.from_xy(xy)
+
+    def scaled(self, old_rect: QRect, new_rect: QRect) -> "StrokePoints":
+        """返回从 old_rect 映射到 new_rect 的新序列（截断取整，与 DrawItem.resize 一致）"""
+        xy = self.xy().astype(np.float64)
+        scale_x = new_rect.width() / old_rect.width()
+        scale_y = new_rect.height() / old_rect.height()
+        xy[:, 0] = new_rect.left() + np.trunc((xy[:, 0] - old_rect.left()) * scale_x)
+        xy[:, 1] = new_rect.top() + np.trunc((xy[:, 1] - old_rect.top()) * scale_y)
+        return StrokePoints.from_xy(xy)
+
+    def simplified(self, tolerance: float) -> "StrokePoints":
+        """返回 RDP 简化后的新序列"""
+        if len(self) < 3:
+            return self.copy()
+        return StrokePoints.from_xy(simplify_polyline(self.xy(), tolerance))
+
+    def to_path(self) -> QPainterPath:
+        """构建折线 QPainterPath"""
+        path = QPainterPath()
+        coords = self._coords
+        if not coords:
+            return path
+        path.moveTo(QPointF(coords[0], coords[1]))
+        for i in range(2, len(coords), 2):
+            path.lineTo(QPointF(coords[i], coords[i + 1]))
+        return path
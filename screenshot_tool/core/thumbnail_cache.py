@@ -0,0 +1,166 @@
+# =====================================================
+# =============== 缩略图缓存 ===============
+# =====================================================
+
+"""
+缩略图缓存 - 历史列表只解码小尺寸缩略图
+
+Feature: history-thumbnail-store
+
+特性：
+- 按字节预算淘汰的 LRU 内存缓存（OrderedDict，O(1) 访问与淘汰）
+- 缩略图编码为 PNG 字节，持久化到 SQLite（见 SQLiteHistoryStorage.save_thumbnail）
+- 原图解码时直接缩放（QImageReader.setScaledSize），JPEG 等格式可跳过全尺寸解码
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader
+
+
+# 缩略图最长边（像素）：列表缩略图 100px，按 2 倍设备像素比生成
+THUMBNAIL_MAX_EDGE = 200
+
+# 缩略图编码格式
+THUMBNAIL_FORMAT = "PNG"
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+def image_nbytes(image: QImage) -> int:
+    """估算 QImage 占用的内存字节数"""
+    if image is None or image.isNull():
+        return 0
+    return image.sizeInBytes()
+
+
+class ByteBudgetLRUCache(Generic[K, V]):
+    """按字节预算淘汰的 LRU 缓存
+
+    Feature: history-thumbnail-store
+
+    每次访问把条目移到末尾，插入后从头部（最久未使用）淘汰，
+    直到总字节数不超过预算。单个条目超过预算时不缓存。
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[V], int]):
+        """初始化缓存
+
+        Args:
+            max_bytes: 字节预算
+            size_of: 计算条目字节数的函数
+        """
+        self._max_bytes = max_bytes
+        self._size_of = size_of
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, nbytes)
+        self._total_bytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> Optional[V]:
+        """获取条目并标记为最近使用"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """插入或替换条目，超出预算时淘汰最久未使用的条目"""
+        self.pop(key)
+        nbytes = self._size_of(value)
+        if nbytes > self._max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self._total_bytes += nbytes
+        while self._total_bytes > self._max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_bytes
+
+    def pop(self, key: K) -> Optional[V]:
+        """移除条目"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._total_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def keys(self) -> list:
+        """按最久未使用 -> 最近使用排序的键列表"""
+        return list(self._entries.keys())
+
+
+def scale_to_thumbnail(image: QImage, max_edge: int = THUMBNAIL_MAX_EDGE) -> QImage:
+    """等比缩放到最长边不超过 max_edge（小图不放大）"""
+    if image.isNull() or max(image.width(), image.height()) <= max_edge:
+        return image
+    return image.scaled(
+        max_edge, max_edge,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
+
+
+def load_scaled_image(path: str, max_edge: int = THUMBNAIL_MAX_EDGE) -> Optional[QImage]:
+    """从文件解码缩略图尺寸的图片
+
+    通过 QImageReader.setScaledSize 让图片插件在解码时缩放，
+    避免先得到全尺寸 QImage。
+
+    Args:
+        path: 图片文件完整路径
+        max_edge: 最长边
+
+    Returns:
+        缩放后的图片，失败返回 None
+    """
+    reader = QImageReader(path)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > max_edge:
+        reader.setScaledSize(size.scaled(
+            QSize(max_edge, max_edge), Qt.AspectRatioMode.KeepAspectRatio
+        ))
+    image = reader.read()
+    if image.isNull():
+        return None
+    return scale_to_thumbnail(image, max_edge)
+
+
+def encode_thumbnail(image: QImage) -> Optional[bytes]:
+    """将缩略图编码为字节（用于持久化）"""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    ok = image.save(buffer, THUMBNAIL_FORMAT)
+    buffer.close()
+    if not ok:
+        return None
+    return bytes(data.data())
+
+
+def decode_thumbnail(data: bytes) -> Optional[QImage]:
+    """从字节解码缩略图"""
+    image = QImage()
+    if not image.loadFromData(data, THUMBNAIL_FORMAT):
+        return None
+    return image
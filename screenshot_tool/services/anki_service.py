@@ -26,6 +26,9 @@ try:
         anki_request,
         WordCardService,
         ensure_model_exists,
+        import_words_pipelined,
+        STATUS_IMPORTED,
+        STATUS_SKIPPED,
         MODEL_NAME,
         IMAGE_MODEL_NAME,
         IMAGE_MODEL_TEMPLATE,
@@ -135,7 +138,9 @@ class AnkiService:
         if not connected:
             return AnkiImportResult.error_result(error)
         
-        valid_words = [w.strip().lower() for w in words if w.strip() and len(w.strip()) >= 2]
+        valid_words = list(dict.fromkeys(
+            w.strip().lower() for w in words if w.strip() and len(w.strip()) >= 2
+        ))
         if not valid_words:
             return AnkiImportResult.error_result("没有有效的英文单词")
         
@@ -150,53 +155,19 @@ class AnkiService:
                     store_media_file(screenshot_filename, f.read())
                 book_image_field = f'<img src="{screenshot_filename}">'
             
-            service = self._get_word_service()
+            # 并发查询，媒体和笔记分批上传
+            statuses = import_words_pipelined(
+                valid_words,
+                deck_name,
+                self._get_word_service(),
+                book_image_field,
+                progress_callback
+            )
             
-            imported = 0
-            skipped = 0
-            failed = 0
             total = len(valid_words)
-            
-            for i, word in enumerate(valid_words):
-                if progress_callback:
-                    progress_callback(i + 1, total, word)
-                
-                try:
-                    data = service.query(word)
-                    
-                    audio_field = ''
-                    if data.get('audio_path') and os.path.exists(data['audio_path']):
-                        store_media_file_from_path(data['audio_path'])
-                        audio_field = f"[sound:{data['audio_filename']}]"
-                    
-                    image_field = ''
-                    if data.get('image_path') and os.path.exists(data['image_path']):
-                        store_media_file_from_path(data['image_path'])
-                        image_field = f'<img src="{data["image_filename"]}">'
-                    
-                    note = {
-                        'deckName': deck_name,
-                        'modelName': MODEL_NAME,
-                        'fields': {
-                            '单词': word,
-                            '音标': data.get('phonetic', ''),
-                            '中文释义': data.get('definition', ''),
-                            '单词发音': audio_field,
-                            '单词配图': image_field,
-                            '绘本原图': book_image_field,
-                        },
-                        'options': {'allowDuplicate': False}
-                    }
-                    
-                    result = add_note(note)
-                    if result:
-                        imported += 1
-                    else:
-                        skipped += 1
-                        
-                except Exception as e:
-                    print(f"[Anki] 导入 {word} 失败: {e}")
-                    failed += 1
+            imported = sum(1 for status in statuses.values() if status == STATUS_IMPORTED)
+            skipped = sum(1 for status in statuses.values() if status == STATUS_SKIPPED)
+            failed = total - imported - skipped
             
             return AnkiImportResult(
                 success=True,
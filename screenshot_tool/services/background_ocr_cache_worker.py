@@ -10,6 +10,7 @@
 - 使用 Worker-Object 模式，将工作逻辑移动到独立线程执行
 - 使用最低优先级线程，不影响用户操作
 - 用户活动时 100ms 内暂停处理
+- 按批并行识别（RapidOCRService.recognize_batch），回填速度随 CPU 核心数提升
 
 Requirements:
 - Requirement 2.1: 使用低优先级线程避免影响用户操作
@@ -28,7 +29,6 @@ from enum import Enum
 from typing import Optional, List, TYPE_CHECKING
 
 from PySide6.QtCore import QObject, Signal, QThread, QMutex, QMutexLocker, QTimer
-from PySide6.QtGui import QImage
 
 # ========== 异步调试日志 ==========
 from screenshot_tool.core.async_logger import async_debug_log
@@ -88,6 +88,9 @@ class BackgroundOCRCacheWorker(QObject):
     state_changed = Signal(str)           # state name
     error_occurred = Signal(str, str)     # (item_id, error_message)
     
+    # 每批取出的项目数 = 并行数 * BATCH_SIZE_PER_WORKER
+    BATCH_SIZE_PER_WORKER = 2
+    
     def __init__(self, parent: Optional[QObject] = None):
         """初始化工作器
         
@@ -118,6 +121,9 @@ class BackgroundOCRCacheWorker(QObject):
         # 历史记录管理器引用（用于获取待处理项目）
         self._history_manager: Optional["ClipboardHistoryManager"] = None
         
+        # 批量 OCR 并行数（None 表示按 CPU 核心数自动选择）
+        self._max_workers: Optional[int] = None
+        
         ocr_worker_debug_log("BackgroundOCRCacheWorker 初始化完成")
 
     # ========== 生命周期方法 ==========
@@ -331,13 +337,13 @@ class BackgroundOCRCacheWorker(QObject):
             self.error_occurred.emit("", str(e))
     
     def _process_next_item(self) -> Optional[str]:
-        """处理下一个待处理项目
+        """处理下一批待处理项目
         
-        从待处理队列中获取下一个项目，执行 OCR 识别，
+        从待处理队列中取出一批项目（并行数的 2 倍），批量执行 OCR 识别，
         并将结果存入 HistoryItem.ocr_cache。
         
         Returns:
-            str: 处理的 item_id，如果队列为空或状态不允许则返回 None
+            str: 本批第一个 item_id，如果队列为空或状态不允许则返回 None
             
         Requirement 2.1: 使用低优先级线程避免影响用户操作
         Requirement 2.4: 按最近添加顺序处理图片（最新优先）
@@ -359,78 +365,160 @@ class BackgroundOCRCacheWorker(QObject):
                 self._is_processing = False
             return None
         
-        # 从队列中获取下一个项目
-        item_id: Optional[str] = None
-        queue_empty = False
+        # 从队列中取出一批项目（最新添加的优先）
+        batch_size = self._get_max_workers() * self.BATCH_SIZE_PER_WORKER
         with QMutexLocker(self._pending_mutex):
-            if not self._pending_items:
-                ocr_worker_debug_log("待处理队列为空，处理完成")
-                queue_empty = True
-            else:
-                # 获取队列中的第一个项目（最新添加的优先）
-                item_id = self._pending_items.pop(0)
+            item_ids = self._pending_items[:batch_size]
+            del self._pending_items[:batch_size]
         
-        if queue_empty:
+        if not item_ids:
+            ocr_worker_debug_log("待处理队列为空，处理完成")
             with QMutexLocker(self._processing_mutex):
                 self._is_processing = False
+            self._release_engine_pool()
             return None
         
         # 标记为处理中
         with QMutexLocker(self._processing_mutex):
             self._is_processing = True
         
-        ocr_worker_debug_log(f"开始处理项目: {item_id}")
+        ocr_worker_debug_log(f"开始处理 {len(item_ids)} 个项目: {item_ids[0]} ...")
         
-        # 执行 OCR 处理
+        # 执行 OCR 处理（每个项目完成时更新进度）
         try:
-            self._perform_ocr(item_id)
+            self._perform_ocr_batch(item_ids)
         except Exception as e:
-            ocr_worker_debug_log(f"处理项目 {item_id} 时发生异常: {e}")
-            self.error_occurred.emit(item_id, str(e))
-        
-        # 更新进度
-        self._completed_count += 1
-        self.progress_changed.emit(self._completed_count, self._total_count)
+            ocr_worker_debug_log(f"批量处理项目时发生异常: {e}")
+            self.error_occurred.emit(item_ids[0], str(e))
         
-        # 使用 QTimer.singleShot 触发下一个项目的处理
-        # 这允许线程在任务间隙处理事件循环中的其他信号（如 pause/stop）
+        # 使用 QTimer.singleShot 触发下一批项目的处理
+        # 这允许线程在批次间隙处理事件循环中的其他信号（如 pause/stop）
         QTimer.singleShot(0, self._process_next_item)
         
-        return item_id
+        return item_ids[0]
     
     def _perform_ocr(self, item_id: str) -> None:
         """执行单个项目的 OCR 处理
         
         Args:
             item_id: 历史记录项目 ID
+        """
+        self._perform_ocr_batch([item_id])
+    
+    def _perform_ocr_batch(self, item_ids: List[str]) -> None:
+        """批量执行 OCR 处理
+        
+        图片解码和识别在 RapidOCRService.recognize_batch 的工作线程中并行进行，
+        结果按完成顺序写入缓存。处理过程中工作器被暂停或停止时，
+        未完成的项目放回队列头部。
+        
+        Args:
+            item_ids: 历史记录项目 ID 列表
             
         Requirement 2.5: 后台 OCR 完成后将结果存入 HistoryItem.ocr_cache
         Requirement 3.3: 跳过已有 OCR 缓存的项目
         Requirement 4.1: 使用单例 RapidOCRService
         Requirement 4.4: 发出错误信号
         """
+        jobs = []  # [(item_id, image_full_path)]
+        for item_id in item_ids:
+            image_full_path = self._get_image_path(item_id)
+            if image_full_path is None:
+                self._mark_item_done()
+            else:
+                jobs.append((item_id, image_full_path))
+        
+        if not jobs:
+            return
+        
+        finished = set()
+        try:
+            from screenshot_tool.services.rapid_ocr_service import RapidOCRService
+            
+            # 检查 OCR 服务是否可用
+            ocr_service = RapidOCRService()
+            available, error_msg = ocr_service.check_service_available()
+            if not available:
+                ocr_worker_debug_log(f"OCR 服务不可用: {error_msg}")
+                for item_id, _ in jobs:
+                    self.error_occurred.emit(item_id, f"OCR 服务不可用: {error_msg}")
+                    self._mark_item_done()
+                return
+            
+            # 执行 OCR 识别
+            ocr_worker_debug_log(f"开始批量 OCR 识别: {len(jobs)} 个项目")
+            results = ocr_service.recognize_batch(
+                [path for _, path in jobs], self._get_max_workers()
+            )
+            try:
+                for index, result in results:
+                    finished.add(index)
+                    self._store_ocr_result(jobs[index][0], result)
+                    self._mark_item_done()
+                    if self.get_state() != WorkerState.RUNNING:
+                        ocr_worker_debug_log("工作器已暂停或停止，中断本批处理")
+                        break
+            finally:
+                # 关闭迭代器：取消未开始的任务，等待进行中的任务结束
+                results.close()
+            
+            # 未完成的项目放回队列头部，恢复后继续处理
+            remaining = [item_id for index, (item_id, _) in enumerate(jobs)
+                         if index not in finished]
+            if remaining:
+                with QMutexLocker(self._pending_mutex):
+                    self._pending_items[:0] = [
+                        item_id for item_id in remaining
+                        if item_id not in self._pending_items
+                    ]
+                ocr_worker_debug_log(f"{len(remaining)} 个项目放回待处理队列")
+                
+        except ImportError as e:
+            ocr_worker_debug_log(f"导入 RapidOCRService 失败: {e}")
+            for item_id, _ in jobs:
+                self.error_occurred.emit(item_id, f"OCR 服务导入失败: {e}")
+                self._mark_item_done()
+        except Exception as e:
+            ocr_worker_debug_log(f"OCR 处理异常: {e}")
+            for index, (item_id, _) in enumerate(jobs):
+                if index not in finished:
+                    self.error_occurred.emit(item_id, f"OCR 处理异常: {e}")
+                    self._mark_item_done()
+    
+    def _get_image_path(self, item_id: str) -> Optional[str]:
+        """检查项目并返回图片完整路径
+        
+        Args:
+            item_id: 历史记录项目 ID
+            
+        Returns:
+            图片完整路径，不需要处理（或无法处理）时返回 None
+            
+        Requirement 3.3: 跳过已有 OCR 缓存的项目
+        Requirement 4.4: 发出错误信号
+        """
         # 检查历史记录管理器
         if self._history_manager is None:
             ocr_worker_debug_log(f"历史记录管理器未设置，跳过项目: {item_id}")
             self.error_occurred.emit(item_id, "历史记录管理器未设置")
-            return
+            return None
         
         # 获取 HistoryItem
         item = self._history_manager.get_item(item_id)
         if item is None:
             ocr_worker_debug_log(f"找不到项目: {item_id}")
             self.error_occurred.emit(item_id, "找不到项目")
-            return
+            return None
         
         # Requirement 3.3: 跳过已有 OCR 缓存的项目
         if item.has_ocr_cache():
             ocr_worker_debug_log(f"项目已有 OCR 缓存，跳过: {item_id}")
-            return
+            return None
         
         # 检查是否有图片路径
         if item.image_path is None:
             ocr_worker_debug_log(f"项目没有图片路径，跳过: {item_id}")
-            return
+            return None
         
         # 构建完整的图片路径
         from screenshot_tool.core.clipboard_history_manager import get_clipboard_data_dir
@@ -441,61 +529,67 @@ class BackgroundOCRCacheWorker(QObject):
         if not os.path.exists(image_full_path):
             ocr_worker_debug_log(f"图片文件不存在: {image_full_path}")
             self.error_occurred.emit(item_id, f"图片文件不存在: {image_full_path}")
-            return
+            return None
         
-        # 加载图片
-        image = QImage(image_full_path)
-        if image.isNull():
-            ocr_worker_debug_log(f"无法加载图片: {image_full_path}")
-            self.error_occurred.emit(item_id, f"无法加载图片: {image_full_path}")
+        return image_full_path
+    
+    def _store_ocr_result(self, item_id: str, result) -> None:
+        """将 OCR 结果存入 HistoryItem.ocr_cache
+        
+        Requirement 2.5: 后台 OCR 完成后将结果存入 HistoryItem.ocr_cache
+        Requirement 4.3: 发出完成信号
+        """
+        if not result.success:
+            ocr_worker_debug_log(f"OCR 识别失败: {result.error}")
+            self.error_occurred.emit(item_id, f"OCR 识别失败: {result.error}")
             return
         
-        ocr_worker_debug_log(f"图片加载成功: {image.width()}x{image.height()}")
+        # 获取 OCR 结果文本
+        ocr_text = result.text if result.text else ""
+        ocr_worker_debug_log(f"OCR 识别完成，文本长度: {len(ocr_text)}")
+        
+        success = self._history_manager.update_ocr_cache(item_id, ocr_text)
+        if success:
+            ocr_worker_debug_log(f"OCR 缓存已更新: {item_id}")
+            self.ocr_completed.emit(item_id, ocr_text)
+        else:
+            ocr_worker_debug_log(f"更新 OCR 缓存失败: {item_id}")
+            self.error_occurred.emit(item_id, "更新 OCR 缓存失败")
+    
+    def _mark_item_done(self) -> None:
+        """记录一个项目处理完成并发出进度信号
         
-        # Requirement 4.1: 使用单例 RapidOCRService
+        Requirement 4.3: 发出进度信号
+        """
+        self._completed_count += 1
+        self.progress_changed.emit(self._completed_count, self._total_count)
+    
+    def _get_max_workers(self) -> int:
+        """批量 OCR 的并行数"""
+        if self._max_workers is None:
+            try:
+                from screenshot_tool.services.rapid_ocr_service import default_batch_workers
+                self._max_workers = default_batch_workers()
+            except ImportError:
+                self._max_workers = 1
+        return self._max_workers
+    
+    def set_max_workers(self, max_workers: int) -> None:
+        """设置批量 OCR 的并行数
+        
+        Args:
+            max_workers: 并行数（每个并行引擎额外占用约 100MB 内存）
+        """
+        self._max_workers = max(1, max_workers)
+    
+    @staticmethod
+    def _release_engine_pool() -> None:
+        """处理完成后释放批量识别创建的额外引擎"""
         try:
-            from screenshot_tool.services.rapid_ocr_service import RapidOCRService
-            
-            # 检查 OCR 服务是否可用
-            ocr_service = RapidOCRService()
-            available, error_msg = ocr_service.check_service_available()
-            if not available:
-                ocr_worker_debug_log(f"OCR 服务不可用: {error_msg}")
-                self.error_occurred.emit(item_id, f"OCR 服务不可用: {error_msg}")
-                return
-            
-            # 执行 OCR 识别
-            ocr_worker_debug_log(f"开始 OCR 识别: {item_id}")
-            result = ocr_service.recognize_image(image)
-            
-            # 释放图片引用（Requirement 5.2: 立即释放图片引用）
-            del image
-            
-            if not result.success:
-                ocr_worker_debug_log(f"OCR 识别失败: {result.error}")
-                self.error_occurred.emit(item_id, f"OCR 识别失败: {result.error}")
-                return
-            
-            # 获取 OCR 结果文本
-            ocr_text = result.text if result.text else ""
-            ocr_worker_debug_log(f"OCR 识别完成，文本长度: {len(ocr_text)}")
-            
-            # Requirement 2.5: 将结果存入 HistoryItem.ocr_cache
-            success = self._history_manager.update_ocr_cache(item_id, ocr_text)
-            if success:
-                ocr_worker_debug_log(f"OCR 缓存已更新: {item_id}")
-                # Requirement 4.3: 发出完成信号
-                self.ocr_completed.emit(item_id, ocr_text)
-            else:
-                ocr_worker_debug_log(f"更新 OCR 缓存失败: {item_id}")
-                self.error_occurred.emit(item_id, "更新 OCR 缓存失败")
-                
-        except ImportError as e:
-            ocr_worker_debug_log(f"导入 RapidOCRService 失败: {e}")
-            self.error_occurred.emit(item_id, f"OCR 服务导入失败: {e}")
-        except Exception as e:
-            ocr_worker_debug_log(f"OCR 处理异常: {e}")
-            self.error_occurred.emit(item_id, f"OCR 处理异常: {e}")
+            from screenshot_tool.services.rapid_ocr_service import release_ocr_engine_pool
+            release_ocr_engine_pool()
+        except ImportError:
+            pass
 
     # ========== 状态查询方法 ==========
     
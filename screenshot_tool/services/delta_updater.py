@@ -15,16 +15,19 @@ import shutil
 import tempfile
 import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from PySide6.QtCore import QObject, Signal
 
 from screenshot_tool.core.async_logger import async_debug_log
 from screenshot_tool.services.manifest_service import (
-    FileEntry, Manifest, DeltaResult, ManifestGenerator
+    ChunkEntry, ContentChunker, FileEntry, FileHashCache, Manifest, DeltaResult,
+    ManifestGenerator, chunk_offsets, hash_files_parallel
 )
 
 
@@ -37,6 +40,18 @@ class DownloadProgress:
     speed_kbps: float
 
 
+@dataclass
+class _DownloadState:
+    """单个文件的下载状态（跨重试保留，用于断点续传）"""
+    downloaded: int = 0
+    sha256: Any = field(default_factory=hashlib.sha256)
+    
+    def reset(self) -> None:
+        """从头开始"""
+        self.downloaded = 0
+        self.sha256 = hashlib.sha256()
+
+
 class DeltaUpdater(QObject):
     """增量更新器 - 下载并应用增量更新
     
@@ -55,6 +70,9 @@ class DeltaUpdater(QObject):
     CONNECT_TIMEOUT = 30
     READ_TIMEOUT = 120
     MAX_RETRIES = 3
+    RETRY_DELAY = 1.0
+    MAX_WORKERS = 4  # 并发下载数（同时也是连接池大小）
+    MAX_RANGE_SIZE = 4 * 1024 * 1024  # 块级补丁单个 Range 请求的最大字节数
     
     def __init__(self, install_dir: str, parent=None):
         """初始化增量更新器
@@ -69,6 +87,10 @@ class DeltaUpdater(QObject):
         self._temp_dir: Optional[Path] = None
         self._cancel_flag = False
         self._update_thread: Optional[threading.Thread] = None
+        self._session: Optional[requests.Session] = None
+        self._abort_event = threading.Event()
+        self._download_hashes: Dict[str, str] = {}  # 下载时计算的哈希 {path: sha256}
+        self._chunker = ContentChunker()
     
     @property
     def install_dir(self) -> Path:
@@ -106,6 +128,7 @@ class DeltaUpdater(QObject):
             
             # 1. 下载增量文件
             if not self._download_delta(delta, base_url):
+                self.update_failed.emit("更新已取消" if self._cancel_flag else "文件下载失败")
                 return
             
             if self._cancel_flag:
@@ -141,11 +164,15 @@ class DeltaUpdater(QObject):
             self.update_failed.emit(f"更新失败: {str(e)}")
         finally:
             # 清理临时目录
+            self._close_session()
             self._cleanup_temp()
     
     def _download_delta(self, delta: DeltaResult, base_url: str) -> bool:
         """下载增量文件
-        
+
+        使用有界线程池并发下载，所有线程共享一个带连接池的 Session，
+        任一文件失败后停止提交剩余任务。
+
         Feature: installer-incremental-update
         Requirements: 5.1, 5.2
         """
@@ -154,45 +181,112 @@ class DeltaUpdater(QObject):
         
         async_debug_log(f"[DELTA_UPDATE] 需要下载 {total_files} 个文件")
         
-        for i, file_entry in enumerate(files_to_download):
-            if self._cancel_flag:
-                return False
-            
-            # 构建下载 URL
-            url = f"{base_url.rstrip('/')}/files/{file_entry.path}"
-            save_path = self._temp_dir / file_entry.path
-            
-            # 确保目录存在
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 下载文件（带重试）
-            success = self._download_file_with_retry(
-                url, str(save_path), file_entry
-            )
-            
-            if not success:
-                async_debug_log(f"[DELTA_UPDATE] 下载失败: {file_entry.path}")
-                return False
+        if total_files == 0:
+            return True
+        
+        self._abort_event.clear()
+        self._download_hashes = {}
+        session = self._get_session()
+        base = base_url.rstrip('/')
+        files_done = 0
+        success = True
+        
+        workers = max(1, min(self.MAX_WORKERS, total_files))
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='delta_download') as pool:
+            futures = {}
+            for file_entry in files_to_download:
+                # 构建下载 URL
+                url = f"{base}/files/{file_entry.path}"
+                save_path = self._temp_dir / file_entry.path
+                
+                # 确保目录存在
+                save_path.parent.mkdir(parents=True, exist_ok=True)
+                
+                chunks = delta.chunks.get(file_entry.path)
+                if chunks:
+                    future = pool.submit(
+                        self._patch_or_download,
+                        url, str(save_path), file_entry, chunks, session
+                    )
+                else:
+                    future = pool.submit(
+                        self._download_file_with_retry,
+                        url, str(save_path), file_entry, session
+                    )
+                futures[future] = file_entry
             
-            self.overall_progress.emit(i + 1, total_files)
+            for future in as_completed(futures):
+                file_entry = futures[future]
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    async_debug_log(f"[DELTA_UPDATE] 下载异常 {file_entry.path}: {e}")
+                    ok = False
+                
+                if not ok:
+                    if success:
+                        async_debug_log(f"[DELTA_UPDATE] 下载失败: {file_entry.path}")
+                    success = False
+                    # 通知其它下载线程尽快退出，并取消尚未开始的任务
+                    self._abort_event.set()
+                    for pending in futures:
+                        pending.cancel()
+                    continue
+                
+                files_done += 1
+                self.overall_progress.emit(files_done, total_files)
         
-        return True
+        return success and not self._cancel_flag
+    
+    def _get_session(self) -> requests.Session:
+        """获取共享的 HTTP 会话（连接池大小与下载线程数一致）"""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.MAX_WORKERS,
+                pool_maxsize=self.MAX_WORKERS
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+    
+    def _close_session(self) -> None:
+        """关闭 HTTP 会话"""
+        if self._session is not None:
+            try:
+                self._session.close()
+            except Exception:
+                pass
+            self._session = None
+    
+    def _should_stop(self) -> bool:
+        """用户取消或其它文件下载失败"""
+        return self._cancel_flag or self._abort_event.is_set()
 
     def _download_file_with_retry(
-        self, url: str, save_path: str, file_entry: FileEntry
+        self, url: str, save_path: str, file_entry: FileEntry,
+        session: Optional[requests.Session] = None
     ) -> bool:
         """下载文件（带重试）
+
+        重试时通过 Range 请求从已写入的位置继续，哈希状态跨尝试保留。
         
         Feature: installer-incremental-update
         Requirements: 5.4
         """
+        session = session or self._get_session()
+        state = _DownloadState()
+        
         for attempt in range(self.MAX_RETRIES):
-            if self._cancel_flag:
+            if self._should_stop():
                 return False
             
             try:
-                success = self._download_file(url, save_path, file_entry)
+                success = self._download_file(url, save_path, file_entry, session, state)
                 if success:
+                    self._download_hashes[file_entry.path] = state.sha256.hexdigest()
                     return True
                     
             except Exception as e:
@@ -201,42 +295,86 @@ class DeltaUpdater(QObject):
                 )
             
             if attempt < self.MAX_RETRIES - 1:
-                time.sleep(1)  # 等待后重试
+                time.sleep(self.RETRY_DELAY)  # 等待后重试
         
         return False
     
     def _download_file(
-        self, url: str, save_path: str, file_entry: FileEntry
+        self, url: str, save_path: str, file_entry: FileEntry,
+        session: Optional[requests.Session] = None,
+        state: Optional["_DownloadState"] = None
     ) -> bool:
-        """下载单个文件"""
+        """下载单个文件
+
+        边写入边计算 SHA-256。state 中记录了上次尝试已写入的字节数时，
+        发送 Range 请求续传；服务器不支持 Range（返回 200）时从头下载。
+        """
+        session = session or self._get_session()
+        state = state or _DownloadState()
+        
+        # 磁盘上的部分文件必须与已哈希的字节一致，否则从头开始
+        if state.downloaded and (
+            not os.path.exists(save_path)
+            or os.path.getsize(save_path) < state.downloaded
+            or state.downloaded >= file_entry.size
+        ):
+            state.reset()
+        
+        headers = {}
+        if state.downloaded:
+            headers['Range'] = f"bytes={state.downloaded}-"
+        
         try:
-            response = requests.get(
+            with session.get(
                 url,
                 stream=True,
+                headers=headers,
                 timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
-            )
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', file_entry.size))
-            downloaded = 0
-            start_time = time.time()
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
-                    if self._cancel_flag:
-                        return False
-                    
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        # 计算速度
-                        elapsed = time.time() - start_time
-                        speed = (downloaded / 1024) / elapsed if elapsed > 0 else 0
+            ) as response:
+                response.raise_for_status()
+                
+                if state.downloaded and response.status_code != 206:
+                    async_debug_log(f"[DELTA_UPDATE] 服务器不支持续传，重新下载: {file_entry.path}")
+                    state.reset()
+                elif state.downloaded:
+                    async_debug_log(
+                        f"[DELTA_UPDATE] 续传 {file_entry.path}: 从 {state.downloaded} 字节开始"
+                    )
+                
+                if state.downloaded:
+                    total_size = file_entry.size
+                else:
+                    total_size = int(response.headers.get('content-length', file_entry.size))
+                start_time = time.time()
+                start_offset = state.downloaded
+                
+                with open(save_path, 'r+b' if state.downloaded else 'wb') as f:
+                    f.seek(state.downloaded)
+                    f.truncate()
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        if self._should_stop():
+                            return False
                         
-                        self.file_progress.emit(
-                            file_entry.path, downloaded, total_size, speed
-                        )
+                        if chunk:
+                            f.write(chunk)
+                            state.sha256.update(chunk)
+                            state.downloaded += len(chunk)
+                            
+                            # 计算速度（只统计本次传输的字节）
+                            elapsed = time.time() - start_time
+                            transferred = state.downloaded - start_offset
+                            speed = (transferred / 1024) / elapsed if elapsed > 0 else 0
+                            
+                            self.file_progress.emit(
+                                file_entry.path, state.downloaded, total_size, speed
+                            )
+            
+            if state.downloaded != file_entry.size:
+                async_debug_log(
+                    f"[DELTA_UPDATE] 下载不完整 {file_entry.path}: "
+                    f"{state.downloaded}/{file_entry.size}"
+                )
+                return False
             
             return True
             
@@ -244,8 +382,150 @@ class DeltaUpdater(QObject):
             async_debug_log(f"[DELTA_UPDATE] 下载错误 {file_entry.path}: {e}")
             return False
     
+    def _patch_or_download(
+        self, url: str, save_path: str, file_entry: FileEntry,
+        chunks: List[ChunkEntry], session: requests.Session
+    ) -> bool:
+        """按块打补丁，失败时退回整个文件下载"""
+        try:
+            if self._patch_file(url, save_path, file_entry, chunks, session):
+                return True
+        except Exception as e:
+            async_debug_log(f"[DELTA_UPDATE] 块级补丁失败 {file_entry.path}: {e}")
+        
+        if self._should_stop():
+            return False
+        async_debug_log(f"[DELTA_UPDATE] 改为整个文件下载: {file_entry.path}")
+        return self._download_file_with_retry(url, save_path, file_entry, session)
+    
+    def _plan_patch(
+        self, local_path: Path, chunks: List[ChunkEntry]
+    ) -> List[tuple]:
+        """生成补丁计划
+
+        对当前安装的文件重新分块（不信任本地清单），远程块在本地存在时复用，
+        否则下载；相邻的待下载块合并为一个 Range 请求（不超过 MAX_RANGE_SIZE）。
+
+        Returns:
+            [('local', 本地偏移, [块]) 或 ('remote', 远程偏移, [块])]
+        """
+        local_chunks, _ = self._chunker.chunk_file(str(local_path))
+        local_index = {}
+        for chunk, offset in zip(local_chunks, chunk_offsets(local_chunks)):
+            local_index.setdefault(chunk.hash, offset)
+        
+        plan = []
+        for chunk, offset in zip(chunks, chunk_offsets(chunks)):
+            local_offset = local_index.get(chunk.hash)
+            if local_offset is not None:
+                plan.append(('local', local_offset, [chunk]))
+            elif (plan and plan[-1][0] == 'remote'
+                  and sum(c.size for c in plan[-1][2]) + chunk.size <= self.MAX_RANGE_SIZE):
+                plan[-1][2].append(chunk)
+            else:
+                plan.append(('remote', offset, [chunk]))
+        return plan
+    
+    def _patch_file(
+        self, url: str, save_path: str, file_entry: FileEntry,
+        chunks: List[ChunkEntry], session: requests.Session
+    ) -> bool:
+        """用本地已有的块和下载的缺失块重组文件
+
+        每个下载的块都校验哈希，整个文件的哈希边写边算。
+        """
+        local_path = self._install_dir / file_entry.path
+        if not local_path.is_file():
+            return False
+        if sum(c.size for c in chunks) != file_entry.size:
+            return False
+        
+        plan = self._plan_patch(local_path, chunks)
+        remote_bytes = sum(c.size for kind, _, group in plan if kind == 'remote' for c in group)
+        async_debug_log(
+            f"[DELTA_UPDATE] 块级补丁 {file_entry.path}: "
+            f"下载 {remote_bytes}/{file_entry.size} 字节"
+        )
+        
+        sha256 = hashlib.sha256()
+        written = 0
+        start_time = time.time()
+        
+        with open(save_path, 'wb') as out, open(local_path, 'rb') as local:
+            for kind, offset, group in plan:
+                if self._should_stop():
+                    return False
+                
+                if kind == 'local':
+                    local.seek(offset)
+                    data = local.read(group[0].size)
+                    if hashlib.sha256(data).hexdigest() != group[0].hash:
+                        return False
+                    pieces = [data]
+                else:
+                    pieces = self._fetch_chunks(url, offset, group, session)
+                    if pieces is None:
+                        return False
+                
+                for data in pieces:
+                    out.write(data)
+                    sha256.update(data)
+                    written += len(data)
+                
+                elapsed = time.time() - start_time
+                speed = (written / 1024) / elapsed if elapsed > 0 else 0
+                self.file_progress.emit(file_entry.path, written, file_entry.size, speed)
+        
+        self._download_hashes[file_entry.path] = sha256.hexdigest()
+        return written == file_entry.size
+    
+    def _fetch_chunks(
+        self, url: str, offset: int, group: List[ChunkEntry],
+        session: requests.Session
+    ) -> Optional[List[bytes]]:
+        """用一个 Range 请求下载连续的若干块并逐块校验
+
+        Returns:
+            块数据列表，服务器不支持 Range 或校验失败时返回 None
+        """
+        length = sum(c.size for c in group)
+        with session.get(
+            url,
+            stream=True,
+            headers={'Range': f"bytes={offset}-{offset + length - 1}"},
+            timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                async_debug_log("[DELTA_UPDATE] 服务器不支持 Range，无法按块下载")
+                return None
+            
+            pieces = []
+            buffer = bytearray()
+            index = 0
+            for data in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                if self._should_stop():
+                    return None
+                buffer += data
+                while index < len(group) and len(buffer) >= group[index].size:
+                    size = group[index].size
+                    piece = bytes(buffer[:size])
+                    del buffer[:size]
+                    if hashlib.sha256(piece).hexdigest() != group[index].hash:
+                        async_debug_log(f"[DELTA_UPDATE] 块哈希不匹配: 偏移 {offset}")
+                        return None
+                    pieces.append(piece)
+                    index += 1
+            
+            if index != len(group) or buffer:
+                return None
+            return pieces
+    
     def _verify_downloads(self, delta: DeltaResult) -> bool:
         """验证下载文件的哈希
+
+        下载时已边写边计算哈希，这里直接比较；
+        没有记录的文件（如外部放入临时目录的）才重新读取计算。
         
         Feature: installer-incremental-update
         Requirements: 5.3
@@ -259,7 +539,9 @@ class DeltaUpdater(QObject):
                 async_debug_log(f"[DELTA_UPDATE] 文件不存在: {file_entry.path}")
                 return False
             
-            actual_hash = self._calculate_hash(str(file_path))
+            actual_hash = self._download_hashes.get(file_entry.path)
+            if actual_hash is None:
+                actual_hash = self._calculate_hash(str(file_path))
             if actual_hash != file_entry.hash:
                 async_debug_log(
                     f"[DELTA_UPDATE] 哈希不匹配: {file_entry.path}\n"
@@ -276,7 +558,7 @@ class DeltaUpdater(QObject):
         """计算文件 SHA-256 哈希"""
         sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
                 sha256.update(chunk)
         return sha256.hexdigest()
     
@@ -413,8 +695,16 @@ class DeltaUpdater(QObject):
                 pass
 
 
-def verify_installation_integrity(install_dir: str, manifest: Manifest) -> bool:
+def verify_installation_integrity(
+    install_dir: str,
+    manifest: Manifest,
+    cache_path: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> bool:
     """验证安装完整性
+
+    先检查所有文件是否存在、大小是否一致，再并行计算哈希；
+    提供 cache_path 时，大小和 mtime 未变的文件直接使用缓存的哈希。
     
     Feature: installer-incremental-update
     Requirements: 8.5
@@ -422,24 +712,52 @@ def verify_installation_integrity(install_dir: str, manifest: Manifest) -> bool:
     Args:
         install_dir: 安装目录
         manifest: 版本清单
+        cache_path: 哈希缓存文件路径（与 ManifestGenerator.generate 格式相同）
+        max_workers: 并行哈希线程数
         
     Returns:
         True 如果所有文件存在且哈希匹配
     """
     install_path = Path(install_dir)
+    cache = FileHashCache(cache_path)
+    stats = {}
+    hashes = {}
+    jobs = {}
     
     for file_entry in manifest.files:
         file_path = install_path / file_entry.path
         
         # 检查文件存在
-        if not file_path.exists():
+        if not file_path.is_file():
             async_debug_log(f"[INTEGRITY] 文件缺失: {file_entry.path}")
             return False
         
-        # 检查哈希
-        actual_hash = DeltaUpdater._calculate_hash(str(file_path))
-        if actual_hash != file_entry.hash:
-            async_debug_log(f"[INTEGRITY] 哈希不匹配: {file_entry.path}")
+        stat = file_path.stat()
+        if stat.st_size != file_entry.size:
+            async_debug_log(f"[INTEGRITY] 大小不匹配: {file_entry.path}")
             return False
+        stats[file_entry.path] = stat
+        
+        cached = cache.get(file_entry.path, stat)
+        if cached is not None:
+            hashes[file_entry.path] = cached[0]
+        else:
+            jobs[file_entry.path] = (
+                lambda p=str(file_path): DeltaUpdater._calculate_hash(p)
+            )
+    
+    for path, file_hash in hash_files_parallel(jobs, max_workers).items():
+        hashes[path] = file_hash
+        cache.put(path, stats[path], file_hash)
+    
+    # 检查哈希
+    valid = True
+    for file_entry in manifest.files:
+        if hashes[file_entry.path] != file_entry.hash:
+            async_debug_log(f"[INTEGRITY] 哈希不匹配: {file_entry.path}")
+            valid = False
+            break
     
-    return True
+    if valid:
+        cache.save(keep=stats)
+    return valid
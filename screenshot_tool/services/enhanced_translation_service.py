@@ -11,7 +11,8 @@ Features:
 - MyMemory 翻译（免费API）
 - Papago 翻译（Naver）
 - 简心翻译（保底）
-- 翻译缓存
+- 翻译缓存（内存 LRU + 句子级翻译记忆，跨重启复用）
+- 多句文本按句合并为一次引擎请求
 - 引擎降级
 - 自动语言检测
 """
@@ -21,10 +22,17 @@ import socket
 import urllib.request
 import urllib.parse
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from enum import Enum
 from collections import OrderedDict
 
+from screenshot_tool.services.translation_memory import (
+    TranslationMemory,
+    get_translation_memory,
+    join_segments,
+    split_segments,
+)
+
 
 class TranslationEngine(Enum):
     """翻译引擎"""
@@ -154,8 +162,22 @@ class EnhancedTranslationService:
     # 最大文本长度限制（字符数）
     MAX_TEXT_LENGTH = 5000
     
+    # 引擎接口地址（测试时可指向本地服务）
+    YOUDAO_URL = "https://dict.youdao.com/jsonapi_s"
+    JIANXIN_URL = "https://api.qvqa.cn/api/fanyi"
+    MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+    PAPAGO_URL = "https://papago.naver.com/apis/n2mt/translate"
+    
+    # 支持多句合并请求的引擎（按换行保持逐句对应）
+    # 有道是词典接口，只能逐句请求
+    BATCH_ENGINES = (TranslationEngine.MYMEMORY, TranslationEngine.PAPAGO)
+    # 单次合并请求的最大字符数（MyMemory 免费接口限制 500 字节左右）
+    BATCH_MAX_CHARS = 500
+    
     def __init__(self, default_engine: TranslationEngine = TranslationEngine.MYMEMORY,
-                 cache_enabled: bool = True, timeout: int = 10):
+                 cache_enabled: bool = True, timeout: int = 10,
+                 memory: Optional[TranslationMemory] = None,
+                 persistent_cache: bool = True):
         """
         初始化翻译服务
         
@@ -163,12 +185,16 @@ class EnhancedTranslationService:
             default_engine: 默认翻译引擎
             cache_enabled: 是否启用缓存
             timeout: 请求超时时间（秒），范围 1-60
+            memory: 翻译记忆，None 时使用全局单例
+            persistent_cache: 是否使用翻译记忆（磁盘）
         """
         self._default_engine = default_engine
         self._cache_enabled = cache_enabled
         # 验证并限制超时范围
         self._timeout = max(1, min(60, timeout))
         self._cache = LRUCache(max_size=1000)
+        self._memory = memory
+        self._persistent_cache = persistent_cache
         
         # 引擎优先级（用于降级）
         # MyMemory 对句子翻译更准确，放在第一位
@@ -189,9 +215,17 @@ class EnhancedTranslationService:
         self._cache_enabled = enabled
     
     def clear_cache(self):
-        """清空缓存"""
+        """清空内存缓存（翻译记忆由 TranslationMemory.clear 清空）"""
         self._cache.clear()
     
+    def _get_memory(self) -> Optional[TranslationMemory]:
+        """获取翻译记忆（首次使用时打开）"""
+        if not (self._cache_enabled and self._persistent_cache):
+            return None
+        if self._memory is None:
+            self._memory = get_translation_memory()
+        return self._memory
+    
     def get_cache_size(self) -> int:
         """获取缓存大小"""
         return self._cache.size()
@@ -263,24 +297,124 @@ class EnhancedTranslationService:
             if engine != self._default_engine:
                 engines_to_try.append(engine)
         
-        # 尝试翻译
+        # 按行、按句切分，逐句查询翻译记忆
+        lines = split_segments(text)
+        segments = list(dict.fromkeys(s for line in lines for s in line))
+        translations: Dict[str, str] = {}
+        detected_lang = ""
+        engines_used: List[str] = []
+        
+        memory = self._get_memory()
+        if memory is not None:
+            hits = memory.get_many(
+                segments, source_lang, target_lang, [e.value for e in engines_to_try]
+            )
+            for segment, entry in hits.items():
+                translations[segment] = entry.translated
+                detected_lang = detected_lang or entry.detected_lang
+                if entry.engine not in engines_used:
+                    engines_used.append(entry.engine)
+        all_cached = len(translations) == len(segments)
+        
+        # 未命中的句子交给引擎，失败的部分降级到下一个引擎
         errors = []
+        pending = [s for s in segments if s not in translations]
         for engine in engines_to_try:
+            if not pending:
+                break
             if not self._is_engine_available(engine):
                 continue
             
+            done, engine_lang, error = self._translate_segments(
+                pending, target_lang, source_lang, engine
+            )
+            if done:
+                translations.update(done)
+                detected_lang = detected_lang or engine_lang
+                if engine.value not in engines_used:
+                    engines_used.append(engine.value)
+                if memory is not None:
+                    memory.put_many(
+                        done.items(), source_lang, target_lang, engine.value, engine_lang
+                    )
+                pending = [s for s in pending if s not in done]
+            if error:
+                errors.append(f"{engine.value}: {error}")
+        
+        if pending:
+            return TranslationResult.error_result(text, f"翻译失败: {'; '.join(errors)}")
+        
+        result = TranslationResult(
+            success=True,
+            source_text=text,
+            translated_text=join_segments(
+                [[translations[s] for s in line] for line in lines], target_lang
+            ),
+            source_lang=detected_lang or source_lang,
+            target_lang=target_lang,
+            engine=engines_used[0] if engines_used else "",
+            from_cache=all_cached
+        )
+        if self._cache_enabled:
+            self._cache.set(text, target_lang, source_lang, result)
+        return result
+    
+    def _translate_segments(self, segments: List[str], target_lang: str, source_lang: str,
+                            engine: TranslationEngine) -> Tuple[Dict[str, str], str, str]:
+        """用一个引擎翻译多个句子
+        
+        支持合并请求的引擎把句子按换行拼接，分批请求；
+        返回行数对不上时（引擎合并或拆分了句子）该批逐句请求。
+        
+        Returns:
+            ({句子: 译文}, 检测到的源语言, 错误信息)，遇到失败即停止
+        """
+        if engine in self.BATCH_ENGINES:
+            batches = self._make_batches(segments)
+        else:
+            batches = [[segment] for segment in segments]
+        
+        done: Dict[str, str] = {}
+        detected_lang = ""
+        for batch in batches:
             try:
-                result = self._translate_with_engine(text, target_lang, source_lang, engine)
-                if result.success:
-                    # 缓存成功结果
-                    if self._cache_enabled:
-                        self._cache.set(text, target_lang, source_lang, result)
-                    return result
-                errors.append(f"{engine.value}: {result.error}")
+                result = self._translate_with_engine('\n'.join(batch), target_lang, source_lang, engine)
             except Exception as e:
-                errors.append(f"{engine.value}: {str(e)}")
-        
-        return TranslationResult.error_result(text, f"翻译失败: {'; '.join(errors)}")
+                return done, detected_lang, str(e)
+            if not result.success:
+                return done, detected_lang, result.error or "翻译失败"
+            detected_lang = detected_lang or result.source_lang
+            
+            parts = result.translated_text.replace('\r\n', '\n').split('\n')
+            if len(parts) == len(batch):
+                for segment, part in zip(batch, parts):
+                    done[segment] = part.strip()
+                continue
+            
+            for segment in batch:
+                try:
+                    result = self._translate_with_engine(segment, target_lang, source_lang, engine)
+                except Exception as e:
+                    return done, detected_lang, str(e)
+                if not result.success:
+                    return done, detected_lang, result.error or "翻译失败"
+                done[segment] = result.translated_text.strip()
+        return done, detected_lang, ""
+    
+    def _make_batches(self, segments: List[str]) -> List[List[str]]:
+        """按 BATCH_MAX_CHARS 把句子分组（超长句子单独一组）"""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        length = 0
+        for segment in segments:
+            if current and length + len(segment) + 1 > self.BATCH_MAX_CHARS:
+                batches.append(current)
+                current, length = [], 0
+            current.append(segment)
+            length += len(segment) + 1
+        if current:
+            batches.append(current)
+        return batches
     
     def _is_engine_available(self, engine: TranslationEngine) -> bool:
         """检查引擎是否可用"""
@@ -383,7 +517,7 @@ class EnhancedTranslationService:
         try:
             # 使用有道词典 API
             encoded_text = urllib.parse.quote(text, encoding='utf-8', safe='')
-            url = f"https://dict.youdao.com/jsonapi_s?doctype=json&jsonversion=4&q={encoded_text}"
+            url = f"{self.YOUDAO_URL}?doctype=json&jsonversion=4&q={encoded_text}"
             
             req = urllib.request.Request(url)
             req.add_header("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
@@ -512,9 +646,9 @@ class EnhancedTranslationService:
             # 构建请求URL - 如果是自动检测，不传source参数
             encoded_text = urllib.parse.quote(text, encoding='utf-8', safe='')
             if source_lang == "auto" or src == "auto":
-                url = f"https://api.qvqa.cn/api/fanyi?text={encoded_text}&target={tgt}"
+                url = f"{self.JIANXIN_URL}?text={encoded_text}&target={tgt}"
             else:
-                url = f"https://api.qvqa.cn/api/fanyi?text={encoded_text}&source={src}&target={tgt}"
+                url = f"{self.JIANXIN_URL}?text={encoded_text}&source={src}&target={tgt}"
             
             req = urllib.request.Request(url)
             req.add_header("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
@@ -586,7 +720,7 @@ class EnhancedTranslationService:
             encoded_text = urllib.parse.quote(text, encoding='utf-8', safe='')
             
             # 构建请求URL
-            url = f"https://api.mymemory.translated.net/get?q={encoded_text}&langpair={src}|{tgt}"
+            url = f"{self.MYMEMORY_URL}?q={encoded_text}&langpair={src}|{tgt}"
             
             req = urllib.request.Request(url)
             req.add_header("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
@@ -638,7 +772,7 @@ class EnhancedTranslationService:
             src = self._detect_source_language(text, source_lang, src)
             
             # 使用 Papago 网页版 API
-            url = "https://papago.naver.com/apis/n2mt/translate"
+            url = self.PAPAGO_URL
             
             data = {
                 "source": src,
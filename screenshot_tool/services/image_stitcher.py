@@ -15,13 +15,19 @@ Features:
 - 支持向上/向下拼接
 - 支持预览图生成
 - 支持拼接失败回退
+- 垂直拼接快速路径：只用前一帧底部条带与新帧做归一化互相关定位偏移，
+  新内容直接追加到预分配画布，有歧义时才回退到 ORB（与帧数成线性）
+- 磁盘画布模式：拼接结果写入内存映射临时文件，帧在确定重叠后即丢弃，
+  峰值内存与最终图像高度无关
 """
 
+import tempfile
+
 import cv2
 import numpy as np
 from PySide6.QtGui import QImage
-from typing import Tuple, List, Optional
-from dataclasses import dataclass, field
+from typing import Callable, Tuple, List, Optional
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 
@@ -93,21 +99,445 @@ def cv2_to_qimage(cv_img: np.ndarray) -> QImage:
         return QImage(rgb_img.data, width, height, bytes_per_line, QImage.Format.Format_RGB888).copy()
 
 
+# =====================================================
+# 垂直拼接快速路径
+# Feature: streaming-stitch
+# =====================================================
+
+# 偏移估计条带宽度：只在水平方向缩小，保留逐行精度
+STRIP_WIDTH = 64
+# 参与匹配的前一帧底部条带高度（行）
+BAND_HEIGHT = 96
+# 重叠较小时条带逐次减半的下限（行）
+MIN_BAND_HEIGHT = 16
+# 最低归一化互相关得分
+MIN_MATCH_SCORE = 0.92
+# 次高峰与最高峰的最小差距，小于该值视为重复内容（有歧义）
+PEAK_MARGIN = 0.03
+# 整个重叠区域的最大平均灰度差
+MAX_STRIP_DIFF = 6.0
+
+
+def frame_strip(image: np.ndarray) -> np.ndarray:
+    """生成用于偏移估计的灰度条带
+
+    Args:
+        image: BGR 或灰度图像
+
+    Returns:
+        (height, min(width, STRIP_WIDTH)) float32 数组，行数与原图相同
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    width = min(STRIP_WIDTH, gray.shape[1])
+    strip = cv2.resize(gray, (width, gray.shape[0]), interpolation=cv2.INTER_AREA)
+    return strip.astype(np.float32)
+
+
+def estimate_vertical_offset(prev_strip: np.ndarray, cur_strip: np.ndarray) -> Optional[int]:
+    """估计新帧相对前一帧向下滚动的行数
+
+    在新帧条带中搜索前一帧底部 BAND_HEIGHT 行，再逐行校验整个重叠区域。
+    重叠比条带还小时依次把条带减半重试（最少 MIN_BAND_HEIGHT 行）。
+
+    Args:
+        prev_strip: 前一帧的 frame_strip
+        cur_strip: 新帧的 frame_strip
+
+    Returns:
+        新帧第 0 行在前一帧中的行号；纯色、重复内容、反向滚动或校验失败时返回 None
+    """
+    if prev_strip.shape[1] != cur_strip.shape[1]:
+        return None
+    band = min(BAND_HEIGHT, prev_strip.shape[0] // 3, cur_strip.shape[0])
+    while band >= MIN_BAND_HEIGHT:
+        offset = _match_band(prev_strip, cur_strip, band)
+        if offset is not None:
+            return offset
+        band //= 2
+    return None
+
+
+def _match_band(prev_strip: np.ndarray, cur_strip: np.ndarray, band: int) -> Optional[int]:
+    """用前一帧底部 band 行定位偏移，失败时返回 None"""
+    prev_height, cur_height = prev_strip.shape[0], cur_strip.shape[0]
+    template = prev_strip[prev_height - band:]
+    if float(template.std()) < 1.0:
+        # 纯色条带无法定位
+        return None
+
+    scores = cv2.matchTemplate(cur_strip, template, cv2.TM_CCOEFF_NORMED).ravel()
+    scores = np.nan_to_num(scores, nan=-1.0, posinf=-1.0, neginf=-1.0)
+    best = int(np.argmax(scores))
+    best_score = float(scores[best])
+    if best_score < MIN_MATCH_SCORE:
+        return None
+
+    # 重复内容（列表、表格行）会在别处产生相近的峰
+    others = scores.copy()
+    others[max(0, best - band // 2):best + band // 2 + 1] = -1.0
+    if others.size and float(others.max()) > best_score - PEAK_MARGIN:
+        return None
+
+    offset = (prev_height - band) - best
+    if offset < 0:
+        return None
+
+    overlap = min(prev_height - offset, cur_height)
+    diff = np.abs(prev_strip[offset:offset + overlap] - cur_strip[:overlap]).mean()
+    if diff > MAX_STRIP_DIFF:
+        return None
+    return offset
+
+
+class StitchCanvas:
+    """可增长的拼接画布
+
+    预分配行缓冲区，容量不足时按 1.5 倍扩展，追加行的均摊代价为 O(行数)，
+    避免每帧 np.vstack / np.zeros 复制整张结果图。
+    """
+
+    def __init__(self, width: int, channels: int = 3, initial_rows: int = 0):
+        self._width = width
+        self._channels = channels
+        self._buffer = np.zeros((max(1, initial_rows), width, channels), dtype=np.uint8)
+        self._height = 0
+
+    @property
+    def height(self) -> int:
+        """已写入的行数"""
+        return self._height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    def append(self, rows: np.ndarray):
+        """追加行（宽度不足的行右侧补黑，更宽的行会加宽画布）"""
+        count, width = rows.shape[0], rows.shape[1]
+        if count == 0:
+            return
+        if width > self._width:
+            self._widen(width)
+        self._reserve(self._height + count)
+        target = self._buffer[self._height:self._height + count]
+        target[:, :width] = rows
+        self._height += count
+
+    def array(self) -> np.ndarray:
+        """返回已写入部分的视图"""
+        return self._buffer[:self._height]
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """读取 [start, stop) 行"""
+        return self._buffer[start:min(stop, self._height)]
+
+    def close(self):
+        """释放缓冲区"""
+        self._buffer = np.zeros((1, self._width, self._channels), dtype=np.uint8)
+        self._height = 0
+
+    def _reserve(self, rows: int):
+        capacity = self._buffer.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, int(capacity * 1.5) + 1)
+        buffer = np.zeros((new_capacity, self._width, self._channels), dtype=np.uint8)
+        buffer[:self._height] = self._buffer[:self._height]
+        self._buffer = buffer
+
+    def _widen(self, width: int):
+        buffer = np.zeros((self._buffer.shape[0], width, self._channels), dtype=np.uint8)
+        buffer[:self._height, :self._width] = self._buffer[:self._height]
+        self._buffer = buffer
+        self._width = width
+
+
+class MappedStitchCanvas:
+    """磁盘映射拼接画布
+
+    行写入临时文件中按固定字节数划分的内存映射段，已写入的页由操作系统按需换出，
+    进程内存不随最终图像高度增长。已映射的段不会被重新映射或截断
+    （Windows 下不能截断仍被映射的文件）。
+
+    宽度在创建时固定：更宽的行被裁剪，更窄的行右侧补黑。
+    """
+
+    # 每个映射段的大小
+    SEGMENT_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, width: int, channels: int = 3, directory: Optional[str] = None):
+        """
+        Args:
+            width: 画布宽度
+            channels: 通道数
+            directory: 临时文件目录，None 使用系统临时目录
+        """
+        self._width = width
+        self._channels = channels
+        self._segment_rows = max(1, self.SEGMENT_BYTES // (width * channels))
+        self._file = tempfile.TemporaryFile(prefix="stitch_", suffix=".raw", dir=directory)
+        self._segments: List[np.memmap] = []
+        self._height = 0
+
+    @property
+    def height(self) -> int:
+        """已写入的行数"""
+        return self._height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    def append(self, rows: np.ndarray):
+        """追加行"""
+        count = rows.shape[0]
+        width = min(rows.shape[1], self._width)
+        written = 0
+        while written < count:
+            index, row = divmod(self._height, self._segment_rows)
+            if index == len(self._segments):
+                self._segments.append(self._map_segment(index))
+            n = min(count - written, self._segment_rows - row)
+            target = self._segments[index][row:row + n]
+            target[:, :width] = rows[written:written + n, :width]
+            if width < self._width:
+                target[:, width:] = 0
+            written += n
+            self._height += n
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """读取 [start, stop) 行（同一段内返回映射视图，跨段时返回拷贝）"""
+        stop = min(stop, self._height)
+        if start >= stop:
+            return np.zeros((0, self._width, self._channels), dtype=np.uint8)
+        first, first_row = divmod(start, self._segment_rows)
+        last = (stop - 1) // self._segment_rows
+        if first == last:
+            return self._segments[first][first_row:first_row + stop - start]
+        parts = []
+        for index in range(first, last + 1):
+            seg_start = index * self._segment_rows
+            lo = max(start, seg_start) - seg_start
+            hi = min(stop, seg_start + self._segment_rows) - seg_start
+            parts.append(self._segments[index][lo:hi])
+        return np.concatenate(parts)
+
+    def array(self) -> np.ndarray:
+        """读取全部行（会把整张图读入内存）"""
+        return self.read(0, self._height)
+
+    def close(self):
+        """释放映射并删除临时文件"""
+        self._segments.clear()
+        self._height = 0
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+    def _map_segment(self, index: int) -> np.memmap:
+        segment_bytes = self._segment_rows * self._width * self._channels
+        return np.memmap(
+            self._file, dtype=np.uint8, mode="r+",
+            offset=index * segment_bytes,
+            shape=(self._segment_rows, self._width, self._channels),
+        )
+
+
+def canvas_to_qimage(canvas, chunk_rows: int = 1024) -> QImage:
+    """分块把画布转换为 RGB888 QImage
+
+    直接写入 QImage 的缓冲区，除结果本身外只占用一个分块的内存。
+
+    Args:
+        canvas: StitchCanvas / MappedStitchCanvas
+        chunk_rows: 每次读取的行数
+
+    Returns:
+        QImage，分配失败时返回空 QImage
+    """
+    height, width = canvas.height, canvas.width
+    image = QImage(width, height, QImage.Format.Format_RGB888)
+    if image.isNull():
+        return image
+    stride = image.bytesPerLine()
+    buffer = np.frombuffer(image.bits(), dtype=np.uint8, count=stride * height).reshape(height, stride)
+    for start in range(0, height, chunk_rows):
+        rows = canvas.read(start, start + chunk_rows)
+        count = rows.shape[0]
+        rgb = cv2.cvtColor(np.ascontiguousarray(rows), cv2.COLOR_BGR2RGB)
+        buffer[start:start + count, :width * 3] = rgb.reshape(count, width * 3)
+    return image
+
+
+def canvas_preview(canvas, max_height: int, chunk_rows: int = 1024) -> Optional[np.ndarray]:
+    """分块生成画布缩略图（BGR）
+
+    每个分块按累计行数缩放，结果与整图 INTER_AREA 缩放近似，
+    读取时只占用一个分块的内存。
+
+    Args:
+        canvas: StitchCanvas / MappedStitchCanvas
+        max_height: 最大高度
+        chunk_rows: 每次读取的行数
+
+    Returns:
+        缩略图，画布为空时返回 None
+    """
+    height, width = canvas.height, canvas.width
+    if height == 0:
+        return None
+    if height <= max_height:
+        return np.array(canvas.read(0, height))
+    scale = max_height / height
+    new_width = max(1, int(width * scale))
+    parts = []
+    for start in range(0, height, chunk_rows):
+        stop = min(start + chunk_rows, height)
+        out_rows = round(stop * scale) - round(start * scale)
+        if out_rows <= 0:
+            continue
+        rows = np.ascontiguousarray(canvas.read(start, stop))
+        parts.append(cv2.resize(rows, (new_width, out_rows), interpolation=cv2.INTER_AREA))
+    return np.concatenate(parts)
+
+
+class VerticalStitchStream:
+    """流式垂直拼接
+
+    每帧只与前一帧比较（条带互相关），只把新帧超出画布的行追加到画布，
+    总代价与帧数成线性。只保留前一帧用于 ORB 回退。
+    """
+
+    def __init__(self, offset_fallback: Optional[Callable[[np.ndarray, np.ndarray], Optional[int]]] = None,
+                 canvas_factory: Optional[Callable[[int, int], object]] = None):
+        """
+        Args:
+            offset_fallback: 快速路径有歧义时调用 (前一帧, 新帧) -> 偏移，通常是 ORB
+            canvas_factory: (宽度, 第一帧高度) -> 画布，默认内存中的 StitchCanvas
+        """
+        self._fallback = offset_fallback
+        self._canvas_factory = canvas_factory
+        self._canvas = None
+        self._prev_frame: Optional[np.ndarray] = None
+        self._prev_strip: Optional[np.ndarray] = None
+        self._prev_top = 0  # 前一帧第 0 行在画布中的行号
+
+    @property
+    def canvas(self):
+        """拼接画布，没有帧时为 None"""
+        return self._canvas
+
+    @property
+    def last_frame(self) -> Optional[np.ndarray]:
+        """最后一帧"""
+        return self._prev_frame
+
+    @property
+    def last_strip(self) -> Optional[np.ndarray]:
+        """最后一帧的偏移估计条带"""
+        if self._prev_strip is None and self._prev_frame is not None:
+            self._prev_strip = frame_strip(self._prev_frame)
+        return self._prev_strip
+
+    @property
+    def height(self) -> int:
+        """当前拼接高度"""
+        return self._canvas.height if self._canvas is not None else 0
+
+    def push(self, frame: np.ndarray, offset: Optional[int] = None,
+             strip: Optional[np.ndarray] = None) -> int:
+        """
+        追加一帧
+
+        Args:
+            frame: BGR 图像
+            offset: 已知的相对前一帧偏移（行），None 时自动估计
+            strip: 已计算的 frame_strip（可选）
+
+        Returns:
+            int: 实际使用的偏移（第一帧为 0）
+        """
+        if strip is None and offset is None:
+            strip = frame_strip(frame)
+        if self._canvas is None:
+            if self._canvas_factory is not None:
+                self._canvas = self._canvas_factory(frame.shape[1], frame.shape[0])
+            else:
+                self._canvas = StitchCanvas(frame.shape[1], initial_rows=frame.shape[0] * 4)
+            self._canvas.append(frame)
+            self._prev_top = 0
+            offset = 0
+        else:
+            prev_height = self._prev_frame.shape[0]
+            if offset is None:
+                offset = estimate_vertical_offset(self.last_strip, strip)
+                if offset is None and self._fallback is not None:
+                    offset = self._fallback(self._prev_frame, frame)
+                if offset is None:
+                    # 无法确定重叠：直接接在前一帧后面
+                    offset = prev_height
+            offset = max(0, min(offset, prev_height))
+
+            top = self._prev_top + offset
+            start = self._canvas.height - top
+            if start < frame.shape[0]:
+                self._canvas.append(frame[start:])
+            self._prev_top = top
+
+        self._prev_frame = frame
+        self._prev_strip = strip
+        return offset
+
+    def result(self) -> Optional[np.ndarray]:
+        """返回拼接结果（画布视图），没有帧时返回 None"""
+        return self._canvas.array() if self._canvas is not None else None
+
+    def close(self):
+        """释放画布和保留的帧"""
+        if self._canvas is not None:
+            self._canvas.close()
+        self._canvas = None
+        self._prev_frame = None
+        self._prev_strip = None
+
+
 class ImageStitcher:
     """图像拼接服务 - 使用特征匹配算法"""
     
     def __init__(self, direction: StitchDirection = StitchDirection.VERTICAL,
-                 overlap_threshold: float = 0.3):
+                 overlap_threshold: float = 0.3,
+                 disk_backed: bool = False,
+                 spill_dir: Optional[str] = None):
         """
         初始化拼接器
         
         Args:
             direction: 拼接方向
             overlap_threshold: 最小重叠比例阈值
+            disk_backed: 磁盘画布模式（仅垂直方向）：每帧确定重叠后立即写入
+                内存映射临时文件并丢弃，峰值内存约为两帧，与最终高度无关
+            spill_dir: 磁盘画布临时文件目录，None 使用系统临时目录
+        
+        Raises:
+            ValueError: 磁盘画布模式使用了非垂直方向
         """
+        if disk_backed and direction != StitchDirection.VERTICAL:
+            raise ValueError("磁盘画布模式只支持垂直拼接")
         self._direction = direction
         self._overlap_threshold = overlap_threshold
         self._frames: List[np.ndarray] = []
+        # 每帧相对前一帧的垂直偏移（行），None 表示尚未确定
+        self._offsets: List[Optional[int]] = []
+        # 最后一帧的偏移估计条带（避免重复计算）
+        self._last_strip: Optional[np.ndarray] = None
+        
+        # 磁盘画布模式：帧直接推入流式拼接，不保留在 _frames 中
+        # Feature: disk-backed-stitch
+        self._disk_backed = disk_backed
+        self._spill_dir = spill_dir
+        self._stream: Optional[VerticalStitchStream] = None
+        self._stream_frame_count = 0
         
         # 创建 ORB 特征检测器
         self._orb = cv2.ORB_create(nfeatures=1000)
@@ -130,19 +560,57 @@ class ImageStitcher:
         
         cv_img = qimage_to_cv2(image)
         
-        if len(self._frames) == 0:
-            self._frames.append(cv_img)
+        if self.get_frame_count() == 0:
+            self._append_frame(cv_img, 0, frame_strip(cv_img))
             return True
         
-        # 检测与前一帧的重叠
-        has_overlap = self._detect_overlap(self._frames[-1], cv_img)
+        # 快速路径：条带互相关定位偏移，得到的重叠比例达到阈值即接受
+        prev_frame, prev_strip = self._last_frame_and_strip()
+        strip = frame_strip(cv_img)
+        offset = estimate_vertical_offset(prev_strip, strip)
+        if offset is not None:
+            overlap_height = min(prev_frame.shape[0] - offset, cv_img.shape[0])
+            if overlap_height >= self._overlap_threshold * cv_img.shape[0]:
+                self._append_frame(cv_img, offset, strip)
+                return True
+            return False
+        
+        # 有歧义时回退到 ORB 检测重叠，偏移留到拼接时确定
+        has_overlap = self._detect_overlap(prev_frame, cv_img)
         
         if has_overlap:
-            self._frames.append(cv_img)
+            self._append_frame(cv_img, None, strip)
             return True
         
         return False
     
+    def _append_frame(self, cv_img: np.ndarray, offset: Optional[int] = None,
+                      strip: Optional[np.ndarray] = None):
+        """追加帧及其偏移（offset 为 None 时拼接时再估计）
+        
+        磁盘画布模式下立即写入画布，帧本身不保留。
+        """
+        if self._disk_backed:
+            if self._stream is None:
+                self._stream = VerticalStitchStream(
+                    self._orb_vertical_offset,
+                    canvas_factory=lambda width, _height: MappedStitchCanvas(width, directory=self._spill_dir),
+                )
+            self._stream.push(cv_img, offset, strip)
+            self._stream_frame_count += 1
+            return
+        self._frames.append(cv_img)
+        self._offsets.append(offset)
+        self._last_strip = strip
+    
+    def _last_frame_and_strip(self) -> Tuple[np.ndarray, np.ndarray]:
+        """最后一帧及其偏移估计条带"""
+        if self._disk_backed:
+            return self._stream.last_frame, self._stream.last_strip
+        if self._last_strip is None:
+            self._last_strip = frame_strip(self._frames[-1])
+        return self._frames[-1], self._last_strip
+    
     def _detect_overlap(self, img1: np.ndarray, img2: np.ndarray) -> bool:
         """检测两张图片是否有足够的重叠"""
         try:
@@ -177,6 +645,9 @@ class ImageStitcher:
         Returns:
             StitchResult: 拼接结果
         """
+        if self._disk_backed:
+            return self._stitch_from_canvas()
+        
         if len(self._frames) == 0:
             return StitchResult(success=False, error="没有可拼接的帧")
         
@@ -214,16 +685,33 @@ class ImageStitcher:
                 frame_count=len(self._frames)
             )
     
-    def _stitch_vertical(self) -> Optional[np.ndarray]:
-        """垂直拼接"""
-        result = self._frames[0].copy()
-        
-        for i in range(1, len(self._frames)):
-            result = self._stitch_two_images_vertical(result, self._frames[i])
-            if result is None:
-                return None
+    def _stitch_from_canvas(self) -> StitchResult:
+        """磁盘画布模式：分块从映射画布生成结果图像"""
+        if self._stream is None or self._stream.canvas is None:
+            return StitchResult(success=False, error="没有可拼接的帧")
         
-        return result
+        frame_count = self._stream_frame_count
+        try:
+            image = canvas_to_qimage(self._stream.canvas)
+        except Exception as e:
+            return StitchResult(success=False, error=str(e), frame_count=frame_count)
+        if image.isNull():
+            return StitchResult(success=False, error="拼接结果过大，无法分配图像", frame_count=frame_count)
+        return StitchResult(success=True, image=image, frame_count=frame_count)
+    
+    def _stitch_vertical(self) -> Optional[np.ndarray]:
+        """垂直拼接（流式，使用并回填每帧的偏移）"""
+        stream = VerticalStitchStream(self._orb_vertical_offset)
+        for i, frame in enumerate(self._frames):
+            self._offsets[i] = stream.push(frame, self._offsets[i])
+        return stream.result()
+    
+    def _stitch_frames_vertical(self, frames: List[np.ndarray]) -> Optional[np.ndarray]:
+        """按顺序流式垂直拼接任意帧序列（不使用缓存的偏移）"""
+        stream = VerticalStitchStream(self._orb_vertical_offset)
+        for frame in frames:
+            stream.push(frame)
+        return stream.result()
     
     def _stitch_horizontal(self) -> Optional[np.ndarray]:
         """水平拼接"""
@@ -250,8 +738,12 @@ class ImageStitcher:
         except Exception:
             return self._stitch_vertical()
     
-    def _stitch_two_images_vertical(self, img1: np.ndarray, img2: np.ndarray) -> Optional[np.ndarray]:
-        """垂直拼接两张图片"""
+    def _orb_vertical_offset(self, img1: np.ndarray, img2: np.ndarray) -> Optional[int]:
+        """用 ORB 特征匹配估计 img2 第 0 行在 img1 中的行号（快速路径有歧义时使用）
+        
+        Returns:
+            Optional[int]: 偏移；特征不足时返回 None
+        """
         try:
             # 转灰度
             gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
@@ -262,49 +754,25 @@ class ImageStitcher:
             kp2, des2 = self._orb.detectAndCompute(gray2, None)
             
             if des1 is None or des2 is None:
-                # 简单拼接
-                return np.vstack([img1, img2])
+                return None
             
             # 匹配特征点
             matches = self._matcher.match(des1, des2)
             
             if len(matches) < 4:
-                # 简单拼接
-                return np.vstack([img1, img2])
+                return None
             
             # 按距离排序
             matches = sorted(matches, key=lambda x: x.distance)
             
-            # 计算重叠区域
             src_pts = np.float32([kp1[m.queryIdx].pt for m in matches[:50]]).reshape(-1, 2)
             dst_pts = np.float32([kp2[m.trainIdx].pt for m in matches[:50]]).reshape(-1, 2)
             
             # 计算 Y 方向偏移
             y_offsets = src_pts[:, 1] - dst_pts[:, 1]
-            median_offset = int(np.median(y_offsets))
-            
-            # 计算重叠高度
-            overlap_height = img1.shape[0] - median_offset
-            
-            if overlap_height <= 0:
-                # 没有重叠，简单拼接
-                return np.vstack([img1, img2])
-            
-            # 裁剪重叠区域
-            new_height = img1.shape[0] + img2.shape[0] - overlap_height
-            result = np.zeros((new_height, max(img1.shape[1], img2.shape[1]), 3), dtype=np.uint8)
-            
-            # 放置第一张图
-            result[:img1.shape[0], :img1.shape[1]] = img1
-            
-            # 放置第二张图（去除重叠部分）
-            start_y = img1.shape[0] - overlap_height
-            result[start_y:start_y + img2.shape[0], :img2.shape[1]] = img2
-            
-            return result
+            return int(np.median(y_offsets))
         except Exception:
-            # 出错时简单拼接
-            return np.vstack([img1, img2])
+            return None
     
     def _stitch_two_images_horizontal(self, img1: np.ndarray, img2: np.ndarray) -> Optional[np.ndarray]:
         """水平拼接两张图片"""
@@ -357,14 +825,32 @@ class ImageStitcher:
     
     def get_frame_count(self) -> int:
         """获取已捕获的帧数"""
+        if self._disk_backed:
+            return self._stream_frame_count
         return len(self._frames)
     
+    def is_disk_backed(self) -> bool:
+        """是否为磁盘画布模式"""
+        return self._disk_backed
+    
     def clear(self):
         """清空所有帧"""
         self._frames.clear()
+        self._offsets.clear()
+        self._last_strip = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._stream_frame_count = 0
     
     def set_direction(self, direction: StitchDirection):
-        """设置拼接方向"""
+        """设置拼接方向
+        
+        Raises:
+            ValueError: 磁盘画布模式使用了非垂直方向
+        """
+        if self._disk_backed and direction != StitchDirection.VERTICAL:
+            raise ValueError("磁盘画布模式只支持垂直拼接")
         self._direction = direction
 
 
@@ -380,8 +866,10 @@ class EnhancedImageStitcher(ImageStitcher):
     """
     
     def __init__(self, direction: StitchDirection = StitchDirection.VERTICAL,
-                 overlap_threshold: float = 0.3):
-        super().__init__(direction, overlap_threshold)
+                 overlap_threshold: float = 0.3,
+                 disk_backed: bool = False,
+                 spill_dir: Optional[str] = None):
+        super().__init__(direction, overlap_threshold, disk_backed, spill_dir)
         self._stitch_frames: List[StitchFrame] = []
         self._preview_scale: float = 0.2  # 预览图缩放比例
     
@@ -399,7 +887,7 @@ class EnhancedImageStitcher(ImageStitcher):
             return False
         
         cv_img = qimage_to_cv2(image)
-        self._frames.append(cv_img)
+        self._append_frame(cv_img)
         return True
     
     def add_stitch_frame(self, frame: StitchFrame) -> bool:
@@ -415,11 +903,12 @@ class EnhancedImageStitcher(ImageStitcher):
         if frame.image.isNull():
             return False
         
-        self._stitch_frames.append(frame)
+        # 磁盘画布模式只保留帧的元数据，不保留图像
+        self._stitch_frames.append(replace(frame, image=QImage()) if self._disk_backed else frame)
         
         # 同时添加到帧列表
         cv_img = qimage_to_cv2(frame.image)
-        self._frames.append(cv_img)
+        self._append_frame(cv_img)
         
         return True
     
@@ -435,6 +924,9 @@ class EnhancedImageStitcher(ImageStitcher):
         Returns:
             StitchResult: 拼接结果
         """
+        if self._disk_backed:
+            return self._disk_backed_unsupported()
+        
         if len(self._frames) == 0:
             return StitchResult(success=False, error="没有可拼接的帧")
         
@@ -477,6 +969,9 @@ class EnhancedImageStitcher(ImageStitcher):
         Returns:
             StitchResult: 拼接结果
         """
+        if self._disk_backed:
+            return self._disk_backed_unsupported()
+        
         if len(self._frames) == 0:
             return StitchResult(success=False, error="没有可拼接的帧")
         
@@ -488,14 +983,8 @@ class EnhancedImageStitcher(ImageStitcher):
             )
         
         try:
-            # 反转帧顺序后拼接
-            reversed_frames = self._frames[::-1]
-            result = self._frames[0].copy()
-            
-            for i in range(1, len(reversed_frames)):
-                result = self._stitch_two_images_vertical(reversed_frames[i], result)
-                if result is None:
-                    return self._create_fallback_result()
+            # 反向滚动时后捕获的帧在上方：反转帧顺序后按向下拼接
+            result = self._stitch_frames_vertical(self._frames[::-1])
             
             if result is not None:
                 return StitchResult(
@@ -518,6 +1007,16 @@ class EnhancedImageStitcher(ImageStitcher):
         Returns:
             Optional[QImage]: 预览图像
         """
+        if self._disk_backed:
+            # 分块从映射画布缩放，不生成全尺寸图像
+            if self._stream is None or self._stream.canvas is None:
+                return None
+            try:
+                preview = canvas_preview(self._stream.canvas, max_height)
+                return cv2_to_qimage(preview) if preview is not None else None
+            except Exception:
+                return None
+        
         if len(self._frames) == 0:
             return None
         
@@ -546,6 +1045,10 @@ class EnhancedImageStitcher(ImageStitcher):
         Returns:
             int: 估计高度
         """
+        if self._disk_backed:
+            # 画布高度即实际拼接高度
+            return self._stream.height if self._stream is not None else 0
+        
         if len(self._frames) == 0:
             return 0
         
@@ -577,41 +1080,40 @@ class EnhancedImageStitcher(ImageStitcher):
         if len(self._frames) < 2:
             return self._frames[0] if self._frames else None
         
-        # 处理第一帧：保留顶部固定区域
-        first_frame = self._frames[0].copy()
-        
-        # 处理中间帧：排除顶部和底部固定区域
-        processed_frames = [first_frame]
-        
-        for i in range(1, len(self._frames)):
-            frame = self._frames[i].copy()
+        # 只拼接内容区域：所有帧去掉顶部和底部固定区域
+        def content(frame: np.ndarray) -> np.ndarray:
             height = frame.shape[0]
-            
-            # 排除固定区域
-            if top_fixed > 0 or bottom_fixed > 0:
-                start_y = top_fixed
-                end_y = height - bottom_fixed if bottom_fixed > 0 else height
-                
-                if end_y > start_y:
-                    frame = frame[start_y:end_y, :]
-            
-            processed_frames.append(frame)
-        
-        # 拼接处理后的帧
-        result = processed_frames[0]
+            end_y = height - bottom_fixed
+            if end_y > top_fixed:
+                return frame[top_fixed:end_y]
+            return frame
         
-        for i in range(1, len(processed_frames)):
-            result = self._stitch_two_images_vertical(result, processed_frames[i])
-            if result is None:
-                return None
-        
-        # 处理最后一帧：保留底部固定区域
-        if bottom_fixed > 0 and len(self._frames) > 1:
-            last_frame = self._frames[-1]
-            bottom_region = last_frame[-bottom_fixed:, :]
-            result = np.vstack([result, bottom_region])
+        result = self._stitch_frames_vertical([content(frame) for frame in self._frames])
+        if result is None:
+            return None
         
-        return result
+        # 固定区域各保留一份：第一帧的顶部、最后一帧的底部
+        parts = [result]
+        first_frame, last_frame = self._frames[0], self._frames[-1]
+        if top_fixed > 0 and first_frame.shape[0] - bottom_fixed > top_fixed:
+            parts.insert(0, first_frame[:top_fixed])
+        if bottom_fixed > 0 and last_frame.shape[0] - bottom_fixed > top_fixed:
+            parts.append(last_frame[-bottom_fixed:])
+        if len(parts) == 1:
+            return result
+        width = max(part.shape[1] for part in parts)
+        canvas = StitchCanvas(width, initial_rows=sum(part.shape[0] for part in parts))
+        for part in parts:
+            canvas.append(part)
+        return canvas.array()
+    
+    def _disk_backed_unsupported(self) -> StitchResult:
+        """磁盘画布模式不保留原始帧，无法重新按其他方式拼接"""
+        return StitchResult(
+            success=False,
+            error="磁盘画布模式只支持向下垂直拼接",
+            frame_count=self.get_frame_count()
+        )
     
     def _create_fallback_result(self, error: str = None) -> StitchResult:
         """
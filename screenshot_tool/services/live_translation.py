@@ -0,0 +1,307 @@
+# =====================================================
+# =============== 实时屏幕翻译流水线 ===============
+# =====================================================
+
+"""
+实时屏幕翻译流水线 - 定时翻译模式的增量 OCR + 翻译
+
+Feature: live-screen-translation
+
+每帧的处理：
+1. 缩小为块均值网格，与上一帧比较，没有变化直接跳过（不 OCR、不翻译）
+2. 按行投影把画面切成文本行带（空白行分隔）
+3. 行带内容（量化后）哈希命中缓存时复用识别结果，只对变化的行带调用 OCR
+4. 只翻译没有缓存过的行，未缓存的行合并为一次翻译请求
+
+与线程无关，由 ScreenTranslator 的后台线程调用。
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PySide6.QtGui import QImage
+
+
+# 变化检测：块大小（像素）和块均值变化阈值（灰度级）
+# 块要比笔画小，否则单个字符的变化会被平均掉
+BLOCK_SIZE = 4
+BLOCK_CHANGE_THRESHOLD = 16.0
+
+# 行带检测：行内相邻像素差超过该值视为有笔画
+ROW_INK_THRESHOLD = 24
+# 空白行少于该值时不拆分（避免把一行字的上下部分拆开）
+MIN_BAND_GAP = 3
+# 行带上下各扩展的像素
+BAND_PADDING = 2
+
+# 行带内容哈希的量化步长（吸收抗锯齿和视频噪声）
+BAND_QUANT_STEP = 32
+
+
+def gray_array(image: QImage) -> np.ndarray:
+    """QImage 转 (h, w) uint8 灰度数组"""
+    gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    width, height = gray.width(), gray.height()
+    if width == 0 or height == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    arr = np.array(gray.constBits(), dtype=np.uint8).reshape(height, gray.bytesPerLine())
+    return arr[:, :width].copy()
+
+
+def block_means(gray: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """缩小为块均值网格（float32），用于帧间变化检测"""
+    height, width = gray.shape
+    if height == 0 or width == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+    size = (max(1, width // block_size), max(1, height // block_size))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def frame_changed(previous: Optional[np.ndarray], current: np.ndarray,
+                  threshold: float = BLOCK_CHANGE_THRESHOLD) -> bool:
+    """两帧块均值网格是否有变化"""
+    if previous is None or previous.shape != current.shape:
+        return True
+    if current.size == 0:
+        return False
+    return bool(np.abs(current - previous).max() > threshold)
+
+
+def find_text_bands(gray: np.ndarray,
+                    ink_threshold: int = ROW_INK_THRESHOLD,
+                    min_gap: int = MIN_BAND_GAP,
+                    padding: int = BAND_PADDING) -> List[Tuple[int, int]]:
+    """按行投影找出文本行带
+
+    Returns:
+        [(top, bottom)]，bottom 不含；画面没有空白行时返回整幅图一个行带
+    """
+    height = gray.shape[0]
+    if height == 0 or gray.shape[1] < 2:
+        return []
+
+    diff = np.abs(np.diff(gray.astype(np.int16), axis=1))
+    active = (diff > ink_threshold).any(axis=1)
+    rows = np.flatnonzero(active)
+    if len(rows) == 0:
+        return []
+
+    bands = []
+    start = prev = int(rows[0])
+    for row in rows[1:]:
+        row = int(row)
+        if row - prev > min_gap:
+            bands.append((start, prev + 1))
+            start = row
+        prev = row
+    bands.append((start, prev + 1))
+
+    return [(max(0, top - padding), min(height, bottom + padding)) for top, bottom in bands]
+
+
+def band_key(gray: np.ndarray, top: int, bottom: int,
+             quant_step: int = BAND_QUANT_STEP) -> bytes:
+    """行带内容的哈希（隔行隔列采样并量化）"""
+    sample = gray[top:bottom:2, ::2] // quant_step
+    digest = hashlib.blake2b(sample.tobytes(), digest_size=16)
+    digest.update(np.array(sample.shape, dtype=np.int32).tobytes())
+    return digest.digest()
+
+
+class _LRU(OrderedDict):
+    """固定容量的 LRU 字典"""
+
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def lookup(self, key):
+        if key not in self:
+            return None
+        self.move_to_end(key)
+        return self[key]
+
+    def store(self, key, value) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+@dataclass
+class LiveFrameResult:
+    """单帧处理结果"""
+    changed: bool                   # 原文是否变化（未变化时无需刷新显示）
+    text: str = ""
+    translated: str = ""
+    detected_lang: str = ""
+    success: bool = True
+    error: str = ""
+    ocr_calls: int = 0
+    translate_calls: int = 0
+
+
+@dataclass
+class LivePipelineStats:
+    """累计统计"""
+    frames: int = 0
+    skipped_frames: int = 0         # 画面无变化，完全跳过
+    ocr_calls: int = 0
+    ocr_cache_hits: int = 0
+    translate_calls: int = 0
+    translation_cache_hits: int = 0
+
+
+class LiveTranslationPipeline:
+    """变化感知的 OCR + 翻译流水线
+
+    ocr_callback 接收 QImage 返回识别文本；
+    translate_callback 接收 (text, target_lang, source_lang)
+    返回 (translated_text, detected_lang, success)，与 ScreenTranslator 相同。
+    """
+
+    def __init__(self, ocr_callback: Callable[[QImage], str],
+                 translate_callback: Callable[[str, str, str], tuple],
+                 band_cache_size: int = 256,
+                 translation_cache_size: int = 1024):
+        self._ocr_callback = ocr_callback
+        self._translate_callback = translate_callback
+        self._band_cache = _LRU(band_cache_size)                # {band_key: 文本}
+        self._translation_cache = _LRU(translation_cache_size)  # {(行, 目标, 源): 译文}
+        self._target_lang = "zh"
+        self._source_lang = "auto"
+        self._detected_lang = ""
+        self._last_blocks: Optional[np.ndarray] = None
+        self._last_text: Optional[str] = None
+        self.stats = LivePipelineStats()
+
+    def set_languages(self, target_lang: str, source_lang: str = "auto") -> None:
+        """设置语言，变化时下一帧重新输出"""
+        if (target_lang, source_lang) != (self._target_lang, self._source_lang):
+            self._target_lang = target_lang
+            self._source_lang = source_lang
+            self.reset()
+
+    def reset(self) -> None:
+        """清除帧状态（保留缓存），下一帧完整处理"""
+        self._last_blocks = None
+        self._last_text = None
+
+    def process(self, image: QImage) -> LiveFrameResult:
+        """处理一帧"""
+        self.stats.frames += 1
+        gray = gray_array(image)
+        blocks = block_means(gray)
+        if not frame_changed(self._last_blocks, blocks):
+            self.stats.skipped_frames += 1
+            return LiveFrameResult(changed=False)
+
+        result = LiveFrameResult(changed=True)
+        text = self._recognize(image, gray, result)
+        # 识别完成后才记录这一帧，OCR 抛出异常时下一帧会重试
+        self._last_blocks = blocks
+
+        if text == self._last_text:
+            result.changed = False
+            return result
+
+        result.text = text
+        if text.strip():
+            translated = self._translate_lines(text.split('\n'), result)
+            if translated is None:
+                # 翻译失败不记录原文，下一帧重试
+                self._last_blocks = None
+                return result
+            result.translated = '\n'.join(translated)
+        result.detected_lang = self._detected_lang
+        self._last_text = text
+        return result
+
+    def _recognize(self, image: QImage, gray: np.ndarray, result: LiveFrameResult) -> str:
+        """逐行带识别，未变化的行带使用缓存"""
+        lines = []
+        width = gray.shape[1]
+        for top, bottom in find_text_bands(gray):
+            key = band_key(gray, top, bottom)
+            text = self._band_cache.lookup(key)
+            if text is None:
+                text = self._ocr_callback(image.copy(0, top, width, bottom - top)) or ""
+                text = text.replace('\r\n', '\n').replace('\r', '\n').strip()
+                self._band_cache.store(key, text)
+                result.ocr_calls += 1
+                self.stats.ocr_calls += 1
+            else:
+                self.stats.ocr_cache_hits += 1
+            if text:
+                lines.append(text)
+        return '\n'.join(lines)
+
+    def _translate_lines(self, lines: List[str], result: LiveFrameResult) -> Optional[List[str]]:
+        """翻译各行，只请求未缓存的行
+
+        未缓存的行用换行拼接为一次请求；返回行数对不上时逐行请求。
+
+        Returns:
+            译文行列表，失败返回 None（result 中记录错误）
+        """
+        target, source = self._target_lang, self._source_lang
+        pending = []
+        for line in lines:
+            stripped = line.strip()
+            if (stripped and (stripped, target, source) not in self._translation_cache
+                    and stripped not in pending):
+                pending.append(stripped)
+        self.stats.translation_cache_hits += sum(
+            1 for line in lines if line.strip() and line.strip() not in pending
+        )
+
+        if pending:
+            translations = self._request(pending, result)
+            if translations is None:
+                return None
+            for line, translated in zip(pending, translations):
+                self._translation_cache.store((line, target, source), translated)
+
+        output = []
+        for line in lines:
+            stripped = line.strip()
+            output.append(
+                self._translation_cache.lookup((stripped, target, source)) if stripped else ""
+            )
+        return output
+
+    def _request(self, pending: List[str], result: LiveFrameResult) -> Optional[List[str]]:
+        """请求翻译引擎"""
+        def call(text: str) -> Optional[str]:
+            translated, detected_lang, success = self._translate_callback(
+                text, self._target_lang, self._source_lang
+            )
+            result.translate_calls += 1
+            self.stats.translate_calls += 1
+            if not success:
+                result.success = False
+                result.error = str(translated)
+                return None
+            if detected_lang:
+                self._detected_lang = detected_lang
+            return translated
+
+        batch = call('\n'.join(pending))
+        if batch is None:
+            return None
+        parts = batch.replace('\r\n', '\n').split('\n')
+        if len(parts) == len(pending):
+            return [part.strip() for part in parts]
+
+        # 引擎合并或拆分了行，逐行翻译以保证对应关系
+        translations = []
+        for line in pending:
+            translated = call(line)
+            if translated is None:
+                return None
+            translations.append(translated.strip())
+        return translations
@@ -7,15 +7,22 @@
 
 Feature: installer-incremental-update
 Requirements: 3.1, 3.2, 3.3, 3.4, 4.2, 4.3, 4.5
+
+大文件额外记录内容定义分块（Gear 滚动哈希），补丁版本只需下载变化的块。
+生成清单时并行计算哈希，并按 (路径, 大小, mtime) 缓存结果，未变化的构建目录几乎无需重新读取。
 """
 
 import hashlib
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
 
 
 @dataclass
@@ -44,6 +51,160 @@ class FileEntry:
             raise ValueError("哈希值必须是有效的十六进制字符串")
 
 
+@dataclass
+class ChunkEntry:
+    """文件内容块（按顺序排列，偏移由前面块的大小累加得到）
+
+    Feature: installer-incremental-update
+    """
+    size: int       # 块大小（字节）
+    hash: str       # 块内容 SHA-256
+
+
+def chunk_offsets(chunks: List[ChunkEntry]) -> List[int]:
+    """返回每个块在文件中的起始偏移"""
+    offsets = []
+    offset = 0
+    for chunk in chunks:
+        offsets.append(offset)
+        offset += chunk.size
+    return offsets
+
+
+class ContentChunker:
+    """内容定义分块器（Gear 滚动哈希）
+
+    块边界只取决于边界附近 32 字节的内容，文件中间插入或删除数据后，
+    其余位置的块边界不变，未改动的块哈希也不变。
+
+    哈希按 32 字节窗口计算：h[i] = Σ G[b[i-k]] << k (k = 0..31, mod 2^32)，
+    用 NumPy 对整块数据做 5 次倍增移位累加，不需要逐字节循环。
+    高位全为 0 的位置作为候选边界，再按最小/最大块大小选取。
+    """
+
+    WINDOW = 32
+    READ_BLOCK = 4 * 1024 * 1024
+
+    # Gear 表：由 SHA-256 派生，与平台和 NumPy 版本无关
+    _GEAR = np.array(
+        [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'little') for i in range(256)],
+        dtype=np.uint32
+    )
+
+    def __init__(
+        self,
+        min_size: int = 16 * 1024,
+        avg_size: int = 64 * 1024,
+        max_size: int = 256 * 1024
+    ):
+        """初始化分块器
+
+        Args:
+            min_size: 最小块大小
+            avg_size: 平均块大小（取 2 的幂）
+            max_size: 最大块大小
+        """
+        if not 0 < min_size <= avg_size <= max_size:
+            raise ValueError("块大小必须满足 0 < min_size <= avg_size <= max_size")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        bits = max(1, int(avg_size).bit_length() - 1)
+        # 取高位作为判定位：高位依赖整个窗口的内容
+        self._mask = np.uint32(((1 << bits) - 1) << (32 - bits))
+
+    def _candidates(self, data: np.ndarray, base: int, history: np.ndarray) -> np.ndarray:
+        """返回 data 中候选边界（块结束位置，相对文件开头）
+
+        history 为 data 之前最多 WINDOW-1 个字节，用于延续滚动哈希。
+        """
+        joined = np.concatenate([history, data]) if len(history) else data
+        h = self._GEAR[joined]
+        # 倍增：S_2m[i] = S_m[i] + (S_m[i-m] << m)，log2(WINDOW) 次即得到整个窗口的和
+        span = 1
+        while span < self.WINDOW:
+            h[span:] += h[:-span] << np.uint32(span)
+            span *= 2
+        h = h[len(history):]
+        hits = np.flatnonzero((h & self._mask) == 0)
+        return hits + (base + 1)
+
+    def _select(self, candidates: np.ndarray, total: int) -> List[int]:
+        """按最小/最大块大小从候选边界中选出实际边界"""
+        ends = []
+        start = 0
+        while start < total:
+            if total - start <= self.min_size:
+                end = total
+            else:
+                limit = min(start + self.max_size, total)
+                j = int(np.searchsorted(candidates, start + self.min_size))
+                if j < len(candidates) and candidates[j] <= limit:
+                    end = int(candidates[j])
+                else:
+                    end = limit
+            ends.append(end)
+            start = end
+        return ends
+
+    def boundaries(self, data: bytes) -> List[int]:
+        """返回内存数据的块结束位置列表"""
+        array = np.frombuffer(data, dtype=np.uint8)
+        if len(array) == 0:
+            return []
+        candidates = self._candidates(array, 0, np.empty(0, dtype=np.uint8))
+        return self._select(candidates, len(array))
+
+    def chunk_bytes(self, data: bytes) -> List[ChunkEntry]:
+        """对内存数据分块"""
+        chunks = []
+        start = 0
+        view = memoryview(data)
+        for end in self.boundaries(data):
+            chunks.append(ChunkEntry(
+                size=end - start,
+                hash=hashlib.sha256(view[start:end]).hexdigest()
+            ))
+            start = end
+        return chunks
+
+    def chunk_file(self, file_path: str) -> Tuple[List[ChunkEntry], str]:
+        """对文件分块
+
+        第一遍分段计算候选边界，第二遍按块读取并计算块哈希和整个文件的哈希，
+        内存占用与文件大小无关。
+
+        Returns:
+            (块列表, 文件 SHA-256)
+        """
+        parts = []
+        history = np.empty(0, dtype=np.uint8)
+        total = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(self.READ_BLOCK)
+                if not block:
+                    break
+                data = np.frombuffer(block, dtype=np.uint8)
+                parts.append(self._candidates(data, total, history))
+                history = np.concatenate([history, data])[-(self.WINDOW - 1):]
+                total += len(data)
+
+        candidates = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        ends = self._select(candidates, total)
+
+        chunks = []
+        file_hash = hashlib.sha256()
+        start = 0
+        with open(file_path, 'rb') as f:
+            for end in ends:
+                data = f.read(end - start)
+                file_hash.update(data)
+                chunks.append(ChunkEntry(size=len(data), hash=hashlib.sha256(data).hexdigest()))
+                start = end
+        return chunks, file_hash.hexdigest()
+
+
 @dataclass
 class Manifest:
     """版本清单
@@ -55,6 +216,11 @@ class Manifest:
     build_time: str                     # 构建时间 ISO 8601 格式
     files: List[FileEntry] = field(default_factory=list)
     total_size: int = 0                 # 总大小（字节）
+    chunks: Dict[str, List[ChunkEntry]] = field(default_factory=dict)  # 大文件的分块 {path: [块]}
+    _path_index: Optional[Dict[str, FileEntry]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _index_key: tuple = field(default=(), init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """验证并计算总大小"""
@@ -72,13 +238,23 @@ class Manifest:
             self.total_size = sum(f.size for f in self.files)
     
     def to_dict(self) -> dict:
-        """转换为字典"""
-        return {
+        """转换为字典
+
+        分块信息放在顶层 "chunks" 键中（[大小, 哈希] 列表），
+        旧版本客户端解析 files 时不受影响。
+        """
+        data = {
             "version": self.version,
             "build_time": self.build_time,
             "total_size": self.total_size,
             "files": [asdict(f) for f in self.files]
         }
+        if self.chunks:
+            data["chunks"] = {
+                path: [[c.size, c.hash] for c in chunks]
+                for path, chunks in self.chunks.items()
+            }
+        return data
     
     def to_json(self, indent: int = 2) -> str:
         """序列化为 JSON 字符串
@@ -92,11 +268,16 @@ class Manifest:
     def from_dict(cls, data: dict) -> 'Manifest':
         """从字典创建"""
         files = [FileEntry(**f) for f in data.get("files", [])]
+        chunks = {
+            path: [ChunkEntry(size=size, hash=chunk_hash) for size, chunk_hash in items]
+            for path, items in data.get("chunks", {}).items()
+        }
         return cls(
             version=data["version"],
             build_time=data["build_time"],
             files=files,
-            total_size=data.get("total_size", 0)
+            total_size=data.get("total_size", 0),
+            chunks=chunks
         )
     
     @classmethod
@@ -109,16 +290,24 @@ class Manifest:
         data = json.loads(json_str)
         return cls.from_dict(data)
     
+    def _index(self) -> Dict[str, FileEntry]:
+        """路径 → 条目索引（files 被替换或增删后自动重建，重复路径取第一个）"""
+        key = (id(self.files), len(self.files))
+        if self._path_index is None or self._index_key != key:
+            index = {}
+            for f in self.files:
+                index.setdefault(f.path, f)
+            self._path_index = index
+            self._index_key = key
+        return self._path_index
+    
     def get_file_by_path(self, path: str) -> Optional[FileEntry]:
         """根据路径获取文件条目"""
-        for f in self.files:
-            if f.path == path:
-                return f
-        return None
+        return self._index().get(path)
     
     def get_all_paths(self) -> Set[str]:
         """获取所有文件路径集合"""
-        return {f.path for f in self.files}
+        return set(self._index())
 
 
 
@@ -135,6 +324,7 @@ class DeltaResult:
     unchanged_files: List[str] = field(default_factory=list)        # 未变更的文件路径
     delta_size: int = 0                                             # 增量下载大小
     full_size: int = 0                                              # 完整下载大小
+    chunks: Dict[str, List[ChunkEntry]] = field(default_factory=dict)  # 可按块打补丁的修改文件 {path: 远程块}
     
     def __post_init__(self):
         """计算增量大小"""
@@ -155,6 +345,135 @@ class DeltaResult:
         return self.added_files + self.modified_files
 
 
+class FileHashCache:
+    """文件哈希缓存
+
+    以 (相对路径, 大小, mtime_ns) 为键保存 SHA-256 和分块列表，存为 JSON 文件。
+    mtime 距扫描开始不足 RACY_WINDOW_NS 的文件不写入缓存：
+    同一时间精度内再次修改且大小不变时，mtime 无法区分。
+
+    Feature: installer-incremental-update
+    """
+
+    FORMAT_VERSION = 1
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, cache_path: Optional[str] = None, chunker: Optional[ContentChunker] = None):
+        """初始化缓存
+
+        Args:
+            cache_path: 缓存文件路径，None 时只在内存中缓存
+            chunker: 分块器，参数变化时缓存中的分块失效；
+                None 时（只需要哈希，如安装完整性校验）保留已有的分块和分块参数，
+                与 ManifestGenerator 共用同一缓存文件不会使分块失效
+        """
+        self._cache_path = cache_path
+        self._chunker_key = (
+            [chunker.min_size, chunker.avg_size, chunker.max_size] if chunker else None
+        )
+        self._entries: Dict[str, list] = {}
+        self._scan_start_ns = time.time_ns()
+        self._load()
+
+    def _load(self) -> None:
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.FORMAT_VERSION:
+            return
+        entries = data.get("entries", {})
+        if self._chunker_key is None:
+            # 未指定分块器：沿用文件中的分块参数，保存时原样写回
+            self._chunker_key = data.get("chunker")
+        elif data.get("chunker") != self._chunker_key:
+            # 分块参数变化：哈希仍然有效，分块丢弃
+            entries = {k: v[:3] + [None] for k, v in entries.items()}
+        self._entries = entries
+
+    def get(
+        self, rel_path: str, stat: os.stat_result, need_chunks: bool = False
+    ) -> Optional[Tuple[str, Optional[List[ChunkEntry]]]]:
+        """查询缓存
+
+        Returns:
+            (哈希, 分块列表或 None)，未命中返回 None
+        """
+        entry = self._entries.get(rel_path)
+        if not entry or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return None
+        if need_chunks and entry[3] is None:
+            return None
+        chunks = None
+        if entry[3] is not None:
+            chunks = [ChunkEntry(size=size, hash=chunk_hash) for size, chunk_hash in entry[3]]
+        return entry[2], chunks
+
+    def put(
+        self, rel_path: str, stat: os.stat_result, file_hash: str,
+        chunks: Optional[List[ChunkEntry]] = None
+    ) -> None:
+        """写入缓存"""
+        if stat.st_mtime_ns >= self._scan_start_ns - self.RACY_WINDOW_NS:
+            self._entries.pop(rel_path, None)
+            return
+        self._entries[rel_path] = [
+            stat.st_size, stat.st_mtime_ns, file_hash,
+            [[c.size, c.hash] for c in chunks] if chunks is not None else None
+        ]
+
+    def save(self, keep: Optional[Iterable[str]] = None) -> None:
+        """保存缓存文件
+
+        Args:
+            keep: 只保留这些路径（去掉已删除文件的条目）
+        """
+        if not self._cache_path:
+            return
+        entries = self._entries
+        if keep is not None:
+            entries = {path: entries[path] for path in keep if path in entries}
+        data = {
+            "version": self.FORMAT_VERSION,
+            "chunker": self._chunker_key,
+            "entries": entries
+        }
+        temp_path = self._cache_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self._cache_path)
+
+
+def default_hash_workers() -> int:
+    """并行哈希的默认线程数（hashlib 处理大块数据时释放 GIL）"""
+    return min(8, os.cpu_count() or 1)
+
+
+def hash_files_parallel(
+    jobs: Dict[str, Callable[[], object]], max_workers: Optional[int] = None
+) -> Dict[str, object]:
+    """在线程池中执行哈希任务
+
+    Args:
+        jobs: {键: 无参函数}
+        max_workers: 线程数，默认 default_hash_workers()
+
+    Returns:
+        {键: 函数返回值}
+    """
+    if not jobs:
+        return {}
+    workers = max(1, min(max_workers or default_hash_workers(), len(jobs)))
+    if workers == 1:
+        return {key: job() for key, job in jobs.items()}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='manifest_hash') as pool:
+        futures = {key: pool.submit(job) for key, job in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
 class ManifestGenerator:
     """清单生成器 - 构建时生成文件清单
     
@@ -173,6 +492,23 @@ class ManifestGenerator:
         '.DS_Store',
     }
     
+    # 不小于该大小的文件记录分块
+    CHUNKED_FILE_MIN_SIZE = 1024 * 1024
+    
+    def __init__(
+        self,
+        chunker: Optional[ContentChunker] = None,
+        max_workers: Optional[int] = None
+    ):
+        """初始化清单生成器
+
+        Args:
+            chunker: 分块器，默认使用 ContentChunker()
+            max_workers: 并行哈希线程数，默认 default_hash_workers()
+        """
+        self._chunker = chunker or ContentChunker()
+        self._max_workers = max_workers
+    
     @staticmethod
     def calculate_file_hash(file_path: str) -> str:
         """计算文件 SHA-256 哈希
@@ -185,8 +521,8 @@ class ManifestGenerator:
         """
         sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            # 分块读取，避免大文件内存问题
-            for chunk in iter(lambda: f.read(8192), b''):
+            # 分块读取，避免大文件内存问题；块足够大时 hashlib 释放 GIL，可并行
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
                 sha256.update(chunk)
         return sha256.hexdigest()
     
@@ -197,12 +533,17 @@ class ManifestGenerator:
                 return True
         return False
     
-    def generate(self, source_dir: str, version: str) -> Manifest:
+    def generate(
+        self, source_dir: str, version: str, cache_path: Optional[str] = None
+    ) -> Manifest:
         """扫描目录生成清单
+
+        未命中缓存的文件在线程池中并行计算哈希（大文件同时分块）。
         
         Args:
             source_dir: 源目录路径
             version: 版本号
+            cache_path: 哈希缓存文件路径，None 表示不使用持久缓存
             
         Returns:
             Manifest 对象
@@ -214,7 +555,10 @@ class ManifestGenerator:
         if not source_path.exists():
             raise FileNotFoundError(f"源目录不存在: {source_dir}")
         
-        files = []
+        cache = FileHashCache(cache_path, self._chunker)
+        stats = {}
+        results = {}
+        jobs = {}
         
         for file_path in source_path.rglob('*'):
             if file_path.is_file():
@@ -225,26 +569,56 @@ class ManifestGenerator:
                 if self._should_ignore(rel_path):
                     continue
                 
-                file_size = file_path.stat().st_size
-                file_hash = self.calculate_file_hash(str(file_path))
-                
-                files.append(FileEntry(
-                    path=rel_path,
-                    size=file_size,
-                    hash=file_hash
-                ))
+                stat = file_path.stat()
+                stats[rel_path] = stat
+                chunked = stat.st_size >= self.CHUNKED_FILE_MIN_SIZE
+                cached = cache.get(rel_path, stat, need_chunks=chunked)
+                if cached is not None:
+                    results[rel_path] = cached
+                elif chunked:
+                    # 分块时顺带计算整个文件的哈希
+                    jobs[rel_path] = self._chunk_job(str(file_path))
+                else:
+                    jobs[rel_path] = self._hash_job(str(file_path))
+        
+        for rel_path, result in hash_files_parallel(jobs, self._max_workers).items():
+            results[rel_path] = result
+            cache.put(rel_path, stats[rel_path], *result)
+        cache.save(keep=stats)
+        
+        files = []
+        chunks = {}
+        for rel_path, (file_hash, file_chunks) in results.items():
+            files.append(FileEntry(
+                path=rel_path,
+                size=stats[rel_path].st_size,
+                hash=file_hash
+            ))
+            if stats[rel_path].st_size >= self.CHUNKED_FILE_MIN_SIZE:
+                chunks[rel_path] = file_chunks
         
         # 按路径排序，保证一致性
         files.sort(key=lambda f: f.path)
+        chunks = {f.path: chunks[f.path] for f in files if f.path in chunks}
         
         build_time = datetime.now(timezone.utc).isoformat()
         
         return Manifest(
             version=version,
             build_time=build_time,
-            files=files
+            files=files,
+            chunks=chunks
         )
     
+    def _hash_job(self, file_path: str) -> Callable[[], Tuple[str, None]]:
+        return lambda: (self.calculate_file_hash(file_path), None)
+    
+    def _chunk_job(self, file_path: str) -> Callable[[], Tuple[str, List[ChunkEntry]]]:
+        def job():
+            file_chunks, file_hash = self._chunker.chunk_file(file_path)
+            return file_hash, file_chunks
+        return job
+    
     def save(self, manifest: Manifest, output_path: str) -> None:
         """保存清单为 JSON 文件
         
@@ -295,6 +669,8 @@ class DeltaCalculator:
         modified_files = []
         deleted_files = []
         unchanged_files = []
+        patch_chunks = {}
+        patch_savings = 0
         
         # 检查远程文件
         for remote_file in remote.files:
@@ -306,6 +682,12 @@ class DeltaCalculator:
             elif local_file.hash != remote_file.hash:
                 # 修改的文件
                 modified_files.append(remote_file)
+                remote_chunks = remote.chunks.get(remote_file.path)
+                if remote_chunks:
+                    # 可按块打补丁：本地已有的块不需要下载
+                    patch_chunks[remote_file.path] = remote_chunks
+                    local_hashes = {c.hash for c in local.chunks.get(remote_file.path, [])}
+                    patch_savings += sum(c.size for c in remote_chunks if c.hash in local_hashes)
             else:
                 # 未变更
                 unchanged_files.append(remote_file.path)
@@ -315,12 +697,20 @@ class DeltaCalculator:
             if path not in remote_paths:
                 deleted_files.append(path)
         
+        delta_size = (
+            sum(f.size for f in added_files) +
+            sum(f.size for f in modified_files) -
+            patch_savings
+        )
+        
         return DeltaResult(
             added_files=added_files,
             modified_files=modified_files,
             deleted_files=deleted_files,
             unchanged_files=unchanged_files,
-            full_size=remote.total_size
+            delta_size=delta_size,
+            full_size=remote.total_size,
+            chunks=patch_chunks
         )
     
     def should_use_delta(self, delta: DeltaResult, threshold: float = 0.5) -> bool:
@@ -0,0 +1,274 @@
+# =====================================================
+# =============== OCR 磁盘缓存 ===============
+# =====================================================
+
+"""
+OCR 磁盘缓存 - 跨进程重启复用 OCR 结果
+
+Feature: ocr-disk-cache
+
+特性：
+- SQLite 存储，键为 引擎 + 预处理配置指纹 + 图片全像素摘要
+- 按字节上限做 LRU 淘汰（last_access 索引 + 窗口函数一次删除）
+- 只缓存成功的结果；失败（网络错误、引擎异常）不落盘
+- 每个线程使用独立连接（与 SQLiteHistoryStorage 相同）
+
+RapidOCRService.recognize_image 与 OCRManager.recognize 在调用引擎前查询。
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Optional
+
+from screenshot_tool.core.async_logger import async_debug_log
+
+
+def ocr_cache_log(message: str):
+    """OCR 磁盘缓存日志"""
+    async_debug_log(message, "OCR-CACHE")
+
+
+def build_ocr_cache_key(image_digest: str, engine: str, config: Any = None) -> str:
+    """构造缓存键
+
+    Args:
+        image_digest: 图片全像素摘要（见 rapid_ocr_service._compute_image_hash）
+        engine: 引擎名称（rapid / tencent / baidu）
+        config: 影响识别结果的配置（dataclass，如 PreprocessingConfig），可为 None
+
+    Returns:
+        缓存键字符串
+    """
+    if config is None:
+        fingerprint = "-"
+    else:
+        if dataclasses.is_dataclass(config):
+            config = dataclasses.asdict(config)
+        encoded = json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+        fingerprint = hashlib.blake2b(encoded, digest_size=8).hexdigest()
+    return f"{engine}:{fingerprint}:{image_digest}"
+
+
+class OCRDiskCache:
+    """OCR 结果磁盘缓存
+
+    Feature: ocr-disk-cache
+    """
+
+    DB_FILE = "ocr_cache.db"
+
+    # 默认容量上限（字节，按结果 JSON 长度计）
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, data_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """初始化磁盘缓存
+
+        Args:
+            data_dir: 数据目录
+            max_bytes: 容量上限，超出后淘汰最久未访问的结果
+        """
+        self._db_path = os.path.join(data_dir, self.DB_FILE)
+        self._max_bytes = max_bytes
+        self._local = threading.local()
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        with self._get_cursor() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ocr_results (
+                    cache_key TEXT PRIMARY KEY,
+                    engine TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ocr_last_access
+                ON ocr_results(last_access)
+            ''')
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        if getattr(self._local, 'connection', None) is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = conn
+        return self._local.connection
+
+    @contextmanager
+    def _get_cursor(self) -> Generator[sqlite3.Cursor, None, None]:
+        """获取游标，退出时提交，异常时回滚"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存结果并更新访问时间
+
+        Args:
+            cache_key: build_ocr_cache_key 构造的键
+
+        Returns:
+            结果字典，未命中或读取失败时返回 None
+        """
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    'SELECT payload FROM ocr_results WHERE cache_key = ?',
+                    (cache_key,)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                cursor.execute(
+                    'UPDATE ocr_results SET last_access = ? WHERE cache_key = ?',
+                    (time.time(), cache_key)
+                )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            ocr_cache_log(f"读取 OCR 磁盘缓存失败: {e}")
+            return None
+
+    def put(self, cache_key: str, engine: str, payload: Dict[str, Any]) -> bool:
+        """写入结果，超出容量上限时淘汰最久未访问的结果
+
+        Args:
+            cache_key: build_ocr_cache_key 构造的键
+            engine: 引擎名称
+            payload: 可 JSON 序列化的结果字典
+
+        Returns:
+            是否写入成功
+        """
+        try:
+            data = json.dumps(payload, ensure_ascii=False)
+            size = len(data.encode("utf-8"))
+            if size > self._max_bytes:
+                return False
+            with self._get_cursor() as cursor:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO ocr_results
+                        (cache_key, engine, payload, size, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (cache_key, engine, data, size, time.time()))
+                self._evict(cursor)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            ocr_cache_log(f"写入 OCR 磁盘缓存失败: {e}")
+            return False
+
+    def _evict(self, cursor: sqlite3.Cursor) -> None:
+        """按访问时间从新到旧累加大小，删除超出上限的部分"""
+        cursor.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_results')
+        if cursor.fetchone()[0] <= self._max_bytes:
+            return
+        cursor.execute('''
+            DELETE FROM ocr_results WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key, SUM(size) OVER (
+                        ORDER BY last_access DESC, cache_key DESC
+                    ) AS running
+                    FROM ocr_results
+                ) WHERE running > ?
+            )
+        ''', (self._max_bytes,))
+        ocr_cache_log(f"OCR 磁盘缓存淘汰 {cursor.rowcount} 条")
+
+    def count(self) -> int:
+        """缓存条目数"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM ocr_results')
+                return cursor.fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def total_bytes(self) -> int:
+        """缓存结果总字节数"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_results')
+                return cursor.fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self) -> None:
+        """清空缓存"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('DELETE FROM ocr_results')
+        except sqlite3.Error as e:
+            ocr_cache_log(f"清空 OCR 磁盘缓存失败: {e}")
+
+    def close(self) -> None:
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            self._local.connection = None
+
+
+# 全局单例实例
+_cache_instance: Optional[OCRDiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ocr_disk_cache(data_dir: Optional[str] = None) -> Optional[OCRDiskCache]:
+    """获取 OCR 磁盘缓存单例
+
+    Args:
+        data_dir: 数据目录，仅在首次调用时有效，默认为用户数据目录
+
+    Returns:
+        OCRDiskCache 实例，数据库无法打开时返回 None（不影响识别）
+    """
+    global _cache_instance
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                if data_dir is None:
+                    from screenshot_tool.core.config_manager import get_user_data_dir
+                    data_dir = get_user_data_dir()
+                try:
+                    _cache_instance = OCRDiskCache(data_dir)
+                except (OSError, sqlite3.Error) as e:
+                    ocr_cache_log(f"OCR 磁盘缓存不可用: {e}")
+                    return None
+
+    return _cache_instance
+
+
+def reset_ocr_disk_cache() -> None:
+    """重置 OCR 磁盘缓存单例
+
+    主要用于测试。
+    """
+    global _cache_instance
+
+    with _cache_lock:
+        if _cache_instance is not None:
+            _cache_instance.close()
+            _cache_instance = None
@@ -14,10 +14,13 @@ OCR管理器 - 统一管理多个OCR引擎
 优化功能：
 - 图像预处理：CLAHE 对比度增强、锐化滤波、自适应二值化
 - OpenVINO 后端：支持 Intel 和 AMD CPU
+- 磁盘缓存：云端引擎的成功结果按图片摘要持久化，重复识别不再消耗 API 配额
+  （本地OCR由 RapidOCRService 自行查询磁盘缓存）
+- 批量识别：recognize_batch 并行识别多张图片（本地OCR），用于历史回填
 """
 
-from dataclasses import dataclass
-from typing import Optional, List, Dict
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import time
 
 from PySide6.QtGui import QImage
@@ -29,6 +32,7 @@ from screenshot_tool.core.async_logger import async_debug_log
 # ========== 预处理配置 ==========
 from screenshot_tool.services.image_preprocessor import PreprocessingConfig
 from screenshot_tool.services.backend_selector import BackendType, BackendInfo
+from screenshot_tool.services.ocr_disk_cache import build_ocr_cache_key, get_ocr_disk_cache
 
 def ocr_manager_log(message: str):
     """OCR管理器日志"""
@@ -199,9 +203,9 @@ class OCRManager:
         # 指定引擎时，使用该引擎（包含完整降级逻辑）
         if force_engine:
             if force_engine == "tencent":
-                return self._recognize_tencent_with_fallback(image)
+                return self._recognize_cached(image, "tencent", self._recognize_tencent_with_fallback)
             elif force_engine == "baidu":
-                return self._recognize_baidu(image)
+                return self._recognize_cached(image, "baidu", self._recognize_baidu)
             elif force_engine == "rapid":
                 return self._recognize_rapid(image)
             else:
@@ -210,6 +214,37 @@ class OCRManager:
         # 默认使用 RapidOCR
         return self._recognize_rapid(image)
     
+    def _recognize_cached(self, image, engine: str, recognize) -> UnifiedOCRResult:
+        """先查询磁盘缓存，未命中时调用引擎并缓存成功结果
+        
+        Feature: ocr-disk-cache
+        
+        Args:
+            image: QImage（ndarray 不缓存，直接识别）
+            engine: 引擎名称，作为缓存键的一部分
+            recognize: 实际识别函数
+        """
+        disk_cache = get_ocr_disk_cache() if isinstance(image, QImage) else None
+        cache_key = None
+        if disk_cache is not None:
+            from screenshot_tool.services.rapid_ocr_service import _compute_image_hash
+            image_digest = _compute_image_hash(image)
+            if image_digest:
+                cache_key = build_ocr_cache_key(image_digest, engine)
+                data = disk_cache.get(cache_key)
+                if data is not None:
+                    try:
+                        result = UnifiedOCRResult(**data)
+                        ocr_manager_log(f"{ENGINE_DISPLAY_NAMES.get(engine, engine)} 命中磁盘缓存")
+                        return result
+                    except TypeError as e:
+                        ocr_manager_log(f"磁盘缓存条目损坏: {e}")
+        
+        result = recognize(image)
+        if result.success and cache_key is not None:
+            disk_cache.put(cache_key, engine, asdict(result))
+        return result
+    
     def _recognize_tencent_with_fallback(self, image: QImage) -> UnifiedOCRResult:
         """使用腾讯OCR识别（高精度版 -> 通用版降级）
         
@@ -238,9 +273,9 @@ class OCRManager:
         
         try:
             if engine == "baidu":
-                return self._recognize_baidu(image)
+                return self._recognize_cached(image, "baidu", self._recognize_baidu)
             elif engine == "tencent":
-                return self._recognize_tencent(image)
+                return self._recognize_cached(image, "tencent", self._recognize_tencent)
             elif engine == "rapid":
                 return self._recognize_rapid(image)
             else:
@@ -309,28 +344,7 @@ class OCRManager:
         try:
             service = self._get_rapid_service()
             result = service.recognize_image(image)
-            
-            # 优先使用 OCRResult 中存储的实际 OCR 处理耗时（毫秒转秒）
-            # 当 rapid_ocr_service 内部缓存命中时，外部测量的时间只是缓存查找时间（≈0），
-            # 而 OCRResult.elapsed_time_ms 保存了原始 OCR 处理的真实耗时
-            if hasattr(result, 'elapsed_time_ms') and result.elapsed_time_ms > 0:
-                elapsed = result.elapsed_time_ms / 1000.0
-            else:
-                elapsed = time.perf_counter() - start_time
-            
-            if result.success:
-                ocr_manager_log(f"本地OCR成功，文本长度: {len(result.text)}，平均分: {result.average_score:.2f}，耗时: {elapsed:.2f}秒")
-                return UnifiedOCRResult(
-                    success=True, 
-                    text=result.text, 
-                    engine="rapid",
-                    average_score=result.average_score,
-                    backend_detail=result.backend_detail or "",
-                    elapsed_time=elapsed
-                )
-            else:
-                ocr_manager_log(f"本地OCR失败: {result.error}，耗时: {elapsed:.2f}秒")
-                return UnifiedOCRResult.error_result(result.error or "本地OCR失败", "rapid")
+            return self._convert_rapid_result(result, start_time)
         except ImportError as e:
             ocr_manager_log(f"本地OCR未安装: {e}")
             return UnifiedOCRResult.error_result("本地OCR未安装，请运行: pip install rapidocr-openvino", "rapid")
@@ -339,6 +353,60 @@ class OCRManager:
             ocr_manager_log(f"本地OCR异常: {e}，耗时: {elapsed:.2f}秒")
             return UnifiedOCRResult.error_result(str(e), "rapid")
     
+    @staticmethod
+    def _convert_rapid_result(result, start_time: float) -> UnifiedOCRResult:
+        """将 RapidOCR 的 OCRResult 转换为 UnifiedOCRResult"""
+        # 优先使用 OCRResult 中存储的实际 OCR 处理耗时（毫秒转秒）
+        # 当 rapid_ocr_service 内部缓存命中时，外部测量的时间只是缓存查找时间（≈0），
+        # 而 OCRResult.elapsed_time_ms 保存了原始 OCR 处理的真实耗时
+        if hasattr(result, 'elapsed_time_ms') and result.elapsed_time_ms > 0:
+            elapsed = result.elapsed_time_ms / 1000.0
+        else:
+            elapsed = time.perf_counter() - start_time
+        
+        if result.success:
+            ocr_manager_log(f"本地OCR成功，文本长度: {len(result.text)}，平均分: {result.average_score:.2f}，耗时: {elapsed:.2f}秒")
+            return UnifiedOCRResult(
+                success=True, 
+                text=result.text, 
+                engine="rapid",
+                average_score=result.average_score,
+                backend_detail=result.backend_detail or "",
+                elapsed_time=elapsed
+            )
+        else:
+            ocr_manager_log(f"本地OCR失败: {result.error}，耗时: {elapsed:.2f}秒")
+            return UnifiedOCRResult.error_result(result.error or "本地OCR失败", "rapid")
+    
+    def recognize_batch(
+        self,
+        images: Iterable[Union[QImage, str]],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[int, UnifiedOCRResult]]:
+        """使用本地OCR批量识别（用于历史回填，不消耗在线API配额）
+        
+        Feature: ocr-batch
+        
+        Args:
+            images: QImage 或图片文件路径
+            max_workers: 并行数，默认按 CPU 核心数
+            
+        Yields:
+            (输入序号, UnifiedOCRResult)，按完成顺序
+        """
+        start_time = time.perf_counter()
+        try:
+            service = self._get_rapid_service()
+        except ImportError as e:
+            ocr_manager_log(f"本地OCR未安装: {e}")
+            error = UnifiedOCRResult.error_result("本地OCR未安装，请运行: pip install rapidocr-openvino", "rapid")
+            for index, _ in enumerate(images):
+                yield index, error
+            return
+        
+        for index, result in service.recognize_batch(images, max_workers):
+            yield index, self._convert_rapid_result(result, start_time)
+    
     def has_baidu_configured(self) -> bool:
         """检查百度OCR是否已配置"""
         return self._baidu_service is not None
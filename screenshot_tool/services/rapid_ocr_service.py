@@ -14,19 +14,29 @@ Requirements:
 优化功能：
 - 图像预处理：CLAHE 对比度增强、锐化滤波、自适应二值化
 - OpenVINO 优化：Performance Hints、模型缓存
+- 结果缓存：全像素摘要 + 可选感知哈希，O(1) LRU + TTL 淘汰
+- 磁盘缓存：成功结果持久化到 SQLite，重启后重复识别直接返回
+- 分块识别：超高/超大图片按重叠条带识别，峰值内存由条带大小决定
+- 批量识别：recognize_batch 使用引擎池并行识别，结果按完成顺序流式返回
 """
 
+import hashlib
+import os
 import time
 import threading
 import traceback
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QImage
 
 # ========== 异步调试日志 ==========
 from screenshot_tool.core.async_logger import async_debug_log
+from screenshot_tool.core.performance_monitor import PerformanceMonitor
 
 # ========== 预处理和后端选择 ==========
 from screenshot_tool.services.image_preprocessor import (
@@ -40,6 +50,18 @@ from screenshot_tool.services.backend_selector import (
     BackendInfo,
     get_backend_display_string as _get_backend_display_string,
 )
+from screenshot_tool.services.ocr_disk_cache import (
+    build_ocr_cache_key,
+    get_ocr_disk_cache,
+)
+
+# xxHash 可选：比 BLAKE2b 快一个数量级，未安装时回退到 hashlib
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
 
 
 def rapid_debug_log(message: str):
@@ -59,11 +81,22 @@ _global_backend_type: Optional[BackendType] = None
 # Bug fix (2026-01-23): 修复多个 OCR 任务同时运行导致内存暴涨的问题
 # 使用图片哈希作为唯一标识，避免同一张图片被多次 OCR
 _ocr_processing_lock = threading.Lock()  # 保护 _ocr_processing 和 _ocr_cache
-_ocr_processing: dict = {}  # 正在处理的图片哈希 -> threading.Event
-_ocr_cache: dict = {}  # 图片哈希 -> (OCRResult, timestamp)
-_OCR_CACHE_MAX_SIZE = 10  # 最多缓存 10 个结果
+_ocr_processing: dict = {}  # 正在处理的图片摘要 -> threading.Event
+_OCR_CACHE_MAX_SIZE = 32  # 最多缓存 32 个结果
 _OCR_CACHE_TTL_SECONDS = 60  # 缓存有效期 60 秒
 
+# 感知哈希层（默认关闭）：相同尺寸且 dHash 汉明距离不超过阈值的图片复用结果。
+# 近似图片的文字可能不同（如只改了一个数字），只适合重复截取同一画面的场景。
+_OCR_CACHE_PERCEPTUAL_MAX_DISTANCE = 2
+
+# PerformanceMonitor 计数器名称
+OCR_CACHE_HIT_COUNTER = "ocr_cache_hit"
+OCR_CACHE_PERCEPTUAL_HIT_COUNTER = "ocr_cache_perceptual_hit"
+OCR_CACHE_MISS_COUNTER = "ocr_cache_miss"
+OCR_CACHE_EVICT_COUNTER = "ocr_cache_evict"
+OCR_DISK_CACHE_HIT_COUNTER = "ocr_disk_cache_hit"
+OCR_DISK_CACHE_MISS_COUNTER = "ocr_disk_cache_miss"
+
 
 # ========== 模块隔离层 ==========
 import sys
@@ -299,78 +332,346 @@ def warmup_ocr_engine() -> bool:
         return False
 
 
-def _compute_image_hash(image: 'QImage') -> int:
-    """计算图片哈希值，用于 OCR 请求去重
+# ========== 批量识别引擎池 ==========
+# Feature: ocr-batch
+#
+# 单个 RapidOCR 实例的推理由 _global_ocr_infer_lock 串行化。批量回填历史时，
+# 每个工作线程从引擎池借用一个独立实例，推理可以在多个 CPU 核心上并行。
+# 第一个引擎就是全局实例（仍使用全局推理锁），其余实例按需创建。
+
+# 批量识别默认最多使用的引擎数（每个 OpenVINO 实例约占用 100MB+ 内存）
+_BATCH_MAX_DEFAULT_WORKERS = 4
+
+# 当前线程借用的引擎 (ocr_instance, error_message, infer_lock)
+_thread_engine = threading.local()
+
+
+def default_batch_workers() -> int:
+    """批量识别的默认并行数：CPU 核心数的一半，最多 _BATCH_MAX_DEFAULT_WORKERS"""
+    return max(1, min(_BATCH_MAX_DEFAULT_WORKERS, (os.cpu_count() or 2) // 2))
+
+
+class _OCREnginePool:
+    """RapidOCR 引擎池
+    
+    Feature: ocr-batch
+    """
     
-    使用图片尺寸 + 采样像素点计算快速哈希，
-    避免对整个图片数据进行哈希计算。
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._idle: List[Tuple] = []
+        self._size = 0
+    
+    def acquire(self, max_size: int) -> Tuple:
+        """借用一个引擎，池中引擎数未达到 max_size 时按需创建
+        
+        Returns:
+            (ocr_instance, error_message, infer_lock)
+        """
+        with self._cond:
+            while not self._idle and self._size >= max_size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+            is_primary = self._size == 1
+        
+        ocr, error = get_global_ocr()
+        if is_primary or ocr is None:
+            return ocr, error, _global_ocr_infer_lock
+        
+        extra, extra_error, _ = _create_ocr_instance_with_backend()
+        if extra is None:
+            # 创建失败时共享全局实例（仍由全局推理锁串行化）
+            rapid_debug_log(f"[OCR批量] 创建额外引擎失败，共享全局实例: {extra_error}")
+            return ocr, error, _global_ocr_infer_lock
+        rapid_debug_log(f"[OCR批量] 已创建第 {self._size} 个引擎")
+        return extra, None, threading.Lock()
+    
+    def release(self, engine: Tuple) -> None:
+        """归还引擎"""
+        with self._cond:
+            self._idle.append(engine)
+            self._cond.notify()
+    
+    def clear(self) -> None:
+        """释放空闲引擎（正在使用的引擎归还后仍会复用）"""
+        with self._cond:
+            self._size -= len(self._idle)
+            self._idle.clear()
+
+
+_engine_pool = _OCREnginePool()
+
+
+def release_ocr_engine_pool() -> None:
+    """释放批量识别创建的空闲引擎
+    
+    Feature: ocr-batch
+    """
+    _engine_pool.clear()
+
+
+def _get_thread_ocr() -> Tuple:
+    """获取当前线程应使用的 OCR 引擎
+    
+    批量识别的工作线程使用借用的引擎，其他线程使用全局实例。
+    
+    Returns:
+        (ocr_instance, error_message, infer_lock)
+    """
+    engine = getattr(_thread_engine, "engine", None)
+    if engine is not None:
+        return engine
+    ocr, error = get_global_ocr()
+    return ocr, error, _global_ocr_infer_lock
+
+
+def _compute_image_hash(image: 'QImage') -> str:
+    """计算图片全像素摘要，用于 OCR 请求去重和结果缓存
+    
+    对尺寸、像素格式和全部像素数据计算 xxh3-128（未安装 xxhash 时为 BLAKE2b）摘要，
+    不同截图不会因采样点相同而碰撞。行尾对齐填充不参与计算。
     
     Args:
         image: QImage 对象
         
     Returns:
-        int: 图片哈希值
+        str: 十六进制摘要，空图片返回空字符串
     """
     if image is None or image.isNull():
-        return 0
+        return ""
     
     w, h = image.width(), image.height()
     if w == 0 or h == 0:
-        return 0
-    
-    # 采样 5 个点的像素值
-    sample_points = [
-        (0, 0),                    # 左上
-        (w - 1, 0),                # 右上
-        (0, h - 1),                # 左下
-        (w - 1, h - 1),            # 右下
-        (w // 2, h // 2),          # 中心
-    ]
-    pixels = tuple(image.pixel(x, y) for x, y in sample_points)
-    return hash((w, h) + pixels)
+        return ""
+    
+    if XXHASH_AVAILABLE:
+        digest = xxhash.xxh3_128()
+    else:
+        digest = hashlib.blake2b(digest_size=16, person=b"ocr")
+    digest.update(f"{w}x{h}:{image.format().value}:".encode("ascii"))
+    
+    bytes_per_line = image.bytesPerLine()
+    row_bytes = (w * image.depth() + 7) // 8
+    # 保持 image 引用期间使用 constBits，避免视图悬空
+    data = memoryview(image.constBits())
+    if row_bytes == bytes_per_line:
+        digest.update(data[:bytes_per_line * h])
+    else:
+        for y in range(h):
+            offset = y * bytes_per_line
+            digest.update(data[offset:offset + row_bytes])
+    return digest.hexdigest()
+
+
+def _compute_perceptual_hash(image: 'QImage') -> Optional[int]:
+    """计算图片的 64 位差值哈希（dHash）
+    
+    缩小到 9x8 灰度图，逐行比较相邻像素亮度，对轻微的抗锯齿、
+    压缩噪声不敏感。
+    
+    Args:
+        image: QImage 对象
+        
+    Returns:
+        64 位整数哈希，空图片返回 None
+    """
+    if image is None or image.isNull():
+        return None
+    
+    small = image.scaled(
+        9, 8,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    ).convertToFormat(QImage.Format.Format_Grayscale8)
+    gray = np.frombuffer(small.constBits(), dtype=np.uint8).reshape(
+        8, small.bytesPerLine()
+    )[:, :9].astype(np.int16)
+    bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+@dataclass
+class _OCRCacheEntry:
+    """OCR 结果缓存条目"""
+    result: "OCRResult"
+    timestamp: float
+    perceptual_key: Optional[Tuple[int, int, int]] = None  # (宽, 高, dHash)
+
+
+class OCRResultCache:
+    """OCR 结果缓存（LRU + TTL）
+    
+    Feature: ocr-result-cache
+    
+    - 精确层：全像素摘要 -> 结果，OrderedDict 实现 O(1) 查找、更新和淘汰
+    - 感知层（可选）：精确层未命中时，在相同尺寸的条目中查找 dHash
+      汉明距离不超过阈值的结果
+    - 命中/未命中/淘汰次数记录到 PerformanceMonitor 计数器
+    
+    非线程安全，由调用方加锁（见 _ocr_processing_lock）。
+    """
+    
+    def __init__(
+        self,
+        max_size: int = _OCR_CACHE_MAX_SIZE,
+        ttl_seconds: float = _OCR_CACHE_TTL_SECONDS,
+        clock=time.monotonic,
+    ):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, _OCRCacheEntry]" = OrderedDict()
+        self.perceptual_enabled = False
+        self.perceptual_max_distance = _OCR_CACHE_PERCEPTUAL_MAX_DISTANCE
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, image_hash: str) -> bool:
+        return image_hash in self._entries
+    
+    def get(
+        self,
+        image_hash: str,
+        perceptual_key: Optional[Tuple[int, int, int]] = None,
+    ) -> Optional["OCRResult"]:
+        """查找缓存结果，命中时标记为最近使用
+        
+        Args:
+            image_hash: 全像素摘要
+            perceptual_key: (宽, 高, dHash)，启用感知层时用于近似匹配
+            
+        Returns:
+            OCRResult 或 None（未命中或已过期）
+        """
+        now = self._clock()
+        entry = self._entries.get(image_hash)
+        if entry is not None:
+            if now - entry.timestamp < self._ttl_seconds:
+                self._entries.move_to_end(image_hash)
+                PerformanceMonitor.increment(OCR_CACHE_HIT_COUNTER)
+                return entry.result
+            del self._entries[image_hash]
+        
+        if self.perceptual_enabled and perceptual_key is not None:
+            matched = self._find_perceptual(perceptual_key, now)
+            if matched is not None:
+                self._entries.move_to_end(matched)
+                PerformanceMonitor.increment(OCR_CACHE_PERCEPTUAL_HIT_COUNTER)
+                return self._entries[matched].result
+        
+        PerformanceMonitor.increment(OCR_CACHE_MISS_COUNTER)
+        return None
+    
+    def put(
+        self,
+        image_hash: str,
+        result: "OCRResult",
+        perceptual_key: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
+        """写入结果，超出容量时淘汰最久未使用的条目"""
+        self._entries[image_hash] = _OCRCacheEntry(result, self._clock(), perceptual_key)
+        self._entries.move_to_end(image_hash)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            PerformanceMonitor.increment(OCR_CACHE_EVICT_COUNTER)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def _find_perceptual(
+        self, perceptual_key: Tuple[int, int, int], now: float
+    ) -> Optional[str]:
+        """在未过期的相同尺寸条目中查找最近似的 dHash"""
+        width, height, phash = perceptual_key
+        best_hash, best_distance = None, self.perceptual_max_distance + 1
+        for image_hash, entry in self._entries.items():
+            key = entry.perceptual_key
+            if key is None or key[0] != width or key[1] != height:
+                continue
+            if now - entry.timestamp >= self._ttl_seconds:
+                continue
+            distance = bin(key[2] ^ phash).count("1")
+            if distance < best_distance:
+                best_hash, best_distance = image_hash, distance
+        return best_hash
+
+
+_ocr_cache = OCRResultCache()
+
+
+def set_ocr_cache_perceptual_matching(
+    enabled: bool,
+    max_distance: int = _OCR_CACHE_PERCEPTUAL_MAX_DISTANCE,
+) -> None:
+    """启用/禁用 OCR 结果缓存的感知哈希层
+    
+    Args:
+        enabled: 是否启用
+        max_distance: 允许的 dHash 最大汉明距离（0-64）
+    """
+    with _ocr_processing_lock:
+        _ocr_cache.perceptual_enabled = enabled
+        _ocr_cache.perceptual_max_distance = max(0, min(64, max_distance))
 
 
-def _get_cached_ocr_result(image_hash: int) -> Optional['OCRResult']:
+def clear_ocr_result_cache() -> None:
+    """清空 OCR 结果缓存"""
+    with _ocr_processing_lock:
+        _ocr_cache.clear()
+
+
+def _compute_perceptual_key(image: 'QImage') -> Optional[Tuple[int, int, int]]:
+    """感知层启用时计算 (宽, 高, dHash)，否则返回 None（不做额外计算）"""
+    if not _ocr_cache.perceptual_enabled:
+        return None
+    phash = _compute_perceptual_hash(image)
+    if phash is None:
+        return None
+    return (image.width(), image.height(), phash)
+
+
+def _get_cached_ocr_result(
+    image_hash: str,
+    perceptual_key: Optional[Tuple[int, int, int]] = None,
+) -> Optional['OCRResult']:
     """获取缓存的 OCR 结果
     
     Args:
-        image_hash: 图片哈希值
+        image_hash: 图片全像素摘要
+        perceptual_key: 可选的 (宽, 高, dHash)
         
     Returns:
         OCRResult 或 None（如果缓存不存在或已过期）
     """
     with _ocr_processing_lock:
-        if image_hash in _ocr_cache:
-            result, timestamp = _ocr_cache[image_hash]
-            # 检查是否过期
-            if time.time() - timestamp < _OCR_CACHE_TTL_SECONDS:
-                rapid_debug_log(f"[OCR去重] 命中缓存: hash={image_hash}")
-                return result
-            else:
-                # 过期，删除缓存
-                del _ocr_cache[image_hash]
-    return None
+        result = _ocr_cache.get(image_hash, perceptual_key)
+    if result is not None:
+        rapid_debug_log(f"[OCR去重] 命中缓存: hash={image_hash}")
+    return result
 
 
-def _set_cached_ocr_result(image_hash: int, result: 'OCRResult') -> None:
+def _set_cached_ocr_result(
+    image_hash: str,
+    result: 'OCRResult',
+    perceptual_key: Optional[Tuple[int, int, int]] = None,
+) -> None:
     """设置 OCR 结果缓存
     
     Args:
-        image_hash: 图片哈希值
+        image_hash: 图片全像素摘要
         result: OCR 结果
+        perceptual_key: 可选的 (宽, 高, dHash)
     """
     with _ocr_processing_lock:
-        # 如果缓存已满，删除最旧的条目
-        if len(_ocr_cache) >= _OCR_CACHE_MAX_SIZE and _ocr_cache:
-            # 找到最旧的条目
-            oldest_hash = min(_ocr_cache.keys(), key=lambda k: _ocr_cache[k][1])
-            del _ocr_cache[oldest_hash]
-        
-        _ocr_cache[image_hash] = (result, time.time())
-        rapid_debug_log(f"[OCR去重] 缓存结果: hash={image_hash}, 当前缓存数={len(_ocr_cache)}")
+        _ocr_cache.put(image_hash, result, perceptual_key)
+        size = len(_ocr_cache)
+    rapid_debug_log(f"[OCR去重] 缓存结果: hash={image_hash}, 当前缓存数={size}")
 
 
-def _try_acquire_ocr_slot(image_hash: int) -> Tuple[bool, Optional[threading.Event]]:
+def _try_acquire_ocr_slot(image_hash: str) -> Tuple[bool, Optional[threading.Event]]:
     """尝试获取 OCR 处理槽位
     
     如果图片正在被其他线程处理，返回 (False, event)，调用方可以等待 event。
@@ -395,7 +696,7 @@ def _try_acquire_ocr_slot(image_hash: int) -> Tuple[bool, Optional[threading.Eve
         return True, None
 
 
-def _release_ocr_slot(image_hash: int) -> None:
+def _release_ocr_slot(image_hash: str) -> None:
     """释放 OCR 处理槽位并通知等待的线程
     
     Args:
@@ -457,7 +758,288 @@ class OCRResult:
     def empty_result(cls) -> "OCRResult":
         """创建空结果（成功但无文字）"""
         return cls(success=True, text="", boxes=[])
+    
+    def to_cache_dict(self) -> dict:
+        """转换为磁盘缓存字典（不含预处理指标）
+        
+        Feature: ocr-disk-cache
+        """
+        return {
+            "success": self.success,
+            "text": self.text,
+            "boxes": [[b.text, b.box, b.score] for b in self.boxes],
+            "error": self.error,
+            "average_score": self.average_score,
+            "backend_type": self.backend_type,
+            "backend_detail": self.backend_detail,
+            "elapsed_time_ms": self.elapsed_time_ms,
+        }
+    
+    @classmethod
+    def from_cache_dict(cls, data: dict) -> "OCRResult":
+        """从磁盘缓存字典恢复
+        
+        Feature: ocr-disk-cache
+        """
+        return cls(
+            success=data["success"],
+            text=data.get("text", ""),
+            boxes=[OCRBox(text, box, score) for text, box, score in data.get("boxes", [])],
+            error=data.get("error"),
+            average_score=data.get("average_score", 0.0),
+            backend_type=data.get("backend_type"),
+            backend_detail=data.get("backend_detail"),
+            elapsed_time_ms=data.get("elapsed_time_ms", 0.0),
+        )
+
+
+
+# ========== 分块识别（超高/超大图片） ==========
+# Feature: ocr-tiling
+
+@dataclass
+class TilingConfig:
+    """分块识别配置
+    
+    长截图（ImageStitcher 拼接结果常超过 10000px）整张送入检测模型时，
+    内存和耗时随图片尺寸线性增长。超过阈值时按水平条带切分，
+    每个条带单独转换和推理，峰值内存由条带大小决定。
+    
+    Attributes:
+        enabled: 是否启用分块识别
+        trigger_height: 图片高度超过此值时分块（像素）
+        trigger_pixels: 图片像素数超过此值时分块
+        tile_height: 条带最大高度（像素）
+        overlap: 相邻条带重叠高度（像素），应大于单行文字高度
+        max_workers: 并行处理条带的线程数，1 表示顺序处理
+    """
+    enabled: bool = True
+    trigger_height: int = 4096
+    trigger_pixels: int = 4096 * 4096
+    tile_height: int = 2048
+    overlap: int = 160
+    max_workers: int = 1
+
 
+# 判定条带边缘截断的容差（像素）
+_TILE_EDGE_MARGIN = 2
+
+# 重叠区两个框的交集占较小框面积的比例超过此值时视为重复
+_TILE_DUPLICATE_RATIO = 0.5
+
+
+def _plan_tile_bands(
+    width: int, height: int, config: TilingConfig
+) -> List[Tuple[int, int]]:
+    """计算条带划分
+    
+    Args:
+        width: 图片宽度
+        height: 图片高度
+        config: 分块配置
+        
+    Returns:
+        条带列表 [(top, bottom), ...]；不需要分块时返回空列表
+    """
+    if not config.enabled or width <= 0 or height <= 0:
+        return []
+    if height <= config.trigger_height and width * height <= config.trigger_pixels:
+        return []
+    
+    # 条带像素数不超过 trigger_pixels，高度至少为两倍重叠，保证条带能向下推进
+    band_height = min(config.tile_height, max(config.trigger_pixels // width, 1))
+    band_height = max(band_height, config.overlap * 2, 1)
+    if band_height >= height:
+        return []
+    
+    step = band_height - config.overlap
+    bands = []
+    top = 0
+    while True:
+        bottom = min(top + band_height, height)
+        bands.append((top, bottom))
+        if bottom >= height:
+            break
+        top += step
+    return bands
+
+
+def _box_y_range(box: List[List[int]]) -> Tuple[int, int]:
+    ys = [p[1] for p in box]
+    return min(ys), max(ys)
+
+
+def _box_rect(box: List[List[int]]) -> Tuple[int, int, int, int]:
+    xs = [p[0] for p in box]
+    ys = [p[1] for p in box]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _suppress_duplicate_boxes(
+    bands: List[Tuple[int, int]],
+    band_items: List[List[Tuple[List[List[int]], str, float]]],
+) -> List[Tuple[List[List[int]], str, float]]:
+    """合并各条带的识别框并去除重叠区内的重复框
+    
+    重叠区中的文字会被相邻两个条带各识别一次。对每条接缝，
+    比较两侧落在重叠区内的框，交集占较小框面积超过阈值时只保留一个：
+    优先保留未被条带边缘截断的框，其次保留面积较大的框。
+    
+    Args:
+        bands: 条带列表 [(top, bottom), ...]
+        band_items: 每个条带的识别框 [(box, text, score), ...]，坐标已换算到整图
+        
+    Returns:
+        去重后的识别框，按 (top, left) 排序
+    """
+    last = len(bands) - 1
+    
+    def is_truncated(index: int, box) -> bool:
+        top, bottom = bands[index]
+        y_min, y_max = _box_y_range(box)
+        return ((index > 0 and y_min <= top + _TILE_EDGE_MARGIN) or
+                (index < last and y_max >= bottom - _TILE_EDGE_MARGIN))
+    
+    dropped = set()  # (band_index, item_index)
+    for seam in range(last):
+        seam_top = bands[seam + 1][0]
+        seam_bottom = bands[seam][1]
+        upper = [(i, item) for i, item in enumerate(band_items[seam])
+                 if _box_y_range(item[0])[1] > seam_top]
+        lower = [(j, item) for j, item in enumerate(band_items[seam + 1])
+                 if _box_y_range(item[0])[0] < seam_bottom]
+        
+        for i, a in upper:
+            ax1, ay1, ax2, ay2 = _box_rect(a[0])
+            area_a = max(ax2 - ax1, 1) * max(ay2 - ay1, 1)
+            for j, b in lower:
+                bx1, by1, bx2, by2 = _box_rect(b[0])
+                inter_w = min(ax2, bx2) - max(ax1, bx1)
+                inter_h = min(ay2, by2) - max(ay1, by1)
+                if inter_w <= 0 or inter_h <= 0:
+                    continue
+                area_b = max(bx2 - bx1, 1) * max(by2 - by1, 1)
+                if inter_w * inter_h < _TILE_DUPLICATE_RATIO * min(area_a, area_b):
+                    continue
+                
+                key_a = (not is_truncated(seam, a[0]), area_a)
+                key_b = (not is_truncated(seam + 1, b[0]), area_b)
+                if key_a >= key_b:
+                    dropped.add((seam + 1, j))
+                else:
+                    dropped.add((seam, i))
+    
+    merged = [
+        item
+        for band_index, items in enumerate(band_items)
+        for item_index, item in enumerate(items)
+        if (band_index, item_index) not in dropped
+    ]
+    merged.sort(key=lambda item: (_box_rect(item[0])[1], _box_rect(item[0])[0]))
+    return merged
+
+
+# ========== 同行合并（向量化） ==========
+# Feature: ocr-vectorized-merge
+
+@dataclass
+class OCRBoxArray:
+    """识别框的数组表示
+    
+    Attributes:
+        coords: (N, 4, 2) 坐标数组
+        scores: 置信度列表（保持 Python float，逐行求和顺序与逐框实现一致）
+        texts: 文字列表
+    """
+    coords: np.ndarray
+    scores: List[float]
+    texts: List[str]
+    
+    @classmethod
+    def from_boxes(cls, boxes: List["OCRBox"]) -> Optional["OCRBoxArray"]:
+        """从 OCRBox 列表构造
+        
+        跳过坐标为空或少于 4 个点的框（与逐框实现相同）。
+        坐标不规则（点数不是 4、含 None、非数值）时返回 None，由逐框实现处理。
+        """
+        valid = [b for b in boxes if b.box is not None and len(b.box) >= 4]
+        if not valid:
+            return cls(np.empty((0, 4, 2), dtype=np.int64), [], [])
+        try:
+            if any(len(b.box) != 4 or any(len(p) != 2 for p in b.box) for b in valid):
+                return None
+            # 先展平再转换，比直接转换嵌套列表快数倍
+            coords = np.array([v for b in valid for p in b.box for v in p])
+        except (ValueError, TypeError):
+            return None
+        if coords.dtype.kind not in "iuf":
+            return None
+        return cls(coords.reshape(len(valid), 4, 2),
+                   [b.score for b in valid], [b.text for b in valid])
+
+
+def _merge_box_array(boxes: OCRBoxArray) -> List["OCRBox"]:
+    """向量化的同行合并，结果与 RapidOCRService._merge_same_line_boxes_per_box 完全一致
+    
+    逐框实现中，每个框只与排序后的前一个框比较 Y 中心距离，
+    因此分行等价于对相邻差值做一次阈值判断；行内排序用稳定的 lexsort，
+    相邻框间距和字符宽度阈值按原公式逐元素计算。
+    """
+    count = len(boxes.texts)
+    if count == 0:
+        return []
+    
+    xs = boxes.coords[:, :, 0]
+    ys = boxes.coords[:, :, 1]
+    x_min = xs.min(axis=1)
+    x_max = xs.max(axis=1)
+    y_min = ys.min(axis=1)
+    y_max = ys.max(axis=1)
+    y_center = (y_min + y_max) / 2
+    
+    # 按 Y 中心排序，相邻框 Y 距离超过阈值处分行
+    order = np.argsort(y_center, kind="stable")
+    heights = y_max[order] - y_min[order]
+    heights = np.where(heights > 0, heights, 1)
+    threshold = np.maximum(np.minimum(heights[1:], heights[:-1]) * 0.5, 10)
+    centers = y_center[order]
+    new_line = np.concatenate(([True], np.abs(centers[1:] - centers[:-1]) > threshold))
+    line_ids = np.cumsum(new_line) - 1
+    
+    # 行内按 X 排序（稳定），各行位置不变
+    final = order[np.lexsort((x_min[order], line_ids))]
+    starts = np.flatnonzero(new_line)
+    
+    # 相邻框间距小于平均字符宽度的 0.8 倍时不加空格
+    text_lens = np.array([len(t) if t else 1 for t in boxes.texts])
+    char_widths = (x_max - x_min) / text_lens
+    prev, curr = final[:-1], final[1:]
+    gaps = x_min[curr] - x_max[prev]
+    add_space = (gaps >= (char_widths[prev] + char_widths[curr]) / 2 * 0.8).tolist()
+    
+    line_x_min = np.minimum.reduceat(x_min[final], starts).tolist()
+    line_x_max = np.maximum.reduceat(x_max[final], starts).tolist()
+    line_y_min = np.minimum.reduceat(y_min[final], starts).tolist()
+    line_y_max = np.maximum.reduceat(y_max[final], starts).tolist()
+    
+    indices = final.tolist()
+    bounds = starts.tolist() + [count]
+    merged_boxes = []
+    for line, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        parts = [boxes.texts[indices[start]] or ""]
+        for i in range(start + 1, end):
+            text = boxes.texts[indices[i]] or ""
+            parts.append(" " + text if add_space[i - 1] else text)
+        
+        left, right = line_x_min[line], line_x_max[line]
+        top, bottom = line_y_min[line], line_y_max[line]
+        score = sum(boxes.scores[indices[i]] for i in range(start, end)) / (end - start)
+        merged_boxes.append(OCRBox(
+            text="".join(parts),
+            box=[[left, top], [right, top], [right, bottom], [left, bottom]],
+            score=score,
+        ))
+    return merged_boxes
 
 
 class RapidOCRService:
@@ -469,7 +1051,8 @@ class RapidOCRService:
     
     def __init__(self, lang: str = "ch", 
                  preprocessing_config: PreprocessingConfig = None,
-                 enable_preprocessing: bool = True):
+                 enable_preprocessing: bool = True,
+                 tiling_config: TilingConfig = None):
         """
         初始化RapidOCR服务
         
@@ -477,6 +1060,7 @@ class RapidOCRService:
             lang: 识别语言 (ch, en 等，RapidOCR 默认支持中英文)
             preprocessing_config: 预处理配置，为 None 时使用默认配置
             enable_preprocessing: 是否启用预处理
+            tiling_config: 分块识别配置，为 None 时使用默认配置
         """
         self.lang = lang
         
@@ -484,6 +1068,7 @@ class RapidOCRService:
         if preprocessing_config is None:
             preprocessing_config = PreprocessingConfig(enabled=enable_preprocessing)
         self._preprocessor = ImagePreprocessor(preprocessing_config)
+        self._tiling_config = tiling_config or TilingConfig()
         
         rapid_debug_log(f"RapidOCR 服务初始化，预处理: {enable_preprocessing}")
     
@@ -495,6 +1080,24 @@ class RapidOCRService:
         """获取预处理配置"""
         return self._preprocessor.get_config()
     
+    def set_tiling_config(self, config: TilingConfig):
+        """更新分块识别配置"""
+        self._tiling_config = config
+    
+    def get_tiling_config(self) -> TilingConfig:
+        """获取分块识别配置"""
+        return self._tiling_config
+    
+    def _get_cache_config(self, image: QImage):
+        """影响识别结果的配置（用于磁盘缓存键）
+        
+        分块识别的结果与整图识别可能不同，需要分块的图片额外包含分块配置。
+        """
+        config = self.get_preprocessing_config()
+        if _plan_tile_bands(image.width(), image.height(), self._tiling_config):
+            return {"preprocessing": asdict(config), "tiling": asdict(self._tiling_config)}
+        return config
+    
     @staticmethod
     def get_backend_type() -> Optional[BackendType]:
         """获取当前使用的后端类型"""
@@ -653,9 +1256,10 @@ class RapidOCRService:
         # ========== OCR 请求去重 ==========
         # Bug fix (2026-01-23): 避免同一张图片被多次 OCR 导致内存暴涨
         image_hash = _compute_image_hash(image)
+        perceptual_key = _compute_perceptual_key(image)
         
         # 1. 检查缓存
-        cached_result = _get_cached_ocr_result(image_hash)
+        cached_result = _get_cached_ocr_result(image_hash, perceptual_key)
         if cached_result is not None:
             rapid_debug_log(f"[OCR去重] 使用缓存结果，跳过重复 OCR")
             return cached_result
@@ -681,12 +1285,21 @@ class RapidOCRService:
                     # 仍然无法获取，返回错误
                     return OCRResult.error_result("OCR 请求冲突，请稍后重试")
         
-        # 3. 执行 OCR（获取到槽位后）
+        # 3. 执行 OCR（获取到槽位后），先查磁盘缓存
         try:
-            result = self._do_recognize_image(image)
+            disk_cache = get_ocr_disk_cache()
+            disk_key = build_ocr_cache_key(
+                image_hash, "rapid", self._get_cache_config(image)
+            )
+            result = self._get_disk_cached_result(disk_cache, disk_key)
+            if result is None:
+                result = self._do_recognize_image(image)
+                # 只持久化成功结果，失败可能是暂时的
+                if result.success and disk_cache is not None:
+                    disk_cache.put(disk_key, "rapid", result.to_cache_dict())
             
             # 4. 缓存结果（成功和失败都缓存，避免重复请求）
-            _set_cached_ocr_result(image_hash, result)
+            _set_cached_ocr_result(image_hash, result, perceptual_key)
             
             return result
         except Exception as e:
@@ -697,12 +1310,88 @@ class RapidOCRService:
             # 5. 释放槽位
             _release_ocr_slot(image_hash)
     
+    @staticmethod
+    def _get_disk_cached_result(disk_cache, disk_key: str) -> Optional[OCRResult]:
+        """从磁盘缓存读取结果
+        
+        Feature: ocr-disk-cache
+        """
+        if disk_cache is None:
+            return None
+        data = disk_cache.get(disk_key)
+        if data is None:
+            PerformanceMonitor.increment(OCR_DISK_CACHE_MISS_COUNTER)
+            return None
+        try:
+            result = OCRResult.from_cache_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            rapid_debug_log(f"[OCR缓存] 磁盘缓存条目损坏: {e}")
+            return None
+        PerformanceMonitor.increment(OCR_DISK_CACHE_HIT_COUNTER)
+        rapid_debug_log(f"[OCR缓存] 命中磁盘缓存: {disk_key}")
+        return result
+    
+    def recognize_batch(
+        self,
+        images: Iterable[Union[QImage, str]],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[int, OCRResult]]:
+        """批量识别图片，结果按完成顺序流式返回
+        
+        Feature: ocr-batch
+        
+        每个工作线程完成 解码 -> 预处理 -> 检测 -> 识别 的完整流程，
+        推理使用从引擎池借用的独立实例，多张图片在多个核心上并行。
+        同时提交的任务数不超过 2 * max_workers，内存占用与批量大小无关。
+        提前关闭返回的迭代器时，未开始的任务会被取消。
+        
+        Args:
+            images: QImage 或图片文件路径（在工作线程中解码）
+            max_workers: 并行数，默认 default_batch_workers()
+            
+        Yields:
+            (输入序号, OCRResult)
+        """
+        workers = max(1, max_workers or default_batch_workers())
+        
+        def run(index: int, image: Union[QImage, str]) -> Tuple[int, OCRResult]:
+            if isinstance(image, str):
+                path = image
+                image = QImage(path)
+                if image.isNull():
+                    return index, OCRResult.error_result(f"无法加载图片: {path}")
+            
+            engine = _engine_pool.acquire(workers)
+            _thread_engine.engine = engine
+            try:
+                return index, self.recognize_image(image)
+            finally:
+                _thread_engine.engine = None
+                _engine_pool.release(engine)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-batch") as executor:
+            pending = set()
+            try:
+                for index, image in enumerate(images):
+                    pending.add(executor.submit(run, index, image))
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+    
     def _do_recognize_image(self, image: QImage) -> OCRResult:
         """实际执行 OCR 识别（内部方法，不含去重逻辑）"""
         total_start = time.perf_counter()
         
         # 检查 OCR 是否可用
-        ocr, init_error = get_global_ocr()
+        ocr, init_error, infer_lock = _get_thread_ocr()
         if ocr is None:
             rapid_debug_log(f"OCR 引擎不可用: {init_error}")
             return OCRResult.error_result(init_error or "OCR 引擎初始化失败")
@@ -712,6 +1401,11 @@ class RapidOCRService:
         if backend:
             rapid_debug_log(f"使用后端: {backend.value}")
         
+        # 超高/超大图片分块识别
+        bands = _plan_tile_bands(image.width(), image.height(), self._tiling_config)
+        if bands:
+            return self._recognize_tiled(ocr, infer_lock, image, bands, backend, total_start)
+        
         img_array = None
         try:
             rapid_debug_log("转换图片为numpy数组...")
@@ -742,7 +1436,7 @@ class RapidOCRService:
             is_extreme_flat = preprocess_metrics.is_extreme_flat
             
             # RapidOCR 调用（加锁防止 OpenVINO 并发冲突）
-            with _global_ocr_infer_lock:
+            with infer_lock:
                 if is_extreme_flat:
                     # 极端扁平图像：使用最激进的参数
                     # - box_thresh: 进一步降低检测阈值
@@ -794,7 +1488,87 @@ class RapidOCRService:
             # 显式释放 numpy 数组内存
             if img_array is not None:
                 del img_array
-
+    
+    def _recognize_tiled(
+        self,
+        ocr,
+        infer_lock,
+        image: QImage,
+        bands: List[Tuple[int, int]],
+        backend: Optional[BackendType],
+        total_start: float,
+    ) -> OCRResult:
+        """分块识别超高/超大图片
+        
+        Feature: ocr-tiling
+        
+        每个条带单独裁剪、转换和推理，识别框换算回整图坐标后在重叠区去重，
+        再交给 _parse_result 做噪声过滤和同行合并。
+        条带较高且宽高比正常，不会触发扁平图像预处理，因此跳过预处理。
+        """
+        rapid_debug_log(
+            f"分块识别: {image.width()}x{image.height()} -> {len(bands)} 个条带"
+        )
+        try:
+            workers = max(1, min(self._tiling_config.max_workers, len(bands)))
+            if workers == 1:
+                band_items = [self._recognize_band(ocr, infer_lock, image, top, bottom)
+                              for top, bottom in bands]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    band_items = list(executor.map(
+                        lambda band: self._recognize_band(ocr, infer_lock, image, *band), bands
+                    ))
+            
+            items = _suppress_duplicate_boxes(bands, band_items)
+            total_time = (time.perf_counter() - total_start) * 1000
+            rapid_debug_log(
+                f"分块识别完成: 去重前 {sum(len(b) for b in band_items)} 个框，"
+                f"去重后 {len(items)} 个，耗时 {total_time:.2f}ms"
+            )
+            
+            if not items:
+                return OCRResult.empty_result()
+            
+            ocr_result = self._parse_result([list(item) for item in items])
+            if ocr_result.success:
+                ocr_result.backend_type = backend.value if backend else None
+                backend_info = self.get_backend_info()
+                ocr_result.backend_detail = get_backend_display_string(backend, backend_info)
+                ocr_result.preprocessing_metrics = PreprocessingMetrics()
+                ocr_result.elapsed_time_ms = total_time
+            return ocr_result
+        except Exception as e:
+            rapid_debug_log(f"分块识别异常: {str(e)}")
+            rapid_debug_log(traceback.format_exc())
+            return OCRResult.error_result(f"OCR识别出错: {str(e)}")
+    
+    def _recognize_band(
+        self, ocr, infer_lock, image: QImage, top: int, bottom: int
+    ) -> List[Tuple[List[List[int]], str, float]]:
+        """识别单个条带，返回整图坐标下的识别框
+        
+        Feature: ocr-tiling
+        """
+        band_array = self._qimage_to_numpy(image.copy(0, top, image.width(), bottom - top))
+        if band_array is None:
+            return []
+        
+        with infer_lock:
+            result, _ = ocr(band_array)
+        del band_array
+        
+        items = []
+        for item in result or []:
+            if not item or len(item) < 3:
+                continue
+            box = [[x, y + top] for x, y in self._parse_box_coords(item[0])]
+            try:
+                score = float(item[2])
+            except (ValueError, TypeError):
+                score = 1.0
+            items.append((box, str(item[1]), score))
+        return items
     
     def _parse_result(self, result: list) -> OCRResult:
         """解析RapidOCR的结果"""
@@ -905,11 +1679,24 @@ class RapidOCRService:
         """
         合并同一行的文字框
         
-        根据Y坐标判断是否在同一行，然后按X坐标排序合并
+        根据Y坐标判断是否在同一行，然后按X坐标排序合并。
+        坐标规则时使用向量化实现（见 _merge_box_array），否则逐框处理。
         """
         if not boxes:
             return []
         
+        box_array = OCRBoxArray.from_boxes(boxes)
+        if box_array is not None:
+            merged_boxes = _merge_box_array(box_array)
+            rapid_debug_log(f"合并前 {len(boxes)} 个框，合并后 {len(merged_boxes)} 行")
+            return merged_boxes
+        return self._merge_same_line_boxes_per_box(boxes)
+    
+    def _merge_same_line_boxes_per_box(self, boxes: List[OCRBox]) -> List[OCRBox]:
+        """逐框合并同一行的文字框（不规则坐标的回退路径）"""
+        if not boxes:
+            return []
+        
         # 计算每个box的中心Y坐标和高度
         box_info = []
         for box in boxes:
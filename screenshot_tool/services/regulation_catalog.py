@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CAAC 规章本地目录
+
+把 WAS5 搜索结果（规章、规范性文件）保存在本地 SQLite 中，
+RegulationService.search 直接查询本地目录，联网只发生在后台同步时。
+
+- 按 url 去重，同步时只写入新增或变化的条目
+- 标题/文号/字号/办文单位建立 FTS5 trigram 索引，不足 3 字的关键词回退 LIKE
+- 记录每种文档类型的同步时间，用于增量同步（按发布日期）
+- 文档对象常驻内存（目录只有几千条），查询只从 SQLite 取 rowid，避免每次构造对象
+
+Feature: regulation-catalog
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterable, List, Optional
+
+from screenshot_tool.services.regulation_service import RegulationDocument
+
+try:
+    from screenshot_tool.core.async_logger import async_debug_log as _debug_log
+except ImportError:
+    def _debug_log(msg, tag="INFO"): print(f"[{tag}] {msg}")
+
+
+# 目录字段（与 RegulationDocument 同名）
+FIELDS = (
+    "title", "url", "validity", "doc_number", "office_unit", "doc_type",
+    "sign_date", "publish_date", "file_number",
+)
+
+# 参与全文检索的字段
+SEARCH_FIELDS = ("title", "doc_number", "file_number", "office_unit")
+
+# trigram 分词的最短查询长度
+TRIGRAM_MIN_LENGTH = 3
+
+
+class RegulationCatalog:
+    """规章本地目录
+
+    Feature: regulation-catalog
+    """
+
+    DB_FILE = "regulation_catalog.db"
+
+    def __init__(self, data_dir: str):
+        """初始化目录
+
+        Args:
+            data_dir: 数据目录
+        """
+        self._db_path = os.path.join(data_dir, self.DB_FILE)
+        self._local = threading.local()
+        # {rowid: RegulationDocument}，写入后失效
+        self._documents: Optional[Dict[int, RegulationDocument]] = None
+        self._documents_lock = threading.Lock()
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        columns = ",\n".join(f"{name} TEXT NOT NULL DEFAULT ''" for name in FIELDS if name != "url")
+        with self._get_cursor() as cursor:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS documents (
+                    url TEXT PRIMARY KEY,
+                    {columns},
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_documents_type_date
+                ON documents(doc_type, publish_date)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+            self._fts = self._create_fts(cursor)
+
+    def _create_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """创建 trigram 全文索引（SQLite < 3.34 不支持时只用 LIKE）"""
+        fields = ", ".join(SEARCH_FIELDS)
+        new_fields = ", ".join(f"new.{name}" for name in SEARCH_FIELDS)
+        old_fields = ", ".join(f"old.{name}" for name in SEARCH_FIELDS)
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    {fields}, content='documents', content_rowid='rowid', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            _debug_log(f"全文索引不可用，使用 LIKE 查询: {e}", "REGULATION")
+            return False
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts(rowid, {fields}) VALUES (new.rowid, {new_fields});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                INSERT INTO documents_fts(documents_fts, rowid, {fields})
+                VALUES ('delete', old.rowid, {old_fields});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+                INSERT INTO documents_fts(documents_fts, rowid, {fields})
+                VALUES ('delete', old.rowid, {old_fields});
+                INSERT INTO documents_fts(rowid, {fields}) VALUES (new.rowid, {new_fields});
+            END
+        ''')
+        return True
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        if getattr(self._local, 'connection', None) is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = conn
+        return self._local.connection
+
+    @contextmanager
+    def _get_cursor(self) -> Generator[sqlite3.Cursor, None, None]:
+        """获取游标，退出时提交，异常时回滚"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    @property
+    def fts_enabled(self) -> bool:
+        return self._fts
+
+    def upsert(self, documents: Iterable[RegulationDocument]) -> List[RegulationDocument]:
+        """写入文档，返回新增或内容有变化的文档"""
+        incoming: Dict[str, RegulationDocument] = {}
+        for document in documents:
+            if document.url:
+                incoming[document.url] = document
+        if not incoming:
+            return []
+
+        changed = []
+        with self._get_cursor() as cursor:
+            urls = list(incoming)
+            existing = {}
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"SELECT {', '.join(FIELDS)} FROM documents WHERE url IN ({placeholders})",
+                    batch
+                )
+                for row in cursor.fetchall():
+                    existing[row[1]] = tuple(row)
+
+            now = time.time()
+            rows = []
+            for url, document in incoming.items():
+                values = tuple(getattr(document, name) or "" for name in FIELDS)
+                if existing.get(url) == values:
+                    continue
+                changed.append(document)
+                rows.append(values + (now,))
+
+            assignments = ", ".join(f"{name} = excluded.{name}" for name in FIELDS if name != "url")
+            cursor.executemany(f'''
+                INSERT INTO documents ({', '.join(FIELDS)}, updated_at)
+                VALUES ({', '.join('?' * (len(FIELDS) + 1))})
+                ON CONFLICT(url) DO UPDATE SET {assignments}, updated_at = excluded.updated_at
+            ''', rows)
+        if changed:
+            with self._documents_lock:
+                self._documents = None
+        return changed
+
+    def _get_documents(self) -> Dict[int, RegulationDocument]:
+        """获取内存中的文档表，失效时从数据库重新加载"""
+        with self._documents_lock:
+            if self._documents is None:
+                with self._get_cursor() as cursor:
+                    cursor.execute(f"SELECT rowid, {', '.join(FIELDS)} FROM documents")
+                    rows = cursor.fetchall()
+                self._documents = {
+                    row[0]: RegulationDocument(**dict(zip(FIELDS, row[1:]))) for row in rows
+                }
+            return self._documents
+
+    def search(
+        self,
+        keyword: str = "",
+        doc_type: str = "all",
+        validity: str = "all",
+        start_date: str = "",
+        end_date: str = "",
+        limit: Optional[int] = None,
+    ) -> List[RegulationDocument]:
+        """查询本地目录
+
+        Args:
+            keyword: 关键词，空格分隔的多个词须同时匹配（标题/文号/字号/办文单位）
+            doc_type: 文档类型 ("all", "regulation", "normative")
+            validity: 有效性 ("all", "valid", "invalid")
+            start_date: 起始发布日期 (YYYY-MM-DD)，空字符串表示不限制
+            end_date: 结束发布日期 (YYYY-MM-DD)，空字符串表示不限制
+            limit: 最多返回条数
+
+        Returns:
+            按发布日期倒序的文档列表（文档对象在多次查询间共享，调用方不应修改）
+        """
+        conditions = []
+        params: list = []
+
+        for term in keyword.split():
+            if self._fts and len(term) >= TRIGRAM_MIN_LENGTH:
+                conditions.append(
+                    "rowid IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)"
+                )
+                params.append('"' + term.replace('"', '""') + '"')
+            else:
+                escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conditions.append("(" + " OR ".join(
+                    f"{name} LIKE ? ESCAPE '\\'" for name in SEARCH_FIELDS
+                ) + ")")
+                params.extend([f"%{escaped}%"] * len(SEARCH_FIELDS))
+
+        if doc_type in ("regulation", "normative"):
+            conditions.append("doc_type = ?")
+            params.append(doc_type)
+        if validity == "valid":
+            conditions.append("validity = '有效'")
+        elif validity == "invalid":
+            conditions.append("validity IN ('失效', '废止')")
+        if start_date:
+            conditions.append("publish_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("publish_date <= ?")
+            params.append(end_date)
+
+        sql = "SELECT rowid FROM documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY publish_date DESC, rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        documents = self._get_documents()
+        with self._get_cursor() as cursor:
+            cursor.execute(sql, params)
+            rowids = cursor.fetchall()
+        return [documents[rowid] for (rowid,) in rowids if rowid in documents]
+
+    def count(self, doc_type: str = "all") -> int:
+        """文档数"""
+        with self._get_cursor() as cursor:
+            if doc_type == "all":
+                cursor.execute("SELECT COUNT(*) FROM documents")
+            else:
+                cursor.execute("SELECT COUNT(*) FROM documents WHERE doc_type = ?", (doc_type,))
+            return cursor.fetchone()[0]
+
+    def latest_publish_date(self, doc_type: str) -> str:
+        """某类文档的最新发布日期，没有时返回空字符串"""
+        with self._get_cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(MAX(publish_date), '') FROM documents WHERE doc_type = ?",
+                (doc_type,)
+            )
+            return cursor.fetchone()[0]
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._get_cursor() as cursor:
+            cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._get_cursor() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def mark_synced(self, doc_type: str, full: bool, timestamp: Optional[float] = None) -> None:
+        """记录同步完成时间"""
+        value = str(timestamp if timestamp is not None else time.time())
+        self._set_meta(f"synced:{doc_type}", value)
+        if full:
+            self._set_meta(f"full_synced:{doc_type}", value)
+
+    def last_synced(self, doc_type: str, full: bool = False) -> Optional[float]:
+        """上次（完整）同步时间，从未同步返回 None"""
+        value = self._get_meta(f"{'full_synced' if full else 'synced'}:{doc_type}")
+        return float(value) if value else None
+
+    def close(self) -> None:
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            self._local.connection = None
+
+
+# 全局单例实例
+_catalog_instance: Optional[RegulationCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_regulation_catalog(data_dir: Optional[str] = None) -> Optional[RegulationCatalog]:
+    """获取规章目录单例
+
+    Args:
+        data_dir: 数据目录，仅在首次调用时有效，默认为用户数据目录
+
+    Returns:
+        RegulationCatalog 实例，数据库无法打开时返回 None（回退为在线搜索）
+    """
+    global _catalog_instance
+
+    if _catalog_instance is None:
+        with _catalog_lock:
+            if _catalog_instance is None:
+                if data_dir is None:
+                    from screenshot_tool.core.config_manager import get_user_data_dir
+                    data_dir = get_user_data_dir()
+                try:
+                    _catalog_instance = RegulationCatalog(data_dir)
+                except (OSError, sqlite3.Error) as e:
+                    _debug_log(f"规章目录不可用: {e}", "REGULATION")
+                    return None
+
+    return _catalog_instance
+
+
+def reset_regulation_catalog() -> None:
+    """重置规章目录单例
+
+    主要用于测试。
+    """
+    global _catalog_instance
+
+    with _catalog_lock:
+        if _catalog_instance is not None:
+            _catalog_instance.close()
+            _catalog_instance = None
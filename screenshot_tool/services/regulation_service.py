@@ -11,6 +11,7 @@ Feature: caac-regulation-search
 
 import os
 import re
+import time
 from dataclasses import dataclass
 from typing import Optional
 from urllib.parse import urljoin, quote
@@ -39,6 +40,14 @@ NORMATIVE_CHANNEL = "238066"   # 规范性文件频道
 REGULATION_FL = "13"   # 民航规章分类
 NORMATIVE_FL = "14"    # 规范性文件分类
 
+# 每页结果数
+SEARCH_PER_PAGE = 100
+
+# 本地目录同步配置
+CATALOG_MAX_PAGES = 200           # 单次同步最多翻页数
+CATALOG_SYNC_INTERVAL_HOURS = 24  # 增量同步间隔
+CATALOG_FULL_SYNC_DAYS = 7        # 完整同步间隔（刷新旧文档的有效性变化）
+
 DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -356,6 +365,26 @@ class RegulationSearchWorker(QThread):
             params += f"&fwrq2={self._end_date}"
         return params
     
+    def _build_search_url(self, channel: str, fl: str, page: int = 1) -> str:
+        """构建 WAS5 搜索 URL
+        
+        Args:
+            channel: 频道 ID
+            fl: 分类 ID
+            page: 页码（从 1 开始），第 1 页不带 page 参数
+            
+        Returns:
+            搜索 URL，按发布日期倒序，每页 SEARCH_PER_PAGE 条
+        """
+        # 有关键词时使用 sw 参数搜索（全文搜索，包含标题）
+        keyword_param = f"&sw={quote(self._keyword)}" if self._keyword else ""
+        page_param = f"&page={page}" if page > 1 else ""
+        return (
+            f"{WAS5_SEARCH_URL}?channelid={channel}{keyword_param}"
+            f"&perpage={SEARCH_PER_PAGE}{page_param}&orderby=-fabuDate&fl={fl}"
+            f"{self._build_date_params()}"
+        )
+    
     def _search_regulations(self) -> list:
         """搜索 CCAR 规章"""
         documents = []
@@ -363,14 +392,7 @@ class RegulationSearchWorker(QThread):
         try:
             # 构建 WAS5 搜索 URL
             # 规章使用 channelid=269689, fl=13
-            date_params = self._build_date_params()
-            
-            if self._keyword:
-                # 使用 sw 参数搜索（全文搜索，包含标题）
-                search_url = f"{WAS5_SEARCH_URL}?channelid={REGULATION_CHANNEL}&sw={quote(self._keyword)}&perpage=100&orderby=-fabuDate&fl={REGULATION_FL}{date_params}"
-            else:
-                # 无关键词时，获取所有规章
-                search_url = f"{WAS5_SEARCH_URL}?channelid={REGULATION_CHANNEL}&perpage=100&orderby=-fabuDate&fl={REGULATION_FL}{date_params}"
+            search_url = self._build_search_url(REGULATION_CHANNEL, REGULATION_FL)
             
             _debug_log(f"规章搜索 URL: {search_url}", "REGULATION")
             html_content = self._fetch_page_content(search_url)
@@ -393,14 +415,7 @@ class RegulationSearchWorker(QThread):
         try:
             # 构建 WAS5 搜索 URL
             # 规范性文件使用 channelid=238066, fl=14
-            date_params = self._build_date_params()
-            
-            if self._keyword:
-                # 使用 sw 参数搜索（全文搜索，包含标题）
-                search_url = f"{WAS5_SEARCH_URL}?channelid={NORMATIVE_CHANNEL}&sw={quote(self._keyword)}&perpage=100&orderby=-fabuDate&fl={NORMATIVE_FL}{date_params}"
-            else:
-                # 无关键词时，获取所有规范性文件
-                search_url = f"{WAS5_SEARCH_URL}?channelid={NORMATIVE_CHANNEL}&perpage=100&orderby=-fabuDate&fl={NORMATIVE_FL}{date_params}"
+            search_url = self._build_search_url(NORMATIVE_CHANNEL, NORMATIVE_FL)
             
             _debug_log(f"规范性文件搜索 URL: {search_url}", "REGULATION")
             html_content = self._fetch_page_content(search_url)
@@ -693,6 +708,115 @@ class RegulationSearchWorker(QThread):
         return documents
 
 
+class RegulationCatalogSyncWorker(RegulationSearchWorker):
+    """规章目录同步工作线程
+    
+    按发布日期倒序翻页获取 WAS5 结果并写入本地目录：
+    - 完整同步：从第 1 页翻到最后一页（首次同步或距上次完整同步超过 CATALOG_FULL_SYNC_DAYS）
+    - 增量同步：只请求不早于目录中最新发布日期的结果，某页没有新增/变化条目即停止
+    
+    Feature: regulation-catalog
+    """
+    
+    synced = Signal(int)  # 同步完成，参数为新增或变化的文档数
+    
+    def __init__(
+        self,
+        catalog,
+        doc_type: str = "all",
+        full: bool = False,
+        session: Optional[requests.Session] = None
+    ):
+        """初始化
+        
+        Args:
+            catalog: RegulationCatalog 实例
+            doc_type: 同步的文档类型 ("all", "regulation", "normative")
+            full: 是否强制完整同步
+            session: HTTP 会话
+        """
+        super().__init__(keyword="", doc_type=doc_type, session=session)
+        self._catalog = catalog
+        self._full = full
+    
+    def run(self):
+        """执行同步"""
+        try:
+            targets = []
+            if self._doc_type in ("all", "regulation"):
+                targets.append(("regulation", REGULATION_CHANNEL, REGULATION_FL, self._parse_regulation_page))
+            if self._doc_type in ("all", "normative"):
+                targets.append(("normative", NORMATIVE_CHANNEL, NORMATIVE_FL, self._parse_normative_page))
+            
+            changed = 0
+            for doc_type, channel, fl, parse in targets:
+                if self._should_stop:
+                    return
+                changed += self._sync_type(doc_type, channel, fl, parse)
+            
+            if self._should_stop:
+                return
+            _debug_log(f"规章目录同步完成，新增或更新 {changed} 条", "REGULATION")
+            self.synced.emit(changed)
+            
+        except Exception as e:
+            _debug_log(f"规章目录同步失败: {e}", "REGULATION")
+            self.error.emit(f"规章目录同步失败: {str(e)}")
+    
+    def _sync_type(self, doc_type: str, channel: str, fl: str, parse) -> int:
+        """同步一种文档类型
+        
+        Returns:
+            新增或变化的文档数
+        """
+        last_full = self._catalog.last_synced(doc_type, full=True)
+        full = (
+            self._full
+            or last_full is None
+            or time.time() - last_full > CATALOG_FULL_SYNC_DAYS * 86400
+        )
+        # 增量同步从最新发布日期当天开始（当天可能还有未收录的文档）
+        self._start_date = "" if full else self._catalog.latest_publish_date(doc_type)
+        self._end_date = ""
+        
+        name = "CCAR 规章" if doc_type == "regulation" else "规范性文件"
+        seen = set()
+        changed = 0
+        for page in range(1, CATALOG_MAX_PAGES + 1):
+            if self._should_stop:
+                return changed
+            
+            self.progress.emit(page, 0, f"正在同步{name}（第 {page} 页）...")
+            html_content = self._fetch_page_content(self._build_search_url(channel, fl, page))
+            if not html_content:
+                if page == 1:
+                    # 第 1 页获取失败，不记录同步时间，下次搜索时重试
+                    _debug_log(f"{name}同步失败：第 1 页内容为空", "REGULATION")
+                    return changed
+                break
+            
+            documents = parse(html_content)
+            # 页码超出范围时站点可能重复返回最后一页
+            fresh = [d for d in documents if d.url not in seen]
+            if not fresh:
+                break
+            seen.update(d.url for d in fresh)
+            
+            page_changed = self._catalog.upsert(fresh)
+            changed += len(page_changed)
+            
+            if not full and not page_changed:
+                break
+            if len(documents) < SEARCH_PER_PAGE:
+                break
+        else:
+            _debug_log(f"{name}同步达到翻页上限 {CATALOG_MAX_PAGES}", "REGULATION")
+        
+        self._catalog.mark_synced(doc_type, full=full)
+        _debug_log(f"{name}{'完整' if full else '增量'}同步：{len(seen)} 条，新增或更新 {changed} 条", "REGULATION")
+        return changed
+
+
 class RegulationService(QObject):
     """规章服务 - 搜索和 PDF 下载
     
@@ -707,12 +831,14 @@ class RegulationService(QObject):
     downloadProgress = Signal(int, int, str)  # 下载进度 (current, total, message)
     downloadComplete = Signal(str)  # 下载完成，参数为文件路径
     downloadError = Signal(str)  # 下载错误，参数为错误信息
+    catalogSynced = Signal(int)  # 本地目录同步完成，参数为新增或变化的文档数
     
-    def __init__(self, save_path: str = ""):
+    def __init__(self, save_path: str = "", catalog=None):
         """初始化服务
         
         Args:
             save_path: PDF 保存路径，默认为 ~/Documents/CAAC_PDF/
+            catalog: 本地规章目录，默认为用户数据目录下的 RegulationCatalog 单例
         """
         super().__init__()
         
@@ -728,6 +854,10 @@ class RegulationService(QObject):
         self._search_worker: Optional[RegulationSearchWorker] = None
         self._download_worker: Optional["PDFDownloadWorker"] = None
         self._old_workers: list = []  # 保存旧线程引用，防止运行中被销毁
+        
+        # 本地目录（Feature: regulation-catalog）
+        self._catalog = catalog
+        self._sync_worker: Optional[RegulationCatalogSyncWorker] = None
     
     @property
     def save_path(self) -> str:
@@ -755,9 +885,10 @@ class RegulationService(QObject):
         start_date: str = "",
         end_date: str = "",
     ) -> None:
-        """搜索规章（异步）
+        """搜索规章
         
-        直接调用 CAAC 官网搜索功能。
+        本地目录已同步所需的文档类型时直接查询本地目录（同步发出 searchFinished），
+        目录过期时在后台增量同步；尚未同步时启动后台同步，本次回退到 CAAC 官网搜索（异步）。
         
         Args:
             keyword: 搜索关键词
@@ -766,6 +897,22 @@ class RegulationService(QObject):
             start_date: 起始日期 (YYYY-MM-DD)，空字符串表示不限制
             end_date: 结束日期 (YYYY-MM-DD)，空字符串表示不限制
         """
+        catalog = self._get_catalog()
+        if catalog is not None:
+            doc_types = ("regulation", "normative") if doc_type == "all" else (doc_type,)
+            try:
+                synced = [catalog.last_synced(t) for t in doc_types]
+                if all(synced):
+                    documents = catalog.search(keyword, doc_type, validity, start_date, end_date)
+                    self.searchProgress.emit(100, 100, f"搜索完成，找到 {len(documents)} 个结果")
+                    self.searchFinished.emit(documents)
+                    if time.time() - min(synced) > CATALOG_SYNC_INTERVAL_HOURS * 3600:
+                        self.sync_catalog()
+                    return
+            except Exception as e:
+                _debug_log(f"本地目录查询失败，回退到在线搜索: {e}", "REGULATION")
+            self.sync_catalog()
+        
         # 清理已完成的旧线程
         self._old_workers = [w for w in self._old_workers if w.isRunning()]
         
@@ -804,6 +951,34 @@ class RegulationService(QObject):
         self._search_worker.progress.connect(self._on_search_progress)
         self._search_worker.start()
     
+    def _get_catalog(self):
+        """获取本地目录，不可用时返回 None"""
+        if self._catalog is None:
+            from screenshot_tool.services.regulation_catalog import get_regulation_catalog
+            self._catalog = get_regulation_catalog()
+        return self._catalog
+    
+    def sync_catalog(self, full: bool = False) -> bool:
+        """在后台同步本地目录
+        
+        Args:
+            full: 是否强制完整同步
+            
+        Returns:
+            是否启动了同步（已有同步在进行或目录不可用时返回 False）
+        """
+        catalog = self._get_catalog()
+        if catalog is None:
+            return False
+        if self._sync_worker and self._sync_worker.isRunning():
+            return False
+        
+        # 同步线程使用独立会话，不与前台搜索/下载共用连接
+        self._sync_worker = RegulationCatalogSyncWorker(catalog, full=full)
+        self._sync_worker.synced.connect(self.catalogSynced.emit)
+        self._sync_worker.start()
+        return True
+    
     def _on_search_finished(self, documents: list):
         """搜索完成"""
         self.searchFinished.emit(documents)
@@ -871,6 +1046,11 @@ class RegulationService(QObject):
     
     def cleanup(self):
         """清理资源"""
+        # 停止目录同步线程
+        if self._sync_worker and self._sync_worker.isRunning():
+            self._sync_worker.stop()
+            self._sync_worker.wait(2000)
+        
         # 停止当前搜索线程
         if self._search_worker and self._search_worker.isRunning():
             self._search_worker.stop()
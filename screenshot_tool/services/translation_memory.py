@@ -0,0 +1,368 @@
+# =====================================================
+# =============== 翻译记忆（磁盘缓存） ===============
+# =====================================================
+
+"""
+翻译记忆 - 跨进程重启复用句子级翻译结果
+
+Feature: translation-memory
+
+特性：
+- SQLite 存储，键为 规范化句子哈希 + 语言对 + 引擎
+- 文本按行、按句切分，不同截图中重复出现的句子直接命中
+- 按字节上限做 LRU 淘汰（与 OCRDiskCache 相同）
+- 只缓存成功的翻译
+- 每个线程使用独立连接（与 SQLiteHistoryStorage 相同）
+
+EnhancedTranslationService.translate 在调用引擎前查询。
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from screenshot_tool.core.async_logger import async_debug_log
+
+
+def translation_memory_log(message: str):
+    """翻译记忆日志"""
+    async_debug_log(message, "TRANSLATION-MEMORY")
+
+
+# 句子边界：ASCII 句末标点后跟空白，或中日文句末标点之后
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;])\s+|(?<=[。！？；])')
+_WHITESPACE = re.compile(r'\s+')
+
+# 目标语言不用空格分隔句子
+_NO_SPACE_LANGS = ("zh", "ja", "ko")
+
+
+def normalize_segment(text: str) -> str:
+    """规范化句子（NFKC、合并空白），作为缓存键的来源
+
+    OCR 结果中全角/半角、多余空格的差异不影响命中。
+    """
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+def segment_hash(text: str) -> str:
+    """规范化句子的哈希"""
+    return hashlib.blake2b(normalize_segment(text).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def split_segments(text: str) -> List[List[str]]:
+    """把文本切分为 行 → 句子
+
+    Returns:
+        每行的句子列表（空行为空列表）
+    """
+    lines = []
+    for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        sentences = [s.strip() for s in _SENTENCE_BOUNDARY.split(line)]
+        lines.append([s for s in sentences if s])
+    return lines
+
+
+def join_segments(lines: Sequence[Sequence[str]], target_lang: str) -> str:
+    """把各行的句子译文拼回文本"""
+    separator = '' if target_lang.startswith(_NO_SPACE_LANGS) else ' '
+    return '\n'.join(separator.join(sentences) for sentences in lines)
+
+
+@dataclass
+class MemoryEntry:
+    """翻译记忆条目"""
+    translated: str
+    detected_lang: str
+    engine: str
+
+
+class TranslationMemory:
+    """句子级翻译记忆
+
+    Feature: translation-memory
+    """
+
+    DB_FILE = "translation_memory.db"
+
+    # 默认容量上限（字节，按译文 UTF-8 长度 + 每行固定开销计）
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+    ROW_OVERHEAD = 64
+
+    # SQLite 单条语句参数个数上限以内分批查询
+    QUERY_BATCH = 500
+
+    def __init__(self, data_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """初始化翻译记忆
+
+        Args:
+            data_dir: 数据目录
+            max_bytes: 容量上限，超出后淘汰最久未访问的条目
+        """
+        self._db_path = os.path.join(data_dir, self.DB_FILE)
+        self._max_bytes = max_bytes
+        self._local = threading.local()
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        with self._get_cursor() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    text_hash TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    translated TEXT NOT NULL,
+                    detected_lang TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (text_hash, source_lang, target_lang, engine)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translations_last_access
+                ON translations(last_access)
+            ''')
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        if getattr(self._local, 'connection', None) is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = conn
+        return self._local.connection
+
+    @contextmanager
+    def _get_cursor(self) -> Generator[sqlite3.Cursor, None, None]:
+        """获取游标，退出时提交，异常时回滚"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_many(
+        self,
+        segments: Iterable[str],
+        source_lang: str,
+        target_lang: str,
+        engines: Sequence[str]
+    ) -> Dict[str, MemoryEntry]:
+        """批量查询句子译文并更新访问时间
+
+        同一句子有多个引擎的译文时，按 engines 中的顺序取第一个。
+
+        Args:
+            segments: 句子列表
+            source_lang: 源语言
+            target_lang: 目标语言
+            engines: 可接受的引擎（按优先级排列）
+
+        Returns:
+            {句子: MemoryEntry}，只包含命中的句子
+        """
+        by_hash: Dict[str, List[str]] = {}
+        for segment in segments:
+            by_hash.setdefault(segment_hash(segment), []).append(segment)
+        if not by_hash or not engines:
+            return {}
+
+        rank = {engine: i for i, engine in enumerate(engines)}
+        best: Dict[str, Tuple[int, MemoryEntry]] = {}
+        hashes = list(by_hash)
+        try:
+            with self._get_cursor() as cursor:
+                for start in range(0, len(hashes), self.QUERY_BATCH):
+                    batch = hashes[start:start + self.QUERY_BATCH]
+                    placeholders = ','.join('?' * len(batch))
+                    cursor.execute(f'''
+                        SELECT text_hash, engine, translated, detected_lang
+                        FROM translations
+                        WHERE source_lang = ? AND target_lang = ?
+                          AND text_hash IN ({placeholders})
+                    ''', (source_lang, target_lang, *batch))
+                    for text_hash, engine, translated, detected_lang in cursor.fetchall():
+                        if engine not in rank:
+                            continue
+                        current = best.get(text_hash)
+                        if current is None or rank[engine] < current[0]:
+                            best[text_hash] = (rank[engine], MemoryEntry(translated, detected_lang, engine))
+
+                if best:
+                    now = time.time()
+                    cursor.executemany('''
+                        UPDATE translations SET last_access = ?
+                        WHERE text_hash = ? AND source_lang = ? AND target_lang = ? AND engine = ?
+                    ''', [
+                        (now, text_hash, source_lang, target_lang, entry.engine)
+                        for text_hash, (_, entry) in best.items()
+                    ])
+        except sqlite3.Error as e:
+            translation_memory_log(f"读取翻译记忆失败: {e}")
+            return {}
+
+        result = {}
+        for text_hash, (_, entry) in best.items():
+            for segment in by_hash[text_hash]:
+                result[segment] = entry
+        return result
+
+    def put_many(
+        self,
+        entries: Iterable[Tuple[str, str]],
+        source_lang: str,
+        target_lang: str,
+        engine: str,
+        detected_lang: str = ""
+    ) -> bool:
+        """批量写入句子译文，超出容量上限时淘汰最久未访问的条目
+
+        Args:
+            entries: [(句子, 译文)]
+            source_lang: 源语言
+            target_lang: 目标语言
+            engine: 引擎名称
+            detected_lang: 引擎检测到的源语言
+
+        Returns:
+            是否写入成功
+        """
+        now = time.time()
+        rows = []
+        for segment, translated in entries:
+            size = len(translated.encode('utf-8')) + self.ROW_OVERHEAD
+            if size > self._max_bytes:
+                continue
+            rows.append((
+                segment_hash(segment), source_lang, target_lang, engine,
+                translated, detected_lang, size, now
+            ))
+        if not rows:
+            return False
+        try:
+            with self._get_cursor() as cursor:
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO translations
+                        (text_hash, source_lang, target_lang, engine,
+                         translated, detected_lang, size, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                self._evict(cursor)
+            return True
+        except sqlite3.Error as e:
+            translation_memory_log(f"写入翻译记忆失败: {e}")
+            return False
+
+    def _evict(self, cursor: sqlite3.Cursor) -> None:
+        """按访问时间从新到旧累加大小，删除超出上限的部分"""
+        cursor.execute('SELECT COALESCE(SUM(size), 0) FROM translations')
+        if cursor.fetchone()[0] <= self._max_bytes:
+            return
+        cursor.execute('''
+            DELETE FROM translations WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (
+                        ORDER BY last_access DESC, rowid DESC
+                    ) AS running
+                    FROM translations
+                ) WHERE running > ?
+            )
+        ''', (self._max_bytes,))
+        translation_memory_log(f"翻译记忆淘汰 {cursor.rowcount} 条")
+
+    def count(self) -> int:
+        """条目数"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM translations')
+                return cursor.fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def total_bytes(self) -> int:
+        """条目总字节数"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('SELECT COALESCE(SUM(size), 0) FROM translations')
+                return cursor.fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self) -> None:
+        """清空翻译记忆"""
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute('DELETE FROM translations')
+        except sqlite3.Error as e:
+            translation_memory_log(f"清空翻译记忆失败: {e}")
+
+    def close(self) -> None:
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            self._local.connection = None
+
+
+# 全局单例实例
+_memory_instance: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory(data_dir: Optional[str] = None) -> Optional[TranslationMemory]:
+    """获取翻译记忆单例
+
+    Args:
+        data_dir: 数据目录，仅在首次调用时有效，默认为用户数据目录
+
+    Returns:
+        TranslationMemory 实例，数据库无法打开时返回 None（不影响翻译）
+    """
+    global _memory_instance
+
+    if _memory_instance is None:
+        with _memory_lock:
+            if _memory_instance is None:
+                if data_dir is None:
+                    from screenshot_tool.core.config_manager import get_user_data_dir
+                    data_dir = get_user_data_dir()
+                try:
+                    _memory_instance = TranslationMemory(data_dir)
+                except (OSError, sqlite3.Error) as e:
+                    translation_memory_log(f"翻译记忆不可用: {e}")
+                    return None
+
+    return _memory_instance
+
+
+def reset_translation_memory() -> None:
+    """重置翻译记忆单例
+
+    主要用于测试。
+    """
+    global _memory_instance
+
+    with _memory_lock:
+        if _memory_instance is not None:
+            _memory_instance.close()
+            _memory_instance = None
@@ -9,7 +9,10 @@ from .utils import (
     check_connection,
     create_deck,
     add_note,
+    add_notes,
+    multi,
     store_media_file,
+    store_media_files,
     store_media_file_from_path,
     anki_request,
     get_hex_name,
@@ -18,7 +21,13 @@ from .utils import (
 
 from .services import WordCardService
 
-from .importer import ensure_model_exists
+from .importer import (
+    ensure_model_exists,
+    import_words_pipelined,
+    STATUS_IMPORTED,
+    STATUS_SKIPPED,
+    STATUS_FAILED,
+)
 
 from .templates import (
     MODEL_NAME,
@@ -32,7 +41,10 @@ __all__ = [
     'check_connection',
     'create_deck',
     'add_note',
+    'add_notes',
+    'multi',
     'store_media_file',
+    'store_media_files',
     'store_media_file_from_path',
     'anki_request',
     'get_hex_name',
@@ -41,6 +53,10 @@ __all__ = [
     'WordCardService',
     # importer
     'ensure_model_exists',
+    'import_words_pipelined',
+    'STATUS_IMPORTED',
+    'STATUS_SKIPPED',
+    'STATUS_FAILED',
     # templates
     'MODEL_NAME',
     'FIELDS',
@@ -5,12 +5,26 @@
 从 AnkiTrans/单词卡工具 集成
 """
 import os
-from typing import Tuple, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .utils import anki_request, create_deck, store_media_file_from_path, add_note
+from .utils import (
+    anki_request, create_deck, store_media_file_from_path, store_media_files,
+    add_note, add_notes,
+)
 from .services import WordCardService
 from .templates import MODEL_NAME, FIELDS, CARD1_FRONT, CARD1_BACK, CARD2_FRONT, CARD2_BACK, CSS
 
+# 并发查询线程数（各主机另有 HOST_MAX_CONCURRENT 限制）
+LOOKUP_WORKERS = 8
+# 每批 addNotes 的笔记数
+NOTE_BATCH_SIZE = 50
+
+# 单词导入状态
+STATUS_IMPORTED = 'imported'
+STATUS_SKIPPED = 'skipped'     # 重复或 Anki 拒绝
+STATUS_FAILED = 'failed'
+
 
 def ensure_model_exists() -> bool:
     """确保模板存在且包含两个卡片模板"""
@@ -66,43 +80,30 @@ def ensure_model_exists() -> bool:
     return updated
 
 
-def import_single_word(
+def build_word_note(
     word: str,
+    data: Dict[str, Any],
     deck_name: str,
-    service: WordCardService,
-    book_image_path: str = ''
-) -> Tuple[bool, str, str]:
+    book_image_field: str = ''
+) -> Tuple[dict, List[str]]:
     """
-    导入单个单词到 Anki
+    由查询结果构建笔记
     
     Returns:
-        (success: bool, word: str, status: str)
+        (note, 需要上传的媒体文件路径)
     """
-    if not word or not word.strip():
-        return False, word or '', "✗ 单词为空"
-    
-    try:
-        data = service.query(word)
-    except Exception as e:
-        print(f"[Anki] 查询 {word} 失败: {e}")
-        return False, word, f"✗ 查询失败"
+    media = []
     
     audio_field = ''
     if data.get('audio_path') and os.path.exists(data['audio_path']):
-        store_media_file_from_path(data['audio_path'])
+        media.append(data['audio_path'])
         audio_field = f"[sound:{data['audio_filename']}]"
     
     image_field = ''
     if data.get('image_path') and os.path.exists(data['image_path']):
-        store_media_file_from_path(data['image_path'])
+        media.append(data['image_path'])
         image_field = f'<img src="{data["image_filename"]}">'
     
-    book_image_field = ''
-    if book_image_path and os.path.exists(book_image_path):
-        store_media_file_from_path(book_image_path)
-        book_filename = os.path.basename(book_image_path)
-        book_image_field = f'<img src="{book_filename}">'
-    
     note = {
         'deckName': deck_name,
         'modelName': MODEL_NAME,
@@ -116,6 +117,39 @@ def import_single_word(
         },
         'options': {'allowDuplicate': False}
     }
+    return note, media
+
+
+def import_single_word(
+    word: str,
+    deck_name: str,
+    service: WordCardService,
+    book_image_path: str = ''
+) -> Tuple[bool, str, str]:
+    """
+    导入单个单词到 Anki
+    
+    Returns:
+        (success: bool, word: str, status: str)
+    """
+    if not word or not word.strip():
+        return False, word or '', "✗ 单词为空"
+    
+    try:
+        data = service.query(word)
+    except Exception as e:
+        print(f"[Anki] 查询 {word} 失败: {e}")
+        return False, word, f"✗ 查询失败"
+    
+    book_image_field = ''
+    if book_image_path and os.path.exists(book_image_path):
+        store_media_file_from_path(book_image_path)
+        book_filename = os.path.basename(book_image_path)
+        book_image_field = f'<img src="{book_filename}">'
+    
+    note, media = build_word_note(word, data, deck_name, book_image_field)
+    for path in media:
+        store_media_file_from_path(path)
     
     result = add_note(note)
     
@@ -129,6 +163,118 @@ def import_single_word(
     return result is not None, word, status
 
 
+def _add_notes_batch(notes: List[dict]) -> List[str]:
+    """批量添加笔记，返回每条笔记的导入状态
+    
+    新版 AnkiConnect 只要有一条重复就拒绝整批，此时逐条添加。
+    """
+    try:
+        ids = add_notes(notes)
+    except Exception as e:
+        print(f"[Anki] 批量添加被拒绝，逐条添加: {e}")
+    else:
+        if ids is None or len(ids) != len(notes):
+            return [STATUS_FAILED] * len(notes)
+        return [STATUS_IMPORTED if note_id else STATUS_SKIPPED for note_id in ids]
+    
+    statuses = []
+    for note in notes:
+        try:
+            statuses.append(STATUS_IMPORTED if add_note(note) else STATUS_SKIPPED)
+        except Exception as e:
+            statuses.append(STATUS_SKIPPED if 'duplicate' in str(e) else STATUS_FAILED)
+    return statuses
+
+
+def import_words_pipelined(
+    words: List[str],
+    deck_name: str,
+    service: WordCardService,
+    book_image_field: str = '',
+    progress_callback: Optional[Callable] = None,
+    max_workers: int = LOOKUP_WORKERS,
+    batch_size: int = NOTE_BATCH_SIZE
+) -> Dict[str, str]:
+    """
+    并发查询单词并分批导入
+    
+    已缓存的单词用 query_cached_many 一次读出，其余在线程池中查询（各词典接口按主机限速）；
+    每凑满 batch_size 个查询结果，就用一次 multi 上传媒体、一次 addNotes 添加笔记，
+    与剩余单词的查询重叠进行。调用方需先创建牌组和模板。
+    
+    Args:
+        words: 单词列表（重复的单词只导入一次）
+        deck_name: 牌组名称
+        service: 单词查询服务（query 需线程安全，另需 query_cached_many）
+        book_image_field: 绘本原图字段（截图需已上传）
+        progress_callback: 查询进度回调 (current, total, word)，在调用线程中按完成顺序调用，
+            抛出异常可中止导入
+        max_workers: 查询线程数
+        batch_size: 每批笔记数
+    
+    Returns:
+        {单词: STATUS_IMPORTED / STATUS_SKIPPED / STATUS_FAILED}
+    """
+    unique_words = list(dict.fromkeys(w.strip() for w in words if w and w.strip()))
+    total = len(unique_words)
+    statuses: Dict[str, str] = {}
+    pending: List[Tuple[str, dict, List[str]]] = []
+    
+    def flush():
+        if not pending:
+            return
+        store_media_files([path for _, _, media in pending for path in media])
+        results = _add_notes_batch([note for _, note, _ in pending])
+        for (word, _, _), status in zip(pending, results):
+            statuses[word] = status
+        pending.clear()
+    
+    current = 0
+    
+    def advance(word):
+        nonlocal current
+        current += 1
+        if progress_callback:
+            progress_callback(current, total, word)
+    
+    def accept(word, data):
+        advance(word)
+        note, media = build_word_note(word, data, deck_name, book_image_field)
+        pending.append((word, note, media))
+        if len(pending) >= batch_size:
+            flush()
+    
+    # 已缓存的单词一次读出，不占用查询线程
+    cached = service.query_cached_many(unique_words)
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {
+            executor.submit(service.query, word): word
+            for word in unique_words if word not in cached
+        }
+        # 网络查询进行时先上传已缓存的单词
+        for word in unique_words:
+            if word in cached:
+                accept(word, cached[word])
+        for future in as_completed(futures):
+            word = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                advance(word)
+                print(f"[Anki] 查询 {word} 失败: {e}")
+                statuses[word] = STATUS_FAILED
+                continue
+            accept(word, data)
+        flush()
+    finally:
+        # 中止时不再等待未开始的查询
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return statuses
+
+
 def import_words(
     words: list,
     deck_name: str,
@@ -150,16 +296,13 @@ def import_words(
     create_deck(deck_name)
     ensure_model_exists()
     
-    service = WordCardService()
-    total = len(words)
-    success = 0
-    
-    for i, word in enumerate(words):
-        if progress_callback:
-            progress_callback(i + 1, total, word)
-        
-        ok, _, _ = import_single_word(word, deck_name, service, screenshot_path or '')
-        if ok:
-            success += 1
+    book_image_field = ''
+    if screenshot_path and os.path.exists(screenshot_path):
+        store_media_file_from_path(screenshot_path)
+        book_image_field = f'<img src="{os.path.basename(screenshot_path)}">'
     
-    return success, total
+    statuses = import_words_pipelined(
+        words, deck_name, WordCardService(), book_image_field, progress_callback
+    )
+    success = sum(1 for status in statuses.values() if status == STATUS_IMPORTED)
+    return success, len(words)
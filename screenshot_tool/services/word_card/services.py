@@ -9,11 +9,12 @@ import os
 import re
 import json
 import time
+import sqlite3
 import hashlib
-import requests
+import threading
 import xml.etree.ElementTree as ET
 from urllib.parse import quote
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Iterable
 
 try:
     from bs4 import BeautifulSoup
@@ -21,14 +22,14 @@ try:
 except ImportError:
     BS4_AVAILABLE = False
 
-from .utils import DEFAULT_UA, MEDIA_DIR, get_hex_name
+from .utils import DEFAULT_UA, MEDIA_DIR, get_hex_name, http_get
+from .word_store import WordStore
 
-# 数据缓存目录
+# 旧版数据缓存目录（每个单词一个 JSON，首次打开单词库时迁移）
 DATA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.screenshot_tool', 'data_cache')
-try:
-    os.makedirs(DATA_CACHE_DIR, exist_ok=True)
-except OSError as e:
-    print(f"[word_card] 创建缓存目录失败: {e}")
+
+# 单词库（单文件 SQLite）
+WORD_STORE_PATH = os.path.join(os.path.expanduser('~'), '.screenshot_tool', 'word_store.db')
 
 # 加载配置文件（旧版兼容）
 CONFIG_FILE = os.path.join(os.path.expanduser('~'), '.screenshot_tool', 'word_card_config.json')
@@ -102,31 +103,56 @@ def get_next_unsplash_key() -> Optional[str]:
     return key
 
 
-def get_word_cache_path(word: str) -> str:
-    """获取单词缓存文件路径"""
-    safe_name = hashlib.md5(word.lower().encode('utf-8')).hexdigest()[:16]
-    return os.path.join(DATA_CACHE_DIR, f"{safe_name}.json")
+_word_store: Optional[WordStore] = None
+_word_store_failed = False
+_word_store_lock = threading.Lock()
+
+
+def get_word_store() -> Optional[WordStore]:
+    """获取单词库（首次调用时打开并迁移旧版 JSON 缓存），无法打开时返回 None"""
+    global _word_store, _word_store_failed
+    with _word_store_lock:
+        if _word_store is None and not _word_store_failed:
+            try:
+                store = WordStore(WORD_STORE_PATH, media_dir=MEDIA_DIR)
+                store.migrate_json_cache(DATA_CACHE_DIR)
+                _word_store = store
+            except (OSError, sqlite3.Error) as e:
+                _word_store_failed = True
+                print(f"[缓存] 打开单词库失败: {e}")
+        return _word_store
 
 
 def load_word_cache(word: str) -> Optional[Dict[str, Any]]:
     """加载单词缓存"""
-    cache_path = get_word_cache_path(word)
-    if os.path.exists(cache_path):
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return None
+    store = get_word_store()
+    if store is None:
+        return None
+    try:
+        return store.get(word)
+    except sqlite3.Error:
+        return None
+
+
+def load_word_cache_many(words: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """批量加载单词缓存，返回 {单词: 数据}（只含命中的单词）"""
+    store = get_word_store()
+    if store is None:
+        return {}
+    try:
+        return store.get_many(words)
+    except sqlite3.Error:
+        return {}
 
 
 def save_word_cache(word: str, data: Dict[str, Any]) -> None:
     """保存单词缓存"""
-    cache_path = get_word_cache_path(word)
+    store = get_word_store()
+    if store is None:
+        return
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
+        store.put(word, data)
+    except (OSError, sqlite3.Error) as e:
         print(f"[缓存] 保存 {word} 失败: {e}")
 
 
@@ -169,7 +195,7 @@ class YoudaoService:
         
         legacy_url = f'http://dict.youdao.com/dictvoice?audio={quote(word)}&type={audio_type}'
         try:
-            resp = requests.get(legacy_url, headers={'User-Agent': DEFAULT_UA}, timeout=10)
+            resp = http_get(legacy_url, headers={'User-Agent': DEFAULT_UA}, timeout=10)
             if resp.status_code == 200 and len(resp.content) > 1000:
                 with open(filepath, 'wb') as f:
                     f.write(resp.content)
@@ -194,7 +220,7 @@ class YoudaoService:
         result = {'phonetic': '', 'us_phonetic': '', 'uk_phonetic': '', 'explains': ''}
         
         try:
-            resp = requests.get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
+            resp = http_get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
             doc = ET.fromstring(resp.content)
             
             symbol = doc.findtext(".//phonetic-symbol")
@@ -235,7 +261,7 @@ class YoudaoService:
             return ''
         try:
             url = f"https://dict.youdao.com/result?word={quote(word)}&lang=en"
-            resp = requests.get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
+            resp = http_get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
             soup = BeautifulSoup(resp.content, 'html.parser')
             
             trans_container = soup.find('div', class_='trans-container')
@@ -278,7 +304,7 @@ class YoudaoService:
         """请求新版发音接口"""
         params = self._build_pronounce_params(text, audio_type)
         try:
-            resp = requests.get(YOUDAO_PRONOUNCE_BASE, params=params, headers={
+            resp = http_get(YOUDAO_PRONOUNCE_BASE, params=params, headers={
                 'User-Agent': DEFAULT_UA, 'Accept': 'audio/mpeg, audio/*, */*',
                 'Referer': 'https://dict.youdao.com/'
             }, timeout=10)
@@ -313,7 +339,7 @@ class MiniDictService:
         
         try:
             url = f"http://apii.dict.cn/mini.php?q={quote(word)}"
-            resp = requests.get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
+            resp = http_get(url, headers={'User-Agent': DEFAULT_UA}, timeout=5)
             soup = BeautifulSoup(resp.content, 'html.parser')
             
             tag = soup.find('span', class_='p')
@@ -393,7 +419,7 @@ class HudawangImageService:
                     pass
         
         try:
-            resp = requests.get(url, timeout=8, stream=True, headers={'User-Agent': DEFAULT_UA})
+            resp = http_get(url, timeout=8, stream=True, headers={'User-Agent': DEFAULT_UA})
             if resp.status_code == 200:
                 with open(filepath, 'wb') as f:
                     for chunk in resp.iter_content(8192):
@@ -464,14 +490,14 @@ class HudawangImageService:
         params = {'query': word, 'per_page': 3, 'orientation': 'squarish'}
         
         try:
-            resp = requests.get(api_url, headers=headers, params=params, timeout=8)
+            resp = http_get(api_url, headers=headers, params=params, timeout=8)
             if resp.status_code == 200:
                 data = resp.json()
                 for photo in data.get('results', []):
                     urls = photo.get('urls', {})
                     image_url = urls.get('small') or urls.get('regular')
                     if image_url:
-                        img_resp = requests.get(image_url, timeout=10, headers={'User-Agent': DEFAULT_UA})
+                        img_resp = http_get(image_url, timeout=10, headers={'User-Agent': DEFAULT_UA})
                         if img_resp.status_code == 200 and len(img_resp.content) > 5000:
                             filename = get_hex_name('unsplash', word + photo.get('id', ''), 'jpg')
                             filepath = os.path.join(MEDIA_DIR, filename)
@@ -500,13 +526,13 @@ class HudawangImageService:
         params = {'key': api_key, 'q': word, 'lang': 'en', 'image_type': 'photo', 'per_page': 5, 'safesearch': 'true'}
         
         try:
-            resp = requests.get(api_url, params=params, timeout=8, headers={'User-Agent': DEFAULT_UA})
+            resp = http_get(api_url, params=params, timeout=8, headers={'User-Agent': DEFAULT_UA})
             if resp.status_code == 200:
                 for hit in resp.json().get('hits', []):
                     image_url = hit.get('webformatURL')
                     if not image_url:
                         continue
-                    img_resp = requests.get(image_url, timeout=10, headers={'User-Agent': DEFAULT_UA})
+                    img_resp = http_get(image_url, timeout=10, headers={'User-Agent': DEFAULT_UA})
                     if img_resp.status_code == 200 and len(img_resp.content) > 5000:
                         filename = get_hex_name('pixabay', word + str(hit.get('id', '')), 'jpg')
                         filepath = os.path.join(MEDIA_DIR, filename)
@@ -528,7 +554,7 @@ class HudawangImageService:
         params = {'term': word, 'filter': ',inCategory,photo,withExamples'}
         
         try:
-            resp = requests.get(api_url, params=params, timeout=3, headers={'User-Agent': DEFAULT_UA})
+            resp = http_get(api_url, params=params, timeout=3, headers={'User-Agent': DEFAULT_UA})
             data = resp.json()
             if data and isinstance(data, list):
                 photo_url = self._extract_langeek_photo(data[0])
@@ -583,7 +609,7 @@ class HudawangImageService:
         for query in search_queries:
             try:
                 params = {'q': query, 'form': 'HDRSC2', 'first': 1}
-                resp = requests.get(search_url, params=params, timeout=5, headers={'User-Agent': DEFAULT_UA})
+                resp = http_get(search_url, params=params, timeout=5, headers={'User-Agent': DEFAULT_UA})
                 matches = re.findall(r'murl&quot;:&quot;(https?://[^&]+?)&quot;', resp.text)
                 for url in matches[:3]:
                     filepath, filename = self._quick_download(url, 'bing', word)
@@ -601,7 +627,7 @@ class HudawangImageService:
         for query in search_queries:
             try:
                 params = {'q': query, 'src': 'srp', 'sn': 0, 'pn': 10}
-                resp = requests.get(search_url, params=params, timeout=5, headers={'User-Agent': DEFAULT_UA})
+                resp = http_get(search_url, params=params, timeout=5, headers={'User-Agent': DEFAULT_UA})
                 for item in resp.json().get('list', [])[:3]:
                     url = item.get('img') or item.get('thumb')
                     if url:
@@ -645,20 +671,23 @@ class WordCardService:
                     'audio_path': None, 'audio_filename': None,
                     'image_path': None, 'image_filename': None}
         
+        # 单词库会还原缺失的媒体文件，无法还原时不返回
         cached = load_word_cache(word)
         if cached:
-            audio_ok = not cached.get('audio_path') or os.path.exists(cached['audio_path'])
-            image_ok = not cached.get('image_path') or os.path.exists(cached['image_path'])
-            if audio_ok and image_ok:
-                print(f"[缓存] {word} 使用本地缓存")
-                return cached
-            else:
-                print(f"[缓存] {word} 媒体文件缺失，重新查询")
+            print(f"[缓存] {word} 使用本地缓存")
+            return cached
         
         result = self._query_from_network(word)
         save_word_cache(word, result)
         return result
     
+    def query_cached_many(self, words: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """批量读取已缓存的单词（一次数据库查询），返回 {单词: 数据}
+        
+        未缓存的单词不在结果中，需要再调用 query。
+        """
+        return load_word_cache_many(w.strip() for w in words if w and w.strip())
+    
     def _query_from_network(self, word: str) -> Dict[str, Any]:
         """从网络查询单词数据"""
         result = {'word': word}
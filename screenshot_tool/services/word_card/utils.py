@@ -5,13 +5,26 @@ AnkiConnect 通信工具 & 通用函数
 从 AnkiTrans/单词卡工具 集成
 """
 import os
+import time
 import base64
+import threading
 import requests
+from contextlib import contextmanager
 from hashlib import sha1
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 
 ANKI_URL = "http://127.0.0.1:8765"
 DEFAULT_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
+# 查询接口的单主机限速：同时请求数上限、相邻请求最小间隔（秒）
+HOST_MAX_CONCURRENT = 4
+HOST_MIN_INTERVAL = 0.02
+
+# 单次 multi 请求上传的媒体总字节数上限（base64 前）
+MEDIA_BATCH_BYTES = 8 * 1024 * 1024
+
 # 媒体文件保存目录（使用用户目录，避免权限问题）
 MEDIA_DIR = os.path.join(os.path.expanduser('~'), '.screenshot_tool', 'media_cache')
 try:
@@ -27,6 +40,65 @@ def get_hex_name(prefix: str, val: str, suffix: str) -> str:
     return name
 
 
+class HostRateLimiter:
+    """按主机限速：限制同时请求数，并保证相邻请求的最小间隔
+
+    批量查询单词时多个线程共用，避免同一词典接口被并发打满。
+    """
+
+    def __init__(self, min_interval: float = HOST_MIN_INTERVAL,
+                 max_concurrent: int = HOST_MAX_CONCURRENT):
+        self._min_interval = min_interval
+        self._max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_time: Dict[str, float] = {}
+
+    @contextmanager
+    def acquire(self, url: str):
+        """占用 url 所在主机的一个请求名额"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self._max_concurrent)
+                self._semaphores[host] = semaphore
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_time.get(host, now))
+                self._next_time[host] = start + self._min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+
+_rate_limiter = HostRateLimiter()
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """查询接口共用的连接池会话"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """限速的 GET 请求（参数同 requests.get），供词典/图片查询使用"""
+    with _rate_limiter.acquire(url):
+        return _get_session().get(url, **kwargs)
+
+
 def anki_request(action: str, params: dict = None, timeout: int = 30):
     """发送请求到 AnkiConnect"""
     try:
@@ -119,3 +191,65 @@ def add_note(note_or_deck, model_name=None, fields=None, tags=None):
 def add_notes(notes: list):
     """批量添加笔记"""
     return anki_request('addNotes', {'notes': notes})
+
+
+def multi(actions: list, timeout: int = 120) -> list:
+    """在一次请求中执行多个 AnkiConnect 操作
+
+    Args:
+        actions: [{'action': ..., 'params': ...}]
+
+    Returns:
+        每个操作的结果，失败的操作为 None
+    """
+    results = anki_request('multi', {'actions': actions}, timeout=timeout)
+    if results is None:
+        return [None] * len(actions)
+    unpacked = []
+    for item in results:
+        # version 6 中每项为 {'result': ..., 'error': ...}
+        if isinstance(item, dict) and set(item) <= {'result', 'error'}:
+            unpacked.append(None if item.get('error') else item.get('result'))
+        else:
+            unpacked.append(item)
+    return unpacked
+
+
+def store_media_files(filepaths: List[str]) -> int:
+    """批量上传本地媒体文件（同名文件只上传一次）
+
+    按 MEDIA_BATCH_BYTES 分批，每批一次 multi 请求。
+
+    Returns:
+        上传成功的文件数
+    """
+    stored = 0
+    batch, batch_bytes = [], 0
+    seen = set()
+
+    def flush():
+        nonlocal stored, batch, batch_bytes
+        if batch:
+            stored += sum(1 for r in multi(batch) if r is not None)
+        batch, batch_bytes = [], 0
+
+    for filepath in filepaths:
+        filename = os.path.basename(filepath or '')
+        if not filename or filename in seen or not os.path.exists(filepath):
+            continue
+        seen.add(filename)
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError) as e:
+            print(f"[Anki] 读取媒体文件失败 {filepath}: {e}")
+            continue
+        if batch and batch_bytes + len(data) > MEDIA_BATCH_BYTES:
+            flush()
+        batch.append({'action': 'storeMediaFile', 'params': {
+            'filename': filename,
+            'data': base64.b64encode(data).decode('utf-8'),
+        }})
+        batch_bytes += len(data)
+    flush()
+    return stored
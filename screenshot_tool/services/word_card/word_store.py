@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+单词数据存储 - 单文件 SQLite
+
+替代 DATA_CACHE_DIR 下每个单词一个 JSON 文件的缓存：
+- 单词数据一行一条，按小写单词索引，get_many 一次查询整批
+- 发音/配图按内容哈希存为 blob，相同文件只存一份
+- 媒体文件被删除时从 blob 还原到 MEDIA_DIR，无需重新下载
+- 首次打开时迁移旧 JSON 缓存（迁移后删除 JSON 文件）
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from hashlib import sha1
+from typing import Any, Dict, Generator, Iterable, Optional
+
+from .utils import MEDIA_DIR
+
+# 媒体字段：(路径键, 文件名键, 哈希列)
+MEDIA_FIELDS = (
+    ('audio_path', 'audio_filename', 'audio_hash'),
+    ('image_path', 'image_filename', 'image_hash'),
+)
+
+# 单条 SQL 的参数个数上限以内分批查询
+QUERY_BATCH = 500
+
+
+class WordStore:
+    """单词数据存储"""
+
+    def __init__(self, db_path: str, media_dir: str = MEDIA_DIR):
+        self._db_path = db_path
+        self._media_dir = media_dir
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._get_cursor() as cursor:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS words (
+                    word TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    audio_hash TEXT,
+                    image_hash TEXT,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS media (
+                    hash TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        if getattr(self._local, 'connection', None) is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = conn
+        return self._local.connection
+
+    @contextmanager
+    def _get_cursor(self) -> Generator[sqlite3.Cursor, None, None]:
+        """获取游标，退出时提交，异常时回滚"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _key(word: str) -> str:
+        return word.strip().lower()
+
+    def get(self, word: str) -> Optional[Dict[str, Any]]:
+        """读取单个单词，未缓存或媒体无法还原时返回 None"""
+        return self.get_many([word]).get(word)
+
+    def get_many(self, words: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """批量读取单词
+
+        媒体文件缺失时从 blob 还原；blob 也没有时视为未缓存。
+
+        Returns:
+            {传入的单词: 数据}，只包含命中的单词
+        """
+        by_key: Dict[str, list] = {}
+        for word in words:
+            if word and word.strip():
+                by_key.setdefault(self._key(word), []).append(word)
+        if not by_key:
+            return {}
+
+        rows = {}
+        keys = list(by_key)
+        with self._get_cursor() as cursor:
+            for start in range(0, len(keys), QUERY_BATCH):
+                batch = keys[start:start + QUERY_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(
+                    f'SELECT word, data, audio_hash, image_hash FROM words WHERE word IN ({placeholders})',
+                    batch
+                )
+                for key, data, audio_hash, image_hash in cursor.fetchall():
+                    rows[key] = (json.loads(data), {'audio_hash': audio_hash, 'image_hash': image_hash})
+
+        result = {}
+        for key, (data, hashes) in rows.items():
+            if not self._restore_media(data, hashes):
+                continue
+            for word in by_key[key]:
+                result[word] = dict(data)
+        return result
+
+    def _restore_media(self, data: Dict[str, Any], hashes: Dict[str, Optional[str]]) -> bool:
+        """填充媒体路径，文件缺失时从 blob 写回 MEDIA_DIR"""
+        for path_key, name_key, hash_key in MEDIA_FIELDS:
+            filename = data.get(name_key)
+            if not filename:
+                data[path_key] = None
+                continue
+            path = os.path.join(self._media_dir, filename)
+            data[path_key] = path
+            if os.path.exists(path):
+                continue
+            blob = self._load_blob(hashes.get(hash_key))
+            if blob is None:
+                return False
+            try:
+                os.makedirs(self._media_dir, exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(blob)
+            except OSError as e:
+                print(f"[缓存] 还原媒体 {filename} 失败: {e}")
+                return False
+        return True
+
+    def _load_blob(self, digest: Optional[str]) -> Optional[bytes]:
+        if not digest:
+            return None
+        with self._get_cursor() as cursor:
+            cursor.execute('SELECT data FROM media WHERE hash = ?', (digest,))
+            row = cursor.fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, word: str, data: Dict[str, Any]) -> bool:
+        """保存单词数据，媒体文件内容存为 blob（相同内容只存一份）
+
+        引用的媒体文件无法读取时不保存（下次查询时重新联网获取），
+        避免缓存成缺少发音/配图的卡片。
+
+        Returns:
+            是否已保存
+        """
+        record = {k: v for k, v in data.items() if k not in ('audio_path', 'image_path')}
+        hashes = {}
+        blobs = []
+        for path_key, name_key, hash_key in MEDIA_FIELDS:
+            path = data.get(path_key)
+            hashes[hash_key] = None
+            if not path:
+                record[name_key] = None
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                print(f"[缓存] {word} 媒体文件缺失，不缓存: {os.path.basename(path)}")
+                return False
+            record[name_key] = record.get(name_key) or os.path.basename(path)
+            digest = sha1(content).hexdigest()
+            hashes[hash_key] = digest
+            blobs.append((digest, content))
+
+        with self._get_cursor() as cursor:
+            cursor.executemany('INSERT OR IGNORE INTO media (hash, data) VALUES (?, ?)', blobs)
+            cursor.execute('''
+                INSERT OR REPLACE INTO words (word, data, audio_hash, image_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                self._key(word), json.dumps(record, ensure_ascii=False),
+                hashes['audio_hash'], hashes['image_hash'], time.time()
+            ))
+        return True
+
+    def count(self) -> int:
+        """单词数"""
+        with self._get_cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM words')
+            return cursor.fetchone()[0]
+
+    def media_count(self) -> int:
+        """媒体 blob 数"""
+        with self._get_cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM media')
+            return cursor.fetchone()[0]
+
+    def migrate_json_cache(self, json_dir: str) -> int:
+        """一次性迁移旧版 JSON 缓存
+
+        每个 JSON 写入数据库后删除；已迁移过（meta 中有标记）时直接返回。
+        媒体文件已缺失的条目不迁移（JSON 同样删除），查询时重新联网获取。
+
+        Returns:
+            迁移的单词数
+        """
+        with self._get_cursor() as cursor:
+            cursor.execute("SELECT value FROM meta WHERE key = 'json_migrated'")
+            if cursor.fetchone():
+                return 0
+
+        migrated = 0
+        if os.path.isdir(json_dir):
+            for name in os.listdir(json_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(json_dir, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    word = data.get('word')
+                    if not word:
+                        continue
+                    stored = self.put(word, data)
+                    os.remove(path)
+                    if stored:
+                        migrated += 1
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"[缓存] 迁移 {name} 失败: {e}")
+
+        with self._get_cursor() as cursor:
+            cursor.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (str(migrated),)
+            )
+        if migrated:
+            print(f"[缓存] 已迁移 {migrated} 个单词到 {os.path.basename(self._db_path)}")
+        return migrated
+
+    def close(self) -> None:
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+标注图层缓存测试
+
+Feature: annotation-layer-cache
+
+测试内容：
+1. 瓦片合成结果与逐项直接绘制一致（DPR 1 / 1.5 / 2）
+2. 无变化的帧不重绘瓦片；移动、改色、删除、重排只重绘受影响的瓦片
+3. 重置后全部重绘
+4. OverlayScreenshot 选中项实时绘制时保持绘制顺序（不露出被马赛克覆盖的内容）
+5. 微基准：200 条画笔笔画时，无变化帧的耗时远小于全部重绘
+"""
+
+import random
+import time
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QColor, QImage, QPainter, QPen, QPixmap, QPolygon
+
+from screenshot_tool.core.paint_engine import AnnotationLayerCache, OptimizedPaintEngine
+from screenshot_tool.ui.overlay_screenshot import DrawItem, DrawTool, OverlayScreenshot
+
+
+SCREEN = QRect(0, 0, 960, 720)
+
+
+def _draw(painter, item):
+    pen = QPen(item.color, item.width)
+    painter.setPen(pen)
+    if item.tool == DrawTool.RECT:
+        painter.drawRect(QRect(item.points[0], item.points[-1]).normalized())
+    else:
+        painter.drawPolyline(QPolygon(item.points))
+
+
+def _signature(item):
+    return (item.color.rgba(), item.width, len(item.points))
+
+
+def _strokes(count, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        x, y = rng.randint(0, 900), rng.randint(0, 660)
+        points = [QPoint(x, y)]
+        for _ in range(rng.randint(2, 20)):
+            x = min(SCREEN.right(), max(0, x + rng.randint(-15, 15)))
+            y = min(SCREEN.bottom(), max(0, y + rng.randint(-15, 15)))
+            points.append(QPoint(x, y))
+        color = QColor(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+        items.append(DrawItem(DrawTool.PEN, color, rng.choice([2, 3, 5]), points))
+    return items
+
+
+def _canvas(dpr):
+    image = QImage(int(SCREEN.width() * dpr), int(SCREEN.height() * dpr),
+                   QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(QColor(240, 240, 240))
+    return image
+
+
+def _direct(items, dpr):
+    image = _canvas(dpr)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    for item in items:
+        _draw(painter, item)
+    painter.end()
+    return image
+
+
+def _cached(layer, items, dpr):
+    image = _canvas(dpr)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    layer.sync(items, _signature)
+    layer.paint(painter, SCREEN, items, _draw)
+    painter.end()
+    return image
+
+
+def _array(image):
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    view = np.frombuffer(image.constBits(), dtype=np.uint8,
+                         count=image.bytesPerLine() * image.height())
+    return view.reshape(image.height(), -1)[:, :image.width() * 4].astype(np.int16)
+
+
+class TestLayerComposition:
+    """瓦片合成与直接绘制一致"""
+
+    @pytest.mark.parametrize("dpr", [1.0, 1.5, 2.0])
+    def test_matches_direct_painting(self, qapp, dpr):
+        items = _strokes(60, seed=int(dpr * 10))
+        items.append(DrawItem(DrawTool.RECT, QColor(255, 0, 0, 160), 4,
+                              [QPoint(100, 100), QPoint(700, 500)]))
+        layer = AnnotationLayerCache()
+        layer.reset(dpr)
+
+        diff = np.abs(_array(_cached(layer, items, dpr)) - _array(_direct(items, dpr)))
+
+        # 预乘 alpha 两次合成只有舍入误差
+        assert diff.max() <= 2
+
+
+class TestLayerInvalidation:
+    """瓦片失效测试"""
+
+    @pytest.fixture
+    def layer(self, qapp):
+        layer = AnnotationLayerCache()
+        layer.reset(1.0)
+        return layer
+
+    def test_unchanged_frame_renders_nothing(self, layer):
+        items = _strokes(40)
+        _cached(layer, items, 1.0)
+        assert layer.last_rendered_tiles > 0
+
+        _cached(layer, items, 1.0)
+        assert layer.last_rendered_tiles == 0
+
+    def test_move_only_touches_old_and_new_tiles(self, layer):
+        items = [
+            DrawItem(DrawTool.RECT, QColor("#FF0000"), 2, [QPoint(20, 20), QPoint(60, 60)]),
+            DrawItem(DrawTool.RECT, QColor("#00FF00"), 2, [QPoint(800, 600), QPoint(850, 650)]),
+        ]
+        _cached(layer, items, 1.0)
+
+        items[0].points = [QPoint(300, 20), QPoint(340, 60)]
+        result = _cached(layer, items, 1.0)
+
+        assert layer.last_rendered_tiles == 2
+        assert result == _direct(items, 1.0)
+
+    def test_color_change_invalidates(self, layer):
+        item = DrawItem(DrawTool.RECT, QColor("#FF0000"), 2, [QPoint(20, 20), QPoint(60, 60)])
+        _cached(layer, [item], 1.0)
+
+        item.color = QColor("#0000FF")
+        result = _cached(layer, [item], 1.0)
+
+        assert layer.last_rendered_tiles == 1
+        assert result == _direct([item], 1.0)
+
+    def test_removed_item_cleared(self, layer):
+        items = _strokes(10)
+        _cached(layer, items, 1.0)
+
+        removed = items.pop(3)
+        result = _cached(layer, items, 1.0)
+
+        assert layer.last_rendered_tiles >= 1
+        assert np.abs(_array(result) - _array(_direct(items, 1.0))).max() <= 2
+        assert removed._id not in layer._items
+
+    def test_reorder_invalidates(self, layer):
+        a = DrawItem(DrawTool.RECT, QColor("#FF0000"), 8, [QPoint(20, 20), QPoint(60, 60)])
+        b = DrawItem(DrawTool.RECT, QColor("#0000FF"), 8, [QPoint(20, 20), QPoint(60, 60)])
+        _cached(layer, [a, b], 1.0)
+
+        result = _cached(layer, [b, a], 1.0)
+        assert layer.last_rendered_tiles == 1
+        assert np.abs(_array(result) - _array(_direct([b, a], 1.0))).max() <= 2
+
+    def test_reset_rerenders(self, layer):
+        items = _strokes(10)
+        _cached(layer, items, 1.0)
+        layer.reset()
+
+        _cached(layer, items, 1.0)
+        assert layer.last_rendered_tiles > 0
+
+    def test_engine_resets_layer_on_resize(self, qapp):
+        engine = OptimizedPaintEngine()
+        engine.initialize(400, 300, 1.0)
+        engine.annotation_layer.sync(_strokes(5), _signature)
+        assert engine.annotation_layer._items
+
+        engine.initialize(800, 600, 2.0)
+        assert not engine.annotation_layer._items
+        assert engine.annotation_layer._device_pixel_ratio == 2.0
+
+
+class TestOverlaySignature:
+    """OverlayScreenshot 标注签名"""
+
+    def test_mosaic_signature_tracks_selection(self, qapp):
+        overlay = OverlayScreenshot()
+        overlay._selected = True
+        overlay._selection_rect = QRect(0, 0, 100, 100)
+        mosaic = DrawItem(DrawTool.MOSAIC, QColor("#000000"), 5, [QPoint(10, 10), QPoint(50, 50)])
+        rect = DrawItem(DrawTool.RECT, QColor("#000000"), 5, [QPoint(10, 10), QPoint(50, 50)])
+
+        before = overlay._annotation_signature(mosaic), overlay._annotation_signature(rect)
+        overlay._selection_rect = QRect(0, 0, 30, 30)
+        after = overlay._annotation_signature(mosaic), overlay._annotation_signature(rect)
+
+        assert before[0] != after[0]
+        assert before[1] == after[1]
+        overlay.deleteLater()
+
+
+class TestOverlayZOrder:
+    """选中项在两层缓存之间实时绘制，保持绘制顺序"""
+
+    @pytest.fixture
+    def overlay(self, qapp):
+        overlay = OverlayScreenshot()
+        overlay.resize(400, 300)
+        screenshot = QPixmap(400, 300)
+        screenshot.fill(QColor(255, 255, 255))
+        overlay._screenshot = screenshot
+        overlay._selected = True
+        overlay._selection_rect = QRect(0, 0, 400, 300)
+        overlay._paint_engine = OptimizedPaintEngine()
+        overlay._paint_engine.initialize(400, 300, 1.0)
+        yield overlay
+        overlay.deleteLater()
+
+    @staticmethod
+    def _render(overlay):
+        image = QImage(400, 300, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(255, 255, 255))
+        painter = QPainter(image)
+        overlay._paint_annotations(painter)
+        painter.end()
+        return image
+
+    def test_selected_item_stays_under_mosaic(self, overlay):
+        secret = DrawItem(DrawTool.RECT, QColor("#FF0000"), 10, [QPoint(50, 50), QPoint(150, 150)])
+        mosaic = DrawItem(DrawTool.MOSAIC, QColor("#000000"), 5, [QPoint(20, 20), QPoint(200, 200)])
+        marker = DrawItem(DrawTool.RECT, QColor("#0000FF"), 4, [QPoint(250, 50), QPoint(350, 150)])
+        overlay._draw_items = [secret, mosaic, marker]
+
+        unselected = self._render(overlay)
+        overlay._selected_item = secret
+        selected = self._render(overlay)
+
+        # 被马赛克覆盖的红框在选中时也不可见
+        assert QColor(selected.pixel(50, 100)) == QColor(255, 255, 255)
+        assert np.abs(_array(selected) - _array(unselected)).max() <= 2
+        assert mosaic._id in overlay._paint_engine.annotation_layer_above._items
+        assert secret._id not in overlay._paint_engine.annotation_layer._items
+
+        # 取消选中后回到下层缓存
+        overlay._selected_item = None
+        assert np.abs(_array(self._render(overlay)) - _array(unselected)).max() <= 2
+        assert not overlay._paint_engine.annotation_layer_above._items
+
+
+class TestLayerBenchmark:
+    """数百条笔画时的帧耗时"""
+
+    def test_unchanged_frame_faster_than_full_redraw(self, qapp):
+        items = _strokes(200, seed=7)
+        layer = AnnotationLayerCache()
+        layer.reset(1.0)
+        _cached(layer, items, 1.0)
+
+        def best_ms(func):
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                func()
+                best = min(best, (time.perf_counter() - start) * 1000)
+            return best
+
+        direct_ms = best_ms(lambda: _direct(items, 1.0))
+        cached_ms = best_ms(lambda: _cached(layer, items, 1.0))
+
+        print(f"\n200 条笔画: 全部重绘 {direct_ms:.1f}ms, 图层缓存 {cached_ms:.1f}ms")
+        assert layer.last_rendered_tiles == 0
+        assert cached_ms < direct_ms
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
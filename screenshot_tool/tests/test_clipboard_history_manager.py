@@ -25,6 +25,9 @@ from screenshot_tool.core.clipboard_history_manager import (
     ClipboardHistoryManager,
     ContentType,
     HistoryItem,
+    ImageEncodeOptions,
+    ImageEncodeQueue,
+    compute_image_hash,
     get_clipboard_data_dir,
 )
 from screenshot_tool.core.sqlite_history_storage import (
@@ -1395,6 +1398,395 @@ class TestImageFileManagement:
             assert not os.path.exists(path), f"图片文件应该被删除: {path}"
 
 
+class TestContentDedup:
+    """内容摘要去重测试
+    
+    Feature: clipboard-content-dedup
+    """
+    
+    @staticmethod
+    def _png_files(temp_data_dir):
+        images_dir = os.path.join(temp_data_dir, "clipboard_images")
+        return sorted(f for f in os.listdir(images_dir) if f.endswith(".png"))
+    
+    def test_duplicate_text_capture_touches_existing(self, manager):
+        """重复复制文本只更新已有条目的时间戳，保留 ID、置顶状态和 OCR 缓存"""
+        import time
+        
+        item1 = create_test_text_item("相同内容", is_pinned=True, ocr_cache="缓存")
+        manager.add_item(item1)
+        original_timestamp = manager.get_item(item1.id).timestamp
+        
+        time.sleep(0.01)
+        manager._capture_text("相同内容")
+        
+        matching = [h for h in manager.get_history() if h.text_content == "相同内容"]
+        assert len(matching) == 1
+        assert matching[0].id == item1.id
+        assert matching[0].is_pinned
+        assert matching[0].ocr_cache == "缓存"
+        assert matching[0].timestamp > original_timestamp
+    
+    def test_add_duplicate_item_replaces_existing(self, manager):
+        """add_item 添加重复内容时替换旧记录，新 ID 可查询且保留置顶状态"""
+        item1 = create_test_text_item("相同内容", is_pinned=True)
+        item2 = create_test_text_item("相同内容")
+        manager.add_item(item1)
+        manager.add_item(item2)
+        
+        assert manager.get_item(item1.id) is None
+        assert manager.get_item(item2.id).is_pinned
+        assert len(manager.get_history()) == 1
+    
+    def test_duplicate_text_moves_to_top(self, manager):
+        """重复复制的文本移到列表最前"""
+        manager._capture_text("第一条")
+        manager._capture_text("第二条")
+        manager._capture_text("第一条")
+        
+        page, _ = manager.get_history_page(limit=10)
+        assert [s.preview_text for s in page] == ["第一条", "第二条"]
+    
+    def test_line_endings_are_normalized(self, manager):
+        """CRLF 与 LF 换行的同一段文本视为重复"""
+        manager._capture_text("第一行\r\n第二行")
+        manager._capture_text("第一行\n第二行")
+        
+        assert len(manager.get_history()) == 1
+    
+    def test_duplicate_image_capture_skips_png(self, manager, temp_data_dir):
+        """重复复制同一张图片不写入新的 PNG 和记录"""
+        manager._capture_image(create_test_image())
+        assert manager.wait_for_pending_images(5000)
+        assert len(self._png_files(temp_data_dir)) == 1
+        first_id = manager.get_history()[0].id
+        
+        manager._capture_image(create_test_image())
+        assert manager.wait_for_pending_images(5000)
+        
+        history = manager.get_history()
+        assert len(history) == 1
+        assert history[0].id == first_id
+        assert len(self._png_files(temp_data_dir)) == 1
+    
+    def test_different_images_are_kept(self, manager, temp_data_dir):
+        """像素不同的图片各自保存"""
+        manager._capture_image(create_test_image())
+        other = create_test_image()
+        other.setPixel(0, 0, 0xFF00FF00)
+        manager._capture_image(other)
+        assert manager.wait_for_pending_images(5000)
+        
+        assert len(manager.get_history()) == 2
+        assert len(self._png_files(temp_data_dir)) == 2
+    
+    def test_image_hash_ignores_pixel_format(self):
+        """像素相同但格式不同的图片摘要一致"""
+        argb = create_test_image(7, 3)
+        rgb = argb.convertToFormat(QImage.Format.Format_RGB888)
+        
+        assert compute_image_hash(argb) == compute_image_hash(rgb)
+        assert compute_image_hash(argb) != compute_image_hash(create_test_image(3, 7))
+    
+    def test_shared_image_file_deleted_with_last_reference(self, manager, temp_data_dir):
+        """多条记录引用同一图片文件时，最后一条删除后才删除文件"""
+        image_rel_path = os.path.join("clipboard_images", "shared.png")
+        image_full_path = os.path.join(temp_data_dir, image_rel_path)
+        create_test_image().save(image_full_path, "PNG")
+        
+        item1 = create_test_image_item(image_path=image_rel_path)
+        item2 = create_test_image_item(image_path=image_rel_path)
+        manager.add_item(item1)
+        manager.add_item(item2)
+        
+        assert manager.delete_item(item1.id)
+        assert os.path.exists(image_full_path)
+        
+        assert manager.delete_item(item2.id)
+        assert not os.path.exists(image_full_path)
+    
+    def test_clear_all_keeps_image_of_pinned_item(self, manager, temp_data_dir):
+        """清空时保留置顶项仍引用的图片文件"""
+        image_rel_path = os.path.join("clipboard_images", "shared.png")
+        image_full_path = os.path.join(temp_data_dir, image_rel_path)
+        create_test_image().save(image_full_path, "PNG")
+        
+        manager.add_item(create_test_image_item(image_path=image_rel_path, is_pinned=True))
+        manager.add_item(create_test_image_item(image_path=image_rel_path))
+        
+        manager.clear_all(keep_pinned=True)
+        
+        assert len(manager.get_history()) == 1
+        assert os.path.exists(image_full_path)
+
+
+class TestImageEncodeQueue:
+    """后台图片编码队列测试
+    
+    Feature: image-encode-queue
+    """
+    
+    @staticmethod
+    def _distinct_image(index: int) -> QImage:
+        image = create_test_image(64, 64)
+        image.setPixel(0, 0, 0xFF000000 | index)
+        return image
+    
+    def test_capture_inserts_pending_item_immediately(self, manager, temp_data_dir):
+        """捕获图片后条目立即可见，文件落盘后退出待写盘状态"""
+        saved_ids = []
+        manager.image_saved.connect(saved_ids.append)
+        
+        image = create_test_image()
+        manager._capture_image(image)
+        
+        history = manager.get_history()
+        assert len(history) == 1
+        item = history[0]
+        assert manager.is_image_pending(item.id)
+        
+        # 编码期间可直接获取内存中的图片
+        pending_image = manager.get_screenshot_image(item.id)
+        assert pending_image is not None
+        assert pending_image.size() == image.size()
+        
+        assert manager.wait_for_pending_images(5000)
+        
+        assert not manager.is_image_pending(item.id)
+        assert saved_ids == [item.id]
+        assert os.path.exists(os.path.join(temp_data_dir, item.image_path))
+        assert not [f for f in os.listdir(os.path.join(temp_data_dir, "clipboard_images"))
+                    if f.endswith(".tmp")]
+    
+    def test_capture_does_not_encode_on_gui_thread(self, manager, monkeypatch):
+        """剪贴板图片编码不在调用线程执行"""
+        import threading
+        
+        save_threads = []
+        original_save = QImage.save
+        
+        def spy_save(image, *args):
+            save_threads.append(threading.get_ident())
+            return original_save(image, *args)
+        
+        monkeypatch.setattr(QImage, "save", spy_save)
+        
+        manager._capture_image(create_test_image(800, 600))
+        assert manager.wait_for_pending_images(5000)
+        
+        assert save_threads
+        assert threading.get_ident() not in save_threads
+    
+    def test_burst_keeps_every_capture_when_full(self, manager, temp_data_dir):
+        """队列满时条目照常插入（待写盘），编码任务排队，不丢弃任何一张"""
+        manager._encode_queue._max_pending = 1
+        
+        for i in range(4):
+            manager._capture_image(self._distinct_image(i))
+        history = manager.get_history()
+        assert len(history) == 4
+        assert all(manager.is_image_pending(item.id) for item in history)
+        assert manager._encode_queue.pending_count() <= 1
+        
+        assert manager.wait_for_pending_images(5000)
+        
+        history = manager.get_history()
+        assert {item.content_hash for item in history} == {
+            compute_image_hash(self._distinct_image(i)) for i in range(4)
+        }
+        for item in history:
+            assert not manager.is_image_pending(item.id)
+            assert os.path.exists(os.path.join(temp_data_dir, item.image_path))
+    
+    def test_deferred_item_deleted_before_encoding(self, manager, temp_data_dir):
+        """等待编码期间删除的条目不再写盘"""
+        manager._encode_queue._max_pending = 1
+        manager._capture_image(self._distinct_image(0))
+        manager._capture_image(self._distinct_image(1))
+        deferred = manager._deferred_saves[0][0]
+        deferred_item = manager.get_item(deferred)
+        
+        assert manager.delete_item(deferred)
+        assert manager.wait_for_pending_images(5000)
+        
+        assert not manager.is_image_pending(deferred)
+        assert not os.path.exists(os.path.join(temp_data_dir, deferred_item.image_path))
+    
+    def test_deleted_pending_item_releases_file(self, manager, temp_data_dir):
+        """编码期间删除条目，落盘的文件随后被清理"""
+        manager._capture_image(create_test_image())
+        item = manager.get_history()[0]
+        
+        assert manager.delete_item(item.id)
+        assert manager.wait_for_pending_images(5000)
+        
+        assert not os.path.exists(os.path.join(temp_data_dir, item.image_path))
+    
+    def test_queue_rejects_when_full_unless_forced(self, qapp, tmp_path):
+        """容量已满时 submit 返回 False，force 不受限制"""
+        queue = ImageEncodeQueue(max_workers=1, max_pending=1)
+        image = create_test_image()
+        
+        assert queue.submit("a", image, str(tmp_path / "a.png"))
+        assert not queue.submit("b", image, str(tmp_path / "b.png"))
+        assert queue.submit("c", image, str(tmp_path / "c.png"), force=True)
+        assert queue.wait_for_done(5000)
+        
+        assert (tmp_path / "a.png").exists()
+        assert not (tmp_path / "b.png").exists()
+        assert (tmp_path / "c.png").exists()
+        assert queue.pending_count() == 0
+    
+    def test_same_path_jobs_keep_last_image(self, qapp, tmp_path):
+        """同一文件的任务串行执行，最后提交的图片落盘"""
+        queue = ImageEncodeQueue(max_workers=2)
+        path = str(tmp_path / "same.png")
+        
+        queue.submit("a", create_test_image(100, 100), path)
+        queue.submit("a", create_test_image(30, 20), path)
+        assert queue.wait_for_done(5000)
+        
+        assert QImage(path).size() == create_test_image(30, 20).size()
+    
+    def test_png_compression_level(self, qapp, tmp_path):
+        """PNG 压缩级别映射到 Qt quality 参数"""
+        assert ImageEncodeOptions(png_compression=0).quality == 100
+        assert ImageEncodeOptions(png_compression=9).quality == 9
+        assert ImageEncodeOptions(png_compression=42).png_compression == 9
+        
+        from PySide6.QtGui import QColor, QLinearGradient, QPainter
+        
+        image = QImage(256, 256, QImage.Format.Format_ARGB32)
+        gradient = QLinearGradient(0, 0, 256, 256)
+        gradient.setColorAt(0.0, QColor(255, 0, 0))
+        gradient.setColorAt(1.0, QColor(0, 0, 255))
+        painter = QPainter(image)
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+        
+        sizes = {}
+        for level in (0, 9):
+            queue = ImageEncodeQueue(ImageEncodeOptions(png_compression=level))
+            path = tmp_path / f"level{level}.png"
+            queue.submit(str(level), image, str(path))
+            assert queue.wait_for_done(5000)
+            sizes[level] = path.stat().st_size
+        
+        assert sizes[9] < sizes[0]
+    
+    def test_webp_format(self, manager, temp_data_dir):
+        """WEBP 选项保存为无损 .webp 文件（Qt 无 WebP 插件时回退 PNG）"""
+        options = ImageEncodeOptions(format="webp")
+        if not ImageEncodeOptions.is_format_supported("WEBP"):
+            assert options.format == "PNG"
+            pytest.skip("Qt 未提供 WebP 插件")
+        
+        manager.set_image_encode_options(options)
+        manager._capture_image(create_test_image(40, 30))
+        assert manager.wait_for_pending_images(5000)
+        
+        item = manager.get_history()[0]
+        assert item.image_path.endswith(".webp")
+        with open(os.path.join(temp_data_dir, item.image_path), "rb") as f:
+            header = f.read(16)
+        assert header[:4] == b"RIFF" and header[8:16] == b"WEBPVP8L"
+
+
+class TestThumbnailStore:
+    """持久化缩略图测试
+    
+    Feature: history-thumbnail-store
+    """
+    
+    BORDER_ANNOTATION = {
+        "tool": "rect",
+        "color": "#00FF00",
+        "width": 40,
+        "points": [[0, 0], [399, 399]],
+    }
+    
+    def test_thumbnail_is_small_and_persisted(self, manager, sqlite_storage):
+        """生成的缩略图不超过最长边并写入 SQLite"""
+        from screenshot_tool.core.thumbnail_cache import THUMBNAIL_MAX_EDGE
+        
+        item_id = manager.add_screenshot_item(image=create_test_image(1600, 800))
+        assert manager.wait_for_pending_images(5000)
+        
+        thumbnail = manager.get_thumbnail(item_id)
+        assert thumbnail is not None
+        assert (thumbnail.width(), thumbnail.height()) == (THUMBNAIL_MAX_EDGE, THUMBNAIL_MAX_EDGE // 2)
+        assert sqlite_storage.get_thumbnail(item_id, THUMBNAIL_MAX_EDGE) is not None
+    
+    def test_thumbnail_reused_without_source_image(self, manager, temp_data_dir):
+        """已持久化的缩略图不再解码原图"""
+        item_id = manager.add_screenshot_item(image=create_test_image(400, 400))
+        assert manager.wait_for_pending_images(5000)
+        assert manager.get_thumbnail(item_id) is not None
+        
+        os.remove(os.path.join(temp_data_dir, manager.get_item(item_id).image_path))
+        manager._thumbnail_cache.clear()
+        
+        thumbnail = manager.get_thumbnail(item_id)
+        assert thumbnail is not None
+        assert thumbnail.pixel(0, 0) == 0xFFFF0000
+    
+    def test_thumbnail_for_pending_image(self, manager):
+        """图片仍在编码时用内存中的图片生成缩略图"""
+        item_id = manager.add_screenshot_item(image=create_test_image(400, 400))
+        thumbnail = manager.get_thumbnail(item_id)
+        assert thumbnail is not None
+        assert thumbnail.width() == 200
+        assert manager.wait_for_pending_images(5000)
+    
+    def test_annotations_update_invalidates_thumbnail(self, manager, qtbot):
+        """update_screenshot_annotations 后缩略图包含新标注"""
+        item_id = manager.add_screenshot_item(image=create_test_image(400, 400))
+        assert manager.wait_for_pending_images(5000)
+        assert manager.get_thumbnail(item_id).pixel(0, 0) == 0xFFFF0000
+        
+        with qtbot.waitSignal(manager.thumbnail_invalidated, timeout=1000) as blocker:
+            assert manager.update_screenshot_annotations(item_id, [self.BORDER_ANNOTATION])
+        assert blocker.args == [item_id]
+        
+        assert manager.get_item(item_id).has_annotations()
+        assert manager.get_thumbnail(item_id).pixel(0, 0) == 0xFF00FF00
+    
+    def test_screenshot_update_invalidates_thumbnail(self, manager):
+        """以相同 ID 更新截图后重新生成缩略图"""
+        item_id = manager.add_screenshot_item(image=create_test_image(400, 400))
+        assert manager.wait_for_pending_images(5000)
+        assert manager.get_thumbnail(item_id).pixel(0, 0) == 0xFFFF0000
+        
+        blue = QImage(400, 400, QImage.Format.Format_ARGB32)
+        blue.fill(0xFF0000FF)
+        manager.add_screenshot_item(image=blue, item_id=item_id)
+        
+        assert manager.get_thumbnail(item_id).pixel(0, 0) == 0xFF0000FF
+        assert manager.wait_for_pending_images(5000)
+    
+    def test_text_item_has_no_thumbnail(self, manager):
+        manager.add_item(create_test_text_item("hello"))
+        assert manager.get_thumbnail(manager.get_history()[0].id) is None
+    
+    def test_image_cache_is_lru_by_bytes(self, manager, temp_data_dir):
+        """全尺寸图片缓存按字节预算淘汰最久未使用的图片"""
+        image_bytes = 400 * 400 * 4
+        manager._image_cache = type(manager._image_cache)(image_bytes * 2, lambda im: im.sizeInBytes())
+        
+        ids = [manager.add_screenshot_item(image=create_test_image(400, 400)) for _ in range(3)]
+        assert manager.wait_for_pending_images(5000)
+        paths = {item_id: manager.get_item(item_id).image_path for item_id in ids}
+        
+        manager._get_cached_image(ids[0], paths[ids[0]])
+        manager._get_cached_image(ids[1], paths[ids[1]])
+        manager._get_cached_image(ids[0], paths[ids[0]])  # ids[0] 变为最近使用
+        manager._get_cached_image(ids[2], paths[ids[2]])
+        
+        assert ids[0] in manager._image_cache
+        assert ids[1] not in manager._image_cache
+        assert ids[2] in manager._image_cache
+
+
 class TestHistoryItemMethods:
     """HistoryItem 数据类方法测试
     
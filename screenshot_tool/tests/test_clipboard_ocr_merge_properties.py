@@ -89,6 +89,12 @@ class MockClipboardHistoryManager:
             or (item.preview_text and query_lower in item.preview_text.lower())
         ]
     
+    def get_history_page(self, after=None, limit=50, query=""):
+        return self.search(query)[:limit], None
+    
+    def get_thumbnail(self, item_id: str):
+        return None
+    
     def copy_to_clipboard(self, item_id: str):
         return True
     
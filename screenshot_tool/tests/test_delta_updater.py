@@ -8,15 +8,19 @@
 Feature: installer-incremental-update
 """
 
+import hashlib
 import os
 import shutil
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from hypothesis import given, strategies as st, settings, assume, HealthCheck
 from pathlib import Path
 
 from screenshot_tool.services.manifest_service import (
-    FileEntry, Manifest, DeltaResult, ManifestGenerator
+    ContentChunker, FileEntry, Manifest, DeltaResult, ManifestGenerator, DeltaCalculator
 )
 from screenshot_tool.services.delta_updater import (
     DeltaUpdater, verify_installation_integrity
@@ -383,3 +387,297 @@ class TestInstallationIntegrityVerification:
         
         # 清理
         test_file.unlink()
+    
+    def test_cached_verification_skips_rehash(self, temp_install_dir, tmp_path, monkeypatch):
+        """使用哈希缓存时，未变化的文件不重新计算"""
+        install_path = Path(temp_install_dir)
+        for i in range(20):
+            (install_path / f"f{i}.bin").write_bytes(os.urandom(1000))
+        past = time.time() - 60
+        for path in install_path.iterdir():
+            os.utime(path, (past, past))
+        manifest = ManifestGenerator().generate(temp_install_dir, "1.0.0")
+        cache_path = str(tmp_path / "integrity_cache.json")
+        
+        assert verify_installation_integrity(temp_install_dir, manifest, cache_path, max_workers=4)
+        
+        calls = []
+        monkeypatch.setattr(DeltaUpdater, '_calculate_hash',
+                            staticmethod(lambda p: calls.append(p) or "0" * 64))
+        assert verify_installation_integrity(temp_install_dir, manifest, cache_path)
+        assert calls == []
+        
+        # 同大小的修改改变了 mtime，会被重新计算
+        (install_path / "f0.bin").write_bytes(os.urandom(1000))
+        assert not verify_installation_integrity(temp_install_dir, manifest, cache_path)
+        assert len(calls) == 1
+
+
+
+# ========== 并发下载与断点续传 ==========
+# Feature: installer-incremental-update
+# Validates: Requirements 5.1, 5.2, 5.4
+
+class _FileServer(ThreadingHTTPServer):
+    """本地文件服务器：支持 Range 和 keep-alive，可让指定文件首次请求中途断开"""
+
+    daemon_threads = True
+
+    def __init__(self, files):
+        super().__init__(('127.0.0.1', 0), _FileHandler)
+        self.files = files                # {path: bytes}
+        self.flaky = {}                   # {path: 首次请求断开前发送的字节数}
+        self.support_range = True
+        self.requests = []                # [(path, Range 头)]
+        self.connections = set()
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split('/files/', 1)[-1]
+        range_header = self.headers.get('Range')
+        with server.lock:
+            server.requests.append((path, range_header))
+            server.connections.add(self.client_address)
+            cut_at = server.flaky.pop(path, None)
+
+        data = server.files.get(path)
+        if data is None:
+            self.send_error(404)
+            return
+
+        start, end = 0, len(data) - 1
+        if range_header and server.support_range:
+            first, last = range_header.split('=')[1].split('-')
+            start = int(first)
+            end = int(last) if last else end
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(data)}")
+        else:
+            self.send_response(200)
+        body = data[start:end + 1]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if cut_at is not None:
+            # 发送一部分后断开连接
+            self.wfile.write(body[:cut_at])
+            self.wfile.flush()
+            with server.lock:
+                server.bytes_sent += cut_at
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+        with server.lock:
+            server.bytes_sent += len(body)
+
+
+@pytest.fixture
+def file_server():
+    """启动本地 HTTP 文件服务器"""
+    server = _FileServer({})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _make_delta(server, files):
+    """把 {path: bytes} 放到服务器上并构造 DeltaResult（全部为新增文件）"""
+    server.files.update(files)
+    entries = [
+        FileEntry(path=path, size=len(data), hash=hashlib.sha256(data).hexdigest())
+        for path, data in files.items()
+    ]
+    return DeltaResult(added_files=entries)
+
+
+@pytest.fixture
+def updater(temp_install_dir):
+    updater = DeltaUpdater(temp_install_dir)
+    updater.RETRY_DELAY = 0
+    updater._temp_dir = Path(tempfile.mkdtemp(prefix='test_delta_dl_'))
+    yield updater
+    updater._close_session()
+    updater._cleanup_temp()
+
+
+class TestParallelResumableDownload:
+    """并发下载、连接复用、断点续传、边下边算哈希"""
+
+    def test_parallel_download_reuses_connections(self, file_server, updater):
+        files = {f"lib/mod_{i}.pyd": os.urandom(1000 + i * 37) for i in range(40)}
+        delta = _make_delta(file_server, files)
+
+        assert updater._download_delta(delta, file_server.base_url)
+
+        for path, data in files.items():
+            assert (updater._temp_dir / path).read_bytes() == data
+        # 40 个文件最多使用 MAX_WORKERS 个连接
+        assert len(file_server.connections) <= DeltaUpdater.MAX_WORKERS
+        assert len(file_server.requests) == 40
+
+    def test_verify_uses_streamed_hashes(self, file_server, updater, monkeypatch):
+        files = {f"f{i}.bin": os.urandom(5000) for i in range(5)}
+        delta = _make_delta(file_server, files)
+        assert updater._download_delta(delta, file_server.base_url)
+
+        def fail(*args):
+            raise AssertionError("不应重新读取文件计算哈希")
+
+        monkeypatch.setattr(DeltaUpdater, '_calculate_hash', staticmethod(fail))
+        assert updater._verify_downloads(delta)
+
+    def test_resume_with_range_after_disconnect(self, file_server, updater):
+        data = os.urandom(300_000)
+        delta = _make_delta(file_server, {"model.onnx": data})
+        file_server.flaky["model.onnx"] = 120_000
+
+        assert updater._download_delta(delta, file_server.base_url)
+
+        assert (updater._temp_dir / "model.onnx").read_bytes() == data
+        assert updater._download_hashes["model.onnx"] == hashlib.sha256(data).hexdigest()
+        ranges = [r for path, r in file_server.requests if path == "model.onnx"]
+        assert ranges[0] is None
+        assert ranges[1] is not None and ranges[1].startswith("bytes=")
+        # 从断开处附近续传（最后一个未完整收到的块会重传），不会从头下载
+        resume_at = int(ranges[1].split('=')[1].rstrip('-'))
+        assert 100_000 <= resume_at <= 120_000
+        assert file_server.bytes_sent == len(data) + 120_000 - resume_at
+
+    def test_restart_when_range_not_supported(self, file_server, updater):
+        data = os.urandom(200_000)
+        delta = _make_delta(file_server, {"big.dll": data})
+        file_server.flaky["big.dll"] = 50_000
+        file_server.support_range = False
+
+        assert updater._download_delta(delta, file_server.base_url)
+
+        assert (updater._temp_dir / "big.dll").read_bytes() == data
+        assert updater._verify_downloads(delta)
+
+    def test_missing_file_fails_download(self, file_server, updater):
+        delta = _make_delta(file_server, {"ok.txt": b"ok"})
+        missing = FileEntry(path="missing.txt", size=3, hash="0" * 64)
+        delta.added_files.append(missing)
+
+        assert not updater._download_delta(delta, file_server.base_url)
+
+    def test_full_update_end_to_end(self, file_server, temp_install_dir):
+        install_path = Path(temp_install_dir)
+        (install_path / "app.exe").write_bytes(b"old")
+        (install_path / "old.dll").write_bytes(b"gone")
+
+        new_app = os.urandom(20_000)
+        file_server.files.update({"app.exe": new_app, "plugins/new.dll": b"new plugin"})
+        delta = DeltaResult(
+            added_files=[FileEntry("plugins/new.dll", 10, hashlib.sha256(b"new plugin").hexdigest())],
+            modified_files=[FileEntry("app.exe", len(new_app), hashlib.sha256(new_app).hexdigest())],
+            deleted_files=["old.dll"],
+        )
+
+        updater = DeltaUpdater(temp_install_dir)
+        failures = []
+        updater.update_failed.connect(failures.append)
+        updater.start_update(delta, file_server.base_url)
+        updater._update_thread.join(timeout=30)
+
+        assert not failures
+        assert (install_path / "app.exe").read_bytes() == new_app
+        assert (install_path / "plugins/new.dll").read_bytes() == b"new plugin"
+        assert not (install_path / "old.dll").exists()
+
+
+# ========== 块级补丁 ==========
+# Feature: installer-incremental-update
+
+class TestChunkPatch:
+    """只下载变化的块，其余块从当前安装复用"""
+
+    @staticmethod
+    def _versions(tmp_path, old_data, new_data):
+        """生成新旧两个版本的清单并计算增量"""
+        chunker = ContentChunker(min_size=4096, avg_size=16384, max_size=65536)
+        generator = ManifestGenerator(chunker)
+        generator.CHUNKED_FILE_MIN_SIZE = 64 * 1024
+        manifests = []
+        for version, data in (("1.0.0", old_data), ("1.0.1", new_data)):
+            directory = tmp_path / version
+            directory.mkdir()
+            (directory / "model.onnx").write_bytes(data)
+            manifests.append(generator.generate(str(directory), version))
+        return chunker, DeltaCalculator().calculate(*manifests)
+
+    @staticmethod
+    def _patch_updater(temp_install_dir, chunker, old_data):
+        (Path(temp_install_dir) / "model.onnx").write_bytes(old_data)
+        updater = DeltaUpdater(temp_install_dir)
+        updater.RETRY_DELAY = 0
+        updater._chunker = chunker
+        updater._temp_dir = Path(tempfile.mkdtemp(prefix='test_delta_patch_'))
+        return updater
+
+    def test_patch_downloads_only_changed_chunks(self, tmp_path, file_server, temp_install_dir):
+        old_data = os.urandom(1_000_000)
+        new_data = old_data[:300_000] + b"patched!" * 64 + old_data[300_512:]
+        chunker, delta = self._versions(tmp_path, old_data, new_data)
+        assert "model.onnx" in delta.chunks
+        assert delta.delta_size < len(new_data) // 4
+
+        file_server.files["model.onnx"] = new_data
+        updater = self._patch_updater(temp_install_dir, chunker, old_data)
+        try:
+            assert updater._download_delta(delta, file_server.base_url)
+            assert (updater._temp_dir / "model.onnx").read_bytes() == new_data
+            assert updater._verify_downloads(delta)
+            # 只传输了变化的块
+            assert file_server.bytes_sent == delta.delta_size
+            assert all(r is not None for _, r in file_server.requests)
+        finally:
+            updater._close_session()
+            updater._cleanup_temp()
+
+    def test_patch_falls_back_without_range_support(self, tmp_path, file_server, temp_install_dir):
+        old_data = os.urandom(300_000)
+        new_data = os.urandom(1000) + old_data[1000:]
+        chunker, delta = self._versions(tmp_path, old_data, new_data)
+
+        file_server.files["model.onnx"] = new_data
+        file_server.support_range = False
+        updater = self._patch_updater(temp_install_dir, chunker, old_data)
+        try:
+            assert updater._download_delta(delta, file_server.base_url)
+            assert (updater._temp_dir / "model.onnx").read_bytes() == new_data
+            assert updater._verify_downloads(delta)
+        finally:
+            updater._close_session()
+            updater._cleanup_temp()
+
+    def test_patch_uses_actual_install_content(self, tmp_path, file_server, temp_install_dir):
+        """本地文件与清单不一致时重新分块，结果仍然正确"""
+        old_data = os.urandom(400_000)
+        new_data = old_data[:200_000] + os.urandom(5000) + old_data[200_000:]
+        chunker, delta = self._versions(tmp_path, old_data, new_data)
+
+        file_server.files["model.onnx"] = new_data
+        damaged = old_data[:100_000] + os.urandom(50_000) + old_data[150_000:]
+        updater = self._patch_updater(temp_install_dir, chunker, damaged)
+        try:
+            assert updater._download_delta(delta, file_server.base_url)
+            assert (updater._temp_dir / "model.onnx").read_bytes() == new_data
+        finally:
+            updater._close_session()
+            updater._cleanup_temp()
@@ -635,3 +635,102 @@ class TestHistoryListModelRowCount:
         # 列表模型的子项数应该为 0
         assert model.rowCount(parent_index) == 0
 
+
+
+class TestHistoryListModelPaging:
+    """HistoryListModel 按需分页加载测试
+
+    Feature: history-keyset-pagination
+    """
+
+    @staticmethod
+    def _make_loader(total: int, calls: list):
+        """创建模拟分页加载器：游标为下一条的序号"""
+        from screenshot_tool.core.history_item_data import HistoryItemData
+
+        def loader(cursor, limit):
+            calls.append((cursor, limit))
+            start = cursor or 0
+            end = min(total, start + limit)
+            items = [
+                HistoryItemData(id=f"item-{i}", preview_text=f"条目 {i}", timestamp="10:00")
+                for i in range(start, end)
+            ]
+            return items, (end if end < total else None)
+
+        return loader
+
+    def test_set_page_loader_loads_first_page_only(self, qtbot):
+        """设置加载器后只加载第一页"""
+        from screenshot_tool.ui.history_list_model import HistoryListModel
+
+        calls = []
+        model = HistoryListModel()
+        model.set_page_loader(self._make_loader(120, calls), page_size=50)
+
+        assert model.rowCount() == 50
+        assert calls == [(None, 50)]
+        assert model.canFetchMore()
+
+    def test_fetch_more_appends_until_exhausted(self, qtbot):
+        """fetchMore 逐页追加，数据取完后停止"""
+        from screenshot_tool.ui.history_list_model import HistoryListModel
+
+        calls = []
+        model = HistoryListModel()
+        model.set_page_loader(self._make_loader(120, calls), page_size=50)
+
+        model.fetchMore()
+        model.fetchMore()
+
+        assert model.rowCount() == 120
+        assert not model.canFetchMore()
+        assert calls == [(None, 50), (50, 50), (100, 50)]
+        assert [model.get_item_at(i).id for i in (0, 50, 119)] == ["item-0", "item-50", "item-119"]
+        assert model.row_of("item-119") == 119
+
+        # 没有更多数据时不再调用加载器
+        model.fetchMore()
+        assert len(calls) == 3
+
+    def test_fetch_more_emits_rows_inserted_at_end(self, qtbot):
+        """分页数据追加到列表末尾"""
+        from screenshot_tool.ui.history_list_model import HistoryListModel
+
+        model = HistoryListModel()
+        model.set_page_loader(self._make_loader(30, []), page_size=20)
+
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.fetchMore()
+
+        assert inserted == [(20, 29)]
+
+    def test_fetch_more_skips_items_already_added(self, qtbot):
+        """通过 add_item 插入到顶部的新条目不会在后续页中重复出现"""
+        from screenshot_tool.ui.history_list_model import HistoryListModel
+        from screenshot_tool.core.history_item_data import HistoryItemData
+
+        model = HistoryListModel()
+        model.set_page_loader(self._make_loader(40, []), page_size=20)
+        model.add_item(HistoryItemData(id="item-25", preview_text="新", timestamp="10:00"))
+        model.force_flush()
+
+        model.fetchMore()
+
+        ids = [model.get_item_at(i).id for i in range(model.rowCount())]
+        assert model.rowCount() == 40
+        assert len(set(ids)) == 40
+        assert ids[0] == "item-25"
+
+    def test_clear_all_stops_paging(self, qtbot):
+        """clear_all 后不再分页"""
+        from screenshot_tool.ui.history_list_model import HistoryListModel
+
+        model = HistoryListModel()
+        model.set_page_loader(self._make_loader(100, []), page_size=10)
+        model.clear_all()
+
+        assert model.rowCount() == 0
+        assert not model.canFetchMore()
+        assert model.row_of("item-0") == -1
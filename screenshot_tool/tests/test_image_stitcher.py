@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+图像拼接测试
+
+Feature: streaming-stitch
+
+测试内容：
+1. 条带互相关偏移估计：准确偏移、纯色/重复内容判为有歧义、反向滚动
+2. 可增长画布追加
+3. 流式垂直拼接还原原始长页面（含帧高度不同、有歧义时回退）
+4. ImageStitcher / EnhancedImageStitcher 的向下、向上、固定区域拼接
+5. 基准：100 帧拼接耗时与帧数成线性
+6. 磁盘画布模式：跨段读写、结果与预览、帧不保留、峰值内存与高度无关
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from screenshot_tool.services.image_stitcher import (
+    EnhancedImageStitcher,
+    ImageStitcher,
+    MappedStitchCanvas,
+    StitchCanvas,
+    StitchDirection,
+    VerticalStitchStream,
+    canvas_preview,
+    canvas_to_qimage,
+    cv2_to_qimage,
+    estimate_vertical_offset,
+    frame_strip,
+    qimage_to_cv2,
+)
+
+
+WIDTH = 320
+FRAME_HEIGHT = 240
+
+
+def _page(height, seed=0):
+    """模拟网页：随机“文字行”块，行间留白"""
+    rng = np.random.default_rng(seed)
+    page = np.full((height, WIDTH, 3), 250, dtype=np.uint8)
+    y = 4
+    while y < height - 12:
+        line_height = int(rng.integers(6, 14))
+        x = 8
+        while x < WIDTH - 20:
+            word = int(rng.integers(8, 40))
+            shade = int(rng.integers(0, 120))
+            page[y:y + line_height, x:min(x + word, WIDTH - 8)] = shade
+            x += word + int(rng.integers(4, 12))
+        y += line_height + int(rng.integers(4, 12))
+    return page
+
+
+def _frames(page, steps):
+    frames = []
+    top = 0
+    for step in [0] + list(steps):
+        top += step
+        frames.append(page[top:top + FRAME_HEIGHT].copy())
+    return frames, top
+
+
+def _to_qimage(frame):
+    return cv2_to_qimage(np.ascontiguousarray(frame))
+
+
+class TestOffsetEstimate:
+    """条带偏移估计"""
+
+    @pytest.mark.parametrize("scroll", [1, 37, 120, 150])
+    def test_exact_offset(self, scroll):
+        page = _page(1200)
+        prev, cur = page[100:100 + FRAME_HEIGHT], page[100 + scroll:100 + scroll + FRAME_HEIGHT]
+        assert estimate_vertical_offset(frame_strip(prev), frame_strip(cur)) == scroll
+
+    def test_no_scroll(self):
+        frame = _page(FRAME_HEIGHT)
+        assert estimate_vertical_offset(frame_strip(frame), frame_strip(frame)) == 0
+
+    def test_flat_band_is_ambiguous(self):
+        blank = np.full((FRAME_HEIGHT, WIDTH, 3), 255, dtype=np.uint8)
+        assert estimate_vertical_offset(frame_strip(blank), frame_strip(blank)) is None
+
+    def test_repeated_rows_are_ambiguous(self):
+        # 周期性条纹：多个位置得分相同
+        stripes = np.zeros((FRAME_HEIGHT * 2, WIDTH, 3), dtype=np.uint8)
+        stripes[::20] = 255
+        stripes[1::20] = 255
+        prev, cur = stripes[:FRAME_HEIGHT], stripes[40:40 + FRAME_HEIGHT]
+        assert estimate_vertical_offset(frame_strip(prev), frame_strip(cur)) is None
+
+    def test_upward_scroll_rejected(self):
+        page = _page(1200)
+        prev, cur = page[300:300 + FRAME_HEIGHT], page[250:250 + FRAME_HEIGHT]
+        assert estimate_vertical_offset(frame_strip(prev), frame_strip(cur)) is None
+
+
+class TestCanvas:
+    """可增长画布"""
+
+    def test_append_grows_and_widens(self):
+        canvas = StitchCanvas(4, initial_rows=2)
+        canvas.append(np.full((3, 4, 3), 1, dtype=np.uint8))
+        canvas.append(np.full((2, 6, 3), 2, dtype=np.uint8))
+
+        result = canvas.array()
+        assert result.shape == (5, 6, 3)
+        assert (result[:3, :4] == 1).all() and (result[:3, 4:] == 0).all()
+        assert (result[3:] == 2).all()
+
+
+class TestStreamingStitch:
+    """流式垂直拼接"""
+
+    def test_reconstructs_page(self):
+        page = _page(4000, seed=1)
+        frames, top = _frames(page, [120, 90, 200, 150, 60, 180, 130])
+
+        stream = VerticalStitchStream()
+        for frame in frames:
+            stream.push(frame)
+
+        result = stream.result()
+        assert result.shape[0] == top + FRAME_HEIGHT
+        assert np.array_equal(result, page[:top + FRAME_HEIGHT])
+
+    def test_known_offsets_skip_estimation(self):
+        page = _page(1200, seed=2)
+        frames, top = _frames(page, [100, 100])
+
+        stream = VerticalStitchStream()
+        assert [stream.push(f, o) for f, o in zip(frames, [0, 100, 100])] == [0, 100, 100]
+        assert np.array_equal(stream.result(), page[:top + FRAME_HEIGHT])
+
+    def test_ambiguous_uses_fallback(self):
+        blank = np.full((FRAME_HEIGHT, WIDTH, 3), 255, dtype=np.uint8)
+        calls = []
+
+        def fallback(prev, cur):
+            calls.append((prev.shape, cur.shape))
+            return 200
+
+        stream = VerticalStitchStream(fallback)
+        stream.push(blank)
+        assert stream.push(blank) == 200
+        assert len(calls) == 1
+        assert stream.result().shape[0] == 200 + FRAME_HEIGHT
+
+    def test_unresolved_appends_whole_frame(self):
+        blank = np.full((FRAME_HEIGHT, WIDTH, 3), 255, dtype=np.uint8)
+        stream = VerticalStitchStream()
+        stream.push(blank)
+        assert stream.push(blank) == FRAME_HEIGHT
+        assert stream.result().shape[0] == FRAME_HEIGHT * 2
+
+
+class TestImageStitcher:
+    """ImageStitcher / EnhancedImageStitcher"""
+
+    def test_add_frame_records_offsets(self, qapp):
+        page = _page(2000, seed=3)
+        frames, top = _frames(page, [100, 150, 120])
+        stitcher = ImageStitcher()
+        for frame in frames:
+            assert stitcher.add_frame(_to_qimage(frame))
+        assert stitcher._offsets == [0, 100, 150, 120]
+
+        result = stitcher.stitch()
+        assert result.success and result.frame_count == 4
+        assert np.array_equal(qimage_to_cv2(result.image), page[:top + FRAME_HEIGHT])
+
+    def test_add_frame_rejects_small_overlap(self, qapp):
+        page = _page(2000, seed=4)
+        stitcher = ImageStitcher(overlap_threshold=0.5)
+        assert stitcher.add_frame(_to_qimage(page[:FRAME_HEIGHT]))
+        # 只重叠 40 行（< 50%）
+        assert not stitcher.add_frame(_to_qimage(page[200:200 + FRAME_HEIGHT]))
+        assert stitcher.get_frame_count() == 1
+
+    def test_upward(self, qapp):
+        page = _page(2000, seed=5)
+        frames, top = _frames(page, [100, 150, 120])
+        stitcher = EnhancedImageStitcher()
+        for frame in reversed(frames):
+            stitcher.add_frame(_to_qimage(frame))
+
+        result = stitcher.stitch_upward()
+        assert result.success
+        assert np.array_equal(qimage_to_cv2(result.image), page[:top + FRAME_HEIGHT])
+
+    def test_fixed_regions(self, qapp):
+        page = _page(2000, seed=6)
+        header = np.full((30, WIDTH, 3), 40, dtype=np.uint8)
+        footer = np.full((20, WIDTH, 3), 200, dtype=np.uint8)
+        frames, top = _frames(page, [100, 150])
+        stitcher = EnhancedImageStitcher()
+        for frame in frames:
+            stitcher.add_frame(_to_qimage(np.vstack([header, frame, footer])))
+
+        result = stitcher.stitch_with_fixed_regions(top_fixed=30, bottom_fixed=20)
+        assert result.success
+        expected = np.vstack([header, page[:top + FRAME_HEIGHT], footer])
+        assert np.array_equal(qimage_to_cv2(result.image), expected)
+
+
+class TestDiskBackedStitch:
+    """磁盘画布模式"""
+
+    def test_mapped_canvas_across_segments(self, tmp_path, monkeypatch):
+        # 每段 10 行，强制跨段读写
+        monkeypatch.setattr(MappedStitchCanvas, "SEGMENT_BYTES", 10 * WIDTH * 3)
+        page = _page(95, seed=8)
+        canvas = MappedStitchCanvas(WIDTH, directory=str(tmp_path))
+        for start in range(0, 95, 7):
+            canvas.append(page[start:start + 7])
+
+        assert canvas.height == 95
+        assert np.array_equal(canvas.read(3, 8), page[3:8])
+        assert np.array_equal(canvas.read(5, 47), page[5:47])
+        assert np.array_equal(canvas.array(), page)
+        canvas.close()
+
+    def test_mapped_canvas_pads_and_crops(self, tmp_path):
+        canvas = MappedStitchCanvas(4, directory=str(tmp_path))
+        canvas.append(np.full((2, 2, 3), 7, dtype=np.uint8))
+        canvas.append(np.full((2, 6, 3), 9, dtype=np.uint8))
+
+        result = canvas.array()
+        assert result.shape == (4, 4, 3)
+        assert (result[:2, :2] == 7).all() and (result[:2, 2:] == 0).all()
+        assert (result[2:] == 9).all()
+        canvas.close()
+
+    def test_chunked_qimage_and_preview(self, qapp):
+        page = _page(3000, seed=9)
+        canvas = StitchCanvas(WIDTH)
+        canvas.append(page)
+
+        image = canvas_to_qimage(canvas, chunk_rows=256)
+        assert np.array_equal(qimage_to_cv2(image), page)
+
+        preview = canvas_preview(canvas, 300, chunk_rows=256)
+        assert preview.shape[:2] == (300, 32)
+
+    def test_reconstructs_page_without_keeping_frames(self, qapp, tmp_path):
+        page = _page(3000, seed=10)
+        frames, top = _frames(page, [100, 150, 120, 90, 160])
+        stitcher = EnhancedImageStitcher(disk_backed=True, spill_dir=str(tmp_path))
+        for frame in frames:
+            assert stitcher.add_frame(_to_qimage(frame))
+
+        assert stitcher.get_frame_count() == len(frames)
+        assert stitcher._frames == []
+        assert stitcher.get_estimated_height() == top + FRAME_HEIGHT
+
+        result = stitcher.stitch()
+        assert result.success and result.frame_count == len(frames)
+        assert np.array_equal(qimage_to_cv2(result.image), page[:top + FRAME_HEIGHT])
+
+        preview = stitcher.generate_preview(max_height=200)
+        assert preview.height() == 200
+
+        assert not stitcher.stitch_upward().success
+        stitcher.clear()
+        assert stitcher.get_frame_count() == 0
+        assert not stitcher.stitch().success
+
+    def test_vertical_only(self):
+        with pytest.raises(ValueError):
+            ImageStitcher(StitchDirection.HORIZONTAL, disk_backed=True)
+        stitcher = ImageStitcher(disk_backed=True)
+        with pytest.raises(ValueError):
+            stitcher.set_direction(StitchDirection.FREE)
+
+    def test_peak_memory_independent_of_height(self, qapp, tmp_path):
+        page = _page(80 * 120 + FRAME_HEIGHT, seed=11)
+        frames, _ = _frames(page, [120] * 79)
+        images = [_to_qimage(frame) for frame in frames]
+        frame_bytes = FRAME_HEIGHT * WIDTH * 3
+
+        def peak(disk_backed, count):
+            stitcher = ImageStitcher(disk_backed=disk_backed, spill_dir=str(tmp_path))
+            tracemalloc.start()
+            for image in images[:count]:
+                stitcher.add_frame(image)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stitcher.clear()
+            return peak_bytes
+
+        disk_20, disk_80 = peak(True, 20), peak(True, 80)
+        memory_80 = peak(False, 80)
+        print(f"\n峰值内存: 磁盘 20 帧 {disk_20 / 1024:.0f}KB, 80 帧 {disk_80 / 1024:.0f}KB, "
+              f"内存模式 80 帧 {memory_80 / 1024:.0f}KB")
+
+        assert disk_80 < frame_bytes * 4
+        assert disk_80 < disk_20 + frame_bytes
+        assert memory_80 > frame_bytes * 40
+
+
+class TestStitchBenchmark:
+    """拼接耗时与帧数成线性"""
+
+    def test_linear_in_frame_count(self):
+        page = _page(100 * 120 + FRAME_HEIGHT, seed=7)
+
+        def run(count):
+            frames, _ = _frames(page, [120] * (count - 1))
+            start = time.perf_counter()
+            stream = VerticalStitchStream()
+            for frame in frames:
+                stream.push(frame)
+            return (time.perf_counter() - start) * 1000, stream.result().shape[0]
+
+        run(10)  # 预热
+        time_25, height_25 = run(25)
+        time_100, height_100 = run(100)
+        print(f"\n拼接 25 帧 {time_25:.1f}ms, 100 帧 {time_100:.1f}ms（结果高度 {height_100}px）")
+
+        assert height_100 == 99 * 120 + FRAME_HEIGHT
+        # 4 倍帧数，允许一定的计时抖动，但不应是平方增长（16 倍）
+        assert time_100 < time_25 * 8
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
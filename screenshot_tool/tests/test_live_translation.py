@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+实时屏幕翻译流水线测试
+
+Feature: live-screen-translation
+
+测试内容：
+1. 画面无变化时跳过 OCR 和翻译（含轻微噪声）
+2. 只重新识别变化的行带、只翻译新出现的行
+3. 批量翻译行数不符时逐行回退；翻译失败不缓存
+4. 语言切换后重新翻译
+5. 字幕序列的调用次数与逐帧完整处理对比
+6. ScreenTranslator 定时模式在后台线程运行
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QImage
+
+from screenshot_tool.services.live_translation import (
+    LiveTranslationPipeline,
+    find_text_bands,
+    gray_array,
+)
+
+
+# 合成"文字"：每个字符是 4x10 的色块，灰度编码字符，背景为白色
+# （字符码乘 37 取模打散，相邻字符的灰度差也足够大）
+CHAR_X0, CHAR_STEP, CHAR_WIDTH, LINE_HEIGHT = 8, 6, 4, 10
+CHAR_GRAY = {chr(32 + i): 20 + (i * 37 % 95) * 2 for i in range(95)}
+GRAY_CHAR = {gray: ch for ch, gray in CHAR_GRAY.items()}
+
+
+def _render(lines, width=400, height=120, line_gap=14, noise=None):
+    """把文本行渲染为灰度图（QImage）"""
+    gray = np.full((height, width), 255, dtype=np.uint8)
+    for row, line in enumerate(lines):
+        top = 6 + row * (LINE_HEIGHT + line_gap)
+        for k, ch in enumerate(line):
+            x = CHAR_X0 + k * CHAR_STEP
+            gray[top:top + LINE_HEIGHT, x:x + CHAR_WIDTH] = CHAR_GRAY[ch]
+    if noise is not None:
+        gray = np.clip(gray.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    return QImage(gray.data, width, height, width, QImage.Format.Format_Grayscale8).copy()
+
+
+def _decode(image):
+    """假 OCR：从色块灰度解码文字"""
+    gray = gray_array(image)
+    lines = []
+    ink_rows = np.flatnonzero((gray < 230).any(axis=1))
+    if len(ink_rows) == 0:
+        return ""
+    runs = np.split(ink_rows, np.flatnonzero(np.diff(ink_rows) > 1) + 1)
+    for run in runs:
+        row = gray[int(run[len(run) // 2])]
+        chars = []
+        x = CHAR_X0 + CHAR_WIDTH // 2
+        while x < len(row) and row[x] < 230:
+            chars.append(GRAY_CHAR[int(row[x])])
+            x += CHAR_STEP
+        lines.append(''.join(chars))
+    return '\n'.join(lines)
+
+
+class FakeEngines:
+    """记录调用的假 OCR / 翻译引擎"""
+
+    def __init__(self, batch_ok=True, fail=False):
+        self.ocr_calls = []
+        self.translate_calls = []
+        self.batch_ok = batch_ok
+        self.fail = fail
+
+    def ocr(self, image):
+        text = _decode(image)
+        self.ocr_calls.append(text)
+        return text
+
+    def translate(self, text, target, source):
+        self.translate_calls.append(text)
+        if self.fail:
+            return "quota exceeded", "", False
+        lines = [f"[{target}]{line}" for line in text.split('\n')]
+        if not self.batch_ok and len(lines) > 1:
+            return ' '.join(lines), "en", True
+        return '\n'.join(lines), "en", True
+
+
+def _pipeline(engines):
+    return LiveTranslationPipeline(engines.ocr, engines.translate)
+
+
+class TestBands:
+    """行带检测"""
+
+    def test_bands_match_lines(self, qapp):
+        gray = gray_array(_render(["hello", "world", "again"]))
+        bands = find_text_bands(gray)
+        assert len(bands) == 3
+        assert all(bottom - top == LINE_HEIGHT + 4 for top, bottom in bands)
+
+    def test_blank_image_has_no_bands(self, qapp):
+        assert find_text_bands(gray_array(_render([]))) == []
+
+
+class TestPipeline:
+    """变化感知的识别与翻译"""
+
+    def test_unchanged_frames_skipped(self, qapp):
+        engines = FakeEngines()
+        pipeline = _pipeline(engines)
+        rng = np.random.default_rng(0)
+
+        first = pipeline.process(_render(["good morning", "how are you"]))
+        assert first.changed and first.success
+        assert first.text == "good morning\nhow are you"
+        assert first.translated == "[zh]good morning\n[zh]how are you"
+        assert first.detected_lang == "en"
+
+        for _ in range(9):
+            noise = rng.integers(-2, 3, size=(120, 400))
+            result = pipeline.process(_render(["good morning", "how are you"], noise=noise))
+            assert not result.changed
+
+        assert pipeline.stats.skipped_frames == 9
+        assert len(engines.ocr_calls) == 2
+        assert len(engines.translate_calls) == 1
+
+    def test_only_changed_line_recognized_and_translated(self, qapp):
+        engines = FakeEngines()
+        pipeline = _pipeline(engines)
+        pipeline.process(_render(["title", "first subtitle", "footer"]))
+        engines.ocr_calls.clear()
+        engines.translate_calls.clear()
+
+        result = pipeline.process(_render(["title", "second subtitle", "footer"]))
+
+        assert result.changed
+        assert engines.ocr_calls == ["second subtitle"]
+        assert engines.translate_calls == ["second subtitle"]
+        assert result.translated == "[zh]title\n[zh]second subtitle\n[zh]footer"
+
+    def test_returning_line_served_from_cache(self, qapp):
+        engines = FakeEngines()
+        pipeline = _pipeline(engines)
+        pipeline.process(_render(["line a"]))
+        pipeline.process(_render(["line b"]))
+        engines.ocr_calls.clear()
+        engines.translate_calls.clear()
+
+        result = pipeline.process(_render(["line a"]))
+
+        assert result.changed
+        assert result.translated == "[zh]line a"
+        assert engines.ocr_calls == []
+        assert engines.translate_calls == []
+
+    def test_batch_mismatch_falls_back_to_lines(self, qapp):
+        engines = FakeEngines(batch_ok=False)
+        pipeline = _pipeline(engines)
+
+        result = pipeline.process(_render(["one", "two"]))
+
+        assert result.translated == "[zh]one\n[zh]two"
+        assert engines.translate_calls == ["one\ntwo", "one", "two"]
+
+    def test_failure_not_cached_and_retried(self, qapp):
+        engines = FakeEngines(fail=True)
+        pipeline = _pipeline(engines)
+
+        result = pipeline.process(_render(["retry me"]))
+        assert not result.success
+        assert result.error == "quota exceeded"
+
+        engines.fail = False
+        result = pipeline.process(_render(["retry me"]))
+        assert result.success and result.changed
+        assert result.translated == "[zh]retry me"
+        # 识别结果已缓存，只重试翻译
+        assert len(engines.ocr_calls) == 1
+
+    def test_language_change_retranslates(self, qapp):
+        engines = FakeEngines()
+        pipeline = _pipeline(engines)
+        pipeline.process(_render(["hello"]))
+
+        pipeline.set_languages("ja")
+        result = pipeline.process(_render(["hello"]))
+
+        assert result.changed
+        assert result.translated == "[ja]hello"
+        assert len(engines.ocr_calls) == 1
+
+    def test_subtitle_sequence_call_reduction(self, qapp):
+        """500ms 间隔 60 帧、每 10 帧换一次字幕"""
+        engines = FakeEngines()
+        pipeline = _pipeline(engines)
+        subtitles = [f"subtitle number {i}" for i in range(6)]
+        frames = [_render(["episode 3", subtitles[i // 10]]) for i in range(60)]
+
+        for frame in frames:
+            pipeline.process(frame)
+
+        naive = 60 * 2  # 每帧一次整图 OCR + 一次翻译
+        actual = len(engines.ocr_calls) + len(engines.translate_calls)
+        print(f"\n60 帧调用次数: 逐帧 {naive} 次, 增量 {actual} 次 "
+              f"(OCR {len(engines.ocr_calls)}, 翻译 {len(engines.translate_calls)})")
+        # 每条字幕只需一次 OCR（变化的行带）和一次翻译，固定的标题行只识别一次
+        assert len(engines.ocr_calls) == 6 + 1
+        assert len(engines.translate_calls) == 6
+        assert actual * 9 <= naive
+
+
+class TestScreenTranslatorTimedMode:
+    """ScreenTranslator 定时模式"""
+
+    def test_timed_mode_runs_in_background(self, qtbot):
+        from screenshot_tool.ui.screen_translator import ScreenTranslator
+
+        engines = FakeEngines()
+        frames = iter([["first"]] * 3 + [["second"]] * 100)
+        threads = set()
+
+        def ocr(image):
+            threads.add(threading.get_ident())
+            return engines.ocr(image)
+
+        translator = ScreenTranslator(QRect(0, 0, 400, 120), ocr, engines.translate)
+        qtbot.addWidget(translator)
+        translator._capture_region = lambda: _render(next(frames, ["second"]))
+
+        translator.start_timed_translation(100)
+        try:
+            qtbot.waitUntil(lambda: translator.get_translated_text() == "[zh]second", timeout=5000)
+        finally:
+            translator.stop_timed_translation()
+
+        assert threading.get_ident() not in threads
+        assert translator.get_original_text() == "second"
+        assert engines.translate_calls == ["first", "second"]
+        assert translator._live_worker is None
+
+    def test_stopping_worker_kept_alive_and_pipeline_not_shared(self, qtbot):
+        from screenshot_tool.ui import screen_translator
+        from screenshot_tool.ui.screen_translator import ScreenTranslator
+
+        engines = FakeEngines()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_ocr(image):
+            entered.set()
+            release.wait(5)
+            return engines.ocr(image)
+
+        translator = ScreenTranslator(QRect(0, 0, 400, 120), slow_ocr, engines.translate)
+        qtbot.addWidget(translator)
+        translator._capture_region = lambda: _render(["first"])
+
+        translator.start_timed_translation(100)
+        assert entered.wait(5)
+        old_worker = translator._live_worker
+        old_pipeline = translator._live_pipeline
+
+        # 旧线程仍在 OCR 中：停止后保留引用，不阻塞界面
+        translator.stop_timed_translation()
+        assert old_worker.isRunning()
+        assert old_worker in screen_translator._stopping_workers
+
+        # 立即重启时换用新流水线，不与旧线程共用
+        translator.start_timed_translation(100)
+        try:
+            assert translator._live_pipeline is not old_pipeline
+            release.set()
+            qtbot.waitUntil(lambda: old_worker not in screen_translator._stopping_workers, timeout=5000)
+        finally:
+            release.set()
+            translator.stop_timed_translation()
+            screen_translator._wait_stopping_workers()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
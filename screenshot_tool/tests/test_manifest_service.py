@@ -9,12 +9,16 @@ Feature: installer-incremental-update
 """
 
 import json
+import os
+import random
+import time
 import pytest
 from hypothesis import given, strategies as st, settings, assume, HealthCheck
 from datetime import datetime, timezone
 
 from screenshot_tool.services.manifest_service import (
-    FileEntry, Manifest, DeltaResult, ManifestGenerator, DeltaCalculator
+    ChunkEntry, ContentChunker, FileEntry, FileHashCache, Manifest, DeltaResult,
+    ManifestGenerator, DeltaCalculator
 )
 
 
@@ -387,3 +391,249 @@ class TestManifestGenerator:
         paths = {f.path for f in manifest.files}
         assert "app.exe" in paths
         assert "lib/module.dll" in paths
+
+
+# ========== 内容定义分块 ==========
+# Feature: installer-incremental-update
+
+def _random_bytes(size, seed):
+    return random.Random(seed).randbytes(size)
+
+
+class TestContentChunker:
+    """内容定义分块测试"""
+
+    def test_chunk_sizes_within_bounds(self):
+        chunker = ContentChunker(min_size=1024, avg_size=4096, max_size=16384)
+        data = _random_bytes(500_000, 1)
+        chunks = chunker.chunk_bytes(data)
+
+        assert sum(c.size for c in chunks) == len(data)
+        assert all(c.size <= 16384 for c in chunks)
+        assert all(c.size >= 1024 for c in chunks[:-1])
+        # 平均块大小接近设定值
+        assert 2048 < len(data) / len(chunks) < 12000
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        chunker = ContentChunker(min_size=1024, avg_size=4096, max_size=16384)
+        data = _random_bytes(400_000, 2)
+        edited = data[:200_000] + b"inserted bytes" + data[200_000:]
+
+        old_hashes = {c.hash for c in chunker.chunk_bytes(data)}
+        new_chunks = chunker.chunk_bytes(edited)
+        changed = sum(c.size for c in new_chunks if c.hash not in old_hashes)
+        assert changed < 3 * 16384
+
+    def test_chunk_file_matches_in_memory(self, tmp_path):
+        chunker = ContentChunker(min_size=1024, avg_size=4096, max_size=16384)
+        # 小的读取块让候选边界跨越多次读取
+        chunker.READ_BLOCK = 10_000
+        data = _random_bytes(123_457, 3)
+        path = tmp_path / "model.onnx"
+        path.write_bytes(data)
+
+        chunks, file_hash = chunker.chunk_file(str(path))
+
+        assert chunks == chunker.chunk_bytes(data)
+        assert file_hash == ManifestGenerator.calculate_file_hash(str(path))
+
+    def test_empty_input(self, tmp_path):
+        chunker = ContentChunker()
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        assert chunker.chunk_bytes(b"") == []
+        assert chunker.chunk_file(str(path))[0] == []
+
+
+class TestChunkedManifest:
+    """清单中的分块信息"""
+
+    def test_generate_emits_chunks_for_large_files(self, tmp_path):
+        (tmp_path / "small.txt").write_bytes(b"small")
+        (tmp_path / "big.pyd").write_bytes(_random_bytes(300_000, 4))
+
+        generator = ManifestGenerator(ContentChunker(min_size=1024, avg_size=4096, max_size=16384))
+        generator.CHUNKED_FILE_MIN_SIZE = 100_000
+        manifest = generator.generate(str(tmp_path), "1.0.0")
+
+        assert set(manifest.chunks) == {"big.pyd"}
+        big = manifest.get_file_by_path("big.pyd")
+        assert sum(c.size for c in manifest.chunks["big.pyd"]) == big.size
+        assert big.hash == ManifestGenerator.calculate_file_hash(str(tmp_path / "big.pyd"))
+
+    def test_chunks_round_trip_and_old_format(self):
+        manifest = Manifest(
+            version="1.0.0",
+            build_time="2024-01-01T00:00:00+00:00",
+            files=[FileEntry(path="a.bin", size=3, hash="a" * 64)],
+            chunks={"a.bin": [ChunkEntry(size=1, hash="b" * 64), ChunkEntry(size=2, hash="c" * 64)]}
+        )
+        assert Manifest.from_json(manifest.to_json()) == manifest
+
+        # 没有分块的清单不输出 chunks 键，旧格式可以正常读取
+        plain = Manifest(version="1.0.0", build_time="2024-01-01T00:00:00+00:00",
+                         files=manifest.files)
+        assert "chunks" not in plain.to_dict()
+        assert Manifest.from_dict(plain.to_dict()).chunks == {}
+
+    def test_delta_counts_only_missing_chunks(self):
+        shared = [ChunkEntry(size=1000, hash=f"{i:064x}") for i in range(9)]
+        new_chunk = ChunkEntry(size=1000, hash="f" * 64)
+        local = Manifest(
+            version="1.0.0", build_time="2024-01-01T00:00:00+00:00",
+            files=[FileEntry(path="model.onnx", size=10_000, hash="1" * 64)],
+            chunks={"model.onnx": shared + [ChunkEntry(size=1000, hash="e" * 64)]}
+        )
+        remote = Manifest(
+            version="1.0.1", build_time="2024-02-01T00:00:00+00:00",
+            files=[FileEntry(path="model.onnx", size=10_000, hash="2" * 64)],
+            chunks={"model.onnx": shared + [new_chunk]}
+        )
+
+        delta = DeltaCalculator().calculate(local, remote)
+
+        assert [f.path for f in delta.modified_files] == ["model.onnx"]
+        assert delta.chunks == {"model.onnx": shared + [new_chunk]}
+        assert delta.delta_size == 1000
+
+
+# ========== 索引与增量生成 ==========
+# Feature: installer-incremental-update
+
+def _age_files(directory, seconds=60):
+    """把文件 mtime 调到过去，避开缓存的 racy 窗口"""
+    past = time.time() - seconds
+    for path in directory.rglob('*'):
+        if path.is_file():
+            os.utime(path, (past, past))
+
+
+class TestManifestIndex:
+    """路径索引"""
+
+    def test_index_follows_file_list_changes(self):
+        manifest = Manifest(
+            version="1.0.0", build_time="2024-01-01T00:00:00+00:00",
+            files=[FileEntry(path="a", size=1, hash="a" * 64),
+                   FileEntry(path="a", size=2, hash="b" * 64)]
+        )
+        # 重复路径与线性查找一致，返回第一个
+        assert manifest.get_file_by_path("a").size == 1
+        assert manifest.get_file_by_path("missing") is None
+
+        manifest.files.append(FileEntry(path="b", size=3, hash="c" * 64))
+        assert manifest.get_file_by_path("b").size == 3
+        manifest.files = [FileEntry(path="c", size=4, hash="d" * 64)]
+        assert manifest.get_file_by_path("a") is None
+        assert manifest.get_all_paths() == {"c"}
+
+    def test_large_delta_is_linear(self):
+        def build(version, count, seed):
+            return Manifest(
+                version=version, build_time="2024-01-01T00:00:00+00:00",
+                files=[FileEntry(path=f"lib/f{i}.pyd", size=i,
+                                 hash=f"{(i * seed) % 7:064x}") for i in range(count)]
+            )
+
+        local, remote = build("1.0.0", 20000, 1), build("1.0.1", 20000, 3)
+        start = time.perf_counter()
+        delta = DeltaCalculator().calculate(local, remote)
+        elapsed = time.perf_counter() - start
+
+        assert len(delta.modified_files) + len(delta.unchanged_files) == 20000
+        assert elapsed < 1.0
+
+
+class TestIncrementalGeneration:
+    """并行哈希与哈希缓存"""
+
+    def _tree(self, tmp_path):
+        source = tmp_path / "build"
+        (source / "lib").mkdir(parents=True)
+        for i in range(30):
+            (source / "lib" / f"mod{i}.pyd").write_bytes(os.urandom(2000 + i))
+        (source / "model.onnx").write_bytes(os.urandom(300_000))
+        _age_files(source)
+        return source
+
+    def _generator(self):
+        generator = ManifestGenerator(ContentChunker(min_size=1024, avg_size=4096, max_size=16384),
+                                      max_workers=4)
+        generator.CHUNKED_FILE_MIN_SIZE = 100_000
+        return generator
+
+    def test_parallel_matches_serial(self, tmp_path):
+        source = self._tree(tmp_path)
+        parallel = self._generator().generate(str(source), "1.0.0")
+        serial = ManifestGenerator(self._generator()._chunker, max_workers=1)
+        serial.CHUNKED_FILE_MIN_SIZE = 100_000
+        expected = serial.generate(str(source), "1.0.0")
+
+        assert parallel.files == expected.files
+        assert parallel.chunks == expected.chunks
+        for entry in parallel.files:
+            assert entry.hash == ManifestGenerator.calculate_file_hash(str(source / entry.path))
+
+    def test_cache_skips_unchanged_files(self, tmp_path, monkeypatch):
+        source = self._tree(tmp_path)
+        cache_path = str(tmp_path / "hash_cache.json")
+        generator = self._generator()
+        first = generator.generate(str(source), "1.0.0", cache_path=cache_path)
+
+        calls = []
+        original = ManifestGenerator.calculate_file_hash
+        monkeypatch.setattr(ManifestGenerator, 'calculate_file_hash',
+                            staticmethod(lambda p: calls.append(p) or original(p)))
+        monkeypatch.setattr(ContentChunker, 'chunk_file',
+                            lambda self, p: pytest.fail("不应重新分块"))
+
+        # 未变化：不读取任何文件
+        again = generator.generate(str(source), "1.0.0", cache_path=cache_path)
+        assert again.files == first.files
+        assert again.chunks == first.chunks
+        assert calls == []
+
+        # 修改一个文件：只重新计算它
+        changed = source / "lib" / "mod3.pyd"
+        changed.write_bytes(b"changed")
+        past = time.time() - 30
+        os.utime(changed, (past, past))
+        updated = generator.generate(str(source), "1.0.1", cache_path=cache_path)
+        assert [os.path.basename(p) for p in calls] == ["mod3.pyd"]
+        assert updated.get_file_by_path("lib/mod3.pyd").hash == original(str(changed))
+
+    def test_integrity_check_keeps_shared_cache_chunks(self, tmp_path, monkeypatch):
+        from screenshot_tool.services.delta_updater import verify_installation_integrity
+
+        source = self._tree(tmp_path)
+        cache_path = str(tmp_path / "hash_cache.json")
+        generator = self._generator()
+        manifest = generator.generate(str(source), "1.0.0", cache_path=cache_path)
+
+        # 不带分块器打开同一缓存：分块和分块参数原样保留
+        assert verify_installation_integrity(str(source), manifest, cache_path)
+        data = json.loads(open(cache_path, encoding="utf-8").read())
+        assert data["chunker"] == [1024, 4096, 16384]
+        assert data["entries"]["model.onnx"][3]
+
+        monkeypatch.setattr(ContentChunker, 'chunk_file',
+                            lambda self, p: pytest.fail("不应重新分块"))
+        again = generator.generate(str(source), "1.0.0", cache_path=cache_path)
+        assert again.chunks == manifest.chunks
+
+    def test_recent_files_not_cached(self, tmp_path):
+        path = tmp_path / "fresh.bin"
+        path.write_bytes(b"fresh")
+        cache = FileHashCache(str(tmp_path / "cache.json"))
+        cache.put("fresh.bin", path.stat(), "0" * 64)
+        assert cache.get("fresh.bin", path.stat()) is None
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        source = self._tree(tmp_path)
+        cache_path = tmp_path / "hash_cache.json"
+        cache_path.write_text("not json", encoding="utf-8")
+
+        manifest = self._generator().generate(str(source), "1.0.0", cache_path=str(cache_path))
+
+        assert len(manifest.files) == 31
+        assert json.loads(cache_path.read_text(encoding="utf-8"))["version"] == FileHashCache.FORMAT_VERSION
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+马赛克引擎测试
+
+Feature: vectorized-mosaic
+
+测试内容：
+1. 块平均与逐块朴素实现一致（包括边缘不完整的块）
+2. 区域裁剪、非 32 位格式、模糊和纯色遮盖模式
+3. AnnotationRenderer 使用同一引擎
+4. 微基准：3840x2160 全图像素化
+"""
+
+import time
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter
+
+from screenshot_tool.core.annotation_renderer import AnnotationRenderer
+from screenshot_tool.core.mosaic_engine import (
+    MosaicMode,
+    image_array_view,
+    pixelate_array,
+    render_mosaic,
+)
+
+
+def _naive_pixelate(region, block_size):
+    height, width = region.shape[:2]
+    rows = []
+    for top in range(0, height, block_size):
+        row = []
+        for left in range(0, width, block_size):
+            block = region[top:top + block_size, left:left + block_size].reshape(-1, region.shape[2])
+            row.append(block.sum(axis=0) // len(block))
+        rows.append(row)
+    return np.array(rows, dtype=np.uint8)
+
+
+def _gradient_image(width, height, fmt=QImage.Format.Format_RGB32):
+    image = QImage(width, height, fmt)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(0, 30, 200))
+    gradient.setColorAt(0.5, QColor(255, 0, 90))
+    gradient.setColorAt(1, QColor(20, 240, 10))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+def _tile_array(tile):
+    view = image_array_view(tile)
+    return view.copy()
+
+
+class TestPixelateArray:
+    """块平均测试"""
+
+    @settings(max_examples=200, deadline=None)
+    @given(
+        height=st.integers(min_value=1, max_value=40),
+        width=st.integers(min_value=1, max_value=40),
+        block_size=st.integers(min_value=1, max_value=17),
+        seed=st.integers(min_value=0, max_value=2 ** 16),
+    )
+    def test_matches_naive(self, height, width, block_size, seed):
+        """Property: 任意尺寸和块大小，结果与逐块平均一致"""
+        region = np.random.default_rng(seed).integers(0, 256, (height, width, 4), dtype=np.uint8)
+        assert np.array_equal(pixelate_array(region, block_size), _naive_pixelate(region, block_size))
+
+    def test_large_block_no_overflow(self):
+        region = np.full((300, 300, 4), 255, dtype=np.uint8)
+        assert np.all(pixelate_array(region, 300) == 255)
+
+
+class TestRenderMosaic:
+    """render_mosaic 测试"""
+
+    def test_pixelate_matches_naive(self, qapp):
+        image = _gradient_image(97, 63)
+        rect = QRect(5, 7, 83, 41)
+
+        tile = render_mosaic(image, rect, 10)
+
+        assert tile.size() == rect.size()
+        region = image_array_view(image)[7:48, 5:88]
+        expected = np.repeat(np.repeat(_naive_pixelate(region, 10), 10, axis=0), 10, axis=1)
+        actual = _tile_array(tile)
+        assert np.array_equal(actual[:, :, :3], expected[:41, :83, :3])
+        assert np.all(actual[:, :, 3] == 255)
+
+    def test_rect_clipped_to_image(self, qapp):
+        image = _gradient_image(50, 40)
+        tile = render_mosaic(image, QRect(30, 20, 100, 100), 10)
+        assert tile.size() == QRect(30, 20, 20, 20).size()
+        assert render_mosaic(image, QRect(60, 60, 10, 10), 10) is None
+
+    def test_source_not_modified(self, qapp):
+        image = _gradient_image(64, 64)
+        before = _tile_array(image)
+        render_mosaic(image, image.rect(), 8)
+        assert np.array_equal(_tile_array(image), before)
+
+    def test_other_formats_converted(self, qapp):
+        rgb32 = _gradient_image(60, 30)
+        rgb888 = rgb32.convertToFormat(QImage.Format.Format_RGB888)
+        rect = QRect(3, 4, 40, 20)
+
+        assert image_array_view(rgb888) is None
+        assert render_mosaic(rgb888, rect, 6) == render_mosaic(rgb32, rect, 6)
+
+    def test_blur(self, qapp):
+        image = _gradient_image(80, 80)
+        image.fill(QColor(255, 255, 255))
+        painter = QPainter(image)
+        painter.fillRect(40, 0, 40, 80, QColor(0, 0, 0))
+        painter.end()
+
+        tile = _tile_array(render_mosaic(image, image.rect(), 10, MosaicMode.BLUR))
+
+        edge = tile[40, 36:44, 0]
+        assert 0 < edge.min() < edge.max() < 255
+        assert tile[40, 0, 0] == 255 and tile[40, 79, 0] == 0
+
+    def test_redact(self, qapp):
+        image = _gradient_image(40, 40)
+        tile = render_mosaic(image, QRect(0, 0, 20, 10), mode=MosaicMode.REDACT,
+                             color=QColor(10, 20, 30))
+        assert tile.pixelColor(5, 5) == QColor(10, 20, 30)
+
+
+class TestAnnotationRendererMosaic:
+    """AnnotationRenderer 使用共享引擎"""
+
+    def test_renders_engine_output(self, qapp):
+        image = _gradient_image(120, 80)
+        annotation = {"tool": "mosaic", "points": [[10, 10], [70, 50]]}
+
+        rendered = AnnotationRenderer.render(image, [annotation])
+
+        expected = render_mosaic(image, QRect(QPoint(10, 10), QPoint(70, 50)), 10)
+        assert rendered.copy(QRect(10, 10, 61, 41)).convertToFormat(QImage.Format.Format_RGB32) \
+            == expected
+        assert rendered.pixelColor(5, 5) == image.pixelColor(5, 5)
+
+    def test_mosaic_mode_key(self, qapp):
+        image = _gradient_image(60, 60)
+        annotation = {"tool": "mosaic", "points": [[0, 0], [30, 30]], "mosaic_mode": "redact"}
+
+        rendered = AnnotationRenderer.render(image, [annotation])
+        assert rendered.pixelColor(15, 15) == QColor(0, 0, 0)
+
+
+class TestMosaicBenchmark:
+    """4K 全图像素化微基准"""
+
+    def test_4k_pixelate(self, qapp):
+        image = _gradient_image(3840, 2160)
+
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            tile = render_mosaic(image, image.rect(), 10)
+            best = min(best, (time.perf_counter() - start) * 1000)
+
+        print(f"\n3840x2160 像素化: {best:.1f}ms")
+        assert tile.size() == image.size()
+        assert best < 150
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
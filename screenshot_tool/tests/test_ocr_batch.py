@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+批量 OCR 测试
+
+Feature: ocr-batch
+
+测试内容：
+1. recognize_batch 每张图片返回一次结果，支持文件路径输入
+2. 多个引擎并行推理，同一引擎不会被并发使用
+3. 提前关闭迭代器时取消未开始的任务
+4. OCRManager.recognize_batch 返回 UnifiedOCRResult
+5. BackgroundOCRCacheWorker 按批处理，暂停时未完成项目放回队列
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from PySide6.QtGui import QColor, QImage
+
+from screenshot_tool.services import rapid_ocr_service
+from screenshot_tool.services.background_ocr_cache_worker import (
+    BackgroundOCRCacheWorker,
+    WorkerState,
+)
+from screenshot_tool.services.ocr_disk_cache import get_ocr_disk_cache, reset_ocr_disk_cache
+from screenshot_tool.services.ocr_manager import OCRManager, UnifiedOCRResult
+from screenshot_tool.services.rapid_ocr_service import (
+    OCRResult,
+    RapidOCRService,
+    clear_ocr_result_cache,
+    release_ocr_engine_pool,
+)
+
+
+class FakeEngine:
+    """模拟 RapidOCR 实例：文字为图片左上角像素的灰度值"""
+
+    def __init__(self, tracker, delay=0.02):
+        self.tracker = tracker
+        self.delay = delay
+        self.active = 0
+
+    def __call__(self, img_array):
+        self.active += 1
+        assert self.active == 1, "同一引擎被并发使用"
+        with self.tracker["lock"]:
+            self.tracker["running"] += 1
+            self.tracker["max_running"] = max(self.tracker["max_running"], self.tracker["running"])
+            self.tracker["calls"] += 1
+        time.sleep(self.delay)
+        with self.tracker["lock"]:
+            self.tracker["running"] -= 1
+        self.active -= 1
+        text = str(int(img_array[0, 0, 0]))
+        return [[[[0, 0], [20, 0], [20, 10], [0, 10]], text, 0.9]], 0.0
+
+
+@pytest.fixture
+def engines(monkeypatch, tmp_path):
+    """替换全局引擎和额外引擎的创建，磁盘缓存使用临时目录"""
+    tracker = {"lock": threading.Lock(), "running": 0, "max_running": 0, "calls": 0, "created": 0}
+    primary = FakeEngine(tracker)
+
+    def create_extra():
+        tracker["created"] += 1
+        return FakeEngine(tracker), None, None
+
+    monkeypatch.setattr(rapid_ocr_service, "get_global_ocr", lambda: (primary, None))
+    monkeypatch.setattr(rapid_ocr_service, "_create_ocr_instance_with_backend", create_extra)
+    clear_ocr_result_cache()
+    release_ocr_engine_pool()
+    reset_ocr_disk_cache()
+    get_ocr_disk_cache(str(tmp_path / "cache"))
+    yield tracker
+    clear_ocr_result_cache()
+    release_ocr_engine_pool()
+    reset_ocr_disk_cache()
+
+
+def _gray_image(value):
+    image = QImage(64, 32, QImage.Format.Format_RGB32)
+    image.fill(QColor(value, value, value))
+    return image
+
+
+class TestRecognizeBatch:
+    """RapidOCRService.recognize_batch 测试"""
+
+    def test_each_image_once(self, qapp, engines):
+        service = RapidOCRService(enable_preprocessing=False)
+        results = dict(service.recognize_batch([_gray_image(v) for v in range(10, 30)], max_workers=3))
+
+        assert sorted(results) == list(range(20))
+        for index, result in results.items():
+            assert result.success
+            assert result.text == str(10 + index)
+        assert engines["calls"] == 20
+
+    def test_runs_in_parallel(self, qapp, engines):
+        service = RapidOCRService(enable_preprocessing=False)
+        list(service.recognize_batch([_gray_image(v) for v in range(10, 22)], max_workers=3))
+
+        assert engines["max_running"] > 1
+        assert engines["created"] <= 2  # 全局实例 + 最多 2 个额外引擎
+
+    def test_single_worker_uses_global_engine(self, qapp, engines):
+        service = RapidOCRService(enable_preprocessing=False)
+        list(service.recognize_batch([_gray_image(v) for v in range(10, 15)], max_workers=1))
+
+        assert engines["created"] == 0
+        assert engines["max_running"] == 1
+
+    def test_file_paths(self, qapp, engines, tmp_path):
+        path = str(tmp_path / "a.png")
+        assert _gray_image(77).save(path, "PNG")
+        missing = str(tmp_path / "missing.png")
+
+        service = RapidOCRService(enable_preprocessing=False)
+        results = dict(service.recognize_batch([path, missing], max_workers=2))
+
+        assert results[0].text == "77"
+        assert not results[1].success
+
+    def test_close_cancels_pending(self, qapp, engines):
+        service = RapidOCRService(enable_preprocessing=False)
+        results = service.recognize_batch([_gray_image(v) for v in range(10, 40)], max_workers=1)
+
+        next(results)
+        results.close()
+        assert engines["calls"] < 30
+
+
+class TestOCRManagerBatch:
+    def test_returns_unified_results(self, qapp, engines):
+        manager = OCRManager()
+        results = dict(manager.recognize_batch([_gray_image(50), _gray_image(60)], max_workers=2))
+
+        assert isinstance(results[0], UnifiedOCRResult)
+        assert results[0].engine == "rapid"
+        assert (results[0].text, results[1].text) == ("50", "60")
+
+
+class FakeHistoryManager:
+    def __init__(self, data_dir, count):
+        self.items = {}
+        self.ocr = {}
+        for index in range(count):
+            name = f"{index}.png"
+            assert _gray_image(10 + index).save(str(data_dir / name), "PNG")
+            self.items[f"id{index}"] = SimpleNamespace(
+                image_path=name, has_ocr_cache=lambda: False
+            )
+
+    def get_item(self, item_id):
+        return self.items.get(item_id)
+
+    def update_ocr_cache(self, item_id, text):
+        self.ocr[item_id] = text
+        return True
+
+
+class TestBackgroundWorkerBatch:
+    """BackgroundOCRCacheWorker 批量处理测试"""
+
+    @pytest.fixture
+    def worker(self, qapp, engines, tmp_path, monkeypatch):
+        import screenshot_tool.core.clipboard_history_manager as history_module
+        monkeypatch.setattr(history_module, "get_clipboard_data_dir", lambda: str(tmp_path))
+
+        worker = BackgroundOCRCacheWorker()
+        worker.set_history_manager(FakeHistoryManager(tmp_path, 6))
+        worker.set_max_workers(3)
+        worker._state = WorkerState.RUNNING
+        worker._total_count = 6
+        return worker
+
+    def test_batch_stores_all_results(self, worker):
+        progress = []
+        worker.progress_changed.connect(lambda done, total: progress.append(done))
+
+        worker._perform_ocr_batch([f"id{i}" for i in range(6)])
+
+        manager = worker._history_manager
+        assert manager.ocr == {f"id{i}": str(10 + i) for i in range(6)}
+        assert progress == [1, 2, 3, 4, 5, 6]
+
+    def test_pause_requeues_unfinished(self, worker):
+        worker.ocr_completed.connect(lambda item_id, text: worker.pause())
+
+        worker._perform_ocr_batch([f"id{i}" for i in range(6)])
+
+        manager = worker._history_manager
+        assert len(manager.ocr) == 1
+        assert worker.pending_count() == 5
+        assert set(worker._pending_items) == {f"id{i}" for i in range(6)} - set(manager.ocr)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 磁盘缓存测试
+
+Feature: ocr-disk-cache
+
+测试内容：
+1. 缓存键包含引擎和预处理配置
+2. OCRDiskCache 读写、跨实例持久化、按字节上限 LRU 淘汰
+3. RapidOCRService 进程内缓存清空（模拟重启）后命中磁盘缓存
+4. OCRManager 云端引擎结果缓存，失败结果不落盘
+"""
+
+import pytest
+from PySide6.QtGui import QImage
+
+from screenshot_tool.core.performance_monitor import PerformanceMonitor
+from screenshot_tool.services.image_preprocessor import PreprocessingConfig
+from screenshot_tool.services.ocr_disk_cache import (
+    OCRDiskCache,
+    build_ocr_cache_key,
+    get_ocr_disk_cache,
+    reset_ocr_disk_cache,
+)
+from screenshot_tool.services.ocr_manager import OCRManager, UnifiedOCRResult
+from screenshot_tool.services.rapid_ocr_service import (
+    OCR_DISK_CACHE_HIT_COUNTER,
+    OCRBox,
+    OCRResult,
+    RapidOCRService,
+    clear_ocr_result_cache,
+)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """使用临时目录的磁盘缓存单例"""
+    reset_ocr_disk_cache()
+    clear_ocr_result_cache()
+    PerformanceMonitor.reset()
+    cache = get_ocr_disk_cache(str(tmp_path))
+    yield cache
+    reset_ocr_disk_cache()
+    clear_ocr_result_cache()
+    PerformanceMonitor.reset()
+
+
+def _image(color=0xFF336699):
+    image = QImage(64, 32, QImage.Format.Format_ARGB32)
+    image.fill(color)
+    return image
+
+
+class TestCacheKey:
+    """缓存键测试"""
+
+    def test_engine_is_part_of_key(self):
+        assert build_ocr_cache_key("abc", "rapid") != build_ocr_cache_key("abc", "tencent")
+
+    def test_config_fingerprint(self):
+        default = build_ocr_cache_key("abc", "rapid", PreprocessingConfig())
+        same = build_ocr_cache_key("abc", "rapid", PreprocessingConfig())
+        changed = build_ocr_cache_key("abc", "rapid", PreprocessingConfig(padding_size=10))
+
+        assert default == same
+        assert default != changed
+
+
+class TestOCRDiskCache:
+    """OCRDiskCache 存储测试"""
+
+    def test_round_trip(self, tmp_path):
+        cache = OCRDiskCache(str(tmp_path))
+        assert cache.get("k") is None
+
+        assert cache.put("k", "rapid", {"text": "你好"})
+        assert cache.get("k") == {"text": "你好"}
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        cache = OCRDiskCache(str(tmp_path))
+        cache.put("k", "rapid", {"text": "hello"})
+        cache.close()
+
+        reopened = OCRDiskCache(str(tmp_path))
+        assert reopened.get("k") == {"text": "hello"}
+        reopened.close()
+
+    def test_evicts_least_recently_used_by_bytes(self, tmp_path, monkeypatch):
+        """超出字节上限时淘汰最久未访问的结果"""
+        import screenshot_tool.services.ocr_disk_cache as module
+
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "time", lambda: now[0])
+
+        payload = {"text": "x" * 80}
+        entry_size = len(module.json.dumps(payload))
+        cache = OCRDiskCache(str(tmp_path), max_bytes=entry_size * 3)
+
+        for key in ("a", "b", "c"):
+            now[0] += 1
+            cache.put(key, "rapid", payload)
+        now[0] += 1
+        assert cache.get("a") is not None  # a 变为最近访问
+
+        now[0] += 1
+        cache.put("d", "rapid", payload)
+
+        assert cache.count() == 3
+        assert cache.get("b") is None
+        for key in ("a", "c", "d"):
+            assert cache.get(key) is not None
+        assert cache.total_bytes() <= cache.max_bytes
+        cache.close()
+
+    def test_oversized_payload_rejected(self, tmp_path):
+        cache = OCRDiskCache(str(tmp_path), max_bytes=10)
+        assert not cache.put("k", "rapid", {"text": "x" * 100})
+        assert cache.count() == 0
+        cache.close()
+
+    def test_clear(self, tmp_path):
+        cache = OCRDiskCache(str(tmp_path))
+        cache.put("k", "rapid", {"text": "hello"})
+        cache.clear()
+        assert cache.count() == 0
+        cache.close()
+
+
+class TestOCRResultSerialization:
+    def test_round_trip(self):
+        result = OCRResult(
+            success=True,
+            text="第一行\nsecond",
+            boxes=[OCRBox("第一行", [[0, 0], [10, 0], [10, 5], [0, 5]], 0.9)],
+            average_score=0.9,
+            backend_type="openvino",
+            backend_detail="本地OCR",
+            elapsed_time_ms=120.5,
+        )
+        restored = OCRResult.from_cache_dict(result.to_cache_dict())
+        assert restored == result
+
+
+class TestRapidOCRServiceDiskCache:
+    """RapidOCRService 磁盘缓存集成测试（不加载 OCR 引擎）"""
+
+    @pytest.fixture
+    def make_service(self, monkeypatch):
+        calls = []
+
+        def factory(config=None):
+            service = RapidOCRService(preprocessing_config=config)
+
+            def fake_recognize(image):
+                calls.append(image)
+                return OCRResult(success=True, text=f"call {len(calls)}", average_score=0.8)
+
+            monkeypatch.setattr(service, "_do_recognize_image", fake_recognize)
+            return service
+
+        factory.calls = calls
+        return factory
+
+    def test_restart_hits_disk_cache(self, qapp, disk_cache, make_service):
+        make_service().recognize_image(_image())
+
+        clear_ocr_result_cache()  # 模拟进程重启
+        result = make_service().recognize_image(_image())
+
+        assert len(make_service.calls) == 1
+        assert result.text == "call 1"
+        assert PerformanceMonitor.get_counter(OCR_DISK_CACHE_HIT_COUNTER) == 1
+
+    def test_preprocessing_config_change_misses(self, qapp, disk_cache, make_service):
+        make_service().recognize_image(_image())
+
+        clear_ocr_result_cache()
+        make_service(PreprocessingConfig(padding_size=10)).recognize_image(_image())
+
+        assert len(make_service.calls) == 2
+
+    def test_failed_result_not_persisted(self, qapp, disk_cache, monkeypatch):
+        service = RapidOCRService()
+        monkeypatch.setattr(
+            service, "_do_recognize_image",
+            lambda image: OCRResult.error_result("引擎不可用"),
+        )
+
+        service.recognize_image(_image())
+        assert disk_cache.count() == 0
+
+
+class FakeCloudService:
+    """模拟云端 OCR 服务"""
+
+    def __init__(self, success=True):
+        self.calls = 0
+        self.success = success
+
+    def recognize_image(self, image):
+        self.calls += 1
+        return OCRResult(
+            success=self.success,
+            text=f"cloud {self.calls}" if self.success else "",
+            error=None if self.success else "网络错误",
+        )
+
+
+class TestOCRManagerDiskCache:
+    """OCRManager 云端引擎磁盘缓存测试"""
+
+    def test_cloud_result_cached(self, qapp, disk_cache):
+        manager = OCRManager()
+        manager._baidu_service = FakeCloudService()
+
+        first = manager.recognize(_image(), force_engine="baidu")
+        second = OCRManager()
+        second._baidu_service = FakeCloudService()
+        cached = second.recognize(_image(), force_engine="baidu")
+
+        assert first.success
+        assert cached == first
+        assert second._baidu_service.calls == 0
+
+    def test_different_engine_not_shared(self, qapp, disk_cache):
+        """同一图片不同引擎的结果分别缓存"""
+        manager = OCRManager()
+        manager._baidu_service = FakeCloudService()
+        manager._tencent_service = FakeCloudService()
+        manager._tencent_service.recognize_accurate = manager._tencent_service.recognize_image
+
+        manager.recognize(_image(), force_engine="baidu")
+        manager.recognize(_image(), force_engine="tencent")
+        manager.recognize_with_engine(_image(), "baidu")
+
+        assert manager._baidu_service.calls == 1
+        assert manager._tencent_service.calls == 1
+        assert disk_cache.count() == 2
+
+    def test_cloud_failure_not_cached(self, qapp, disk_cache):
+        manager = OCRManager()
+        manager._baidu_service = FakeCloudService(success=False)
+
+        assert not manager.recognize(_image(), force_engine="baidu").success
+        assert not manager.recognize(_image(), force_engine="baidu").success
+        assert manager._baidu_service.calls == 2
+        assert disk_cache.count() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 同行合并测试
+
+Feature: ocr-vectorized-merge
+
+测试内容：
+1. 向量化合并与逐框实现结果完全一致（文字、坐标、分数）
+2. 不规则坐标回退到逐框实现
+3. 100 / 1,000 / 10,000 个框时结果一致
+"""
+
+import random
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from screenshot_tool.services.rapid_ocr_service import (
+    OCRBox,
+    OCRBoxArray,
+    RapidOCRService,
+)
+
+
+def _rect(x, y, w, h):
+    return [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+
+
+box_strategy = st.builds(
+    lambda x, y, w, h, text, score: OCRBox(text, _rect(x, y, w, h), score),
+    x=st.integers(min_value=0, max_value=800),
+    y=st.integers(min_value=0, max_value=600),
+    w=st.integers(min_value=0, max_value=200),
+    h=st.integers(min_value=0, max_value=60),
+    text=st.text(alphabet="ab中 ", max_size=6),
+    score=st.floats(min_value=0.0, max_value=1.0),
+)
+
+
+@pytest.fixture(scope="module")
+def service():
+    return RapidOCRService(enable_preprocessing=False)
+
+
+def _dense_page(count, seed=0):
+    """模拟表格/代码页面：每行若干个框，行高和间距带随机抖动"""
+    rng = random.Random(seed)
+    boxes = []
+    per_line = 10
+    for index in range(count):
+        row, col = divmod(index, per_line)
+        x = col * 90 + rng.randint(0, 20)
+        y = row * 24 + rng.randint(0, 3)
+        text = "".join(rng.choice("abcdef中文") for _ in range(rng.randint(1, 8)))
+        boxes.append(OCRBox(text, _rect(x, y, rng.randint(20, 80), rng.randint(14, 20)),
+                            rng.random()))
+    rng.shuffle(boxes)
+    return boxes
+
+
+class TestVectorizedMerge:
+    """向量化合并与逐框实现一致性测试"""
+
+    @settings(max_examples=300, deadline=None)
+    @given(boxes=st.lists(box_strategy, max_size=40))
+    def test_identical_to_per_box(self, service, boxes):
+        """Property: 任意规则框列表，两种实现输出完全相同"""
+        expected = service._merge_same_line_boxes_per_box(boxes)
+        actual = service._merge_same_line_boxes(boxes)
+
+        assert actual == expected
+        for merged in actual:
+            assert all(type(v) is int for point in merged.box for v in point)
+
+    def test_dense_page_identical(self, service):
+        boxes = _dense_page(2000)
+        assert service._merge_same_line_boxes(boxes) == \
+            service._merge_same_line_boxes_per_box(boxes)
+
+    def test_float_coordinates(self, service):
+        boxes = [
+            OCRBox("ab", [[0.5, 0.0], [20.5, 0.0], [20.5, 10.0], [0.5, 10.0]], 0.9),
+            OCRBox("cd", [[21.0, 1.0], [40.0, 1.0], [40.0, 11.0], [21.0, 11.0]], 0.8),
+        ]
+        assert service._merge_same_line_boxes(boxes) == \
+            service._merge_same_line_boxes_per_box(boxes)
+
+    def test_irregular_boxes_fall_back(self, service):
+        boxes = [
+            OCRBox("a", _rect(0, 0, 10, 10)),
+            OCRBox("b", [[20, 0], [30, 0], [30, 10], [20, 10], [25, 12]]),
+            OCRBox("c", [[0, 0]]),
+        ]
+        assert OCRBoxArray.from_boxes(boxes) is None
+        assert service._merge_same_line_boxes(boxes) == \
+            service._merge_same_line_boxes_per_box(boxes)
+
+    def test_from_boxes_skips_short_boxes(self):
+        array = OCRBoxArray.from_boxes([OCRBox("a", None), OCRBox("b", _rect(0, 0, 5, 5))])
+        assert array.coords.shape == (1, 4, 2)
+        assert array.texts == ["b"]
+
+
+class TestMergeLargeInputs:
+    """大量框时两种实现结果一致"""
+
+    @pytest.mark.parametrize("count", [100, 1000, 10000])
+    def test_matches_per_box(self, service, count):
+        boxes = _dense_page(count, seed=count)
+
+        assert service._merge_same_line_boxes(boxes) == \
+            service._merge_same_line_boxes_per_box(boxes)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+RapidOCR 结果缓存测试
+
+Feature: ocr-result-cache
+
+测试内容：
+1. 全像素摘要：任意像素变化都改变摘要，行尾填充不影响摘要
+2. OCRResultCache：O(1) LRU 淘汰、TTL 过期
+3. 可选感知哈希层：近似图片复用结果，默认关闭
+4. 命中/未命中计数器记录到 PerformanceMonitor
+5. recognize_image 命中缓存时不重复识别
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter
+
+from screenshot_tool.core.performance_monitor import PerformanceMonitor
+from screenshot_tool.services.ocr_disk_cache import get_ocr_disk_cache, reset_ocr_disk_cache
+from screenshot_tool.services import rapid_ocr_service
+from screenshot_tool.services.rapid_ocr_service import (
+    OCR_CACHE_EVICT_COUNTER,
+    OCR_CACHE_HIT_COUNTER,
+    OCR_CACHE_MISS_COUNTER,
+    OCR_CACHE_PERCEPTUAL_HIT_COUNTER,
+    OCRResult,
+    OCRResultCache,
+    RapidOCRService,
+    _compute_image_hash,
+    _compute_perceptual_hash,
+    clear_ocr_result_cache,
+    set_ocr_cache_perceptual_matching,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_state(tmp_path):
+    """每个测试前后清空缓存和计数器，磁盘缓存使用临时目录"""
+    PerformanceMonitor.reset()
+    clear_ocr_result_cache()
+    set_ocr_cache_perceptual_matching(False)
+    reset_ocr_disk_cache()
+    get_ocr_disk_cache(str(tmp_path))
+    yield
+    PerformanceMonitor.reset()
+    clear_ocr_result_cache()
+    set_ocr_cache_perceptual_matching(False)
+    reset_ocr_disk_cache()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _gradient_image(width=120, height=80, fmt=QImage.Format.Format_ARGB32):
+    image = QImage(width, height, fmt)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0.0, QColor(20, 40, 200))
+    gradient.setColorAt(1.0, QColor(240, 220, 10))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+def _result(text):
+    return OCRResult(text=text, success=True)
+
+
+class TestImageDigest:
+    """全像素摘要测试"""
+
+    def test_identical_images_same_digest(self, qapp):
+        assert _compute_image_hash(_gradient_image()) == _compute_image_hash(_gradient_image())
+
+    def test_non_sampled_pixel_changes_digest(self, qapp):
+        """旧实现只采样四角和中心，其他像素变化会碰撞"""
+        image = _gradient_image()
+        changed = image.copy()
+        changed.setPixel(7, 3, 0xFF000000)
+        assert _compute_image_hash(image) != _compute_image_hash(changed)
+
+    def test_row_padding_ignored(self, qapp):
+        """RGB888 奇数宽度有行尾填充，填充字节不参与摘要"""
+        image = _gradient_image(101, 20, QImage.Format.Format_RGB888)
+        assert image.bytesPerLine() > 101 * 3
+        assert _compute_image_hash(image) == _compute_image_hash(image.copy())
+
+    def test_size_is_part_of_digest(self, qapp):
+        a = QImage(10, 20, QImage.Format.Format_ARGB32)
+        b = QImage(20, 10, QImage.Format.Format_ARGB32)
+        a.fill(0xFFFFFFFF)
+        b.fill(0xFFFFFFFF)
+        assert _compute_image_hash(a) != _compute_image_hash(b)
+
+    def test_null_image(self, qapp):
+        assert _compute_image_hash(QImage()) == ""
+        assert _compute_perceptual_hash(QImage()) is None
+
+    def test_perceptual_hash_tolerates_small_change(self, qapp):
+        image = _gradient_image()
+        changed = image.copy()
+        changed.setPixel(7, 3, 0xFF000000)
+        distance = bin(_compute_perceptual_hash(image) ^ _compute_perceptual_hash(changed)).count("1")
+        assert distance <= 2
+
+
+class TestOCRResultCache:
+    """LRU + TTL 缓存测试"""
+
+    def test_lru_eviction(self):
+        cache = OCRResultCache(max_size=2)
+        cache.put("a", _result("a"))
+        cache.put("b", _result("b"))
+        assert cache.get("a").text == "a"  # a 变为最近使用
+
+        cache.put("c", _result("c"))
+        assert "a" in cache
+        assert "b" not in cache
+        assert PerformanceMonitor.get_counter(OCR_CACHE_EVICT_COUNTER) == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = OCRResultCache(ttl_seconds=60, clock=clock)
+        cache.put("a", _result("a"))
+
+        clock.now += 59
+        assert cache.get("a") is not None
+        clock.now += 2
+        assert cache.get("a") is None
+        assert "a" not in cache
+
+    def test_hit_and_miss_counters(self):
+        cache = OCRResultCache()
+        cache.put("a", _result("a"))
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+
+        assert PerformanceMonitor.get_counter(OCR_CACHE_HIT_COUNTER) == 2
+        assert PerformanceMonitor.get_counter(OCR_CACHE_MISS_COUNTER) == 1
+
+    def test_perceptual_tier_disabled_by_default(self):
+        cache = OCRResultCache()
+        cache.put("a", _result("a"), perceptual_key=(10, 10, 0b1111))
+        assert cache.get("b", perceptual_key=(10, 10, 0b1111)) is None
+
+    def test_perceptual_tier_matches_near_duplicate(self):
+        cache = OCRResultCache()
+        cache.perceptual_enabled = True
+        cache.perceptual_max_distance = 2
+        cache.put("a", _result("a"), perceptual_key=(10, 10, 0b1111))
+
+        assert cache.get("b", perceptual_key=(10, 10, 0b1100)).text == "a"
+        assert cache.get("c", perceptual_key=(10, 10, 0b1000)) is None  # 距离 3
+        assert cache.get("d", perceptual_key=(10, 11, 0b1111)) is None  # 尺寸不同
+        assert PerformanceMonitor.get_counter(OCR_CACHE_PERCEPTUAL_HIT_COUNTER) == 1
+
+    @settings(max_examples=100)
+    @given(
+        max_size=st.integers(min_value=1, max_value=8),
+        keys=st.lists(st.integers(min_value=0, max_value=15), max_size=50),
+    )
+    def test_size_never_exceeds_max(self, max_size, keys):
+        """Property: 任意写入/读取序列后条目数不超过容量，最近写入的条目一定存在"""
+        cache = OCRResultCache(max_size=max_size)
+        for key in keys:
+            cache.get(str(key))
+            cache.put(str(key), _result(str(key)))
+            assert len(cache) <= max_size
+            assert str(key) in cache
+
+
+class TestRecognizeImageCache:
+    """recognize_image 缓存集成测试（不加载 OCR 引擎）"""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        service = RapidOCRService(enable_preprocessing=False)
+        calls = []
+
+        def fake_recognize(image):
+            calls.append(image)
+            return _result(f"call {len(calls)}")
+
+        monkeypatch.setattr(service, "_do_recognize_image", fake_recognize)
+        service.calls = calls
+        return service
+
+    def test_same_image_recognized_once(self, qapp, service):
+        first = service.recognize_image(_gradient_image())
+        second = service.recognize_image(_gradient_image())
+
+        assert len(service.calls) == 1
+        assert second.text == first.text
+        assert PerformanceMonitor.get_counter(OCR_CACHE_HIT_COUNTER) == 1
+
+    def test_different_image_recognized_again(self, qapp, service):
+        image = _gradient_image()
+        changed = image.copy()
+        changed.setPixel(7, 3, 0xFF000000)
+
+        service.recognize_image(image)
+        service.recognize_image(changed)
+        assert len(service.calls) == 2
+
+    def test_perceptual_matching_reuses_near_duplicate(self, qapp, service):
+        set_ocr_cache_perceptual_matching(True)
+        image = _gradient_image()
+        changed = image.copy()
+        changed.setPixel(7, 3, 0xFF000000)
+
+        service.recognize_image(image)
+        result = service.recognize_image(changed)
+        assert len(service.calls) == 1
+        assert result.text == "call 1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 分块识别测试
+
+Feature: ocr-tiling
+
+测试内容：
+1. 条带划分覆盖整图、相邻条带按配置重叠、条带高度不超过上限
+2. 重叠区重复框去重，优先保留未被条带边缘截断的框
+3. 分块识别结果每行只出现一次，推理输入高度受条带大小限制
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtGui import QColor, QImage, QPainter
+
+from screenshot_tool.services import rapid_ocr_service
+from screenshot_tool.services.rapid_ocr_service import (
+    RapidOCRService,
+    TilingConfig,
+    _plan_tile_bands,
+    _suppress_duplicate_boxes,
+)
+
+
+def _rect_box(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+class TestPlanTileBands:
+    """条带划分测试"""
+
+    def test_small_image_not_tiled(self):
+        assert _plan_tile_bands(1920, 1080, TilingConfig()) == []
+
+    def test_disabled(self):
+        assert _plan_tile_bands(1000, 20000, TilingConfig(enabled=False)) == []
+
+    def test_tall_image_tiled(self):
+        config = TilingConfig(trigger_height=500, tile_height=400, overlap=80)
+        assert _plan_tile_bands(200, 1500, config) == [
+            (0, 400), (320, 720), (640, 1040), (960, 1360), (1280, 1500)
+        ]
+
+    def test_huge_image_tiled_by_pixels(self):
+        """像素数超限时条带像素数不超过上限"""
+        config = TilingConfig(trigger_height=100000, trigger_pixels=1000 * 1000,
+                              tile_height=4000, overlap=50)
+        bands = _plan_tile_bands(2000, 1500, config)
+        assert bands
+        assert all((bottom - top) * 2000 <= 1000 * 1000 for top, bottom in bands)
+
+    @settings(max_examples=200)
+    @given(
+        width=st.integers(min_value=1, max_value=5000),
+        height=st.integers(min_value=1, max_value=50000),
+        tile_height=st.integers(min_value=64, max_value=4096),
+        overlap=st.integers(min_value=0, max_value=256),
+    )
+    def test_bands_cover_image(self, width, height, tile_height, overlap):
+        """Property: 条带从 0 开始连续覆盖到图片底部，相邻条带重叠且逐步推进"""
+        config = TilingConfig(trigger_height=tile_height, tile_height=tile_height,
+                              overlap=overlap)
+        bands = _plan_tile_bands(width, height, config)
+        if not bands:
+            return
+
+        assert bands[0][0] == 0
+        assert bands[-1][1] == height
+        for (top, bottom), (next_top, next_bottom) in zip(bands, bands[1:]):
+            assert next_top > top
+            assert next_top <= bottom
+            assert bottom - next_top == overlap
+        assert max(bottom - top for top, bottom in bands) <= max(tile_height, overlap * 2)
+
+
+class TestSuppressDuplicateBoxes:
+    """重叠区去重测试"""
+
+    BANDS = [(0, 400), (320, 720)]
+
+    def test_duplicate_in_overlap_removed(self):
+        a = (_rect_box(10, 340, 100, 360), "hello", 0.9)
+        b = (_rect_box(11, 341, 100, 360), "hello", 0.8)
+        merged = _suppress_duplicate_boxes(self.BANDS, [[a], [b]])
+        assert len(merged) == 1
+
+    def test_truncated_box_loses(self):
+        """跨越条带底边的框被截断，保留下一条带中完整的框"""
+        truncated = (_rect_box(10, 390, 100, 400), "hel", 0.9)
+        complete = (_rect_box(10, 390, 100, 410), "hello", 0.8)
+        merged = _suppress_duplicate_boxes(self.BANDS, [[truncated], [complete]])
+        assert [item[1] for item in merged] == ["hello"]
+
+    def test_distinct_boxes_kept_and_sorted(self):
+        first = (_rect_box(10, 10, 100, 30), "a", 0.9)
+        left = (_rect_box(10, 340, 50, 360), "b", 0.9)
+        right = (_rect_box(200, 340, 300, 360), "c", 0.9)
+        last = (_rect_box(10, 600, 100, 620), "d", 0.9)
+        merged = _suppress_duplicate_boxes(self.BANDS, [[right, first], [left, last]])
+        assert [item[1] for item in merged] == ["a", "b", "c", "d"]
+
+
+class FakeLineOCR:
+    """模拟 OCR 引擎：把每段连续的深色行识别为一行文字，文字为其宽度"""
+
+    def __init__(self):
+        self.input_heights = []
+
+    def __call__(self, img_array):
+        self.input_heights.append(img_array.shape[0])
+        dark = img_array.min(axis=2) < 128
+        rows = np.flatnonzero(dark.any(axis=1))
+        result = []
+        if rows.size == 0:
+            return result, 0.0
+        runs = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+        for run in runs:
+            cols = np.flatnonzero(dark[run[0]:run[-1] + 1].any(axis=0))
+            x1, x2 = int(cols[0]), int(cols[-1]) + 1
+            y1, y2 = int(run[0]), int(run[-1]) + 1
+            # 被条带截断的行文字不完整
+            text = f"w{x2 - x1}" if y2 - y1 >= 20 else "partial"
+            result.append([_rect_box(x1, y1, x2, y2), text, 0.9])
+        return result, 0.0
+
+
+# 文字行：起始 y 坐标，宽度互不相同
+LINE_TOPS = [50, 330, 390, 700, 1000, 1450]
+
+
+def _lines_image():
+    image = QImage(200, 1500, QImage.Format.Format_RGB32)
+    image.fill(0xFFFFFFFF)
+    painter = QPainter(image)
+    for index, top in enumerate(LINE_TOPS):
+        painter.fillRect(10, top, 30 + 10 * index, 20, QColor(0, 0, 0))
+    painter.end()
+    return image
+
+
+class TestRecognizeTiled:
+    """分块识别集成测试（模拟 OCR 引擎）"""
+
+    @pytest.fixture
+    def fake_ocr(self, monkeypatch):
+        fake = FakeLineOCR()
+        monkeypatch.setattr(rapid_ocr_service, "get_global_ocr", lambda: (fake, None))
+        return fake
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_each_line_once(self, qapp, fake_ocr, workers):
+        config = TilingConfig(trigger_height=500, tile_height=400, overlap=80,
+                              max_workers=workers)
+        service = RapidOCRService(enable_preprocessing=False, tiling_config=config)
+
+        result = service._do_recognize_image(_lines_image())
+
+        assert result.success
+        expected = [f"w{30 + 10 * index}" for index in range(len(LINE_TOPS))]
+        assert result.text.split("\n") == expected
+        assert [box.box[0][1] for box in result.boxes] == LINE_TOPS
+        assert len(fake_ocr.input_heights) == 5
+        assert max(fake_ocr.input_heights) <= 400
+
+    def test_small_image_single_pass(self, qapp, fake_ocr):
+        service = RapidOCRService(enable_preprocessing=False)
+        image = QImage(200, 300, QImage.Format.Format_RGB32)
+        image.fill(0xFFFFFFFF)
+        painter = QPainter(image)
+        painter.fillRect(10, 100, 50, 20, QColor(0, 0, 0))
+        painter.end()
+
+        result = service._do_recognize_image(image)
+        assert result.text == "w50"
+        assert fake_ocr.input_heights == [300]
+
+    def test_cache_config_includes_tiling_for_tall_images(self, qapp):
+        config = TilingConfig(trigger_height=500, tile_height=400, overlap=80)
+        service = RapidOCRService(tiling_config=config)
+
+        assert service._get_cache_config(QImage(200, 300, QImage.Format.Format_RGB32)) \
+            == service.get_preprocessing_config()
+        assert "tiling" in service._get_cache_config(_lines_image())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
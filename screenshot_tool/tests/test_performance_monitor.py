@@ -694,6 +694,59 @@ class TestPerformanceMonitorProperties:
         assert result == expected
 
 
+# ========== 计数器测试 ==========
+
+class TestCounters:
+    """increment() / get_counter() 测试"""
+    
+    def test_increment_and_get(self):
+        PerformanceMonitor.increment("hits")
+        PerformanceMonitor.increment("hits", 2)
+        
+        assert PerformanceMonitor.get_counter("hits") == 3
+        assert PerformanceMonitor.get_counter("unknown") == 0
+        assert PerformanceMonitor.get_all_counters() == {"hits": 3}
+    
+    def test_disabled_does_not_count(self):
+        PerformanceMonitor.disable()
+        PerformanceMonitor.increment("hits")
+        
+        assert PerformanceMonitor.get_counter("hits") == 0
+    
+    def test_clear_counter(self):
+        PerformanceMonitor.increment("hits")
+        PerformanceMonitor.increment("misses")
+        
+        PerformanceMonitor.clear("hits")
+        assert PerformanceMonitor.get_all_counters() == {"misses": 1}
+        
+        PerformanceMonitor.clear()
+        assert PerformanceMonitor.get_all_counters() == {}
+    
+    def test_concurrent_increments(self):
+        """多线程累加不丢失计数"""
+        import threading
+        
+        def worker():
+            for _ in range(1000):
+                PerformanceMonitor.increment("shared")
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert PerformanceMonitor.get_counter("shared") == 4000
+    
+    def test_format_report_includes_counters(self):
+        PerformanceMonitor.increment("ocr_cache_hit", 5)
+        
+        report = PerformanceMonitor.format_report()
+        assert "Counters:" in report
+        assert "ocr_cache_hit: 5" in report
+
+
 # ========== 边界情况测试 ==========
 
 class TestEdgeCases:
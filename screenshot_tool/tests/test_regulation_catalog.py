@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+"""
+规章本地目录测试
+
+Feature: regulation-catalog
+
+测试内容：
+1. 保存的 WAS5 结果页面（规章、规范性文件）解析
+2. RegulationCatalog 写入去重、关键词/类型/有效性/日期筛选，查询 < 10ms
+3. RegulationCatalogSyncWorker 完整同步翻页、增量同步按发布日期提前停止
+4. RegulationService.search 在目录已同步时只查本地
+"""
+
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from screenshot_tool.services import regulation_service
+from screenshot_tool.services.regulation_catalog import RegulationCatalog
+from screenshot_tool.services.regulation_service import (
+    NORMATIVE_CHANNEL,
+    REGULATION_CHANNEL,
+    SEARCH_PER_PAGE,
+    RegulationCatalogSyncWorker,
+    RegulationDocument,
+    RegulationSearchWorker,
+    RegulationService,
+)
+
+
+# ============================================================
+# 保存的 WAS5 结果页面
+# ============================================================
+
+REGULATION_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>民航规章</title></head>
+<body>
+<table class="t_table" width="100%">
+  <thead><tr><th>序号</th><th>名称</th><th>CCAR部号</th><th>有效性</th></tr></thead>
+  <tbody>
+    <tr>
+      <td>1</td>
+      <td class="t_l">
+        <a href="http://www.caac.gov.cn/XXGK/XXGK/MHGZ/202512/t20251217_229435.html" target="_blank">大型飞机公共航空运输承运人运行合格审定规则</a>
+        <div class="t_l_content"><ul>
+          <li class="t_l_content_left">办文单位：飞行标准司</li>
+          <li>发文日期：2025年12月17日</li>
+          <li>有 效 性：有效</li>
+        </ul></div>
+      </td>
+      <td>CCAR-121-R8</td>
+      <td>有效</td>
+    </tr>
+    <tr>
+      <td>2</td>
+      <td class="t_l">
+        <a href="/XXGK/XXGK/MHGZ/202403/t20240305_223001.html" target="_blank">民用航空器维修单位合格审定规则</a>
+        <div class="t_l_content"><ul>
+          <li class="t_l_content_left">办文单位：飞行标准司</li>
+        </ul></div>
+      </td>
+      <td>CCAR-145-R4</td>
+      <td>有效</td>
+    </tr>
+    <tr>
+      <td>3</td>
+      <td class="t_l">
+        <a href="/XXGK/XXGK/MHGZ/201801/t20180112_048211.html" target="_blank">民用航空器驾驶员学校合格审定规则</a>
+      </td>
+      <td>CCAR-141</td>
+      <td>失效</td>
+    </tr>
+    <tr><td colspan="4">共 3 条</td></tr>
+  </tbody>
+</table>
+</body></html>
+"""
+
+NORMATIVE_PAGE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>规范性文件</title></head>
+<body>
+<table class="t_table" width="100%">
+  <thead><tr><th>序号</th><th>名称</th><th>成文日期</th><th>发文日期</th><th>文号</th><th>有效性</th></tr></thead>
+  <tbody>
+    <tr>
+      <td>1</td>
+      <td class="tdMC">
+        <a href="/XXGK/XXGK/GFXWJ/202511/t20251120_229102.html" target="_blank">航空器驾驶员训练中心合格审定程序</a>
+        <div class="t_l_content"><ul>
+          <li class="t_l_content_left">办文单位：飞行标准司</li>
+          <li class="t_l_content_right">文号：AC-142-FS-2025-01</li>
+        </ul></div>
+      </td>
+      <td class="tdRQ">2025年11月3日</td>
+      <td class="tdRQ">2025年11月20日</td>
+      <td class="strFL">AC-142-FS-2025-01</td>
+      <td class="strGF">有效</td>
+    </tr>
+    <tr>
+      <td>2</td>
+      <td class="tdMC">
+        <a href="/XXGK/XXGK/GFXWJ/202106/t20210618_208233.html" target="_blank">民用无人驾驶航空器运行安全管理规则</a>
+        <div class="t_l_content"><ul>
+          <li class="t_l_content_left">办文单位：运输司</li>
+        </ul></div>
+      </td>
+      <td class="tdRQ">2021-06-01</td>
+      <td class="tdRQ">2021-06-18</td>
+      <td class="strFL">IB-TR-2021-02</td>
+      <td class="strGF">废止</td>
+    </tr>
+  </tbody>
+</table>
+</body></html>
+"""
+
+
+def _regulation_page(documents):
+    """按规章页面结构生成结果页面"""
+    rows = "".join(
+        f'<tr><td>{i}</td><td class="t_l"><a href="{d.url}">{d.title}</a></td>'
+        f'<td>{d.doc_number}</td><td>{d.validity}</td></tr>'
+        for i, d in enumerate(documents, 1)
+    )
+    return f'<table class="t_table"><tbody>{rows}</tbody></table>'
+
+
+def _normative_page(documents):
+    """按规范性文件页面结构生成结果页面"""
+    rows = "".join(
+        f'<tr><td>{i}</td><td class="tdMC"><a href="{d.url}">{d.title}</a></td>'
+        f'<td class="tdRQ">{d.sign_date}</td><td class="tdRQ">{d.publish_date}</td>'
+        f'<td class="strFL">{d.doc_number}</td><td class="strGF">{d.validity}</td></tr>'
+        for i, d in enumerate(documents, 1)
+    )
+    return f'<table class="t_table"><tbody>{rows}</tbody></table>'
+
+
+def _make_documents(doc_type, count, start_day=0):
+    """生成按发布日期倒序排列的文档（第 0 条最新）"""
+    documents = []
+    for i in range(count):
+        day = start_day + count - i
+        date = time.strftime("%Y-%m-%d", time.gmtime(1500000000 + day * 86400))
+        stamp = date.replace("-", "")
+        number = day
+        documents.append(RegulationDocument(
+            title=f"{'运行规则' if doc_type == 'regulation' else '咨询通告'}第{number}号",
+            url=f"http://www.caac.gov.cn/XXGK/XXGK/{doc_type}/{stamp[:6]}/t{stamp}_{number}.html",
+            validity="有效" if number % 5 else "失效",
+            doc_number=f"CCAR-{number}" if doc_type == "regulation" else f"AC-{number}",
+            office_unit="飞行标准司",
+            doc_type=doc_type,
+            sign_date=date if doc_type == "normative" else "",
+            publish_date=date,
+        ))
+    return documents
+
+
+class _FakeSite:
+    """模拟 WAS5 搜索：按 channelid/page/fwrq1 返回结果页面"""
+
+    def __init__(self, regulations, normatives, repeat_last_page=False):
+        self.documents = {REGULATION_CHANNEL: regulations, NORMATIVE_CHANNEL: normatives}
+        self.repeat_last_page = repeat_last_page
+        self.fail = False
+        self.requests = []
+
+    def fetch(self, url):
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        self.requests.append(query)
+        if self.fail:
+            return ""
+        channel = query["channelid"]
+        documents = [d for d in self.documents[channel] if d.publish_date >= query.get("fwrq1", "")]
+        per_page = int(query["perpage"])
+        page = int(query.get("page", 1))
+        pages = max(1, -(-len(documents) // per_page))
+        if page > pages:
+            if not self.repeat_last_page:
+                return "<html><body>没有找到相关结果</body></html>"
+            page = pages
+        chunk = documents[(page - 1) * per_page:page * per_page]
+        render = _regulation_page if channel == REGULATION_CHANNEL else _normative_page
+        return render(chunk)
+
+    def pages_requested(self, channel):
+        return [int(q.get("page", 1)) for q in self.requests if q["channelid"] == channel]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RegulationCatalog(str(tmp_path))
+    yield catalog
+    catalog.close()
+
+
+def _sync(catalog, site, full=False, doc_type="all"):
+    worker = RegulationCatalogSyncWorker(catalog, doc_type=doc_type, full=full)
+    worker._fetch_page_content = site.fetch
+    results = []
+    worker.synced.connect(results.append)
+    worker.run()
+    return results
+
+
+# ============================================================
+# 页面解析
+# ============================================================
+
+class TestSavedPageParsing:
+    """保存的结果页面解析"""
+
+    def test_regulation_page(self):
+        worker = RegulationSearchWorker(keyword="")
+        documents = worker._parse_regulation_page(REGULATION_PAGE_HTML)
+
+        assert [d.doc_number for d in documents] == ["CCAR-121-R8", "CCAR-145-R4", "CCAR-141"]
+        first = documents[0]
+        assert first.title == "大型飞机公共航空运输承运人运行合格审定规则"
+        assert first.office_unit == "飞行标准司"
+        assert first.publish_date == "2025-12-17"
+        assert first.doc_type == "regulation"
+        # 相对链接补全，发文日期从 URL 提取
+        assert documents[1].url == "https://www.caac.gov.cn/XXGK/XXGK/MHGZ/202403/t20240305_223001.html"
+        assert documents[1].publish_date == "2024-03-05"
+        assert documents[2].validity == "失效"
+
+    def test_normative_page(self):
+        worker = RegulationSearchWorker(keyword="")
+        documents = worker._parse_normative_page(NORMATIVE_PAGE_HTML)
+
+        assert len(documents) == 2
+        first = documents[0]
+        assert first.doc_number == "AC-142-FS-2025-01"
+        assert (first.sign_date, first.publish_date) == ("2025-11-03", "2025-11-20")
+        assert first.office_unit == "飞行标准司"
+        assert documents[1].validity == "废止"
+        assert documents[1].doc_type == "normative"
+
+    def test_search_url_paging(self):
+        worker = RegulationSearchWorker(keyword="维修", start_date="2024-01-01")
+        first = worker._build_search_url(REGULATION_CHANNEL, "13")
+        second = worker._build_search_url(REGULATION_CHANNEL, "13", page=2)
+
+        assert "page=" not in first.replace("perpage=", "")
+        assert f"perpage={SEARCH_PER_PAGE}" in first
+        assert "sw=%E7%BB%B4%E4%BF%AE" in first and "fwrq1=2024-01-01" in first
+        assert "&page=2&" in second
+
+
+# ============================================================
+# 本地目录
+# ============================================================
+
+class TestRegulationCatalog:
+    """RegulationCatalog 存储与查询"""
+
+    @pytest.fixture
+    def filled(self, catalog):
+        worker = RegulationSearchWorker(keyword="")
+        catalog.upsert(worker._parse_regulation_page(REGULATION_PAGE_HTML))
+        catalog.upsert(worker._parse_normative_page(NORMATIVE_PAGE_HTML))
+        return catalog
+
+    def test_upsert_returns_changed(self, catalog):
+        documents = _make_documents("regulation", 3)
+
+        assert len(catalog.upsert(documents)) == 3
+        assert catalog.upsert(documents) == []
+
+        documents[1].validity = "废止"
+        assert [d.url for d in catalog.upsert(documents)] == [documents[1].url]
+        assert catalog.count() == 3
+
+    def test_keyword_search(self, filled):
+        assert filled.fts_enabled
+        titles = [d.title for d in filled.search("合格审定")]
+        assert titles == [
+            "大型飞机公共航空运输承运人运行合格审定规则",
+            "航空器驾驶员训练中心合格审定程序",
+            "民用航空器维修单位合格审定规则",
+            "民用航空器驾驶员学校合格审定规则",
+        ]
+        # 文号、办文单位、多个关键词
+        assert [d.doc_number for d in filled.search("CCAR-145")] == ["CCAR-145-R4"]
+        assert len(filled.search("运输司")) == 1
+        assert [d.doc_number for d in filled.search("驾驶员 学校")] == ["CCAR-141"]
+        # 不足 3 字的关键词回退 LIKE
+        assert [d.doc_number for d in filled.search("维修")] == ["CCAR-145-R4"]
+        assert filled.search("不存在的规章") == []
+
+    def test_filters(self, filled):
+        assert len(filled.search(doc_type="regulation")) == 3
+        assert len(filled.search(doc_type="normative")) == 2
+        assert {d.validity for d in filled.search(validity="invalid")} == {"失效", "废止"}
+        assert len(filled.search(validity="valid")) == 3
+
+        in_range = filled.search(start_date="2021-01-01", end_date="2024-12-31")
+        assert [d.publish_date for d in in_range] == ["2024-03-05", "2021-06-18"]
+        assert [d.doc_number for d in filled.search("航空器", validity="valid", start_date="2025-01-01")] == [
+            "AC-142-FS-2025-01"
+        ]
+
+    def test_sync_state(self, catalog):
+        assert catalog.last_synced("regulation") is None
+        catalog.mark_synced("regulation", full=False, timestamp=100.0)
+        assert catalog.last_synced("regulation") == 100.0
+        assert catalog.last_synced("regulation", full=True) is None
+        catalog.mark_synced("regulation", full=True, timestamp=200.0)
+        assert catalog.last_synced("regulation", full=True) == 200.0
+
+    def test_local_search_under_10ms(self, catalog):
+        catalog.upsert(_make_documents("regulation", 3000))
+        catalog.upsert(_make_documents("normative", 3000))
+
+        queries = [
+            dict(keyword="运行规则"),
+            dict(keyword="咨询通告 第12", validity="valid"),
+            dict(keyword="AC-2", start_date="2018-01-01", end_date="2019-12-31"),
+            dict(doc_type="regulation", validity="invalid", start_date="2018-06-01"),
+        ]
+        timings = []
+        for query in queries:
+            catalog.search(**query)
+            start = time.perf_counter()
+            for _ in range(5):
+                catalog.search(**query)
+            timings.append((time.perf_counter() - start) / 5)
+
+        print(f"\n6000 条目录查询耗时: {', '.join(f'{t * 1000:.2f}ms' for t in timings)}")
+        assert max(timings) < 0.01
+
+
+# ============================================================
+# 同步
+# ============================================================
+
+class TestCatalogSync:
+    """RegulationCatalogSyncWorker"""
+
+    def test_full_sync_pages_through_all_results(self, catalog):
+        site = _FakeSite(_make_documents("regulation", 250), _make_documents("normative", 120))
+
+        assert _sync(catalog, site) == [370]
+
+        assert catalog.count("regulation") == 250
+        assert catalog.count("normative") == 120
+        assert site.pages_requested(REGULATION_CHANNEL) == [1, 2, 3]
+        assert site.pages_requested(NORMATIVE_CHANNEL) == [1, 2]
+        assert catalog.last_synced("regulation", full=True) is not None
+
+    def test_repeated_last_page_stops(self, catalog):
+        site = _FakeSite(_make_documents("regulation", 200), [], repeat_last_page=True)
+
+        _sync(catalog, site, doc_type="regulation")
+
+        assert catalog.count("regulation") == 200
+        assert site.pages_requested(REGULATION_CHANNEL) == [1, 2, 3]
+
+    def test_incremental_sync_fetches_only_new(self, catalog):
+        old = _make_documents("regulation", 250)
+        site = _FakeSite(old, [])
+        _sync(catalog, site, doc_type="regulation")
+        latest = catalog.latest_publish_date("regulation")
+
+        new = _make_documents("regulation", 3, start_day=250)
+        site.documents[REGULATION_CHANNEL] = new + old
+        site.requests.clear()
+
+        assert _sync(catalog, site, doc_type="regulation") == [3]
+
+        assert catalog.count("regulation") == 253
+        assert [q.get("fwrq1") for q in site.requests] == [latest]
+        assert [d.url for d in catalog.search(doc_type="regulation", limit=3)] == [d.url for d in new]
+
+    def test_weekly_full_sync_refreshes_validity(self, catalog):
+        documents = _make_documents("regulation", 150)
+        site = _FakeSite(documents, [])
+        _sync(catalog, site, doc_type="regulation")
+
+        documents[-1].validity = "废止"
+        catalog.mark_synced("regulation", full=True, timestamp=time.time() - 8 * 86400)
+        site.requests.clear()
+
+        assert _sync(catalog, site, doc_type="regulation") == [1]
+        assert site.pages_requested(REGULATION_CHANNEL) == [1, 2]
+        assert catalog.search(documents[-1].title)[0].validity == "废止"
+
+    def test_fetch_failure_not_marked_synced(self, catalog):
+        site = _FakeSite(_make_documents("regulation", 10), [])
+        site.fail = True
+
+        _sync(catalog, site, doc_type="regulation")
+
+        assert catalog.last_synced("regulation") is None
+
+
+# ============================================================
+# RegulationService
+# ============================================================
+
+class TestServiceLocalSearch:
+    """RegulationService.search 查询本地目录"""
+
+    @pytest.fixture
+    def service(self, qapp, catalog, monkeypatch):
+        syncs = []
+        monkeypatch.setattr(RegulationService, "sync_catalog", lambda self, full=False: syncs.append(full))
+        service = RegulationService(catalog=catalog)
+        service.syncs = syncs
+        yield service
+        service.cleanup()
+
+    def test_synced_catalog_answers_locally(self, service, catalog, monkeypatch):
+        worker = RegulationSearchWorker(keyword="")
+        catalog.upsert(worker._parse_regulation_page(REGULATION_PAGE_HTML))
+        catalog.upsert(worker._parse_normative_page(NORMATIVE_PAGE_HTML))
+        catalog.mark_synced("regulation", full=True)
+        catalog.mark_synced("normative", full=True)
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("不应联网搜索")
+
+        monkeypatch.setattr(regulation_service, "RegulationSearchWorker", no_network)
+        results = []
+        service.searchFinished.connect(results.append)
+
+        service.search(keyword="合格审定", doc_type="regulation", validity="valid")
+
+        assert [d.doc_number for d in results[0]] == ["CCAR-121-R8", "CCAR-145-R4"]
+        assert service.syncs == []
+
+    def test_stale_catalog_triggers_background_sync(self, service, catalog):
+        catalog.mark_synced("regulation", full=True, timestamp=time.time() - 2 * 86400)
+        results = []
+        service.searchFinished.connect(results.append)
+
+        service.search(doc_type="regulation")
+
+        assert results == [[]]
+        assert service.syncs == [False]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
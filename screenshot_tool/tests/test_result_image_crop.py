@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+结果图片先裁剪后绘制测试
+
+Feature: crop-first-result
+
+测试内容：
+1. 先裁剪后绘制的结果与"完整截图上绘制后裁剪"逐像素一致（DPR 1 / 1.5 / 2）
+2. 完全在选区外的绘制项被跳过，部分相交的绘制项被正确裁剪
+3. 选区超出截图时按截图边界裁剪
+"""
+
+import pytest
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+
+from screenshot_tool.ui.overlay_screenshot import DrawItem, DrawTool, OverlayScreenshot
+
+
+def _screenshot(logical_width, logical_height, dpr):
+    width, height = int(logical_width * dpr), int(logical_height * dpr)
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(10, 60, 200))
+    gradient.setColorAt(1, QColor(250, 200, 30))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def _items():
+    red = QColor("#FF0000")
+    return [
+        DrawItem(DrawTool.RECT, red, 3, [QPoint(40, 40), QPoint(160, 120)]),
+        DrawItem(DrawTool.ELLIPSE, QColor("#00AA00"), 2, [QPoint(500, 20), QPoint(560, 60)]),
+        DrawItem(DrawTool.ARROW, red, 4, [QPoint(10, 10), QPoint(120, 90)]),
+        DrawItem(DrawTool.LINE, QColor("#0000FF"), 5, [QPoint(0, 150), QPoint(400, 150)]),
+        DrawItem(DrawTool.PEN, red, 3, [QPoint(90, 60), QPoint(95, 70), QPoint(130, 75)]),
+        DrawItem(DrawTool.MARKER, QColor("#FFFF00"), 2, [QPoint(70, 80), QPoint(220, 100)]),
+        DrawItem(DrawTool.MOSAIC, QColor("#000000"), 5, [QPoint(100, 30), QPoint(180, 70)]),
+        DrawItem(DrawTool.TEXT, red, 16, [QPoint(60, 110)], text="Hello 你好"),
+        DrawItem(DrawTool.STEP, red, 30, [QPoint(150, 50)], step_number=3),
+        DrawItem(DrawTool.RECT, red, 3, [QPoint(300, 300), QPoint(380, 360)]),
+    ]
+
+
+def _full_then_crop(overlay):
+    """旧实现：在完整截图上绘制所有绘制项后再裁剪"""
+    dpr = overlay._device_pixel_ratio
+    rect = overlay._get_selection_rect()
+    full = overlay._screenshot.copy()
+    full.setDevicePixelRatio(overlay._screenshot.devicePixelRatio())
+    painter = QPainter(full)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    for item in overlay._draw_items:
+        overlay._draw_item(painter, item)
+    painter.end()
+    image = full.toImage()
+    x, y = max(0, int(rect.x() * dpr)), max(0, int(rect.y() * dpr))
+    w = min(int(rect.width() * dpr), image.width() - x)
+    h = min(int(rect.height() * dpr), image.height() - y)
+    return image.copy(x, y, w, h)
+
+
+@pytest.fixture
+def overlay(qapp):
+    widget = OverlayScreenshot()
+    yield widget
+    widget.deleteLater()
+
+
+def _setup(overlay, dpr, selection, items):
+    overlay._screenshot = _screenshot(600, 400, dpr)
+    overlay._cached_image = None
+    overlay._device_pixel_ratio = dpr
+    overlay._selected = True
+    overlay._selection_rect = selection
+    overlay._draw_items = items
+
+
+class TestCropFirstResult:
+    """先裁剪后绘制测试"""
+
+    @pytest.mark.parametrize("dpr", [1.0, 1.5, 2.0])
+    @pytest.mark.parametrize("selection", [
+        QRect(50, 45, 150, 90),
+        QRect(33, 17, 101, 77),
+        QRect(0, 0, 600, 400),
+    ])
+    def test_pixel_identical(self, overlay, dpr, selection):
+        _setup(overlay, dpr, selection, _items())
+
+        expected = _full_then_crop(overlay)
+        actual = overlay._get_result_image()
+
+        assert actual.size() == expected.size()
+        assert actual.convertToFormat(QImage.Format.Format_RGB32) == \
+            expected.convertToFormat(QImage.Format.Format_RGB32)
+
+    def test_no_items(self, overlay):
+        _setup(overlay, 2.0, QRect(10, 10, 50, 40), [])
+        assert overlay._get_result_image() == _full_then_crop(overlay)
+
+    def test_selection_clipped_to_screenshot(self, overlay):
+        _setup(overlay, 1.5, QRect(550, 350, 200, 200), _items())
+        actual = overlay._get_result_image()
+        assert (actual.width(), actual.height()) == (75, 75)
+        assert actual == _full_then_crop(overlay)
+
+    def test_items_outside_selection_skipped(self, overlay, monkeypatch):
+        _setup(overlay, 1.0, QRect(20, 20, 100, 80), _items())
+        drawn = []
+        original = overlay._draw_item
+        monkeypatch.setattr(overlay, "_draw_item",
+                            lambda painter, item, **kw: (drawn.append(item), original(painter, item, **kw)))
+
+        overlay._get_result_image()
+
+        tools = [item.tool for item in drawn]
+        assert DrawTool.ELLIPSE not in tools  # (500, 20) 附近，远离选区
+        assert len([t for t in tools if t == DrawTool.RECT]) == 1
+        assert DrawTool.ARROW in tools and DrawTool.LINE not in tools
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+R 树空间索引测试
+
+Feature: rtree-spatial-index
+
+测试内容：
+1. 点/矩形查询与暴力搜索一致（逐个插入和批量构建，含随机更新/删除）
+2. 结果按插入顺序返回，update 保留顺序；精确几何过滤
+3. nearest(pos, k) 与暴力排序一致
+4. 树结构不变量（叶子同深度、父节点边界包含子节点）
+5. 基准：10 / 1,000 / 10,000 个混合大小图形，与网格索引对比
+"""
+
+import random
+import time
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtCore import QPoint, QRect
+
+from screenshot_tool.core.spatial_index import GridSpatialIndex, SpatialIndex
+
+
+class _Shape:
+    """测试用图形（按身份比较）"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"_Shape({self.name})"
+
+
+def _mixed_rect(rng):
+    """90% 小图形，10% 大矩形/长箭头"""
+    if rng.random() < 0.1:
+        return QRect(rng.randint(0, 3000), rng.randint(0, 2000),
+                     rng.randint(200, 2000), rng.randint(200, 1500))
+    return QRect(rng.randint(0, 3800), rng.randint(0, 2100),
+                 rng.randint(1, 60), rng.randint(1, 60))
+
+
+def _brute_query(rects, pos, radius):
+    return {
+        shape for shape, r in rects.items()
+        if r.left() - radius <= pos.x() <= r.right() + radius
+        and r.top() - radius <= pos.y() <= r.bottom() + radius
+    }
+
+
+def _distance_sq(pos, rect):
+    dx = max(rect.left() - pos.x(), 0, pos.x() - rect.right())
+    dy = max(rect.top() - pos.y(), 0, pos.y() - rect.bottom())
+    return dx * dx + dy * dy
+
+
+def _check_structure(index):
+    leaf_depths = set()
+
+    def visit(node, depth):
+        if node.leaf:
+            leaf_depths.add(depth)
+        for child in node.entries:
+            assert child.parent is node
+            x1, y1, x2, y2 = child.bbox
+            assert node.bbox[0] <= x1 and node.bbox[1] <= y1
+            assert node.bbox[2] >= x2 and node.bbox[3] >= y2
+            if not node.leaf:
+                visit(child, depth + 1)
+
+    if index._root.entries:
+        visit(index._root, 0)
+        assert len(leaf_depths) == 1
+
+
+def _build(seed, count, bulk):
+    rng = random.Random(seed)
+    shapes = [_Shape(i) for i in range(count)]
+    rects = {shape: _mixed_rect(rng) for shape in shapes}
+    index = SpatialIndex(max_entries=8)
+    if bulk:
+        index.bulk_load(rects.items())
+    else:
+        for shape, rect in rects.items():
+            index.insert(shape, rect)
+    return rng, shapes, rects, index
+
+
+class TestQueries:
+    """查询与暴力搜索一致"""
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_query_matches_brute_force_after_churn(self, qapp, bulk):
+        rng, shapes, rects, index = _build(1, 800, bulk)
+
+        for _ in range(800):
+            shape = rng.choice(shapes)
+            if rng.random() < 0.3:
+                index.remove(shape)
+                rects.pop(shape, None)
+            else:
+                rects[shape] = _mixed_rect(rng)
+                index.update(shape, rects[shape])
+
+        assert len(index) == len(rects)
+        _check_structure(index)
+        for _ in range(200):
+            pos = QPoint(rng.randint(0, 4000), rng.randint(0, 2500))
+            radius = rng.randint(0, 20)
+            assert set(index.query(pos, radius)) == _brute_query(rects, pos, radius)
+
+    def test_query_rect(self, qapp):
+        rng, _, rects, index = _build(2, 300, False)
+        area = QRect(1000, 500, 400, 300)
+        expected = {shape for shape, r in rects.items() if r.intersects(area)}
+        assert set(index.query_rect(area)) == expected
+        assert index.query_rect(QRect()) == []
+
+    def test_results_in_insertion_order(self, qapp):
+        index = SpatialIndex()
+        a, b, c = _Shape("a"), _Shape("b"), _Shape("c")
+        for shape in (a, b, c):
+            index.insert(shape, QRect(0, 0, 100, 100))
+
+        # update 不改变顺序
+        index.update(a, QRect(10, 10, 100, 100))
+        assert index.query(QPoint(50, 50)) == [a, b, c]
+
+        # 删除后重新插入排到最后
+        index.remove(a)
+        index.insert(a, QRect(0, 0, 100, 100))
+        assert index.query(QPoint(50, 50)) == [b, c, a]
+
+    def test_predicate_filters(self, qapp):
+        index = SpatialIndex()
+        a, b = _Shape("a"), _Shape("b")
+        index.insert(a, QRect(0, 0, 100, 100))
+        index.insert(b, QRect(0, 0, 100, 100))
+        assert index.query(QPoint(50, 50), predicate=lambda s: s is a) == [a]
+
+    def test_empty_rect_and_clear(self, qapp):
+        index = SpatialIndex()
+        shape = _Shape("a")
+        index.insert(shape, QRect())
+        assert len(index) == 0
+
+        index.insert(shape, QRect(0, 0, 10, 10))
+        index.clear()
+        assert index.query(QPoint(5, 5)) == []
+        assert index.nearest(QPoint(5, 5)) == []
+
+    @given(st.lists(st.tuples(st.integers(0, 500), st.integers(0, 500),
+                              st.integers(1, 200), st.integers(1, 200)),
+                    min_size=1, max_size=60),
+           st.integers(0, 600), st.integers(0, 600))
+    @settings(max_examples=50, deadline=None)
+    def test_query_property(self, qapp, boxes, x, y):
+        index = SpatialIndex(max_entries=4)
+        rects = {}
+        for i, (bx, by, bw, bh) in enumerate(boxes):
+            shape = _Shape(i)
+            rects[shape] = QRect(bx, by, bw, bh)
+            index.insert(shape, rects[shape])
+        pos = QPoint(x, y)
+        assert set(index.query(pos, 5)) == _brute_query(rects, pos, 5)
+
+
+class TestNearest:
+    """最近邻查询"""
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_nearest_matches_brute_force(self, qapp, bulk):
+        rng, _, rects, index = _build(3, 500, bulk)
+        for _ in range(100):
+            pos = QPoint(rng.randint(0, 4000), rng.randint(0, 2500))
+            result = index.nearest(pos, k=5)
+            expected = sorted(_distance_sq(pos, r) for r in rects.values())[:5]
+            assert [_distance_sq(pos, rects[s]) for s in result] == expected
+
+    def test_max_distance_and_predicate(self, qapp):
+        index = SpatialIndex()
+        near, far = _Shape("near"), _Shape("far")
+        index.insert(near, QRect(10, 0, 5, 5))
+        index.insert(far, QRect(100, 0, 5, 5))
+
+        assert index.nearest(QPoint(0, 0), k=2) == [near, far]
+        assert index.nearest(QPoint(0, 0), k=2, max_distance=20) == [near]
+        assert index.nearest(QPoint(0, 0), k=1, predicate=lambda s: s is far) == [far]
+
+    def test_ties_prefer_latest(self, qapp):
+        index = SpatialIndex()
+        shapes = [_Shape(i) for i in range(20)]
+        for shape in shapes:
+            index.insert(shape, QRect(0, 0, 50, 50))
+        assert index.nearest(QPoint(25, 25), k=3) == shapes[:-4:-1]
+
+
+class TestBenchmark:
+    """与网格索引对比（混合大小图形）"""
+
+    @pytest.mark.parametrize("count", [10, 1000, 10000])
+    def test_against_grid(self, qapp, count):
+        rng = random.Random(count)
+        shapes = [_Shape(i) for i in range(count)]
+        rects = [_mixed_rect(rng) for _ in range(count)]
+        points = [QPoint(rng.randint(0, 3800), rng.randint(0, 2100)) for _ in range(500)]
+        big = shapes[0]
+
+        timings = {}
+        for name, index in (("rtree", SpatialIndex()), ("grid", GridSpatialIndex(cell_size=50))):
+            start = time.perf_counter()
+            for shape, rect in zip(shapes, rects):
+                index.insert(shape, rect)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for pos in points:
+                index.query(pos, radius=5)
+            query_ms = (time.perf_counter() - start) * 1000
+
+            # 拖动一个大矩形：每次鼠标移动更新一次
+            start = time.perf_counter()
+            for i in range(100):
+                index.update(big, QRect(i, i, 2000, 1500))
+            drag_ms = (time.perf_counter() - start) * 1000
+            timings[name] = (build_ms, query_ms, drag_ms)
+
+        start = time.perf_counter()
+        SpatialIndex().bulk_load(zip(shapes, rects))
+        bulk_ms = (time.perf_counter() - start) * 1000
+
+        rtree, grid = timings["rtree"], timings["grid"]
+        print(f"\n{count} 个图形: 构建 R树 {rtree[0]:.1f}ms (批量 {bulk_ms:.1f}ms) / 网格 {grid[0]:.1f}ms, "
+              f"500 次查询 {rtree[1]:.1f}ms / {grid[1]:.1f}ms, "
+              f"100 次大矩形拖动 {rtree[2]:.1f}ms / {grid[2]:.1f}ms")
+        # 大图形更新代价与面积无关
+        assert rtree[2] < grid[2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
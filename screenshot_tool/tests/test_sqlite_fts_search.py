@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite 全文搜索测试
+
+Feature: history-fts-search
+
+验证 FTS5 trigram 全文索引：
+1. 与原 LIKE 子串搜索结果一致（属性测试）
+2. 插入、更新、删除、INSERT OR REPLACE 时索引由触发器同步
+3. 从 schema v1 升级时自动创建并回填索引
+4. FTS5 不可用时回退到 LIKE 查询
+5. 相关度排序与高亮片段
+6. 10k / 100k 条记录的搜索延迟基准
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from screenshot_tool.core.sqlite_history_storage import (
+    SQLiteHistoryStorage,
+    HistoryItem,
+    ContentType,
+    SearchResult,
+)
+
+
+# ============================================================================
+# 测试夹具和辅助函数
+# ============================================================================
+
+@pytest.fixture
+def temp_storage():
+    """创建临时 SQLite 存储实例"""
+    temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_test_")
+    storage = SQLiteHistoryStorage(data_dir=temp_dir)
+    yield storage
+    storage.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def like_storage(monkeypatch):
+    """创建模拟 SQLite 未编译 FTS5 的存储实例"""
+    monkeypatch.setattr(
+        SQLiteHistoryStorage, "_is_fts5_available", staticmethod(lambda cursor: False)
+    )
+    temp_dir = tempfile.mkdtemp(prefix="sqlite_like_test_")
+    storage = SQLiteHistoryStorage(data_dir=temp_dir)
+    yield storage
+    storage.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def make_item(
+    index: int,
+    text: str = None,
+    ocr_cache: str = None,
+    content_type: ContentType = ContentType.TEXT,
+) -> HistoryItem:
+    """创建测试用历史记录（时间戳随 index 递增）"""
+    return HistoryItem(
+        id=f"fts_item_{index:05d}",
+        content_type=content_type,
+        text_content=text,
+        image_path="clipboard_images/x.png" if content_type == ContentType.IMAGE else None,
+        preview_text=(text or "[图片]")[:50],
+        timestamp=datetime(2025, 1, 1) + timedelta(seconds=index),
+        ocr_cache=ocr_cache,
+    )
+
+
+def search_ids(storage: SQLiteHistoryStorage, query: str, use_fts: bool) -> list:
+    """分别用全文索引或 LIKE 路径搜索，返回 ID 列表"""
+    saved = storage._fts_enabled
+    storage._fts_enabled = use_fts and saved
+    try:
+        return [item.id for item in storage.search_items(query, 0, 1000)]
+    finally:
+        storage._fts_enabled = saved
+
+
+def bulk_insert(storage: SQLiteHistoryStorage, count: int) -> None:
+    """批量插入基准测试数据（绕过 add_item 以缩短准备时间，触发器仍会同步索引）"""
+    words = [
+        "截图", "剪贴板", "工作台", "识别", "文字", "翻译",
+        "history", "clipboard", "screenshot", "python", "sqlite", "window",
+    ]
+    base = datetime(2025, 1, 1)
+    rows = []
+    for i in range(count):
+        text = " ".join(words[(i * 7 + j * 3) % len(words)] for j in range(40))
+        ocr = " ".join(words[(i + j * 5) % len(words)] for j in range(80)) if i % 3 == 0 else None
+        rows.append((
+            f"bench_{i:06d}", "text", text, None, text[:50],
+            (base + timedelta(seconds=i)).isoformat(), ocr,
+        ))
+    # 少量稀有内容，模拟精确查找
+    for i in range(0, count, count // 10):
+        rows[i] = rows[i][:2] + (f"订单号 ORD-{i:06d}-XYZ",) + rows[i][3:]
+    with storage._get_cursor() as cursor:
+        cursor.executemany('''
+            INSERT INTO history_items (
+                id, content_type, text_content, image_path,
+                preview_text, timestamp, ocr_cache
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+
+def measure_ms(func, repeat: int = 5) -> float:
+    """多次执行取最小耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+# ============================================================================
+# 搜索语义一致性
+# ============================================================================
+
+# 小字母表让随机查询有较高命中率
+search_text_strategy = st.text(alphabet="abcAB截图文字 -\"*", min_size=0, max_size=30)
+
+
+class TestFTSMatchesLikeSemantics:
+    """全文索引与 LIKE 子串搜索结果一致"""
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        texts=st.lists(search_text_strategy, min_size=1, max_size=15),
+        ocr_texts=st.lists(st.one_of(st.none(), search_text_strategy), min_size=15, max_size=15),
+        query=st.text(alphabet="abcAB截图文字 -\"*", min_size=1, max_size=5),
+    )
+    def test_fts_results_equal_like_results(self, texts, ocr_texts, query):
+        """*For any* 数据集和查询，FTS 路径与 LIKE 路径返回相同记录和顺序"""
+        if not query.strip():
+            return
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_test_")
+        storage = SQLiteHistoryStorage(data_dir=temp_dir)
+        try:
+            if not storage.fts_enabled:
+                pytest.skip("SQLite 未编译 FTS5 trigram")
+            for i, text in enumerate(texts):
+                storage.add_item(make_item(i, text=text or None, ocr_cache=ocr_texts[i]))
+
+            assert search_ids(storage, query, True) == search_ids(storage, query, False)
+        finally:
+            storage.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_search_is_case_insensitive(self, temp_storage):
+        temp_storage.add_item(make_item(1, text="Hello Clipboard World"))
+
+        assert [i.id for i in temp_storage.search_items("clipboard")] == ["fts_item_00001"]
+        assert [i.id for i in temp_storage.search_items("CLIPBOARD")] == ["fts_item_00001"]
+
+    def test_short_cjk_query_uses_like_fallback(self, temp_storage):
+        """两个汉字的查询低于 trigram 最小长度，仍应命中"""
+        temp_storage.add_item(make_item(1, text="这是一段截图文字"))
+        temp_storage.add_item(make_item(2, text="无关内容"))
+
+        assert [i.id for i in temp_storage.search_items("截图")] == ["fts_item_00001"]
+
+    def test_fts_syntax_characters_are_literal(self, temp_storage):
+        """FTS5 语法字符按字面匹配，不会导致查询错误"""
+        temp_storage.add_item(make_item(1, text='say "hi" AND bye*'))
+
+        assert len(temp_storage.search_items('"hi" AND')) == 1
+        assert len(temp_storage.search_items('bye*')) == 1
+        assert temp_storage.search_items('NOT NEAR(') == []
+
+    def test_searches_ocr_cache(self, temp_storage):
+        temp_storage.add_item(make_item(
+            1, content_type=ContentType.IMAGE, ocr_cache="发票号码 12345678"
+        ))
+
+        result = temp_storage.search_items("12345678")
+        assert [i.id for i in result] == ["fts_item_00001"]
+
+
+# ============================================================================
+# 索引同步
+# ============================================================================
+
+class TestFTSIndexSync:
+    """触发器保持全文索引与主表同步"""
+
+    def test_index_follows_update(self, temp_storage):
+        item = make_item(1, text="original content")
+        temp_storage.add_item(item)
+
+        item.text_content = "replaced content"
+        item.preview_text = "replaced content"
+        temp_storage.update_item(item)
+
+        assert temp_storage.search_items("original") == []
+        assert len(temp_storage.search_items("replaced")) == 1
+
+    def test_index_follows_ocr_cache_update(self, temp_storage):
+        temp_storage.add_item(make_item(1, content_type=ContentType.IMAGE))
+
+        assert temp_storage.search_items("invoice") == []
+        temp_storage.update_ocr_cache("fts_item_00001", "invoice total")
+        assert len(temp_storage.search_items("invoice")) == 1
+
+    def test_index_follows_delete(self, temp_storage):
+        temp_storage.add_item(make_item(1, text="to be deleted"))
+        temp_storage.delete_item("fts_item_00001")
+
+        assert temp_storage.search_items("deleted") == []
+
+    def test_index_follows_insert_or_replace(self, temp_storage):
+        """add_item 使用 INSERT OR REPLACE，旧内容必须从索引移除"""
+        temp_storage.add_item(make_item(1, text="first version"))
+        temp_storage.add_item(make_item(1, text="second version"))
+
+        assert temp_storage.search_items("first") == []
+        assert len(temp_storage.search_items("second")) == 1
+        if temp_storage.fts_enabled:
+            # 外部内容表完整性检查：索引与主表内容一致
+            with temp_storage._get_cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO history_fts(history_fts, rank) VALUES('integrity-check', 1)"
+                )
+
+    def test_index_follows_clear_all(self, temp_storage):
+        temp_storage.add_item(make_item(1, text="unpinned text"))
+        pinned = make_item(2, text="pinned text")
+        pinned.is_pinned = True
+        temp_storage.add_item(pinned)
+
+        temp_storage.clear_all(keep_pinned=True)
+
+        assert [i.id for i in temp_storage.search_items("text")] == ["fts_item_00002"]
+
+
+# ============================================================================
+# Schema 迁移与回退
+# ============================================================================
+
+class TestFTSMigration:
+    """从 schema v1 升级"""
+
+    def test_upgrade_from_v1_backfills_index(self):
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_migrate_")
+        try:
+            db_path = os.path.join(temp_dir, SQLiteHistoryStorage.DB_FILE)
+            conn = sqlite3.connect(db_path)
+            conn.executescript('''
+                CREATE TABLE history_items (
+                    id TEXT PRIMARY KEY,
+                    content_type TEXT NOT NULL,
+                    text_content TEXT,
+                    image_path TEXT,
+                    preview_text TEXT NOT NULL,
+                    timestamp DATETIME NOT NULL,
+                    is_pinned INTEGER DEFAULT 0,
+                    custom_name TEXT,
+                    ocr_cache TEXT,
+                    ocr_cache_timestamp DATETIME,
+                    annotations TEXT,
+                    selection_rect TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE schema_version (version INTEGER PRIMARY KEY);
+                INSERT INTO schema_version (version) VALUES (1);
+                INSERT INTO history_items (id, content_type, text_content, preview_text, timestamp)
+                VALUES ('legacy', 'text', 'legacy clipboard text', 'legacy', '2024-01-01T00:00:00');
+            ''')
+            conn.commit()
+            conn.close()
+
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            try:
+                if not storage.fts_enabled:
+                    pytest.skip("SQLite 未编译 FTS5 trigram")
+                with storage._get_cursor() as cursor:
+                    cursor.execute('SELECT version FROM schema_version')
+                    assert cursor.fetchone()[0] == SQLiteHistoryStorage.SCHEMA_VERSION
+
+                assert [i.id for i in storage.search_items("clipboard")] == ["legacy"]
+            finally:
+                storage.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_reopen_keeps_index(self):
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_reopen_")
+        try:
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            storage.add_item(make_item(1, text="persisted content"))
+            storage.close()
+
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            try:
+                assert len(storage.search_items("persisted")) == 1
+            finally:
+                storage.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestLikeFallback:
+    """FTS5 不可用时的 LIKE 回退"""
+
+    def test_fts_disabled(self, like_storage):
+        assert like_storage.fts_enabled is False
+        assert like_storage.rebuild_search_index() is False
+
+    def test_search_still_works(self, like_storage):
+        like_storage.add_item(make_item(1, text="fallback search content"))
+        like_storage.add_item(make_item(2, text="other"))
+
+        assert [i.id for i in like_storage.search_items("search")] == ["fts_item_00001"]
+
+    def test_index_recovers_after_fts_unavailable(self, monkeypatch):
+        """曾在无 FTS5 环境下写入的记录，重新支持 FTS5 后应被回填"""
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_recover_")
+        try:
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            if not storage.fts_enabled:
+                storage.close()
+                pytest.skip("SQLite 未编译 FTS5 trigram")
+            storage.close()
+
+            with monkeypatch.context() as m:
+                m.setattr(
+                    SQLiteHistoryStorage, "_is_fts5_available",
+                    staticmethod(lambda cursor: False),
+                )
+                storage = SQLiteHistoryStorage(data_dir=temp_dir)
+                assert storage.add_item(make_item(1, text="written without index"))
+                storage.close()
+
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            try:
+                assert storage.fts_enabled
+                assert len(storage.search_items("without index")) == 1
+            finally:
+                storage.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_ranked_search_builds_snippet(self, like_storage):
+        like_storage.add_item(make_item(1, text="fallback search content"))
+
+        results = like_storage.search_items_ranked("search")
+        assert len(results) == 1
+        assert results[0].snippet == "fallback 【search】 content"
+
+
+# ============================================================================
+# 相关度排序与片段
+# ============================================================================
+
+class TestRankedSearch:
+    """search_items_ranked 相关度排序与高亮片段"""
+
+    def test_returns_search_results_with_highlight(self, temp_storage):
+        temp_storage.add_item(make_item(1, text="the quick brown fox jumps"))
+
+        results = temp_storage.search_items_ranked("brown")
+        assert len(results) == 1
+        assert isinstance(results[0], SearchResult)
+        assert results[0].item.id == "fts_item_00001"
+        assert "【brown】" in results[0].snippet
+
+    def test_more_relevant_item_ranks_first(self, temp_storage):
+        if not temp_storage.fts_enabled:
+            pytest.skip("SQLite 未编译 FTS5 trigram")
+        # 较新的记录只提到一次，较旧的记录反复出现关键词
+        temp_storage.add_item(make_item(1, text="report report report report"))
+        temp_storage.add_item(make_item(2, text="a long text that mentions report once " + "x" * 200))
+
+        results = temp_storage.search_items_ranked("report")
+        assert [r.item.id for r in results] == ["fts_item_00001", "fts_item_00002"]
+        assert results[0].rank <= results[1].rank
+
+    def test_empty_query_returns_nothing(self, temp_storage):
+        temp_storage.add_item(make_item(1, text="anything"))
+
+        assert temp_storage.search_items_ranked("  ") == []
+
+
+# ============================================================================
+# 性能基准
+# ============================================================================
+
+class TestFTSSearchBenchmark:
+    """全文索引与 LIKE 全表扫描的搜索延迟对比
+
+    10k 条记录默认运行；100k 条记录准备数据较慢，
+    设置环境变量 SCREENSHOT_TOOL_BENCHMARK=1 时运行。
+    """
+
+    def _run_benchmark(self, count: int) -> None:
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_fts_bench_")
+        storage = SQLiteHistoryStorage(data_dir=temp_dir)
+        try:
+            if not storage.fts_enabled:
+                pytest.skip("SQLite 未编译 FTS5 trigram")
+            bulk_insert(storage, count)
+
+            report = []
+            for label, query in (
+                ("稀有词", "ORD-000000-XYZ"),
+                ("未命中", "不存在的内容"),
+                ("高频词", "clipboard"),
+            ):
+                fts_ms = measure_ms(lambda: search_ids(storage, query, True))
+                like_ms = measure_ms(lambda: search_ids(storage, query, False))
+                report.append(f"{count} 条 {label}: FTS {fts_ms:.2f}ms / LIKE {like_ms:.2f}ms")
+                assert search_ids(storage, query, True) == search_ids(storage, query, False)
+
+                if label != "高频词":
+                    # 选择性查询：全文索引应远快于全表扫描
+                    assert fts_ms < like_ms
+                else:
+                    # 高频词自动回退到按时间索引扫描，不应明显退化
+                    assert fts_ms < like_ms + 50
+            print("\n" + "\n".join(report))
+        finally:
+            storage.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_benchmark_10k(self):
+        self._run_benchmark(10_000)
+
+    @pytest.mark.skipif(
+        not os.environ.get("SCREENSHOT_TOOL_BENCHMARK"),
+        reason="设置 SCREENSHOT_TOOL_BENCHMARK=1 运行 100k 基准",
+    )
+    def test_benchmark_100k(self):
+        self._run_benchmark(100_000)
@@ -30,6 +30,8 @@ from screenshot_tool.core.sqlite_history_storage import (
     SQLiteHistoryStorage,
     HistoryItem,
     ContentType,
+    PageCursor,
+    compute_text_hash,
 )
 
 
@@ -1795,6 +1797,401 @@ class TestPaginationReturnsCorrectSubset:
                         f"{result[i].timestamp} < {result[i + 1].timestamp}"
 
 
+# ============================================================================
+# 游标分页（keyset pagination）测试
+# ============================================================================
+
+class TestKeysetPagination:
+    """游标分页测试
+    
+    Feature: history-keyset-pagination
+    
+    get_summary_page(after, limit) 按 (timestamp, id) 降序返回摘要，
+    逐页翻完应覆盖全部条目且不重复、不遗漏。
+    """
+
+    @staticmethod
+    def _collect_pages(storage, limit, query=None):
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = storage.get_summary_page(cursor, limit, query)
+            pages.append(page)
+            if cursor is None:
+                return pages
+
+    @settings(max_examples=10, deadline=None)
+    @given(
+        num_items=st.integers(min_value=0, max_value=40),
+        num_timestamps=st.integers(min_value=1, max_value=5),
+        limit=st.integers(min_value=1, max_value=15),
+    )
+    def test_pages_cover_all_items_in_order(
+        self,
+        num_items: int,
+        num_timestamps: int,
+        limit: int,
+    ):
+        """逐页翻完等价于 get_all_items 的完整排序结果（包含时间戳相同的条目）"""
+        with TempStorageContext() as storage:
+            for i in range(num_items):
+                storage.add_item(HistoryItem(
+                    id=f"keyset_{i:04d}",
+                    content_type=ContentType.TEXT,
+                    text_content=f"Content {i}",
+                    image_path=None,
+                    preview_text=f"Preview {i}",
+                    # 故意制造大量相同时间戳，验证 id 作为第二排序键
+                    timestamp=datetime(2025, 1, 1, 12, i % num_timestamps),
+                    is_pinned=False,
+                ))
+            
+            pages = self._collect_pages(storage, limit)
+            paged_ids = [s.id for page in pages for s in page]
+            
+            assert all(len(page) <= limit for page in pages)
+            assert len(paged_ids) == len(set(paged_ids))
+            assert paged_ids == [item.id for item in storage.get_all_items()]
+
+    def test_ties_broken_by_id_descending(self, temp_storage):
+        """时间戳相同时按 id 降序"""
+        ts = datetime(2025, 1, 1, 12, 0, 0)
+        for item_id in ["b", "a", "c"]:
+            temp_storage.add_item(HistoryItem(
+                id=item_id,
+                content_type=ContentType.TEXT,
+                text_content=item_id,
+                image_path=None,
+                preview_text=item_id,
+                timestamp=ts,
+                is_pinned=False,
+            ))
+        
+        first, cursor = temp_storage.get_summary_page(None, 2)
+        assert [s.id for s in first] == ["c", "b"]
+        assert cursor == PageCursor(ts.isoformat(), "b")
+        
+        second, cursor = temp_storage.get_summary_page(cursor, 2)
+        assert [s.id for s in second] == ["a"]
+        assert cursor is None
+
+    def test_search_with_cursor(self, temp_storage):
+        """搜索条件与游标可以组合使用"""
+        for i in range(10):
+            temp_storage.add_item(HistoryItem(
+                id=f"item_{i:02d}",
+                content_type=ContentType.TEXT,
+                text_content=("match " if i % 2 == 0 else "other ") + str(i),
+                image_path=None,
+                preview_text=f"Preview {i}",
+                timestamp=datetime(2025, 1, 1, 12, i),
+                is_pinned=False,
+            ))
+        
+        pages = self._collect_pages(temp_storage, 2, "match")
+        paged_ids = [s.id for page in pages for s in page]
+        assert paged_ids == ["item_08", "item_06", "item_04", "item_02", "item_00"]
+
+    def test_summary_excludes_heavy_columns(self, temp_storage):
+        """摘要只携带列表所需字段，标注通过 annotated 标志体现"""
+        temp_storage.add_item(HistoryItem(
+            id="annotated",
+            content_type=ContentType.IMAGE,
+            text_content=None,
+            image_path="clipboard_images/a.png",
+            preview_text="[图片]",
+            timestamp=datetime(2025, 1, 1, 12, 1),
+            is_pinned=True,
+            annotations=[{"tool": "rect", "color": "#FF0000", "width": 2}],
+            ocr_cache="x" * 10000,
+        ))
+        temp_storage.add_item(HistoryItem(
+            id="plain",
+            content_type=ContentType.IMAGE,
+            text_content=None,
+            image_path="clipboard_images/b.png",
+            preview_text="[图片]",
+            timestamp=datetime(2025, 1, 1, 12, 0),
+            is_pinned=False,
+            annotations=[],
+        ))
+        
+        summaries, cursor = temp_storage.get_summary_page(None, 10)
+        assert cursor is None
+        by_id = {s.id: s for s in summaries}
+        
+        assert by_id["annotated"].has_annotations()
+        assert by_id["annotated"].is_pinned
+        assert by_id["annotated"].image_path == "clipboard_images/a.png"
+        assert by_id["annotated"].content_type == ContentType.IMAGE
+        assert not by_id["plain"].has_annotations()
+        assert not hasattr(by_id["annotated"], "ocr_cache")
+
+    def test_page_query_uses_composite_index(self, temp_storage):
+        """游标查询走 (timestamp, id) 复合索引，不需要临时排序"""
+        conn = temp_storage._get_connection()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM history_items "
+            "WHERE (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT 50",
+            ("2025-01-01T00:00:00", "x"),
+        ).fetchall()
+        details = " ".join(str(row[-1]) for row in plan)
+        
+        assert "idx_timestamp_id" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_migration_replaces_timestamp_index(self):
+        """旧版本数据库升级后使用复合索引"""
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_test_")
+        try:
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            conn = storage._get_connection()
+            conn.execute("DROP INDEX IF EXISTS idx_timestamp_id")
+            conn.execute("CREATE INDEX idx_timestamp ON history_items(timestamp DESC)")
+            conn.execute("UPDATE schema_version SET version = 2")
+            conn.commit()
+            storage.close()
+            
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            conn = storage._get_connection()
+            indexes = {
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+            storage.close()
+            
+            assert "idx_timestamp_id" in indexes
+            assert "idx_timestamp" not in indexes
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# ============================================================================
+# 内容摘要去重测试
+# ============================================================================
+
+class TestContentHash:
+    """content_hash 列与唯一索引测试
+    
+    Feature: clipboard-content-dedup
+    """
+
+    @staticmethod
+    def _text_item(item_id, text, minute=0, content_hash=None):
+        return HistoryItem(
+            id=item_id,
+            content_type=ContentType.TEXT,
+            text_content=text,
+            image_path=None,
+            preview_text=text,
+            timestamp=datetime(2025, 1, 1, 12, minute),
+            is_pinned=False,
+            content_hash=content_hash,
+        )
+
+    def test_find_by_content_hash(self, temp_storage):
+        """按摘要查找记录"""
+        content_hash = compute_text_hash("hello")
+        temp_storage.add_item(self._text_item("a", "hello", content_hash=content_hash))
+        
+        found = temp_storage.find_by_content_hash(content_hash)
+        assert found is not None
+        assert found.id == "a"
+        assert found.content_hash == content_hash
+        assert temp_storage.find_by_content_hash(compute_text_hash("other")) is None
+
+    def test_content_hash_is_unique(self, temp_storage):
+        """同一摘要只能存在一条记录，未计算摘要的记录不受限制"""
+        content_hash = compute_text_hash("hello")
+        temp_storage.add_item(self._text_item("a", "hello", content_hash=content_hash))
+        temp_storage.add_item(self._text_item("b", "hello", content_hash=content_hash))
+        temp_storage.add_item(self._text_item("c", "hello"))
+        temp_storage.add_item(self._text_item("d", "hello"))
+        
+        assert temp_storage.count_items() == 3
+
+    def test_touch_item_moves_to_top(self, temp_storage):
+        """touch_item 只更新时间戳"""
+        temp_storage.add_item(self._text_item("old", "old", minute=0))
+        temp_storage.add_item(self._text_item("new", "new", minute=1))
+        
+        assert temp_storage.touch_item("old", datetime(2025, 1, 1, 12, 2))
+        assert [item.id for item in temp_storage.get_all_items()] == ["old", "new"]
+        assert not temp_storage.touch_item("missing")
+
+    def test_count_image_references(self, temp_storage):
+        """统计引用同一图片文件的记录数"""
+        for item_id in ["a", "b"]:
+            temp_storage.add_item(HistoryItem(
+                id=item_id,
+                content_type=ContentType.IMAGE,
+                text_content=None,
+                image_path="clipboard_images/shared.png",
+                preview_text="[图片]",
+                timestamp=datetime(2025, 1, 1, 12, 0),
+            ))
+        
+        assert temp_storage.count_image_references("clipboard_images/shared.png") == 2
+        temp_storage.delete_item("a")
+        assert temp_storage.count_image_references("clipboard_images/shared.png") == 1
+        assert temp_storage.count_image_references("clipboard_images/none.png") == 0
+
+    def test_text_hash_normalizes_line_endings(self):
+        """CRLF / CR / LF 换行得到相同摘要"""
+        assert compute_text_hash("a\r\nb") == compute_text_hash("a\nb")
+        assert compute_text_hash("a\rb") == compute_text_hash("a\nb")
+        assert compute_text_hash("a b") != compute_text_hash("a\nb")
+
+    def test_migration_backfills_text_hashes(self):
+        """v3 数据库升级后添加摘要列，并为文本记录回填摘要（重复文本只回填最新一条）"""
+        import sqlite3
+        
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_test_")
+        try:
+            conn = sqlite3.connect(os.path.join(temp_dir, SQLiteHistoryStorage.DB_FILE))
+            conn.execute('''
+                CREATE TABLE history_items (
+                    id TEXT PRIMARY KEY,
+                    content_type TEXT NOT NULL,
+                    text_content TEXT,
+                    image_path TEXT,
+                    preview_text TEXT NOT NULL,
+                    timestamp DATETIME NOT NULL,
+                    is_pinned INTEGER DEFAULT 0,
+                    custom_name TEXT,
+                    ocr_cache TEXT,
+                    ocr_cache_timestamp DATETIME,
+                    annotations TEXT,
+                    selection_rect TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute("CREATE TABLE schema_version (version INTEGER PRIMARY KEY)")
+            conn.execute("INSERT INTO schema_version (version) VALUES (3)")
+            rows = [
+                ("old_dup", "text", "dup", None, "dup", "2025-01-01T12:00:00"),
+                ("new_dup", "text", "dup", None, "dup", "2025-01-01T12:01:00"),
+                ("unique", "text", "unique", None, "unique", "2025-01-01T12:02:00"),
+                ("image", "image", None, "clipboard_images/a.png", "[图片]", "2025-01-01T12:03:00"),
+            ]
+            conn.executemany(
+                "INSERT INTO history_items (id, content_type, text_content, image_path, "
+                "preview_text, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+            conn.close()
+            
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            try:
+                hashes = {item.id: item.content_hash for item in storage.get_all_items()}
+                assert hashes["new_dup"] == compute_text_hash("dup")
+                assert hashes["old_dup"] is None
+                assert hashes["unique"] == compute_text_hash("unique")
+                assert hashes["image"] is None
+                assert storage.find_by_content_hash(compute_text_hash("dup")).id == "new_dup"
+            finally:
+                storage.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+
+class TestThumbnailStorage:
+    """thumbnails 缩略图表测试
+    
+    Feature: history-thumbnail-store
+    """
+
+    @staticmethod
+    def _image_item(item_id, minute=0):
+        return HistoryItem(
+            id=item_id,
+            content_type=ContentType.IMAGE,
+            text_content=None,
+            image_path=f"clipboard_images/{item_id}.png",
+            preview_text="[图片]",
+            timestamp=datetime(2025, 1, 1, 12, minute),
+            is_pinned=False,
+        )
+
+    def test_save_and_get_thumbnail(self, temp_storage):
+        """保存后按最长边读取"""
+        temp_storage.add_item(self._image_item("a"))
+        assert temp_storage.get_thumbnail("a", 200) is None
+        
+        assert temp_storage.save_thumbnail("a", 200, b"thumb")
+        assert temp_storage.get_thumbnail("a", 200) == b"thumb"
+        # 尺寸不一致视为未命中
+        assert temp_storage.get_thumbnail("a", 100) is None
+
+    def test_save_thumbnail_requires_item(self, temp_storage):
+        """记录不存在时不保存孤立缩略图"""
+        assert not temp_storage.save_thumbnail("missing", 200, b"thumb")
+        assert temp_storage.get_thumbnail("missing", 200) is None
+
+    def test_delete_thumbnail(self, temp_storage):
+        """删除缩略图不影响记录"""
+        temp_storage.add_item(self._image_item("a"))
+        temp_storage.save_thumbnail("a", 200, b"thumb")
+        
+        assert temp_storage.delete_thumbnail("a")
+        assert temp_storage.get_thumbnail("a", 200) is None
+        assert temp_storage.get_item("a") is not None
+
+    def test_thumbnail_deleted_with_item(self, temp_storage):
+        """删除记录、清空、数量限制时级联删除缩略图"""
+        for i, item_id in enumerate(["a", "b", "c", "d"]):
+            temp_storage.add_item(self._image_item(item_id, minute=i))
+            temp_storage.save_thumbnail(item_id, 200, item_id.encode())
+        
+        temp_storage.delete_item("d")
+        temp_storage.delete_oldest_unpinned(keep_count=2)
+        assert temp_storage.get_thumbnail("d", 200) is None
+        assert temp_storage.get_thumbnail("a", 200) is None
+        assert temp_storage.get_thumbnail("c", 200) == b"c"
+        
+        temp_storage.clear_all(keep_pinned=False)
+        with temp_storage._get_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM thumbnails")
+            assert cursor.fetchone()[0] == 0
+
+    def test_thumbnail_deleted_when_item_replaced(self, temp_storage):
+        """INSERT OR REPLACE 覆盖记录时旧缩略图失效"""
+        temp_storage.add_item(self._image_item("a"))
+        temp_storage.save_thumbnail("a", 200, b"thumb")
+        
+        temp_storage.add_item(self._image_item("a", minute=5))
+        assert temp_storage.get_thumbnail("a", 200) is None
+
+    def test_migrate_v4_adds_thumbnails_table(self):
+        """v4 数据库升级后可保存缩略图"""
+        import sqlite3
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            storage.add_item(self._image_item("a"))
+            storage.close()
+            
+            conn = sqlite3.connect(os.path.join(temp_dir, SQLiteHistoryStorage.DB_FILE))
+            conn.execute("DROP TABLE thumbnails")
+            conn.execute("UPDATE schema_version SET version = 4")
+            conn.commit()
+            conn.close()
+            
+            storage = SQLiteHistoryStorage(data_dir=temp_dir)
+            try:
+                assert storage.save_thumbnail("a", 200, b"thumb")
+                assert storage.get_thumbnail("a", 200) == b"thumb"
+            finally:
+                storage.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 # ============================================================================
 # 运行测试
 # ============================================================================
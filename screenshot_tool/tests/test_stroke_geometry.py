@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+笔画几何测试
+
+Feature: stroke-simplification
+
+测试内容：
+1. RDP 简化：首尾保留、偏差不超过容差、直线退化为两点、重复点去除
+2. StrokePoints 序列协议、平移、缩放、序列化
+3. DrawItem 提交简化、路径缓存、AnnotationData 往返
+4. 长笔画的点数和序列化体积
+"""
+
+import json
+import math
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QColor
+
+from screenshot_tool.core.stroke_geometry import (
+    StrokePoints,
+    simplify_polyline,
+    stroke_tolerance,
+)
+from screenshot_tool.ui.overlay_screenshot import DrawItem, DrawTool
+
+
+def _segment_distance(p, a, b):
+    ax, ay = a
+    bx, by = b
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(p[0] - ax, p[1] - ay)
+    t = max(0.0, min(1.0, ((p[0] - ax) * dx + (p[1] - ay) * dy) / length_sq))
+    return math.hypot(p[0] - (ax + t * dx), p[1] - (ay + t * dy))
+
+
+def _freehand(count, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(-3, 4, size=(count, 2))
+    return np.cumsum(steps, axis=0).astype(np.int32) + 500
+
+
+class TestSimplifyPolyline:
+    """RDP 简化"""
+
+    def test_straight_line_reduces_to_endpoints(self):
+        xy = np.array([(i, 2 * i) for i in range(100)], dtype=np.int32)
+        result = simplify_polyline(xy, 0.5)
+        assert result.tolist() == [[0, 0], [99, 198]]
+
+    def test_duplicates_removed(self):
+        xy = np.array([(0, 0), (0, 0), (5, 5), (5, 5), (10, 0)], dtype=np.int32)
+        result = simplify_polyline(xy, 0)
+        assert result.tolist() == [[0, 0], [5, 5], [10, 0]]
+
+    def test_corner_kept(self):
+        xy = np.array([(0, 0), (5, 0), (10, 0), (10, 5), (10, 10)], dtype=np.int32)
+        result = simplify_polyline(xy, 0.5)
+        assert result.tolist() == [[0, 0], [10, 0], [10, 10]]
+
+    @given(
+        st.lists(st.tuples(st.integers(0, 200), st.integers(0, 200)), min_size=3, max_size=80),
+        st.floats(0.1, 5.0),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_error_bounded_by_tolerance(self, points, tolerance):
+        """每个原始点到简化折线的距离不超过容差"""
+        xy = np.array(points, dtype=np.int32)
+        result = simplify_polyline(xy, tolerance)
+
+        assert result[0].tolist() == xy[0].tolist()
+        assert result[-1].tolist() == xy[-1].tolist()
+        segments = list(zip(result[:-1].tolist(), result[1:].tolist())) or [(result[0].tolist(),) * 2]
+        for p in xy.tolist():
+            distance = min(_segment_distance(p, a, b) for a, b in segments)
+            assert distance <= tolerance + 1e-9
+
+    def test_tolerance_scales_with_dpr(self):
+        assert stroke_tolerance(2.0) == pytest.approx(stroke_tolerance(1.0) / 2)
+        assert stroke_tolerance(0) == stroke_tolerance(1.0)
+
+
+class TestStrokePoints:
+    """紧凑点序列"""
+
+    def test_sequence_protocol(self, qapp):
+        points = StrokePoints.from_points([QPoint(1, 2), QPoint(3, 4), QPoint(5, 6)])
+        assert len(points) == 3
+        assert points[0] == QPoint(1, 2)
+        assert points[-1] == QPoint(5, 6)
+        assert list(points) == [QPoint(1, 2), QPoint(3, 4), QPoint(5, 6)]
+        assert points == [QPoint(1, 2), QPoint(3, 4), QPoint(5, 6)]
+        assert points.to_tuples() == [(1, 2), (3, 4), (5, 6)]
+        with pytest.raises(IndexError):
+            points[3]
+
+    def test_bounds_translate_scale(self, qapp):
+        points = StrokePoints.from_xy([(10, 20), (30, 5), (15, 40)])
+        assert points.bounds() == QRect(10, 5, 20, 35)
+        assert points.translated(5, -5).to_tuples() == [(15, 15), (35, 0), (20, 35)]
+
+        scaled = points.scaled(QRect(10, 5, 20, 35), QRect(0, 0, 40, 70))
+        assert scaled.to_tuples() == [(0, 30), (40, 0), (10, 70)]
+
+    def test_path_matches_points(self, qapp):
+        points = StrokePoints.from_xy([(0, 0), (10, 0), (10, 10)])
+        path = points.to_path()
+        assert path.elementCount() == 3
+        assert path.boundingRect().toRect() == QRect(0, 0, 10, 10)
+
+
+class TestDrawItemStroke:
+    """DrawItem 画笔笔画"""
+
+    def test_commit_simplifies_and_compacts(self, qapp):
+        raw = [QPoint(int(x), int(y)) for x, y in _freehand(2000)]
+        item = DrawItem(DrawTool.PEN, QColor("#FF0000"), 3, raw)
+        bounds = item.get_bounding_rect()
+
+        item.simplify_stroke(stroke_tolerance(1.0))
+
+        assert isinstance(item.points, StrokePoints)
+        assert len(item.points) < len(raw)
+        assert item.points[0] == raw[0] and item.points[-1] == raw[-1]
+        # 简化只删点，边界不会变大
+        assert bounds.contains(item.get_bounding_rect())
+
+    def test_serialized_size_shrinks(self, qapp):
+        raw = [QPoint(int(x), int(y)) for x, y in _freehand(2000, seed=3)]
+        before = DrawItem(DrawTool.PEN, QColor("#FF0000"), 3, list(raw))
+        after = DrawItem(DrawTool.PEN, QColor("#FF0000"), 3, list(raw))
+        after.simplify_stroke(stroke_tolerance(1.0))
+
+        size_before = len(json.dumps(before.to_annotation_data().to_dict()))
+        size_after = len(json.dumps(after.to_annotation_data().to_dict()))
+        print(f"\n2000 点笔画序列化: {size_before} -> {size_after} 字节")
+        assert size_after < size_before
+
+    def test_non_pen_untouched(self, qapp):
+        points = [QPoint(0, 0), QPoint(5, 0), QPoint(10, 0)]
+        item = DrawItem(DrawTool.RECT, QColor("#FF0000"), 3, list(points))
+        item.simplify_stroke(1.0)
+        assert item.points == points
+        assert isinstance(item.points, list)
+
+    def test_path_cached_until_points_replaced(self, qapp):
+        item = DrawItem(DrawTool.PEN, QColor("#FF0000"), 3,
+                        [QPoint(0, 0), QPoint(10, 5), QPoint(20, 0)])
+        item.simplify_stroke(0.5)
+
+        path = item.get_path()
+        assert item.get_path() is path
+
+        item.move_by(QPoint(5, 5))
+        assert isinstance(item.points, StrokePoints)
+        moved = item.get_path()
+        assert moved is not path
+        assert moved.boundingRect().toRect() == QRect(5, 5, 20, 5)
+
+    def test_resize_keeps_compact_storage(self, qapp):
+        item = DrawItem(DrawTool.PEN, QColor("#FF0000"), 3,
+                        [QPoint(0, 0), QPoint(10, 5), QPoint(20, 0)])
+        item.simplify_stroke(0.5)
+        item.resize(QRect(0, 0, 20, 5), QRect(0, 0, 40, 10))
+
+        assert isinstance(item.points, StrokePoints)
+        assert item.points.to_tuples() == [(0, 0), (20, 10), (40, 0)]
+
+    def test_annotation_round_trip(self, qapp):
+        item = DrawItem(DrawTool.PEN, QColor("#00FF00"), 5,
+                        [QPoint(int(x), int(y)) for x, y in _freehand(300, seed=5)])
+        item.simplify_stroke(stroke_tolerance(1.5))
+
+        restored = DrawItem.from_annotation_data(item.to_annotation_data())
+
+        assert isinstance(restored.points, StrokePoints)
+        assert restored.points == item.points
+        assert restored.get_bounding_rect() == item.get_bounding_rect()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
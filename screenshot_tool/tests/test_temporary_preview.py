@@ -124,6 +124,14 @@ class MockClipboardHistoryManager:
         """搜索历史记录"""
         return self._history.copy()
     
+    def get_history_page(self, after=None, limit=50, query=""):
+        """分页获取历史摘要"""
+        return self._history[:limit], None
+    
+    def get_thumbnail(self, item_id: str):
+        """获取缩略图"""
+        return None
+    
     def get_item(self, item_id: str):
         """根据 ID 获取条目"""
         for item in self._history:
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+缩略图缓存测试
+
+Feature: history-thumbnail-store
+
+测试内容：
+1. ByteBudgetLRUCache 按字节预算淘汰最久未使用的条目
+2. 缩略图缩放、解码缩放与编解码往返
+"""
+
+import os
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from PySide6.QtGui import QImage
+
+from screenshot_tool.core.thumbnail_cache import (
+    THUMBNAIL_MAX_EDGE,
+    ByteBudgetLRUCache,
+    decode_thumbnail,
+    encode_thumbnail,
+    image_nbytes,
+    load_scaled_image,
+    scale_to_thumbnail,
+)
+
+
+def _make_image(width: int, height: int, color: int = 0xFF3366CC) -> QImage:
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(color)
+    return image
+
+
+class TestByteBudgetLRUCache:
+    """字节预算 LRU 缓存测试"""
+
+    def test_evicts_least_recently_used(self):
+        """超出预算时淘汰最久未使用的条目，而非最早插入的"""
+        cache = ByteBudgetLRUCache(30, len)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.put("c", b"x" * 10)
+
+        assert cache.get("a") is not None  # a 变为最近使用
+        cache.put("d", b"x" * 10)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.keys() == ["c", "a", "d"]
+        assert cache.total_bytes == 30
+
+    def test_large_entry_evicts_several(self):
+        """大条目一次淘汰多个小条目"""
+        cache = ByteBudgetLRUCache(30, len)
+        for key in "abc":
+            cache.put(key, b"x" * 10)
+
+        cache.put("big", b"x" * 25)
+        assert cache.keys() == ["big"]
+        assert cache.total_bytes == 25
+
+    def test_oversized_entry_not_cached(self):
+        """超过预算的单个条目不缓存，也不清空已有条目"""
+        cache = ByteBudgetLRUCache(30, len)
+        cache.put("a", b"x" * 10)
+        cache.put("huge", b"x" * 31)
+
+        assert "huge" not in cache
+        assert "a" in cache
+
+    def test_replace_updates_size(self):
+        """替换条目时重新计算字节数"""
+        cache = ByteBudgetLRUCache(30, len)
+        cache.put("a", b"x" * 10)
+        cache.put("a", b"x" * 20)
+
+        assert len(cache) == 1
+        assert cache.total_bytes == 20
+
+    def test_pop_and_clear(self):
+        cache = ByteBudgetLRUCache(30, len)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 5)
+
+        assert cache.pop("a") == b"x" * 10
+        assert cache.pop("a") is None
+        assert cache.total_bytes == 5
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
+
+    @settings(max_examples=100)
+    @given(
+        budget=st.integers(min_value=1, max_value=200),
+        ops=st.lists(
+            st.tuples(
+                st.sampled_from(["put", "get", "pop"]),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=0, max_value=80),
+            ),
+            max_size=60,
+        ),
+    )
+    def test_total_bytes_never_exceeds_budget(self, budget, ops):
+        """Property: 任意操作序列后，总字节数等于各条目之和且不超过预算"""
+        cache = ByteBudgetLRUCache(budget, len)
+        for op, key, size in ops:
+            if op == "put":
+                cache.put(key, b"x" * size)
+            elif op == "get":
+                cache.get(key)
+            else:
+                cache.pop(key)
+
+            assert cache.total_bytes <= budget
+            assert cache.total_bytes == sum(len(cache.get(k)) for k in cache.keys())
+
+
+class TestThumbnailImages:
+    """缩略图缩放与编解码测试"""
+
+    def test_scale_keeps_aspect_ratio(self, qapp):
+        thumb = scale_to_thumbnail(_make_image(3840, 2160))
+        assert thumb.width() == THUMBNAIL_MAX_EDGE
+        assert thumb.height() == round(THUMBNAIL_MAX_EDGE * 2160 / 3840)
+
+    def test_small_image_not_enlarged(self, qapp):
+        image = _make_image(50, 20)
+        thumb = scale_to_thumbnail(image)
+        assert (thumb.width(), thumb.height()) == (50, 20)
+
+    def test_load_scaled_image(self, qapp, tmp_path):
+        """从文件解码时直接得到缩略图尺寸"""
+        path = str(tmp_path / "big.png")
+        assert _make_image(1000, 400).save(path, "PNG")
+
+        thumb = load_scaled_image(path)
+        assert thumb is not None
+        assert max(thumb.width(), thumb.height()) == THUMBNAIL_MAX_EDGE
+        assert thumb.width() == THUMBNAIL_MAX_EDGE
+
+    def test_load_scaled_image_missing_file(self, qapp, tmp_path):
+        assert load_scaled_image(os.path.join(str(tmp_path), "missing.png")) is None
+
+    def test_encode_decode_round_trip(self, qapp):
+        image = _make_image(40, 30)
+        data = encode_thumbnail(image)
+        assert data
+
+        decoded = decode_thumbnail(data)
+        assert decoded is not None
+        assert decoded.convertToFormat(QImage.Format.Format_ARGB32) == image
+
+    def test_image_nbytes(self, qapp):
+        assert image_nbytes(_make_image(10, 10)) == 10 * 10 * 4
+        assert image_nbytes(QImage()) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
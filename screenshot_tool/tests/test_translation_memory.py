@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+翻译记忆测试
+
+Feature: translation-memory
+
+测试内容：
+1. 句子切分/拼接，规范化后的句子哈希一致
+2. TranslationMemory 读写、跨实例持久化、引擎优先级、按字节上限淘汰
+3. EnhancedTranslationService（本地假 MyMemory/Papago 服务）：
+   - 多句文本合并为一次请求
+   - 重启（新实例）后整段命中，不再请求
+   - 新文本只请求没见过的句子
+   - 引擎合并句子时逐句回退；失败不缓存；降级引擎的结果同样缓存
+"""
+
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from screenshot_tool.services.enhanced_translation_service import EnhancedTranslationService
+from screenshot_tool.services.translation_memory import (
+    TranslationMemory,
+    join_segments,
+    segment_hash,
+    split_segments,
+)
+
+
+class _FakeEngine:
+    """本地假翻译服务：MyMemory（GET /mymemory）和 Papago（POST /papago）"""
+
+    def __init__(self):
+        self.requests = []          # [(engine, text)]
+        self.merge_lines = False    # 把多行译文合并为一行
+        self.fail = set()           # 返回错误的引擎
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                if parsed.path != "/mymemory":
+                    self.send_error(404)
+                    return
+                query = urllib.parse.parse_qs(parsed.query)
+                text = query["q"][0]
+                target = query["langpair"][0].split("|")[1]
+                fake.requests.append(("mymemory", text))
+                if "mymemory" in fake.fail:
+                    self._reply({"responseData": {"translatedText": ""},
+                                 "responseDetails": "QUOTA EXCEEDED"})
+                    return
+                self._reply({"responseData": {"translatedText": fake.render(text, target)}})
+
+            def do_POST(self):
+                if self.path != "/papago":
+                    self.send_error(404)
+                    return
+                length = int(self.headers["Content-Length"])
+                form = urllib.parse.parse_qs(self.rfile.read(length).decode("utf-8"))
+                text = form["text"][0]
+                fake.requests.append(("papago", text))
+                if "papago" in fake.fail:
+                    self._reply({"errorMessage": "blocked"})
+                    return
+                self._reply({"translatedText": fake.render(text, form["target"][0]),
+                             "srcLangType": "en"})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def render(self, text, target):
+        lines = [f"<{target}:{line}>" for line in text.split("\n")]
+        return " ".join(lines) if self.merge_lines else "\n".join(lines)
+
+    def texts(self, engine="mymemory"):
+        return [text for name, text in self.requests if name == engine]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    fake = _FakeEngine()
+    monkeypatch.setattr(EnhancedTranslationService, "MYMEMORY_URL", f"{fake.url}/mymemory")
+    monkeypatch.setattr(EnhancedTranslationService, "PAPAGO_URL", f"{fake.url}/papago")
+    monkeypatch.setattr(EnhancedTranslationService, "YOUDAO_URL", f"{fake.url}/youdao")
+    monkeypatch.setattr(EnhancedTranslationService, "JIANXIN_URL", f"{fake.url}/jianxin")
+    yield fake
+    fake.close()
+
+
+def _service(tmp_path, **kwargs):
+    memory = TranslationMemory(str(tmp_path))
+    return EnhancedTranslationService(timeout=5, memory=memory, **kwargs), memory
+
+
+class TestSegments:
+    """句子切分"""
+
+    def test_split_lines_and_sentences(self):
+        text = "Open the file. Then save it!\n\n第一句。第二句？\nversion 3.14 is out"
+        assert split_segments(text) == [
+            ["Open the file.", "Then save it!"],
+            [],
+            ["第一句。", "第二句？"],
+            ["version 3.14 is out"],
+        ]
+
+    def test_join_uses_target_separator(self):
+        lines = [["a.", "b."], ["c."]]
+        assert join_segments(lines, "en") == "a. b.\nc."
+        assert join_segments(lines, "zh") == "a.b.\nc."
+
+    def test_hash_normalizes_width_and_spaces(self):
+        assert segment_hash("Hello   world！") == segment_hash(" Ｈｅｌｌｏ world!")
+        assert segment_hash("Hello world") != segment_hash("hello world")
+
+
+class TestTranslationMemory:
+    """TranslationMemory 存储"""
+
+    def test_round_trip_and_persistence(self, tmp_path):
+        memory = TranslationMemory(str(tmp_path))
+        assert memory.get_many(["Hi."], "en", "zh", ["mymemory"]) == {}
+
+        assert memory.put_many([("Hi.", "你好。")], "en", "zh", "mymemory", "en")
+        memory.close()
+
+        reopened = TranslationMemory(str(tmp_path))
+        hit = reopened.get_many(["Hi.", "Bye."], "en", "zh", ["mymemory"])
+        assert list(hit) == ["Hi."]
+        assert hit["Hi."].translated == "你好。"
+        assert hit["Hi."].detected_lang == "en"
+        # 语言对不同不命中
+        assert reopened.get_many(["Hi."], "en", "ja", ["mymemory"]) == {}
+        reopened.close()
+
+    def test_engine_priority(self, tmp_path):
+        memory = TranslationMemory(str(tmp_path))
+        memory.put_many([("Hi.", "papago")], "en", "zh", "papago")
+        memory.put_many([("Hi.", "mymemory")], "en", "zh", "mymemory")
+
+        assert memory.get_many(["Hi."], "en", "zh", ["mymemory", "papago"])["Hi."].engine == "mymemory"
+        assert memory.get_many(["Hi."], "en", "zh", ["papago", "mymemory"])["Hi."].engine == "papago"
+        assert memory.get_many(["Hi."], "en", "zh", ["youdao"]) == {}
+        memory.close()
+
+    def test_evicts_least_recently_used_by_bytes(self, tmp_path):
+        row = TranslationMemory.ROW_OVERHEAD + 100
+        memory = TranslationMemory(str(tmp_path), max_bytes=row * 3)
+        for i in range(3):
+            memory.put_many([(f"s{i}", "x" * 100)], "en", "zh", "mymemory")
+        # 访问 s0，使 s1 成为最久未访问
+        memory.get_many(["s0"], "en", "zh", ["mymemory"])
+
+        memory.put_many([("s3", "x" * 100)], "en", "zh", "mymemory")
+
+        assert memory.total_bytes() <= memory.max_bytes
+        hits = memory.get_many(["s0", "s1", "s2", "s3"], "en", "zh", ["mymemory"])
+        assert sorted(hits) == ["s0", "s2", "s3"]
+        memory.close()
+
+
+class TestServiceWithMemory:
+    """EnhancedTranslationService 句子级缓存与合并请求"""
+
+    TEXT = "Open the file. Then save it.\nClose the window."
+
+    def test_sentences_batched_into_one_request(self, tmp_path, fake_engine):
+        service, memory = _service(tmp_path)
+
+        result = service.translate(self.TEXT, "zh", "en")
+
+        assert result.success and not result.from_cache
+        assert result.engine == "mymemory"
+        assert result.translated_text == (
+            "<zh-CN:Open the file.><zh-CN:Then save it.>\n<zh-CN:Close the window.>"
+        )
+        assert fake_engine.texts() == ["Open the file.\nThen save it.\nClose the window."]
+        assert memory.count() == 3
+
+    def test_restart_served_from_memory(self, tmp_path, fake_engine):
+        service, memory = _service(tmp_path)
+        first = service.translate(self.TEXT, "zh", "en")
+        memory.close()
+
+        # 新实例：内存缓存为空，翻译记忆在磁盘上
+        restarted, _ = _service(tmp_path)
+        second = restarted.translate(self.TEXT, "zh", "en")
+
+        assert second.success and second.from_cache
+        assert second.translated_text == first.translated_text
+        assert len(fake_engine.requests) == 1
+
+    def test_only_new_sentences_requested(self, tmp_path, fake_engine):
+        service, _ = _service(tmp_path)
+        service.translate(self.TEXT, "zh", "en")
+
+        result = service.translate("Then save it. Exit now.", "zh", "en")
+
+        assert result.success and not result.from_cache
+        assert result.translated_text == "<zh-CN:Then save it.><zh-CN:Exit now.>"
+        assert fake_engine.texts()[1:] == ["Exit now."]
+
+    def test_merged_batch_falls_back_to_sentences(self, tmp_path, fake_engine):
+        fake_engine.merge_lines = True
+        service, memory = _service(tmp_path)
+
+        result = service.translate("One. Two.", "en", "zh")
+
+        assert result.translated_text == "<en:One.> <en:Two.>"
+        assert fake_engine.texts() == ["One.\nTwo.", "One.", "Two."]
+        assert memory.count() == 2
+
+    def test_failure_not_cached(self, tmp_path, fake_engine):
+        fake_engine.fail = {"mymemory", "papago"}
+        service, memory = _service(tmp_path)
+
+        result = service.translate("Hello there.", "zh", "en")
+
+        assert not result.success
+        assert "QUOTA EXCEEDED" in result.error
+        assert memory.count() == 0
+
+        fake_engine.fail = set()
+        assert service.translate("Hello there.", "zh", "en").success
+        assert memory.count() == 1
+
+    def test_fallback_engine_results_cached(self, tmp_path, fake_engine):
+        fake_engine.fail = {"mymemory"}
+        service, _ = _service(tmp_path)
+
+        result = service.translate("Good night. See you.", "zh", "en")
+
+        assert result.success and result.engine == "papago"
+        assert fake_engine.texts("papago") == ["Good night.\nSee you."]
+
+        restarted, _ = _service(tmp_path)
+        again = restarted.translate("See you.", "zh", "en")
+        assert again.from_cache and again.engine == "papago"
+        assert again.translated_text == "<zh-CN:See you.>"
+
+    def test_persistent_cache_disabled(self, tmp_path, fake_engine):
+        service = EnhancedTranslationService(timeout=5, persistent_cache=False)
+        assert service._get_memory() is None
+        assert service.translate("Hi.", "zh", "en").success
+
+    def test_large_batches_split(self, tmp_path, fake_engine, monkeypatch):
+        monkeypatch.setattr(EnhancedTranslationService, "BATCH_MAX_CHARS", 25)
+        service, _ = _service(tmp_path)
+
+        result = service.translate("Alpha one. Beta two. Gamma three.", "zh", "en")
+
+        assert result.success
+        assert fake_engine.texts() == ["Alpha one.\nBeta two.", "Gamma three."]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+单词卡批量导入测试
+
+Feature: word-card-bulk-import
+
+测试内容：
+1. 按主机限速：同一主机的请求间隔与并发数受限，不同主机互不影响
+2. 并发查询 + multi/addNotes 分批上传（本地 AnkiConnect 替身）
+3. 整批被拒绝（含重复）时逐条添加；查询失败只影响该单词
+4. AnkiService.import_words 统计导入/跳过/失败
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from screenshot_tool.services.word_card import utils
+from screenshot_tool.services.word_card.importer import (
+    STATUS_FAILED,
+    STATUS_IMPORTED,
+    STATUS_SKIPPED,
+    import_words,
+    import_words_pipelined,
+)
+from screenshot_tool.services.word_card.templates import MODEL_NAME
+from screenshot_tool.services.word_card.utils import HostRateLimiter
+
+
+class _FakeAnki:
+    """本地 AnkiConnect 替身（version 6 协议）"""
+
+    def __init__(self, reject_duplicate_batches=False):
+        self.calls = []             # 顶层 action
+        self.media = []             # 上传的媒体文件名
+        self.notes = {}             # {单词: note_id}
+        self.reject_duplicate_batches = reject_duplicate_batches
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                payload = json.loads(self.rfile.read(length))
+                with fake._lock:
+                    fake.calls.append(payload["action"])
+                    try:
+                        body = {"result": fake.handle(payload["action"], payload.get("params", {})),
+                                "error": None}
+                    except ValueError as e:
+                        body = {"result": None, "error": str(e)}
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, action, params):
+        if action == "version":
+            return 6
+        if action == "createDeck":
+            return 1
+        if action == "modelNames":
+            return [MODEL_NAME]
+        if action == "modelTemplates":
+            return {"英译中": {}, "中译英": {}}
+        if action == "updateModelStyling":
+            return None
+        if action == "storeMediaFile":
+            self.media.append(params["filename"])
+            return params["filename"]
+        if action == "multi":
+            results = []
+            for item in params["actions"]:
+                try:
+                    results.append({"result": self.handle(item["action"], item.get("params", {})),
+                                    "error": None})
+                except ValueError as e:
+                    results.append({"result": None, "error": str(e)})
+            return results
+        if action == "addNote":
+            return self._add(params["note"])
+        if action == "addNotes":
+            words = [note["fields"]["单词"] for note in params["notes"]]
+            if self.reject_duplicate_batches and any(word in self.notes for word in words):
+                raise ValueError("['cannot create note because it is a duplicate']")
+            ids = []
+            for note in params["notes"]:
+                try:
+                    ids.append(self._add(note))
+                except ValueError:
+                    ids.append(None)
+            return ids
+        raise ValueError(f"unsupported action {action}")
+
+    def _add(self, note):
+        word = note["fields"]["单词"]
+        if word in self.notes:
+            raise ValueError("cannot create note because it is a duplicate")
+        self.notes[word] = len(self.notes) + 1
+        return self.notes[word]
+
+    def count(self, action):
+        return self.calls.count(action)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _SlowWordService:
+    """模拟网络查询的单词服务（每个单词 delay 秒）"""
+
+    def __init__(self, media_dir, delay=0.05, fail=(), cached=()):
+        self.media_dir = media_dir
+        self.delay = delay
+        self.fail = set(fail)
+        self.cached = set(cached)
+        self.queried = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        audio = media_dir / "shared.mp3"
+        audio.write_bytes(b"ID3" + b"\0" * 2000)
+        self.shared_audio = str(audio)
+
+    def query_cached_many(self, words):
+        return {word: self._data(word) for word in words if word in self.cached}
+
+    def _data(self, word):
+        image = self.media_dir / f"{word}.jpg"
+        image.write_bytes(b"\xff\xd8\xff" + word.encode() * 100)
+        return {
+            "word": word, "phonetic": f"/{word}/", "definition": f"def {word}",
+            "audio_path": self.shared_audio, "audio_filename": "shared.mp3",
+            "image_path": str(image), "image_filename": image.name,
+        }
+
+    def query(self, word):
+        with self._lock:
+            self.queried.append(word)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if word in self.fail:
+                raise RuntimeError("network down")
+            return self._data(word)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def fake_anki(monkeypatch):
+    fake = _FakeAnki()
+    monkeypatch.setattr(utils, "ANKI_URL", fake.url)
+    yield fake
+    fake.close()
+
+
+class TestHostRateLimiter:
+    """按主机限速"""
+
+    def _run(self, limiter, urls, hold=0.0):
+        starts = {}
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def worker(i, url):
+            with limiter.acquire(url):
+                with lock:
+                    starts[i] = time.monotonic()
+                    active["now"] += 1
+                    active["max"] = max(active["max"], active["now"])
+                time.sleep(hold)
+                with lock:
+                    active["now"] -= 1
+
+        threads = [threading.Thread(target=worker, args=(i, url)) for i, url in enumerate(urls)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(starts.values()), active["max"]
+
+    def test_min_interval_per_host(self):
+        limiter = HostRateLimiter(min_interval=0.03, max_concurrent=10)
+        start = time.monotonic()
+        starts, _ = self._run(limiter, ["http://a.test/x"] * 6)
+        # 6 个请求依次排期，最后一个不早于第一个之后 5 个间隔（不比较单个间隔，避免调度抖动）
+        assert starts[-1] - start >= 5 * 0.03
+
+    def test_hosts_independent(self):
+        limiter = HostRateLimiter(min_interval=0.5, max_concurrent=10)
+        start = time.monotonic()
+        self._run(limiter, [f"http://host{i}.test/" for i in range(6)])
+        assert time.monotonic() - start < 0.4
+
+    def test_max_concurrent_per_host(self):
+        limiter = HostRateLimiter(min_interval=0.0, max_concurrent=2)
+        _, peak = self._run(limiter, ["https://a.test/"] * 8, hold=0.03)
+        assert peak == 2
+
+
+class TestPipelinedImport:
+    """并发查询与分批上传"""
+
+    def test_200_words_batched(self, fake_anki, tmp_path):
+        service = _SlowWordService(tmp_path)
+        words = [f"word{i:03d}" for i in range(200)]
+        progress = []
+
+        start = time.perf_counter()
+        statuses = import_words_pipelined(
+            words, "Deck", service, progress_callback=lambda c, t, w: progress.append((c, t)),
+            max_workers=8, batch_size=50
+        )
+        elapsed = time.perf_counter() - start
+
+        serial = len(words) * service.delay
+        print(f"\n200 个单词: {elapsed:.2f}s（逐个查询至少 {serial:.1f}s），"
+              f"AnkiConnect 请求 {len(fake_anki.calls)} 次")
+        assert elapsed < serial / 3
+        assert service.max_active == 8
+        assert all(status == STATUS_IMPORTED for status in statuses.values())
+        assert len(fake_anki.notes) == 200
+        # 4 批，每批一次 multi（媒体）+ 一次 addNotes，不再逐个 addNote/storeMediaFile
+        assert fake_anki.count("addNotes") == 4
+        assert fake_anki.count("multi") == 4
+        assert fake_anki.count("addNote") == 0
+        assert fake_anki.count("storeMediaFile") == 0
+        # 共用的发音文件每批只上传一次
+        assert fake_anki.media.count("shared.mp3") == 4
+        assert len(fake_anki.media) == 200 + 4
+        assert progress[-1] == (200, 200)
+
+    def test_rejected_batch_falls_back_to_single_notes(self, fake_anki, tmp_path):
+        fake_anki.reject_duplicate_batches = True
+        fake_anki.notes["beta"] = 99
+        service = _SlowWordService(tmp_path, delay=0)
+
+        statuses = import_words_pipelined(["alpha", "beta", "gamma"], "Deck", service)
+
+        assert statuses == {"alpha": STATUS_IMPORTED, "beta": STATUS_SKIPPED, "gamma": STATUS_IMPORTED}
+        assert fake_anki.count("addNotes") == 1
+        assert fake_anki.count("addNote") == 3
+
+    def test_query_failure_isolated(self, fake_anki, tmp_path):
+        service = _SlowWordService(tmp_path, delay=0, fail={"bad"})
+
+        statuses = import_words_pipelined(["good", "bad", "good", "fine"], "Deck", service)
+
+        assert statuses == {"good": STATUS_IMPORTED, "bad": STATUS_FAILED, "fine": STATUS_IMPORTED}
+        assert sorted(fake_anki.notes) == ["fine", "good"]
+
+    def test_cached_words_not_queried(self, fake_anki, tmp_path):
+        service = _SlowWordService(tmp_path, delay=0, cached={"alpha", "gamma"})
+        progress = []
+
+        statuses = import_words_pipelined(["alpha", "beta", "gamma"], "Deck", service,
+                                          progress_callback=lambda c, t, w: progress.append(w))
+
+        assert service.queried == ["beta"]
+        assert set(statuses.values()) == {STATUS_IMPORTED}
+        assert sorted(progress) == ["alpha", "beta", "gamma"]
+
+    def test_progress_callback_can_abort(self, fake_anki, tmp_path):
+        service = _SlowWordService(tmp_path, delay=0.01)
+
+        def cancel(current, total, word):
+            if current == 3:
+                raise InterruptedError("用户取消")
+
+        with pytest.raises(InterruptedError):
+            import_words_pipelined([f"w{i}" for i in range(50)], "Deck", service,
+                                   progress_callback=cancel, max_workers=2)
+        assert fake_anki.count("addNotes") == 0
+
+    def test_import_words_uploads_screenshot_once(self, fake_anki, tmp_path, monkeypatch):
+        from screenshot_tool.services.word_card import importer
+
+        service = _SlowWordService(tmp_path, delay=0)
+        monkeypatch.setattr(importer, "WordCardService", lambda: service)
+        screenshot = tmp_path / "page.png"
+        screenshot.write_bytes(b"\x89PNG" + b"\0" * 100)
+
+        success, total = import_words(["one", "two", "three"], "Deck", str(screenshot))
+
+        assert (success, total) == (3, 3)
+        assert fake_anki.media.count("page.png") == 1
+        assert all(note_id for note_id in fake_anki.notes.values())
+
+
+class TestAnkiServiceImport:
+    """AnkiService.import_words"""
+
+    def test_counts(self, fake_anki, tmp_path):
+        from screenshot_tool.services.anki_service import AnkiService
+
+        fake_anki.notes["two"] = 99
+        anki = AnkiService()
+        anki._word_service = _SlowWordService(tmp_path, delay=0, fail={"three"})
+
+        result = anki.import_words(["one", "two", "three", "One", "four"], "Deck")
+
+        assert result.success
+        assert (result.total, result.imported, result.skipped, result.failed) == (4, 2, 1, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+单词库测试
+
+Feature: word-store
+
+测试内容：
+1. WordStore 读写、大小写不敏感、get_many 批量读取
+2. 媒体按内容存为 blob（去重），文件被删除后从 blob 还原
+3. 旧版 JSON 缓存一次性迁移
+4. WordCardService 通过单词库缓存查询结果
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from screenshot_tool.services.word_card import services
+from screenshot_tool.services.word_card.services import WordCardService
+from screenshot_tool.services.word_card.word_store import WordStore
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    path = tmp_path / "media"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, media_dir):
+    store = WordStore(str(tmp_path / "words.db"), media_dir=str(media_dir))
+    yield store
+    store.close()
+
+
+def _word_data(media_dir, word, audio=b"ID3-shared", image=None):
+    audio_path = media_dir / "shared.mp3"
+    audio_path.write_bytes(audio)
+    image_path = media_dir / f"{word}.jpg"
+    image_path.write_bytes(image if image is not None else b"\xff\xd8\xff" + word.encode())
+    return {
+        "word": word, "phonetic": f"/{word}/", "definition": f"def {word}",
+        "audio_path": str(audio_path), "audio_filename": audio_path.name,
+        "image_path": str(image_path), "image_filename": image_path.name,
+    }
+
+
+class TestWordStore:
+    """WordStore 存储"""
+
+    def test_round_trip_case_insensitive(self, store, media_dir):
+        store.put("Apple", _word_data(media_dir, "apple"))
+
+        data = store.get("apple")
+        assert data["definition"] == "def apple"
+        assert data["image_path"] == str(media_dir / "apple.jpg")
+        assert store.get("APPLE")["phonetic"] == "/apple/"
+        assert store.get("pear") is None
+
+    def test_get_many(self, store, media_dir):
+        for word in ("one", "two", "three"):
+            store.put(word, _word_data(media_dir, word))
+
+        result = store.get_many(["one", "Three", "four", "one"])
+
+        assert sorted(result) == ["Three", "one"]
+        assert result["Three"]["definition"] == "def three"
+
+    def test_media_deduplicated_by_content(self, store, media_dir):
+        store.put("one", _word_data(media_dir, "one"))
+        store.put("two", _word_data(media_dir, "two"))
+
+        # 两个单词共用同一发音内容，只存一份
+        assert store.count() == 2
+        assert store.media_count() == 3
+
+    def test_missing_media_restored_from_blob(self, store, media_dir):
+        store.put("cat", _word_data(media_dir, "cat", image=b"\xff\xd8\xffcat-image"))
+        (media_dir / "cat.jpg").unlink()
+
+        data = store.get("cat")
+
+        assert (media_dir / "cat.jpg").read_bytes() == b"\xff\xd8\xffcat-image"
+        assert data["image_path"] == str(media_dir / "cat.jpg")
+
+    def test_word_without_media(self, store):
+        assert store.put("dog", {"word": "dog", "phonetic": "", "definition": "狗",
+                                 "audio_path": None, "audio_filename": None,
+                                 "image_path": None, "image_filename": None})
+
+        data = store.get("dog")
+        assert data["definition"] == "狗"
+        assert data["audio_path"] is None and data["image_path"] is None
+
+    def test_missing_media_not_stored(self, store, media_dir):
+        # 引用的媒体已不存在：不缓存，查询时视为未命中
+        assert not store.put("dog", {"word": "dog", "phonetic": "", "definition": "狗",
+                                     "audio_path": str(media_dir / "gone.mp3"), "audio_filename": "gone.mp3",
+                                     "image_path": None, "image_filename": None})
+        assert store.get("dog") is None
+
+    def test_persists_across_instances(self, tmp_path, media_dir):
+        first = WordStore(str(tmp_path / "words.db"), media_dir=str(media_dir))
+        first.put("sun", _word_data(media_dir, "sun"))
+        first.close()
+
+        second = WordStore(str(tmp_path / "words.db"), media_dir=str(media_dir))
+        assert second.get("sun")["definition"] == "def sun"
+        second.close()
+
+
+class TestMigration:
+    """旧版 JSON 缓存迁移"""
+
+    def _write_legacy(self, json_dir, data):
+        name = hashlib.md5(data["word"].lower().encode("utf-8")).hexdigest()[:16]
+        with open(json_dir / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def test_migrates_once_and_removes_json(self, store, tmp_path, media_dir):
+        json_dir = tmp_path / "data_cache"
+        json_dir.mkdir()
+        for word in ("red", "green", "blue"):
+            self._write_legacy(json_dir, _word_data(media_dir, word))
+        (json_dir / "broken.json").write_text("{not json", encoding="utf-8")
+
+        assert store.migrate_json_cache(str(json_dir)) == 3
+
+        assert sorted(p.name for p in json_dir.iterdir()) == ["broken.json"]
+        assert sorted(store.get_many(["red", "green", "blue"])) == ["blue", "green", "red"]
+
+        # 再次调用不重复迁移
+        self._write_legacy(json_dir, _word_data(media_dir, "late"))
+        assert store.migrate_json_cache(str(json_dir)) == 0
+        assert store.get("late") is None
+
+    def test_entries_with_missing_media_not_migrated(self, store, tmp_path, media_dir):
+        json_dir = tmp_path / "data_cache"
+        json_dir.mkdir()
+        self._write_legacy(json_dir, _word_data(media_dir, "kept"))
+        self._write_legacy(json_dir, {"word": "apple", "phonetic": "", "definition": "苹果",
+                                      "audio_path": str(media_dir / "a.mp3"), "audio_filename": "a.mp3",
+                                      "image_path": None, "image_filename": None})
+
+        assert store.migrate_json_cache(str(json_dir)) == 1
+
+        assert store.get("apple") is None
+        assert store.get("kept")["definition"] == "def kept"
+        assert list(json_dir.iterdir()) == []
+
+    def test_missing_json_dir(self, store, tmp_path):
+        assert store.migrate_json_cache(str(tmp_path / "absent")) == 0
+
+
+class TestWordCardServiceCache:
+    """WordCardService 使用单词库"""
+
+    @pytest.fixture
+    def word_store(self, tmp_path, media_dir, monkeypatch):
+        json_dir = tmp_path / "data_cache"
+        json_dir.mkdir()
+        TestMigration()._write_legacy(json_dir, _word_data(media_dir, "legacy"))
+        monkeypatch.setattr(services, "WORD_STORE_PATH", str(tmp_path / "word_store.db"))
+        monkeypatch.setattr(services, "DATA_CACHE_DIR", str(json_dir))
+        monkeypatch.setattr(services, "MEDIA_DIR", str(media_dir))
+        monkeypatch.setattr(services, "_word_store", None)
+        monkeypatch.setattr(services, "_word_store_failed", False)
+        yield
+        if services._word_store is not None:
+            services._word_store.close()
+
+    def test_query_uses_store(self, word_store, media_dir, monkeypatch):
+        service = WordCardService()
+        calls = []
+
+        def network(word):
+            calls.append(word)
+            return _word_data(media_dir, word)
+
+        monkeypatch.setattr(service, "_query_from_network", network)
+
+        assert service.query("hello")["definition"] == "def hello"
+        assert service.query("hello")["definition"] == "def hello"
+        # 旧版 JSON 已在首次打开时迁移
+        assert service.query("legacy")["definition"] == "def legacy"
+        assert calls == ["hello"]
+
+        cached = service.query_cached_many(["hello", "legacy", "new"])
+        assert sorted(cached) == ["hello", "legacy"]
+
+    def test_query_refetches_when_media_missing(self, word_store, media_dir, monkeypatch):
+        service = WordCardService()
+        calls = []
+        broken = {"word": "pear", "phonetic": "", "definition": "old",
+                  "audio_path": str(media_dir / "pear.mp3"), "audio_filename": "pear.mp3",
+                  "image_path": None, "image_filename": None}
+
+        def network(word):
+            calls.append(word)
+            return broken if len(calls) == 1 else _word_data(media_dir, word)
+
+        monkeypatch.setattr(service, "_query_from_network", network)
+
+        service.query("pear")
+        assert service.query("pear")["definition"] == "def pear"
+        assert service.query("pear")["definition"] == "def pear"
+        assert calls == ["pear", "pear"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
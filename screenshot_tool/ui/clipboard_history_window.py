@@ -18,7 +18,7 @@ Requirements: 11.1, 11.4, 11.8
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
@@ -34,6 +34,7 @@ from PySide6.QtGui import QPixmap, QKeyEvent, QAction, QImage
 from screenshot_tool.ui.history_list_model import HistoryListModel
 from screenshot_tool.ui.history_item_delegate import HistoryItemDelegate
 from screenshot_tool.core.history_item_data import HistoryItemData
+from screenshot_tool.core.sqlite_history_storage import HistorySummary, PageCursor
 
 # 延迟历史更新管理器（Feature: extreme-performance-optimization, Requirements: 11.9, 12.4）
 from screenshot_tool.core.deferred_history_update import DeferredHistoryUpdate
@@ -202,6 +203,30 @@ QListView {{
 """
 
 
+def _format_list_timestamp(dt: datetime) -> str:
+    """格式化列表中显示的时间（今天只显示时分，今年省略年份）"""
+    now = datetime.now()
+    if dt.date() == now.date():
+        return dt.strftime("%H:%M")
+    elif dt.year == now.year:
+        return dt.strftime("%m-%d %H:%M")
+    return dt.strftime("%Y-%m-%d")
+
+
+def _format_list_text(custom_name: Optional[str], preview_text: str) -> str:
+    """生成列表显示文本（优先显示自定义名称）"""
+    if custom_name:
+        display_text = custom_name
+    else:
+        display_text = preview_text.replace('\n', ' ')
+    
+    if len(display_text) > 40:
+        display_text = display_text[:40] + "..."
+    if not display_text.strip():
+        display_text = "(空内容)"
+    return display_text
+
+
 def _convert_history_item_to_data(item: HistoryItem) -> HistoryItemData:
     """将 HistoryItem 转换为 HistoryItemData
     
@@ -214,26 +239,8 @@ def _convert_history_item_to_data(item: HistoryItem) -> HistoryItemData:
     Returns:
         HistoryItemData 纯数据对象
     """
-    # 格式化时间戳
-    now = datetime.now()
-    dt = item.timestamp
-    if dt.date() == now.date():
-        time_str = dt.strftime("%H:%M")
-    elif dt.year == now.year:
-        time_str = dt.strftime("%m-%d %H:%M")
-    else:
-        time_str = dt.strftime("%Y-%m-%d")
-    
     # 优先显示自定义名称，如果没有则显示预览文本
-    if hasattr(item, 'custom_name') and item.custom_name:
-        display_text = item.custom_name
-    else:
-        display_text = item.preview_text.replace('\n', ' ')
-    
-    if len(display_text) > 40:
-        display_text = display_text[:40] + "..."
-    if not display_text.strip():
-        display_text = "(空内容)"
+    custom_name = item.custom_name if hasattr(item, 'custom_name') else None
     
     # 检查是否有标注
     has_annotations = item.has_annotations() if hasattr(item, 'has_annotations') else False
@@ -243,8 +250,8 @@ def _convert_history_item_to_data(item: HistoryItem) -> HistoryItemData:
     
     return HistoryItemData(
         id=item.id,
-        preview_text=display_text,
-        timestamp=time_str,
+        preview_text=_format_list_text(custom_name, item.preview_text),
+        timestamp=_format_list_timestamp(item.timestamp),
         is_pinned=item.is_pinned,
         has_annotations=has_annotations,
         thumbnail_path=item.image_path if content_type_str == "image" else None,
@@ -252,6 +259,31 @@ def _convert_history_item_to_data(item: HistoryItem) -> HistoryItemData:
     )
 
 
+def _convert_summary_to_data(summary: HistorySummary) -> HistoryItemData:
+    """将分页摘要行转换为 HistoryItemData
+    
+    Feature: history-keyset-pagination
+    
+    Args:
+        summary: ClipboardHistoryManager.get_history_page 返回的摘要
+        
+    Returns:
+        HistoryItemData 纯数据对象
+    """
+    content_type = getattr(summary.content_type, "value", summary.content_type)
+    content_type_str = "image" if content_type == "image" else "text"
+    
+    return HistoryItemData(
+        id=summary.id,
+        preview_text=_format_list_text(summary.custom_name, summary.preview_text),
+        timestamp=_format_list_timestamp(summary.timestamp),
+        is_pinned=summary.is_pinned,
+        has_annotations=summary.has_annotations(),
+        thumbnail_path=summary.image_path if content_type_str == "image" else None,
+        content_type=content_type_str
+    )
+
+
 
 class ClipboardHistoryWindow(QWidget):
     """工作台窗口
@@ -288,6 +320,9 @@ class ClipboardHistoryWindow(QWidget):
     PREVIEW_INDEX_TEXT = 2       # 文本预览
     PREVIEW_INDEX_EMPTY = 3      # 空状态
     
+    # 列表分页大小（Feature: history-keyset-pagination）
+    LIST_PAGE_SIZE = 50
+    
     def __init__(self, manager: ClipboardHistoryManager, parent=None, skip_initial_refresh: bool = False):
         """初始化工作台窗口
         
@@ -597,6 +632,13 @@ class ClipboardHistoryWindow(QWidget):
         self._clear_btn.clicked.connect(self._clear_all)
         # 初始时连接刷新信号
         self._connect_refresh_signal()
+        # 后台编码的图片落盘后补载缩略图（Feature: image-encode-queue）
+        image_saved = getattr(self._manager, "image_saved", None)
+        if image_saved is not None:
+            image_saved.connect(self._on_image_saved)
+        thumbnail_invalidated = getattr(self._manager, "thumbnail_invalidated", None)
+        if thumbnail_invalidated is not None:
+            thumbnail_invalidated.connect(self._on_thumbnail_invalidated)
         # 文本编辑后自动保存
         self._text_preview.textChanged.connect(self._on_text_edited)
         
@@ -684,6 +726,37 @@ class ClipboardHistoryWindow(QWidget):
                 pass  # 信号可能已断开
             self._refresh_signal_connected = False
     
+    def _on_image_saved(self, item_id: str):
+        """后台编码的图片文件写入完成
+        
+        Feature: image-encode-queue
+        
+        条目插入列表时文件可能尚未落盘，缩略图和预览在此补载。
+        """
+        if self._list_model.row_of(item_id) < 0:
+            return
+        
+        item = self._manager.get_item(item_id)
+        if item is None:
+            return
+        
+        self._load_thumbnails_async([item])
+        if self._get_current_item_id() == item_id:
+            self._show_preview(item_id)
+    
+    def _on_thumbnail_invalidated(self, item_id: str):
+        """图片或标注变化，丢弃旧缩略图并重新加载
+        
+        Feature: history-thumbnail-store
+        """
+        item = self._manager.get_item(item_id)
+        if item is None or not item.image_path:
+            return
+        
+        self._list_delegate.remove_thumbnail(item.image_path)
+        if self._list_model.row_of(item_id) >= 0:
+            self._load_thumbnails_async([item])
+    
     def _on_history_changed(self):
         """历史记录变化回调（带防抖和延迟更新支持）
         
@@ -746,12 +819,11 @@ class ClipboardHistoryWindow(QWidget):
         # 记住当前选中项的 ID
         selected_id = self._get_current_item_id()
         
-        # 清空模型
-        self._list_model.clear_all()
-        
-        items = self._manager.search(self._search_text) if self._search_text else self._manager.get_history()
+        # 重置模型并按需分页加载（只加载第一页，滚动到底部时加载后续页）
+        # Feature: history-keyset-pagination
+        self._list_model.set_page_loader(self._load_history_page, self.LIST_PAGE_SIZE)
         
-        if not items:
+        if self._list_model.rowCount() == 0:
             self._list.hide()
             self._empty_label.show()
             self._empty_label.setText(f'未找到 "{self._search_text}"' if self._search_text else "暂无记录")
@@ -763,20 +835,8 @@ class ClipboardHistoryWindow(QWidget):
         self._empty_label.hide()
         self._list.show()
         
-        # 转换并添加所有条目到模型
-        restore_row = 0
-        for i, item in enumerate(items):
-            item_data = _convert_history_item_to_data(item)
-            self._list_model.add_item(item_data)
-            # 找到之前选中的项
-            if item.id == selected_id:
-                restore_row = i
-        
-        # 强制立即执行插入（不等待防抖）
-        self._list_model.force_flush()
-        
-        # 加载缩略图（后台加载）
-        self._load_thumbnails_async(items)
+        # 之前选中的项不在已加载的页中时选中第一项
+        restore_row = max(0, self._list_model.row_of(selected_id)) if selected_id else 0
         
         # 恢复选中项
         # 阻止信号循环：setCurrentIndex 会触发 selectionChanged 信号
@@ -789,6 +849,30 @@ class ClipboardHistoryWindow(QWidget):
             # 手动触发选择变更处理（因为信号被阻塞了）
             self._on_selection_changed()
     
+    def _load_history_page(
+        self,
+        after: Optional[PageCursor],
+        limit: int,
+    ) -> Tuple[List[HistoryItemData], Optional[PageCursor]]:
+        """HistoryListModel 的分页加载器
+        
+        只查询摘要列，并为本页的图片条目加载缩略图。
+        
+        Feature: history-keyset-pagination
+        
+        Args:
+            after: 上一页游标
+            limit: 每页数量
+            
+        Returns:
+            (条目数据列表, 下一页游标)
+        """
+        summaries, next_cursor = self._manager.get_history_page(
+            after, limit, self._search_text
+        )
+        self._load_thumbnails_async(summaries)
+        return [_convert_summary_to_data(s) for s in summaries], next_cursor
+    
     def _load_thumbnails_async(self, items: List[HistoryItem]):
         """异步加载缩略图
         
@@ -800,34 +884,23 @@ class ClipboardHistoryWindow(QWidget):
         Bug fix (2026-01-23): 加载完成后必须触发视图更新，
         否则缩略图不会显示（只显示占位符）。
         """
-        import os
-        try:
-            from screenshot_tool.core.clipboard_history_manager import get_clipboard_data_dir
-            data_dir = get_clipboard_data_dir()
-        except ImportError:
-            return
-        
         loaded_count = 0
         for item in items:
-            if item.content_type == ContentType.IMAGE and item.image_path:
+            # 兼容 HistoryItem 与 HistorySummary（两者的 ContentType 枚举不同）
+            content_type = getattr(item.content_type, "value", item.content_type)
+            if content_type == ContentType.IMAGE.value and item.image_path:
                 # 检查是否已缓存
                 if self._list_delegate.has_thumbnail(item.image_path):
                     continue
                 
-                # 同步加载缩略图（简化实现，后续可改为后台线程）
-                full_path = os.path.join(data_dir, item.image_path)
-                if os.path.exists(full_path):
-                    pixmap = QPixmap(full_path)
-                    if not pixmap.isNull():
-                        # 缩放到缩略图大小（高清缩略图）
-                        thumb_size = HistoryItemDelegate.THUMB_SIZE
-                        scaled = pixmap.scaled(
-                            thumb_size, thumb_size,
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                            Qt.TransformationMode.SmoothTransformation
-                        )
-                        self._list_delegate.set_thumbnail(item.image_path, scaled)
-                        loaded_count += 1
+                # 持久化的小尺寸缩略图，不解码全尺寸原图
+                # Feature: history-thumbnail-store
+                thumbnail = self._manager.get_thumbnail(item.id)
+                if thumbnail is not None and not thumbnail.isNull():
+                    self._list_delegate.set_thumbnail(
+                        item.image_path, QPixmap.fromImage(thumbnail)
+                    )
+                    loaded_count += 1
         
         # Bug fix: 加载缩略图后必须触发视图重绘
         # 否则 delegate 的 paint() 方法不会被重新调用，缩略图不显示
@@ -929,8 +1002,14 @@ class ClipboardHistoryWindow(QWidget):
         full_path = os.path.join(get_clipboard_data_dir(), item.image_path)
         if not os.path.exists(full_path):
             self._ocr_btn.hide()
-            self._image_label.setText("图片文件不存在")
-            self._image_label.setStyleSheet(f"color: {COLORS['danger']};")
+            # 后台仍在编码时提示保存中，文件落盘后由 _on_image_saved 重新显示
+            is_pending = getattr(self._manager, "is_image_pending", None)
+            if is_pending is not None and is_pending(item.id):
+                self._image_label.setText("图片保存中…")
+                self._image_label.setStyleSheet("")
+            else:
+                self._image_label.setText("图片文件不存在")
+                self._image_label.setStyleSheet(f"color: {COLORS['danger']};")
             self._preview_stack.setCurrentIndex(self.PREVIEW_INDEX_IMAGE)
             self._current_preview_mode = self.PREVIEW_INDEX_IMAGE
             return
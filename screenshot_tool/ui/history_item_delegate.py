@@ -394,6 +394,15 @@ class HistoryItemDelegate(QStyledItemDelegate):
         """
         return path in self._thumbnail_cache
     
+    def remove_thumbnail(self, path: str) -> None:
+        """移除单个缩略图缓存（图片或标注变化后重新加载）
+        
+        Args:
+            path: 缩略图文件路径
+        """
+        if self._thumbnail_cache.pop(path, None) is not None:
+            self._thumbnail_lru.remove(path)
+    
     def clear_thumbnail_cache(self) -> None:
         """清除缩略图缓存
         
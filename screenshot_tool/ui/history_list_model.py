@@ -13,9 +13,11 @@ Requirements: 11.1, 11.2, 11.6
 2. 使用 beginInsertRows/endInsertRows 批量更新
 3. 只有可见项才会触发 delegate 绘制
 4. 100ms 防抖批量插入，避免频繁 UI 更新
+5. 按需分页加载：视图滚动到底部时通过 fetchMore 加载下一页
+   （Feature: history-keyset-pagination）
 """
 
-from typing import List, Optional, Any
+from typing import Any, Callable, List, Optional, Tuple
 from PySide6.QtCore import (
     Qt, QAbstractListModel, QModelIndex, QTimer, QObject
 )
@@ -23,6 +25,10 @@ from PySide6.QtCore import (
 from screenshot_tool.core.history_item_data import HistoryItemData
 
 
+# 分页加载器：(游标, 页大小) -> (条目列表, 下一页游标)，游标为 None 表示没有更多数据
+PageLoader = Callable[[Optional[Any], int], Tuple[List[HistoryItemData], Optional[Any]]]
+
+
 class HistoryListModel(QAbstractListModel):
     """高性能历史列表模型
     
@@ -51,6 +57,9 @@ class HistoryListModel(QAbstractListModel):
     # 自定义角色
     ItemDataRole = Qt.ItemDataRole.UserRole + 1
     
+    # 分页加载的默认页大小
+    DEFAULT_PAGE_SIZE = 50
+    
     def __init__(self, parent: Optional[QObject] = None) -> None:
         """初始化历史列表模型
         
@@ -69,6 +78,12 @@ class HistoryListModel(QAbstractListModel):
         self._update_timer.setSingleShot(True)
         self._update_timer.setInterval(100)  # 100ms 防抖
         self._update_timer.timeout.connect(self._flush_inserts)
+        
+        # 分页加载状态（Feature: history-keyset-pagination）
+        self._page_loader: Optional[PageLoader] = None
+        self._page_size = self.DEFAULT_PAGE_SIZE
+        self._next_cursor: Optional[Any] = None
+        self._has_more = False
     
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """返回行数
@@ -111,6 +126,63 @@ class HistoryListModel(QAbstractListModel):
         
         return None
     
+    def set_page_loader(
+        self,
+        loader: Optional[PageLoader],
+        page_size: Optional[int] = None
+    ) -> None:
+        """设置分页加载器，重置模型并加载第一页
+        
+        之后视图滚动到底部时会调用 fetchMore() 加载后续页，
+        每次加载的代价只与页大小有关。
+        
+        Args:
+            loader: 分页加载器，None 表示停止分页
+            page_size: 每页数量，默认 DEFAULT_PAGE_SIZE
+            
+        Feature: history-keyset-pagination
+        """
+        self.clear_all()
+        self._page_loader = loader
+        if page_size is not None:
+            self._page_size = page_size
+        self._has_more = loader is not None
+        self.fetchMore()
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """是否还有未加载的页
+        
+        Args:
+            parent: 父索引（列表模型忽略子项）
+        """
+        if parent.isValid():
+            return False
+        return self._has_more and self._page_loader is not None
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """加载下一页并追加到列表末尾
+        
+        Args:
+            parent: 父索引（列表模型忽略子项）
+        """
+        if not self.canFetchMore(parent):
+            return
+        
+        items, self._next_cursor = self._page_loader(self._next_cursor, self._page_size)
+        self._has_more = self._next_cursor is not None
+        
+        # 跳过已通过 add_item 插入到顶部的条目
+        items = [item for item in items if item.id not in self._id_to_index]
+        if not items:
+            return
+        
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        for offset, item in enumerate(items):
+            self._id_to_index[item.id] = start + offset
+        self._items.extend(items)
+        self.endInsertRows()
+    
     def add_item(self, item: HistoryItemData) -> None:
         """添加条目（延迟批量处理）
         
@@ -217,6 +289,17 @@ class HistoryListModel(QAbstractListModel):
             return None
         return self._items[row]
     
+    def row_of(self, item_id: str) -> int:
+        """获取条目所在行号
+        
+        Args:
+            item_id: 条目 ID
+            
+        Returns:
+            行号，不存在（或尚未加载）时返回 -1
+        """
+        return self._id_to_index.get(item_id, -1)
+    
     def contains(self, item_id: str) -> bool:
         """检查是否包含指定 ID 的条目
         
@@ -246,6 +329,9 @@ class HistoryListModel(QAbstractListModel):
         self._id_to_index.clear()
         self._pending_inserts.clear()
         self._update_timer.stop()
+        self._page_loader = None
+        self._next_cursor = None
+        self._has_more = False
         self.endResetModel()
     
     def get_all_items(self) -> List[HistoryItemData]:
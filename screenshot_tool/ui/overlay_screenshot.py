@@ -27,6 +27,9 @@ from screenshot_tool.core.topmost_window_manager import TopmostWindowManager
 # Feature: extreme-performance-optimization
 # Requirements: 2.2
 from screenshot_tool.core.performance_monitor import PerformanceMonitor
+# 马赛克引擎（与历史渲染共用）
+from screenshot_tool.core.mosaic_engine import MosaicMode, render_mosaic
+from screenshot_tool.core.stroke_geometry import StrokePoints, stroke_tolerance
 
 from PySide6.QtWidgets import (
     QWidget, QApplication, QToolButton, 
@@ -36,7 +39,7 @@ from PySide6.QtCore import Qt, Signal, QPoint, QRect, QTimer, QObject, QEvent
 from PySide6.QtGui import (
     QPixmap, QPainter, QColor, QPen, QBrush,
     QMouseEvent, QPaintEvent, QKeyEvent, QWheelEvent, QImage,
-    QGuiApplication, QPolygon, QFont, QFontMetrics, QInputMethodEvent
+    QGuiApplication, QPolygon, QFont, QFontMetrics, QInputMethodEvent, QPainterPath
 )
 
 # 线条粗细常量（模块级别，供多个类使用）
@@ -107,6 +110,10 @@ class DrawItem:
     # 类级别的 ID 计数器，确保唯一性
     _id_counter: int = field(default=0, init=False, repr=False, compare=False)
     _id: int = field(default=0, init=False, repr=False, compare=False)
+    # 画笔路径缓存（points 对象被替换时失效）
+    # Feature: stroke-simplification
+    _path: Optional[QPainterPath] = field(default=None, init=False, repr=False, compare=False)
+    _path_points: Optional[StrokePoints] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """初始化后分配唯一 ID"""
@@ -131,6 +138,8 @@ class DrawItem:
             if len(self.points) >= 2:
                 return QRect(self.points[0], self.points[-1]).normalized()
         elif self.tool in (DrawTool.PEN,):
+            if isinstance(self.points, StrokePoints):
+                return self.points.bounds()
             if len(self.points) >= 1:
                 min_x = min(p.x() for p in self.points)
                 max_x = max(p.x() for p in self.points)
@@ -232,6 +241,9 @@ class DrawItem:
     
     def move_by(self, delta: QPoint):
         """移动图形"""
+        if isinstance(self.points, StrokePoints):
+            self.points = self.points.translated(delta.x(), delta.y())
+            return
         self.points = [QPoint(p.x() + delta.x(), p.y() + delta.y()) for p in self.points]
     
     def resize(self, old_rect: QRect, new_rect: QRect):
@@ -243,14 +255,17 @@ class DrawItem:
             return
         scale_x = new_rect.width() / old_rect.width()
         scale_y = new_rect.height() / old_rect.height()
-        new_points = []
-        for p in self.points:
-            rel_x = p.x() - old_rect.left()
-            rel_y = p.y() - old_rect.top()
-            new_x = new_rect.left() + int(rel_x * scale_x)
-            new_y = new_rect.top() + int(rel_y * scale_y)
-            new_points.append(QPoint(new_x, new_y))
-        self.points = new_points
+        if isinstance(self.points, StrokePoints):
+            self.points = self.points.scaled(old_rect, new_rect)
+        else:
+            new_points = []
+            for p in self.points:
+                rel_x = p.x() - old_rect.left()
+                rel_y = p.y() - old_rect.top()
+                new_x = new_rect.left() + int(rel_x * scale_x)
+                new_y = new_rect.top() + int(rel_y * scale_y)
+                new_points.append(QPoint(new_x, new_y))
+            self.points = new_points
         
         # 文字项：根据缩放比例调整字体大小
         if self.tool == DrawTool.TEXT and self.width and self.width > 0:
@@ -275,6 +290,35 @@ class DrawItem:
             # 限制直径范围 20-100
             self.width = max(20, min(100, new_diameter))
     
+    def simplify_stroke(self, tolerance: float) -> None:
+        """提交画笔笔画时简化并转为紧凑存储
+        
+        Feature: stroke-simplification
+        
+        Args:
+            tolerance: 逻辑像素容差，见 stroke_tolerance()
+        """
+        if self.tool != DrawTool.PEN or len(self.points) < 2:
+            return
+        points = self.points
+        if not isinstance(points, StrokePoints):
+            points = StrokePoints.from_points(points)
+        self.points = points.simplified(tolerance)
+    
+    def get_path(self) -> QPainterPath:
+        """返回画笔笔画的 QPainterPath（缓存）
+        
+        Feature: stroke-simplification
+        """
+        points = self.points
+        if not isinstance(points, StrokePoints):
+            # 未提交的笔画：每次重建，不缓存
+            return StrokePoints.from_points(points).to_path()
+        if self._path is None or self._path_points is not points:
+            self._path = points.to_path()
+            self._path_points = points
+        return self._path
+    
     def to_annotation_data(self) -> 'AnnotationData':
         """转换为 AnnotationData（可序列化格式）
         
@@ -290,7 +334,10 @@ class DrawItem:
             tool=self.tool.value,
             color=self.color.name(),
             width=self.width,
-            points=[(p.x(), p.y()) for p in self.points],
+            points=(
+                self.points.to_tuples() if isinstance(self.points, StrokePoints)
+                else [(p.x(), p.y()) for p in self.points]
+            ),
             text=self.text,
             step_number=self.step_number,
         )
@@ -310,11 +357,15 @@ class DrawItem:
         """
         from screenshot_tool.core.screenshot_state_manager import AnnotationData
         
+        tool = DrawTool(data.tool)
         return cls(
-            tool=DrawTool(data.tool),
+            tool=tool,
             color=QColor(data.color),
             width=data.width,
-            points=[QPoint(p[0], p[1]) for p in data.points],
+            points=(
+                StrokePoints.from_xy(data.points) if tool == DrawTool.PEN and data.points
+                else [QPoint(p[0], p[1]) for p in data.points]
+            ),
             text=data.text,
             step_number=data.step_number,
         )
@@ -1346,6 +1397,7 @@ class OverlayScreenshot(QWidget):
             for ann_data in state.annotations:
                 item = DrawItem.from_annotation_data(ann_data)
                 self._draw_items.append(item)
+            self._rebuild_spatial_index()
             
             # 重置步骤计数器
             max_step = 0
@@ -1509,6 +1561,7 @@ class OverlayScreenshot(QWidget):
                         continue
                 
                 debug_log(f"恢复了 {len(self._draw_items)} 个标注", "HISTORY")
+            self._rebuild_spatial_index()
             
             # 重置步骤计数器
             max_step = 0
@@ -1672,7 +1725,7 @@ class OverlayScreenshot(QWidget):
         try:
             if self._spatial_index is None:
                 from screenshot_tool.core.spatial_index import SpatialIndex
-                self._spatial_index = SpatialIndex(cell_size=50)
+                self._spatial_index = SpatialIndex()
             else:
                 self._spatial_index.clear()
         except (ImportError, AttributeError, RuntimeError) as e:
@@ -1906,22 +1959,13 @@ class OverlayScreenshot(QWidget):
         if self._selected or self._selecting:
             self._draw_selection_border(buffer_painter)
         
-        # 绘制所有绘制项（带脏区域追踪）
-        # Feature: performance-ui-optimization
-        # Requirements: 2.4, 5.1
-        for item in self._draw_items:
-            # 跳过正在编辑的文字项（避免重叠显示）
-            if self._inline_editor.active and item == self._inline_editor.editing_item:
-                continue
-            
-            # 追踪标注项边界（用于脏区域计算）
-            item_rect = item.get_bounding_rect()
-            if not item_rect.isEmpty():
-                self._paint_engine.track_annotation(item._id, item_rect, item.width or 2)
-            
-            self._draw_item(buffer_painter, item)
-            # 显示选中或悬停图形的调整手柄
-            if item == self._selected_item or item == self._hovered_item:
+        # 绘制所有绘制项
+        # Feature: annotation-layer-cache
+        editing_item = self._inline_editor.editing_item if self._inline_editor.active else None
+        self._paint_annotations(buffer_painter, editing_item)
+        # 显示选中或悬停图形的调整手柄
+        for item in (self._selected_item, self._hovered_item):
+            if item is not None and item is not editing_item and item in self._draw_items:
                 self._draw_item_handles(buffer_painter, item)
         
         # 绘制当前正在绘制的项
@@ -1949,6 +1993,59 @@ class OverlayScreenshot(QWidget):
         screen_painter.drawPixmap(0, 0, buffer)
         screen_painter.end()
     
+    def _paint_annotations(self, painter: QPainter, editing_item: Optional[DrawItem] = None):
+        """绘制标注项，保持绘制顺序
+        
+        已提交的标注项从图层缓存贴图，只重绘失效的瓦片；
+        选中的标注项（可能正在拖动/缩放）实时绘制。选中项之后的标注项放在
+        上层缓存中、画在选中项之上，选中被马赛克等覆盖的项时不会露出来。
+        
+        Args:
+            painter: 目标 painter
+            editing_item: 正在内联编辑的文字项（跳过，避免重叠显示）
+            
+        Feature: annotation-layer-cache
+        """
+        items = [item for item in self._draw_items if item is not editing_item]
+        live_index = next(
+            (i for i, item in enumerate(items) if item is self._selected_item), None
+        )
+        if live_index is None:
+            below, live_item, above = items, None, []
+        else:
+            below, live_item, above = items[:live_index], items[live_index], items[live_index + 1:]
+        
+        lower = self._paint_engine.annotation_layer
+        lower.sync(below, self._annotation_signature)
+        lower.paint(painter, self.rect(), below, self._draw_item)
+        
+        if live_item is not None:
+            self._draw_item(painter, live_item)
+        
+        upper = self._paint_engine.annotation_layer_above
+        upper.sync(above, self._annotation_signature)
+        upper.paint(painter, self.rect(), above, self._draw_item)
+    
+    def _annotation_signature(self, item: DrawItem) -> tuple:
+        """标注项的外观签名，签名变化时图层缓存重绘该项所在区域
+        
+        边界变化由 AnnotationDirtyTracker 检测，这里覆盖颜色、粗细、文字等
+        不一定改变边界的属性。马赛克还依赖选区和截图内容。
+        """
+        points = item.points
+        signature = (
+            item.tool, item.color.rgba(), item.width, item.text, item.step_number,
+            len(points),
+            (points[0].x(), points[0].y(), points[-1].x(), points[-1].y()) if points else None,
+        )
+        if item.tool == DrawTool.MOSAIC:
+            selection = self._get_selection_rect()
+            signature += (
+                selection.getRect(),
+                self._screenshot.cacheKey() if self._screenshot is not None else 0,
+            )
+        return signature
+
     def _paint_direct(self, event: QPaintEvent):
         """直接绘制（回退模式）"""
         painter = QPainter(self)
@@ -2228,8 +2325,11 @@ class OverlayScreenshot(QWidget):
             if len(item.points) >= 2:
                 if log_enabled:
                     debug_log(f"绘制画笔: {len(item.points)} 个点", "DRAW")
-                for i in range(1, len(item.points)):
-                    painter.drawLine(item.points[i-1], item.points[i])
+                pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+                pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+                painter.setPen(pen)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawPath(item.get_path())
         elif item.tool == DrawTool.MARKER:
             # 矩形高亮工具 - 绘制半透明填充矩形
             if len(item.points) >= 2:
@@ -2366,12 +2466,11 @@ class OverlayScreenshot(QWidget):
         painter.drawPolygon(QPolygon([tip, p1, p2]))
 
     # 马赛克常量
-    MOSAIC_DEFAULT_BLOCK_SIZE = 10  # 默认块大小
-    MOSAIC_MAX_BLOCKS = 10000       # 最大块数限制（性能保护）
-    MOSAIC_SAMPLE_POINTS = 9        # 每块采样点数 (3x3)
+    MOSAIC_DEFAULT_BLOCK_SIZE = 10  # 默认块大小（逻辑像素）
+    MOSAIC_MODE = MosaicMode.PIXELATE
     
     def _draw_mosaic(self, painter: QPainter, points: List[QPoint]):
-        """绘制马赛克效果 - 使用区域平均采样避免条纹
+        """绘制马赛克效果 - 在设备像素上按块求平均
         
         Args:
             painter: QPainter 绑定的绘图对象
@@ -2380,7 +2479,6 @@ class OverlayScreenshot(QWidget):
         if not self._screenshot or len(points) < 2:
             return
         
-        block_size = self.MOSAIC_DEFAULT_BLOCK_SIZE
         rect = QRect(points[0], points[-1]).normalized()
         
         # 获取并验证选区
@@ -2397,41 +2495,18 @@ class OverlayScreenshot(QWidget):
         img = self._cached_image
         if img.isNull():
             return
-        img_w, img_h = img.width(), img.height()
-        if img_w <= 0 or img_h <= 0:
-            return
         
+        # 逻辑坐标映射到截图的设备像素
         dpr = self._device_pixel_ratio
+        device_rect = QRect(
+            int(rect.left() * dpr), int(rect.top() * dpr),
+            max(1, round(rect.width() * dpr)), max(1, round(rect.height() * dpr)),
+        )
+        block_size = max(1, round(self.MOSAIC_DEFAULT_BLOCK_SIZE * dpr))
         
-        # 动态调整块大小：大区域使用更大的块以保证性能
-        total_blocks = (rect.width() // block_size + 1) * (rect.height() // block_size + 1)
-        if total_blocks > self.MOSAIC_MAX_BLOCKS:
-            block_size = max(block_size, int(math.sqrt(rect.width() * rect.height() / self.MOSAIC_MAX_BLOCKS)))
-        
-        # 采样步长：确保每块至少有 3x3 采样点
-        sample_step = max(1, block_size // 3)
-        
-        for x in range(rect.left(), rect.right(), block_size):
-            for y in range(rect.top(), rect.bottom(), block_size):
-                block_rect = QRect(x, y, block_size, block_size).intersected(rect)
-                if block_rect.isEmpty():
-                    continue
-                
-                # 区域平均采样：取块内多个点的平均颜色
-                r_sum, g_sum, b_sum, count = 0, 0, 0, 0
-                for sx in range(block_rect.left(), block_rect.right() + 1, sample_step):
-                    for sy in range(block_rect.top(), block_rect.bottom() + 1, sample_step):
-                        px, py = int(sx * dpr), int(sy * dpr)
-                        if 0 <= px < img_w and 0 <= py < img_h:
-                            color = img.pixelColor(px, py)
-                            r_sum += color.red()
-                            g_sum += color.green()
-                            b_sum += color.blue()
-                            count += 1
-                
-                if count > 0:
-                    avg_color = QColor(r_sum // count, g_sum // count, b_sum // count)
-                    painter.fillRect(block_rect, avg_color)
+        tile = render_mosaic(img, device_rect, block_size, self.MOSAIC_MODE)
+        if tile is not None:
+            painter.drawImage(rect, tile)
 
     def _get_selection_rect(self) -> QRect:
         if self._selected:
@@ -2688,14 +2763,13 @@ class OverlayScreenshot(QWidget):
         
         # 使用空间索引加速查找（如果可用）
         if self._spatial_index is not None:
-            nearby_items = self._spatial_index.query(pos, radius=margin)
-            # 按绘制顺序反向检查（后绘制的优先）
-            for item in reversed(self._draw_items):
-                if item in nearby_items:
-                    # 使用 contains_point 进行精确检测（直线/箭头使用点到线段距离）
-                    if item.contains_point(pos, margin):
-                        return item
-            return None
+            # 只对候选项做精确检测（直线/箭头使用点到线段距离），
+            # 结果按插入顺序返回，最后一个即最上层
+            hits = self._spatial_index.query(
+                pos, radius=margin,
+                predicate=lambda item: item.contains_point(pos, margin),
+            )
+            return hits[-1] if hits else None
         
         # 回退到线性搜索
         for item in reversed(self._draw_items):
@@ -2711,12 +2785,22 @@ class OverlayScreenshot(QWidget):
         if self._spatial_index is None:
             return
         
-        self._spatial_index.clear()
+        self._spatial_index.bulk_load(
+            (item, self._index_rect(item)) for item in self._draw_items
+        )
+    
+    @staticmethod
+    def _index_rect(item: DrawItem) -> QRect:
+        """绘制项在空间索引中的矩形
         
-        for item in self._draw_items:
-            rect = item.get_bounding_rect()
-            if not rect.isEmpty():
-                self._spatial_index.insert(item, rect)
+        边界矩形按线宽扩展，保证 contains_point 的命中范围（直线/箭头为
+        margin + 线宽的一半）不会超出索引矩形 + 查询半径。
+        """
+        rect = item.get_bounding_rect()
+        if rect.isEmpty():
+            return rect
+        pad = max((item.width or 0) // 2, 3)
+        return rect.adjusted(-pad, -pad, pad, pad)
     
     def _add_item_to_index(self, item: DrawItem):
         """添加绘制项到空间索引"""
@@ -2725,9 +2809,7 @@ class OverlayScreenshot(QWidget):
         if self._spatial_index is None:
             return
         
-        rect = item.get_bounding_rect()
-        if not rect.isEmpty():
-            self._spatial_index.insert(item, rect)
+        self._spatial_index.insert(item, self._index_rect(item))
     
     def _remove_item_from_index(self, item: DrawItem):
         """从空间索引移除绘制项"""
@@ -2737,10 +2819,8 @@ class OverlayScreenshot(QWidget):
     def _update_item_in_index(self, item: DrawItem):
         """更新绘制项在空间索引中的边界框（用于大小改变后）"""
         if self._spatial_index is not None:
-            self._spatial_index.remove(item)
-            rect = item.get_bounding_rect()
-            if not rect.isEmpty():
-                self._spatial_index.insert(item, rect)
+            # update 保留原插入顺序（即绘制顺序）
+            self._spatial_index.update(item, self._index_rect(item))
 
     def _find_item_at(self, pos: QPoint) -> Optional[DrawItem]:
         for item in reversed(self._draw_items):
@@ -2943,6 +3023,8 @@ class OverlayScreenshot(QWidget):
             self._side_toolbar.hide()
         self._draw_items.clear()
         self._undo_stack.clear()
+        if self._spatial_index is not None:
+            self._spatial_index.clear()
         self._selected_item = None
         self.update()
 
@@ -3077,12 +3159,16 @@ class OverlayScreenshot(QWidget):
             # Feature: performance-ui-optimization
             # Requirements: 2.2, 2.4
             if self._selected_item:
+                self._update_item_in_index(self._selected_item)
                 self._update_item_region(self._selected_item)
             return
         if self._drawing:
             self._drawing = False
             if len(self._current_draw_points) >= 2:
                 item = DrawItem(tool=self._current_tool, color=QColor(self._current_color), width=get_actual_width(self._current_width_level), points=self._current_draw_points.copy())
+                # 画笔笔画：简化并转为紧凑存储
+                # Feature: stroke-simplification
+                item.simplify_stroke(stroke_tolerance(self.devicePixelRatio()))
                 self._draw_items.append(item)
                 self._undo_stack.clear()
                 # 标记绘制项区域为脏区域
@@ -3716,6 +3802,7 @@ class OverlayScreenshot(QWidget):
                 
                 item_rect = self._selected_item.get_bounding_rect()
                 self._draw_items.remove(self._selected_item)
+                self._remove_item_from_index(self._selected_item)
                 self._undo_stack.append(self._selected_item)
                 self._selected_item = None
                 
@@ -4229,12 +4316,10 @@ class OverlayScreenshot(QWidget):
             if self._inline_editor.editing_item:
                 # 更新已有项
                 editing_item = self._inline_editor.editing_item
-                # 先从空间索引移除旧项（边界矩形可能变化）
-                self._remove_item_from_index(editing_item)
                 # 更新文字内容
                 editing_item.text = self._inline_editor.text
-                # 重新添加到空间索引
-                self._add_item_to_index(editing_item)
+                # 更新空间索引（边界矩形可能变化）
+                self._update_item_in_index(editing_item)
             else:
                 # 创建新项
                 # 确保颜色有效
@@ -4495,6 +4580,7 @@ class OverlayScreenshot(QWidget):
         if self._draw_items:
             item = self._draw_items.pop()
             self._undo_stack.append(item)
+            self._remove_item_from_index(item)
             if self._selected_item == item:
                 self._selected_item = None
             # 如果是高亮工具，取消对应的 OCR 任务
@@ -4516,6 +4602,7 @@ class OverlayScreenshot(QWidget):
         if self._undo_stack:
             item = self._undo_stack.pop()
             self._draw_items.append(item)
+            self._add_item_to_index(item)
             
             # 追踪标注项被恢复（用于脏区域计算）
             # Feature: performance-ui-optimization
@@ -4528,15 +4615,20 @@ class OverlayScreenshot(QWidget):
             # 使用局部更新而非全屏重绘
             self._update_item_region(item)
 
+    # 结果合成时判断绘制项是否与选区相交的额外边距（逻辑像素），
+    # 覆盖线宽、箭头头部等超出点边界矩形的部分
+    RESULT_ITEM_MARGIN = 20
+
     def _get_result_image(self) -> Optional[QImage]:
         """获取结果图片，包含选区内的截图和绘制项
         
-        采用 Flameshot 的方法：先在完整截图上绘制所有绘制项，然后裁剪选区
+        先裁剪选区，再只在裁剪后的图像上绘制与选区相交的绘制项，
+        避免多显示器高分屏下复制和转换整张截图。
         
         关键点：
         - _screenshot 已设置 devicePixelRatio，Qt 会自动处理逻辑坐标到物理像素的转换
-        - 绘制项坐标是 widget 坐标（逻辑像素），直接使用即可
-        - 不需要手动 scale，Qt 会根据 pixmap 的 DPR 自动缩放
+        - 绘制项坐标是 widget 坐标（逻辑像素），通过平移画笔映射到裁剪图像
+        - 平移量按物理像素偏移换算，保证与在完整截图上绘制后裁剪的像素一致
         """
         rect = self._get_selection_rect()
         if rect.isEmpty() or self._screenshot is None:
@@ -4556,50 +4648,13 @@ class OverlayScreenshot(QWidget):
             debug_log(f"选区 (widget坐标): x={rect.x()}, y={rect.y()}, w={rect.width()}, h={rect.height()}", "RESULT")
             debug_log(f"截图 pixmap DPR: {self._screenshot.devicePixelRatio()}", "RESULT")
             
-            # 决定使用哪个源图像
-            source_pixmap = self._screenshot
-            
-            # 如果有绘制项，先在完整截图上绘制，然后裁剪
-            if self._draw_items:
-                debug_log(f"有 {len(self._draw_items)} 个绘制项需要绘制", "RESULT")
-                
-                # 复制原始截图（保留 DPR 设置）
-                screenshot_with_drawings = self._screenshot.copy()
-                # 确保复制后的 pixmap 也有正确的 DPR
-                screenshot_with_drawings.setDevicePixelRatio(self._screenshot.devicePixelRatio())
-                
-                # 在完整截图上绘制所有绘制项
-                # 由于 pixmap 设置了 DPR，QPainter 会自动将逻辑坐标转换为物理像素
-                painter = QPainter(screenshot_with_drawings)
-                if painter.isActive():
-                    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-                    # 不需要手动 scale！pixmap 的 DPR 会让 Qt 自动处理坐标转换
-                    
-                    for idx, item in enumerate(self._draw_items):
-                        if item.points:
-                            first_pt = item.points[0]
-                            debug_log(f"绘制项 {idx}: tool={item.tool}, first=({first_pt.x()}, {first_pt.y()})", "RESULT")
-                        self._draw_item(painter, item, log_enabled=True)
-                    
-                    painter.end()
-                    # 绘制成功，使用带绘制项的截图
-                    source_pixmap = screenshot_with_drawings
-                else:
-                    debug_log("无法创建 QPainter，将使用原始截图（不含绘制项）", "ERROR")
-            
-            # 转换为 QImage
-            source_image = source_pixmap.toImage()
-            if source_image.isNull():
-                debug_log("源图像为空", "ERROR")
-                return None
-            
-            # 计算物理像素坐标（QImage.copy 使用物理像素坐标）
+            # 计算物理像素坐标（QPixmap.copy 使用物理像素坐标）
             phys_x = int(rect.x() * dpr)
             phys_y = int(rect.y() * dpr)
             phys_w = int(rect.width() * dpr)
             phys_h = int(rect.height() * dpr)
             
-            src_w, src_h = source_image.width(), source_image.height()
+            src_w, src_h = self._screenshot.width(), self._screenshot.height()
             debug_log(f"源图像尺寸: {src_w}x{src_h}", "RESULT")
             debug_log(f"物理像素坐标 (裁剪区域): x={phys_x}, y={phys_y}, w={phys_w}, h={phys_h}", "RESULT")
             
@@ -4613,11 +4668,47 @@ class OverlayScreenshot(QWidget):
                 debug_log("裁剪区域无效", "ERROR")
                 return None
             
-            # 裁剪选区
-            result = source_image.copy(phys_x, phys_y, phys_w, phys_h)
-            if result.isNull():
+            # 先裁剪选区（保留 DPR 设置）
+            cropped = self._screenshot.copy(phys_x, phys_y, phys_w, phys_h)
+            if cropped.isNull():
                 debug_log("裁剪结果为空", "ERROR")
                 return None
+            cropped.setDevicePixelRatio(self._screenshot.devicePixelRatio())
+            
+            # 只绘制与裁剪区域相交的绘制项
+            crop_logical = QRect(
+                int(phys_x / dpr), int(phys_y / dpr),
+                int(phys_w / dpr) + 2, int(phys_h / dpr) + 2,
+            )
+            items = [
+                item for item in self._draw_items
+                if self._item_intersects(item, crop_logical)
+            ]
+            if items:
+                debug_log(f"有 {len(items)}/{len(self._draw_items)} 个绘制项需要绘制", "RESULT")
+                
+                # 由于 pixmap 设置了 DPR，QPainter 会自动将逻辑坐标转换为物理像素
+                painter = QPainter(cropped)
+                if painter.isActive():
+                    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+                    # 平移到裁剪图像的坐标系，偏移量对应物理像素 (phys_x, phys_y)
+                    painter.translate(-phys_x / dpr, -phys_y / dpr)
+                    
+                    for idx, item in enumerate(items):
+                        if item.points:
+                            first_pt = item.points[0]
+                            debug_log(f"绘制项 {idx}: tool={item.tool}, first=({first_pt.x()}, {first_pt.y()})", "RESULT")
+                        self._draw_item(painter, item, log_enabled=True)
+                    
+                    painter.end()
+                else:
+                    debug_log("无法创建 QPainter，将使用原始截图（不含绘制项）", "ERROR")
+            
+            # 转换为 QImage
+            result = cropped.toImage()
+            if result.isNull():
+                debug_log("结果图像为空", "ERROR")
+                return None
             
             debug_log(f"最终图像尺寸: {result.width()}x{result.height()}", "RESULT")
             return result
@@ -4628,6 +4719,17 @@ class OverlayScreenshot(QWidget):
             debug_log(traceback.format_exc(), "ERROR")
             return None
 
+    def _item_intersects(self, item: DrawItem, rect: QRect) -> bool:
+        """绘制项是否可能影响 rect 内的像素
+        
+        边界矩形为空（无法计算）的绘制项总是返回 True，交给 QPainter 裁剪。
+        """
+        bounds = item.get_bounding_rect()
+        if bounds.isEmpty():
+            return True
+        margin = self.RESULT_ITEM_MARGIN + max(item.width or 0, 1) * 4
+        return bounds.adjusted(-margin, -margin, margin, margin).intersects(rect)
+
     def _copy(self):
         debug_log("_copy() 被调用（双击保存）", "COPY")
         debug_log(f"当前绘制项数量: {len(self._draw_items)}", "COPY")
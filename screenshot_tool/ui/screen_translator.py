@@ -9,7 +9,7 @@ Requirements: 3.1-3.11
 Features:
 - OCR + 翻译流程
 - 翻译覆盖层窗口
-- 定时翻译模式
+- 定时翻译模式（后台线程，画面/文本未变化时不重复 OCR 和翻译）
 - 点击复制功能
 - 保持文本布局结构
 """
@@ -18,14 +18,18 @@ from PySide6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
     QApplication, QFrame
 )
-from PySide6.QtCore import Qt, Signal, QRect, QTimer, QPoint
+from PySide6.QtCore import Qt, Signal, QRect, QTimer, QPoint, QThread
 from PySide6.QtGui import QImage, QPixmap, QFont, QColor, QPainter, QBrush
-from typing import Optional, Callable
+from typing import Optional, Callable, Set
 from dataclasses import dataclass
+import threading
+import time
 import mss
 import mss.tools
 import requests
 
+from screenshot_tool.services.live_translation import LiveTranslationPipeline
+
 
 @dataclass
 class TranslationOverlayConfig:
@@ -39,6 +43,88 @@ class TranslationOverlayConfig:
     timed_interval_ms: int = 2000
 
 
+class LiveTranslationWorker(QThread):
+    """定时翻译后台线程
+
+    按间隔截图并交给 LiveTranslationPipeline，只有原文变化时才发出信号。
+    OCR 和翻译回调在本线程中调用。
+    """
+    translated = Signal(str, str, str)  # (原文, 译文, 检测到的语言)
+    failed = Signal(str)
+    
+    def __init__(self, capture: Callable[[], QImage],
+                 pipeline: LiveTranslationPipeline, interval_ms: int):
+        super().__init__()
+        self._capture = capture
+        self._pipeline = pipeline
+        self._interval = interval_ms / 1000.0
+        self._stop_event = threading.Event()
+    
+    def set_interval(self, interval_ms: int):
+        """修改间隔（下一帧生效）"""
+        self._interval = interval_ms / 1000.0
+    
+    def request_stop(self):
+        """请求停止线程"""
+        self._stop_event.set()
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                image = self._capture()
+                if image is not None and not image.isNull():
+                    result = self._pipeline.process(image)
+                    if self._stop_event.is_set():
+                        break
+                    if not result.success:
+                        self.failed.emit(f"翻译失败: {result.error}")
+                    elif result.changed:
+                        self.translated.emit(result.text, result.translated, result.detected_lang)
+            except Exception as e:
+                # 单帧出错不终止定时翻译
+                self.failed.emit(f"错误: {str(e)}")
+            
+            elapsed = time.monotonic() - started
+            self._stop_event.wait(max(0.0, self._interval - elapsed))
+
+
+# 已请求停止但仍在处理当前帧的线程：保留引用直到 finished，
+# 避免 QThread 在运行中被销毁（"QThread: Destroyed while thread is still running"）
+_stopping_workers: Set[LiveTranslationWorker] = set()
+_quit_hook_installed = False
+
+
+def _wait_stopping_workers(timeout_ms: int = 5000) -> None:
+    """退出程序前等待仍在停止中的定时翻译线程"""
+    for worker in list(_stopping_workers):
+        worker.wait(timeout_ms)
+
+
+def _retire_worker(worker: LiveTranslationWorker) -> None:
+    """请求线程停止，结束后再 deleteLater（不阻塞界面）"""
+    global _quit_hook_installed
+    
+    worker.request_stop()
+    _stopping_workers.add(worker)
+    
+    def on_finished():
+        if worker in _stopping_workers:
+            _stopping_workers.discard(worker)
+            worker.deleteLater()
+    
+    worker.finished.connect(on_finished)
+    # 连接前线程可能已经结束
+    if worker.isFinished() or not worker.isRunning():
+        on_finished()
+        return
+    
+    app = QApplication.instance()
+    if app is not None and not _quit_hook_installed:
+        app.aboutToQuit.connect(_wait_stopping_workers)
+        _quit_hook_installed = True
+
+
 class ScreenTranslator(QWidget):
     """屏幕翻译覆盖层"""
     
@@ -76,8 +162,8 @@ class ScreenTranslator(QWidget):
         self._translated_text = ""
         
         self._timed_mode = False
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._on_timer_tick)
+        self._live_pipeline: Optional[LiveTranslationPipeline] = None
+        self._live_worker: Optional[LiveTranslationWorker] = None
         
         self._setup_window()
         self._setup_ui()
@@ -294,23 +380,75 @@ class ScreenTranslator(QWidget):
     def start_timed_translation(self, interval_ms: int = 2000):
         """开始定时翻译
         
+        截图、OCR 和翻译在后台线程中进行；画面未变化时跳过，
+        只重新识别变化的行、只翻译新出现的行。
+        
         Args:
             interval_ms: 定时间隔（毫秒），最小100ms，最大60000ms
         """
         # 验证并限制间隔范围
         interval_ms = max(100, min(60000, interval_ms))
+        if self._ocr_callback is None or self._translate_callback is None:
+            self._show_error("回调函数未设置")
+            return
+        
         self._timed_mode = True
-        self._timer.start(interval_ms)
+        if self._live_worker is not None and self._live_worker.isRunning():
+            self._live_worker.set_interval(interval_ms)
+        else:
+            # 流水线不是线程安全的，旧线程还在处理最后一帧时换用新的流水线
+            if self._live_pipeline is None or self._live_pipeline_busy():
+                self._live_pipeline = LiveTranslationPipeline(
+                    self._ocr_callback, self._translate_callback
+                )
+            self._live_pipeline.set_languages(self._target_lang, self._source_lang)
+            self._live_pipeline.reset()
+            
+            self._live_worker = LiveTranslationWorker(
+                self._capture_region, self._live_pipeline, interval_ms
+            )
+            self._live_worker.translated.connect(self._on_live_translated)
+            self._live_worker.failed.connect(self._on_live_failed)
+            self._live_worker.start()
+        
         self._timer_btn.setText("⏸")
         self._timer_btn.setToolTip("停止定时翻译")
     
     def stop_timed_translation(self):
         """停止定时翻译"""
         self._timed_mode = False
-        self._timer.stop()
+        worker = self._live_worker
+        self._live_worker = None
+        if worker is not None:
+            worker.translated.disconnect(self._on_live_translated)
+            worker.failed.disconnect(self._on_live_failed)
+            # 当前帧的 OCR/翻译可能还在进行，线程结束后再释放
+            _retire_worker(worker)
         self._timer_btn.setText("⏱")
         self._timer_btn.setToolTip("定时翻译")
     
+    def _live_pipeline_busy(self) -> bool:
+        """是否有停止中的线程仍在使用当前流水线"""
+        return any(
+            worker._pipeline is self._live_pipeline and worker.isRunning()
+            for worker in list(_stopping_workers)
+        )
+    
+    def _on_live_translated(self, text: str, translated: str, detected_lang: str):
+        """后台线程完成一帧翻译（原文有变化）"""
+        self._original_text = text
+        self._translated_text = translated
+        if detected_lang:
+            self._detected_lang = detected_lang
+        self._restore_text_style()
+        self._update_display()
+        self.translationComplete.emit(text, translated)
+    
+    def _on_live_failed(self, message: str):
+        """后台线程出错"""
+        self._show_error(message)
+        self.translationError.emit(message)
+    
     def _toggle_timed_mode(self):
         """切换定时翻译模式"""
         if self._timed_mode:
@@ -318,17 +456,17 @@ class ScreenTranslator(QWidget):
         else:
             self.start_timed_translation(self._config.timed_interval_ms)
     
-    def _on_timer_tick(self):
-        """定时器触发"""
-        self.translate_once()
-    
     def set_target_language(self, lang: str):
         """设置目标语言"""
         self._target_lang = lang
+        if self._live_pipeline is not None:
+            self._live_pipeline.set_languages(self._target_lang, self._source_lang)
     
     def set_source_language(self, lang: str):
         """设置源语言"""
         self._source_lang = lang
+        if self._live_pipeline is not None:
+            self._live_pipeline.set_languages(self._target_lang, self._source_lang)
     
     def get_original_text(self) -> str:
         """获取原文"""